@@ -14,12 +14,20 @@ from apps.accounts.models import (
     DepositAccount
 )
 from apps.accounts.services.trading_service import TradingService
+from core.pagination import KeysetPagination
 from .serializers import (
     CategoryAccountSerializer, TransactionSerializer, SavingsRewardSerializer,
     DepositAccountSerializer
 )
 
 
+class TransactionPagination(KeysetPagination):
+    """거래 내역 키셋(커서) 페이지네이션 (최신순)"""
+    page_size = 50
+    max_page_size = 200
+    ordering = ('-transaction_date', '-id')
+
+
 class CategoryAccountViewSet(viewsets.ModelViewSet):
     """카테고리별 통장 관리"""
     permission_classes = [IsAuthenticated]
@@ -207,11 +215,20 @@ class CategoryAccountViewSet(viewsets.ModelViewSet):
 
     @action(detail=True, methods=['get'])
     def transactions(self, request, pk=None):
-        """거래 내역 조회"""
+        """
+        거래 내역 조회 (최신순, 커서 페이지네이션)
+        
+        Query Parameters:
+        - cursor: 페이지 커서 (응답의 next/previous)
+        - page_size: 페이지 크기 (기본: 50, 최대: 200)
+        """
         account = self.get_object()
-        transactions = Transaction.objects.filter(account=account).order_by('-transaction_date')
-        serializer = TransactionSerializer(transactions, many=True)
-        return Response(serializer.data)
+        transactions = Transaction.objects.filter(account=account)
+        
+        paginator = TransactionPagination()
+        page = paginator.paginate_queryset(transactions, request)
+        serializer = TransactionSerializer(page, many=True)
+        return paginator.get_paginated_response(serializer.data)
     
     @action(detail=True, methods=['post'], url_path='link-bank-account')
     def link_bank_account(self, request, pk=None):
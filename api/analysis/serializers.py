@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from apps.analysis.models import (
     MateAnalysis,
+    MateAnalysisJob,
     QualitativeAnalysis,
     TenKInsight,
     ValuationJournalEntry,
@@ -27,6 +28,28 @@ class MateAnalysisSerializer(serializers.ModelSerializer):
         ]
 
 
+class MateAnalysisJobSerializer(serializers.ModelSerializer):
+    """메이트 분석 작업 Serializer (완료되면 result에 분석 결과)"""
+    
+    stock_code = serializers.CharField(source='stock.stock_code', read_only=True)
+    result = MateAnalysisSerializer(source='analysis', read_only=True)
+    
+    class Meta:
+        model = MateAnalysisJob
+        fields = [
+            'id',
+            'stock_code',
+            'mate_type',
+            'analysis_version',
+            'status',
+            'error',
+            'result',
+            'created_at',
+            'started_at',
+            'finished_at',
+        ]
+
+
 class QualitativeAnalysisSerializer(serializers.ModelSerializer):
     """정성적 분석 Serializer"""
     
@@ -4,6 +4,7 @@ from . import views
 
 router = DefaultRouter()
 router.register(r'journals', views.ValuationJournalEntryViewSet, basename='valuation-journal')
+router.register(r'jobs', views.MateAnalysisJobViewSet, basename='analysis-job')
 router.register(r'', views.AnalysisViewSet, basename='analysis')
 
 urlpatterns = [
@@ -1,12 +1,33 @@
-from rest_framework import viewsets, status
+from rest_framework import mixins, viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
 from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.db.models import Count, Max
 
 from apps.stocks.models import Stock
-from apps.analysis.models import MateAnalysis, ProperPrice, ValuationJournalEntry
-from .serializers import MateAnalysisSerializer, ValuationJournalEntrySerializer
+from apps.analysis.models import MateAnalysis, MateAnalysisJob, ProperPrice, ValuationJournalEntry
+from apps.analysis.services import enqueue_mate_analysis
+from core.conditional import conditional_response
+from core.utils.mate_engine import MateEngine
+from .serializers import MateAnalysisJobSerializer, MateAnalysisSerializer, ValuationJournalEntrySerializer
+
+
+def mate_analysis_state(request, stock_code=None):
+    """
+    조건부 GET 상태: 메이트 분석 최종 분석 시각 (분석 수를 지문으로)
+    
+    분석이 없으면 (202 분석 중) 조건부 처리하지 않음
+    """
+    summary = MateAnalysis.objects.filter(
+        stock__stock_code=stock_code,
+        stock__is_active=True,
+    ).aggregate(
+        last_analyzed=Max('analyzed_at'),
+        count=Count('id'),
+    )
+    return summary['last_analyzed'], summary['count']
 
 
 class AnalysisViewSet(viewsets.ViewSet):
@@ -16,6 +37,7 @@ class AnalysisViewSet(viewsets.ViewSet):
     permission_classes = [AllowAny]
     
     @action(detail=False, methods=['get'], url_path='(?P<stock_code>[^/.]+)')
+    @conditional_response(mate_analysis_state)
     def get_analysis(self, request, stock_code=None):
         """
         종목 분석
@@ -74,11 +96,17 @@ class AnalysisViewSet(viewsets.ViewSet):
     @action(detail=False, methods=['post'])
     def analyze_now(self, request):
         """
-        즉시 분석 (캐시 무시)
+        즉시 분석 요청 (백그라운드 작업)
         POST /api/analysis/analyze_now/
-        Body: {"stock_code": "005930"}
+        Body: {"stock_code": "005930", "mate_type": "benjamin"}
+        
+        LLM 호출은 Celery 작업으로 실행하고 작업 ID를 바로 반환 (202)
+        같은 프롬프트(지표 미변경)는 LLM 응답 캐시를 재사용
+        같은 (종목, 메이트, 분석 버전)의 진행 중 작업이 있으면 그 작업을 반환
+        진행 상황/결과: GET /api/analysis/jobs/{job_id}/
         """
         stock_code = request.data.get('stock_code')
+        mate_type = request.data.get('mate_type', 'benjamin')
         
         if not stock_code:
             return Response(
@@ -86,48 +114,46 @@ class AnalysisViewSet(viewsets.ViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        stock = get_object_or_404(Stock, stock_code=stock_code, is_active=True)
+        if mate_type not in MateEngine.MATE_PROMPTS:
+            return Response(
+                {'error': f"mate_type은 {', '.join(MateEngine.MATE_PROMPTS)} 중 하나"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         
-        # TODO: 비동기로 분석 실행 (Celery)
-        # 지금은 동기로 (테스트용)
+        stock = get_object_or_404(Stock, stock_code=stock_code, is_active=True)
         
-        try:
-            engine = MateEngine()
-            
-            # 샘플 데이터 (실제로는 DB에서)
-            stock_data = {
-                'stock_name': stock.stock_name,
-                'pbr': 1.8,
-                'debt_ratio': 30.5,
-                'dividend_yield': 2.5,
-            }
-            
-            # 벤저민 메이트 분석
-            result = engine.analyze(stock_data, mate_type='benjamin')
-            
-            # DB 저장
-            mate_analysis, created = MateAnalysis.objects.update_or_create(
-                stock=stock,
-                mate_type='benjamin',
-                defaults={
-                    'score': result['score'],
-                    'summary': result['summary'],
-                    'reason': result['reason'],
-                    'caution': result.get('caution', ''),
-                    'score_detail': result.get('score_detail', {}),
-                }
-            )
-            
-            return Response({
-                'message': '분석 완료',
-                'data': MateAnalysisSerializer(mate_analysis).data
-            })
+        job, created = enqueue_mate_analysis(stock, mate_type)
+        status_url = reverse('analysis-job-detail', args=[job.id])
         
-        except Exception as e:
+        if job.status == 'failed':
+            # 작업 큐(브로커)에 전달하지 못함
             return Response(
-                {'error': str(e)},
-                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+                {'error': job.error, 'job_id': str(job.id)},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
             )
+        
+        return Response(
+            {
+                'message': '분석 요청 완료' if created else '진행 중인 분석이 있습니다',
+                'job_id': str(job.id),
+                'status': job.status,
+                'status_url': status_url,
+            },
+            status=status.HTTP_202_ACCEPTED,
+            headers={'Location': status_url},
+        )
+
+
+class MateAnalysisJobViewSet(mixins.RetrieveModelMixin, viewsets.GenericViewSet):
+    """
+    메이트 분석 작업 조회
+    GET /api/analysis/jobs/{job_id}/
+    
+    status: queued → running → success (result에 분석 결과) / failed (error)
+    """
+    queryset = MateAnalysisJob.objects.select_related('stock', 'analysis')
+    serializer_class = MateAnalysisJobSerializer
+    permission_classes = [AllowAny]
 
 
 class ValuationJournalEntryViewSet(viewsets.ModelViewSet):
@@ -6,9 +6,12 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
 from django.shortcuts import get_object_or_404
+from django.db.models import Count, Max
 
 from apps.content.models import ContentSource, ContentCategory, CuratedContent, WeeklyBrief
 from apps.stocks.models import Stock
+from core.conditional import conditional_response
+from core.pagination import KeysetPagination
 from .serializers import ContentSourceSerializer, ContentCategorySerializer, CuratedContentSerializer, WeeklyBriefSerializer
 
 
@@ -23,6 +26,58 @@ def str_to_bool(value: str | None) -> bool | None:
     return None
 
 
+# 콘텐츠 기본 정렬 / ordering 파라미터로 지정 가능한 필드
+CONTENT_ORDERING = ('-priority', '-is_featured', '-created_at', '-id')
+CONTENT_ORDERING_FIELDS = ('priority', 'created_at', 'updated_at')
+
+
+def content_ordering(value: str | None) -> list[str]:
+    """ordering 파라미터 (예: '-created_at,priority') → 정렬 키 (마지막은 id)"""
+    ordering = [
+        name for name in (value or '').split(',')
+        if name.strip().lstrip('-') in CONTENT_ORDERING_FIELDS
+    ]
+    if not ordering:
+        return list(CONTENT_ORDERING)
+    return [name.strip() for name in ordering] + ['-id']
+
+
+class ContentPagination(KeysetPagination):
+    """콘텐츠 키셋(커서) 페이지네이션 (?cursor=...&limit=20)"""
+    page_size = 50
+    page_size_query_param = 'limit'
+    max_page_size = 200
+    ordering = CONTENT_ORDERING
+
+
+class WeeklyBriefPagination(KeysetPagination):
+    page_size = 20
+    max_page_size = 100
+    ordering = ('-year', '-week_number', '-id')
+
+
+def curated_content_state(request, *args, **kwargs):
+    """
+    조건부 GET 상태: 콘텐츠 최종 수정 시각 (콘텐츠 수/종목 연결 수를 지문으로)
+    """
+    summary = CuratedContent.objects.aggregate(
+        last_updated=Max('updated_at'),
+        count=Count('id'),
+    )
+    stock_links = CuratedContent.recommended_for_stocks.through.objects.count()
+    return summary['last_updated'], f"{summary['count']}:{stock_links}"
+
+
+def latest_brief_state(request, *args, **kwargs):
+    """
+    조건부 GET 상태: 최신 발행 브리핑 수정 시각 (브리핑 ID를 지문으로)
+    """
+    row = WeeklyBrief.objects.filter(is_published=True).order_by(
+        '-year', '-week_number'
+    ).values_list('updated_at', 'id').first()
+    return row if row is not None else (None, None)
+
+
 class ContentViewSet(viewsets.ReadOnlyModelViewSet):
     """
     콘텐츠 큐레이션 API
@@ -31,10 +86,13 @@ class ContentViewSet(viewsets.ReadOnlyModelViewSet):
     - retrieve: 콘텐츠 상세
     - by_stock: 특정 종목의 큐레이션
     - by_category: 카테고리별 콘텐츠
+    
+    목록은 모두 커서 페이지네이션 (cursor, limit)
     """
     permission_classes = [AllowAny]
     queryset = CuratedContent.objects.all()
     serializer_class = CuratedContentSerializer
+    pagination_class = ContentPagination
     ordering_fields = ['priority', 'created_at', 'updated_at']
     ordering = ['-priority', '-is_featured', '-created_at']
 
@@ -67,30 +125,20 @@ class ContentViewSet(viewsets.ReadOnlyModelViewSet):
         if search:
             queryset = queryset.filter(title__icontains=search)
 
-        ordering_param = params.get('ordering')
-        if ordering_param:
-            queryset = queryset.order_by(ordering_param)
-        else:
-            queryset = queryset.order_by('-priority', '-is_featured', '-created_at')
-
-        return queryset
+        return queryset.order_by(*content_ordering(params.get('ordering')))
 
+    @conditional_response(curated_content_state)
     def list(self, request, *args, **kwargs):
         queryset = self.filter_queryset(self.get_queryset())
-        total = queryset.count()
-        limit = request.query_params.get('limit')
-        if limit:
-            try:
-                limit_value = int(limit)
-                if limit_value > 0:
-                    queryset = queryset[:limit_value]
-            except ValueError:
-                pass
-
-        serializer = self.get_serializer(queryset, many=True)
-        return Response({'results': serializer.data, 'total': total})
+        page = self.paginator.paginate_queryset(
+            queryset, request, ordering=content_ordering(request.query_params.get('ordering'))
+        )
+
+        serializer = self.get_serializer(page, many=True)
+        return self.paginator.get_paginated_response(serializer.data)
     
     @action(detail=False, methods=['get'], url_path='stocks/(?P<stock_id>[^/.]+)')
+    @conditional_response(curated_content_state)
     def by_stock(self, request, stock_id=None):
         """
         특정 종목의 큐레이션 콘텐츠
@@ -101,7 +149,10 @@ class ContentViewSet(viewsets.ReadOnlyModelViewSet):
         
         contents = CuratedContent.objects.filter(
             recommended_for_stocks=stock
-        ).select_related('source', 'category').order_by('-priority', '-is_featured', '-is_required')
+        ).select_related('source', 'category')
+        page = self.paginator.paginate_queryset(
+            contents, request, ordering=['-priority', '-is_featured', '-is_required', '-id']
+        )
         
         return Response({
             'stock': {
@@ -109,11 +160,13 @@ class ContentViewSet(viewsets.ReadOnlyModelViewSet):
                 'stock_code': stock.stock_code,
                 'stock_name': stock.stock_name,
             },
-            'contents': CuratedContentSerializer(contents, many=True).data,
-            'total': contents.count(),
+            'contents': CuratedContentSerializer(page, many=True).data,
+            'next': self.paginator.get_next_link(),
+            'previous': self.paginator.get_previous_link(),
         })
     
     @action(detail=False, methods=['get'])
+    @conditional_response(curated_content_state)
     def by_category(self, request):
         """
         카테고리별 콘텐츠
@@ -126,13 +179,15 @@ class ContentViewSet(viewsets.ReadOnlyModelViewSet):
             category = get_object_or_404(ContentCategory, slug=category_slug)
             contents = CuratedContent.objects.filter(
                 category=category
-            ).select_related('source', 'category').order_by('-priority')
+            ).select_related('source', 'category')
         else:
-            contents = CuratedContent.objects.all().select_related('source', 'category').order_by('-priority')
+            contents = CuratedContent.objects.all().select_related('source', 'category')
+        page = self.paginator.paginate_queryset(contents, request, ordering=['-priority', '-id'])
         
         return Response({
-            'contents': CuratedContentSerializer(contents, many=True).data,
-            'total': contents.count(),
+            'contents': CuratedContentSerializer(page, many=True).data,
+            'next': self.paginator.get_next_link(),
+            'previous': self.paginator.get_previous_link(),
         })
 
 
@@ -143,8 +198,10 @@ class WeeklyBriefViewSet(viewsets.ReadOnlyModelViewSet):
     permission_classes = [AllowAny]
     queryset = WeeklyBrief.objects.filter(is_published=True).order_by('-year', '-week_number')
     serializer_class = WeeklyBriefSerializer
+    pagination_class = WeeklyBriefPagination
     
     @action(detail=False, methods=['get'])
+    @conditional_response(latest_brief_state)
     def latest(self, request):
         """최신 브리핑"""
         brief = self.queryset.first()
@@ -0,0 +1,35 @@
+"""
+스트리밍 내보내기 렌더러
+
+?format=csv|ndjson 요청이 콘텐츠 협상을 통과하도록 등록만 하는 렌더러
+(실제 응답은 뷰가 StreamingHttpResponse로 직접 생성)
+"""
+import json
+
+from rest_framework.renderers import BaseRenderer
+
+
+class CSVRenderer(BaseRenderer):
+    media_type = 'text/csv'
+    format = 'csv'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        # 오류 응답 등 스트리밍이 아닌 응답
+        if data is None:
+            return b''
+        if isinstance(data, dict):
+            message = data.get('error', data.get('detail', ''))
+            return f'error\n{message}\n'.encode(self.charset)
+        return str(data).encode(self.charset)
+
+
+class NDJSONRenderer(BaseRenderer):
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return (json.dumps(data, ensure_ascii=False) + '\n').encode(self.charset)
@@ -2,7 +2,7 @@
 주식 데이터 Serializers
 """
 from rest_framework import serializers
-from apps.stocks.models import Stock, StockFinancialRaw, StockPrice
+from apps.stocks.models import Stock, StockFinancialRaw, StockPrice, StockIndicatorHistory
 
 
 class StockListSerializer(serializers.ModelSerializer):
@@ -176,6 +176,54 @@ class StockIndicatorsSerializer(serializers.Serializer):
     # 현금흐름 품질
     ocf_to_net_income = serializers.FloatField(allow_null=True)  # OCF / Net Income
     fcf_positive_quarters = serializers.IntegerField()  # 최근 20분기 중 FCF > 0인 분기 수
+    
+    # 섹터/산업 내 백분위 (0-100, {지표: 백분위}, 메이트 점수는 mate_<타입>)
+    sector = serializers.CharField(required=False, allow_null=True, allow_blank=True)
+    industry = serializers.CharField(required=False, allow_null=True, allow_blank=True)
+    sector_percentile = serializers.DictField(child=serializers.FloatField(allow_null=True), required=False)
+    industry_percentile = serializers.DictField(child=serializers.FloatField(allow_null=True), required=False)
+
+
+class StockIndicatorHistorySerializer(serializers.ModelSerializer):
+    """
+    분기별 시점 TTM 지표 (차트/백테스트)
+    """
+    period = serializers.SerializerMethodField()
+    
+    class Meta:
+        model = StockIndicatorHistory
+        fields = [
+            'period',
+            'disclosure_year',
+            'disclosure_quarter',
+            'ttm_period',
+            'quarter_count',
+            
+            # TTM
+            'ttm_ocf',
+            'ttm_fcf',
+            'ttm_capex',
+            'ttm_revenue',
+            'ttm_net_income',
+            
+            # 기준 분기 재무상태
+            'total_assets',
+            'total_liabilities',
+            'total_equity',
+            
+            # 지표
+            'fcf_margin',
+            'roe',
+            'debt_ratio',
+            'current_ratio',
+            'revenue_growth',
+            'fcf_growth',
+            'ocf_to_net_income',
+            'fcf_positive_quarters',
+        ]
+    
+    def get_period(self, obj):
+        return f"{obj.disclosure_year}Q{obj.disclosure_quarter}"
 
 
 class StockPriceSerializer(serializers.ModelSerializer):
@@ -1,32 +1,263 @@
 """
 주식 데이터 API Views
 """
+import csv
+import json
+from functools import wraps
+
+import numpy as np
+
 from rest_framework import viewsets, status, filters
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.permissions import AllowAny, IsAuthenticated
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.permissions import AllowAny, IsAuthenticated, IsAdminUser
 # from core.permissions import require_tier  # 개인 사용: 로그인 불필요
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
-from django.db.models import Q, Sum, Avg, Count, F, Case, When, FloatField, IntegerField
+from django.db.models import Q, Sum, Avg, Count, Max, F, Case, When, FloatField, IntegerField, OuterRef, Subquery
 from django.db.models.functions import Coalesce
 
-from apps.stocks.models import Stock, StockFinancialRaw, StockPrice
-from apps.analysis.models import MateAnalysis
+from apps.stocks.models import Stock, StockFinancialRaw, StockPrice, StockIndicatorSnapshot, StockScore
+from apps.stocks.services import (
+    get_indicator_snapshot,
+    get_indicator_snapshots,
+    snapshot_indicators,
+    get_indicator_history,
+    get_stock_percentiles,
+    get_distribution_version,
+    search_stocks,
+)
+from apps.stocks.services.proper_price import effective_shares, get_latest_prices
+from apps.stocks.services.sector_distribution import DISTRIBUTION_METRICS, mate_metric
+from apps.stocks.services.response_cache import (
+    CACHED_ENDPOINTS,
+    get_or_compute_response,
+    get_response_cache_stats,
+)
+from core.conditional import conditional_response
+from core.pagination import KeysetPagination
+from core.utils.score_engine import GRADES, score_indicators
+from core.utils.screening_engine import get_screening_engine
+from core.utils.valuation_engine import ValuationEngine
+from core.utils.screening_filter import (
+    INDICATOR_FIELDS,
+    ScreeningFilterError,
+    compile_condition,
+    compile_screening_filter,
+    mate_types,
+)
+from apps.analysis.models import MateAnalysis, ValuationDistribution
+from .renderers import CSVRenderer, NDJSONRenderer
 from .serializers import (
     StockListSerializer,
     StockDetailSerializer,
     StockFinancialSerializer,
     StockIndicatorsSerializer,
+    StockIndicatorHistorySerializer,
     StockPriceSerializer,
 )
 
 
-class StandardResultsSetPagination(PageNumberPagination):
+# 스크리닝 파라미터 → 필터 조건 (지표, 연산자)
+SCREEN_PARAM_CONDITIONS = {
+    'min_fcf': ('ttm_fcf', '>='),
+    'min_roe': ('roe', '>='),
+    'max_debt_ratio': ('debt_ratio', '<='),
+    'min_fcf_margin': ('fcf_margin', '>='),
+    'min_revenue_growth': ('revenue_growth', '>='),
+    'fcf_positive_quarters': ('fcf_positive_quarters', '>='),
+}
+
+# 스크리닝 정렬 키 → 스냅샷 필드
+SCREEN_SORT_FIELDS = {
+    'fcf': 'ttm_fcf',
+    'roe': 'roe',
+    'fcf_margin': 'fcf_margin',
+    'revenue_growth': 'revenue_growth',
+    'mate_score': 'mate_score',
+}
+
+
+# 스크리닝 내보내기: 서버 측 커서로 한 번에 가져오는 행 수 / 종목 컬럼
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_STOCK_FIELDS = ('stock_code', 'stock_name', 'stock_name_en', 'exchange', 'sector', 'industry')
+
+
+# 지표 일괄 조회 최대 종목 수
+BATCH_INDICATORS_MAX = 300
+
+# 종목 비교 최대 종목 수 / 기본 분기 수
+COMPARE_MAX_STOCKS = 50
+COMPARE_QUARTERS = 12
+
+# 비교 지표 (백분위 계산 대상)
+COMPARE_METRICS = (
+    'ttm_fcf',
+    'ttm_revenue',
+    'fcf_margin',
+    'roe',
+    'debt_ratio',
+    'revenue_growth',
+    'fcf_growth',
+)
+
+# 비교 분기 시계열 필드
+COMPARE_SERIES_FIELDS = ('revenue', 'net_income', 'ocf', 'fcf')
+
+# DCF 민감도 기본 격자 (성장률 × 할인율 × 영구 성장률) / 축당 최대 값 수
+SENSITIVITY_GROWTH_RATES = (0.0, 0.025, 0.05, 0.075, 0.10, 0.125, 0.15)
+SENSITIVITY_DISCOUNT_RATES = (0.08, 0.09, 0.10, 0.11, 0.12)
+SENSITIVITY_TERMINAL_GROWTHS = (0.02, 0.03)
+SENSITIVITY_MAX_VALUES = 50
+
+
+class Echo:
+    """csv.writer 출력을 그대로 반환하는 버퍼 (스트리밍용)"""
+    
+    def write(self, value):
+        return value
+
+
+def parse_rates(value, default):
+    """
+    쉼표 구분 비율 목록 (예: "0.05,0.1") → float 튜플
+    
+    Raises:
+        ValueError: 숫자가 아니거나 -100% 이하 / 값이 너무 많음
+    """
+    if not value:
+        return default
+    
+    rates = tuple(float(item) for item in value.split(',') if item.strip())
+    if not rates or len(rates) > SENSITIVITY_MAX_VALUES:
+        raise ValueError
+    if any(not np.isfinite(rate) or rate <= -1 for rate in rates):
+        raise ValueError
+    return rates
+
+
+def grid_to_list(values):
+    """NumPy 격자 → 중첩 리스트 (소수 2자리, 계산 불가 NaN → None)"""
+    rounded = np.round(values, 2)
+    return np.where(np.isfinite(rounded), rounded, None).tolist()
+
+
+def percentile_rank(values, value):
+    """
+    값의 백분위 (0-100, values 중 value 이하인 비율, 동률은 절반)
+    
+    value 또는 values가 비어 있으면 None
+    """
+    values = [v for v in values if v is not None]
+    if value is None or not values:
+        return None
+    below = len([v for v in values if v < value])
+    equal = len([v for v in values if v == value])
+    return round((below + equal / 2) / len(values) * 100, 1)
+
+
+# 종목 상세 응답 캐시 시간 (초) - 데이터 변경 시 버전 키로 즉시 무효화
+STOCK_RESPONSE_TTL = 60 * 60 * 6
+
+
+def cache_stock_response(endpoint, timeout=STOCK_RESPONSE_TTL):
+    """
+    종목 상세 액션 응답 캐시 (종목별·엔드포인트별, 쿼리 파라미터 포함)
+    
+    키는 정수 종목 ID (/stocks/007/도 bump_stock_cache_version(7)로 무효화),
+    숫자가 아닌 pk는 캐시하지 않음 (뷰에서 404)
+    """
+    CACHED_ENDPOINTS.add(endpoint)
+    
+    def decorator(view):
+        @wraps(view)
+        def wrapper(self, request, pk=None):
+            try:
+                stock_id = int(pk)
+            except (TypeError, ValueError):
+                return view(self, request, pk=pk)
+            
+            def compute():
+                response = view(self, request, pk=pk)
+                return response.data, response.status_code
+            
+            data, status_code = get_or_compute_response(
+                endpoint, stock_id, request.query_params.dict(), compute, timeout
+            )
+            return Response(data, status=status_code)
+        return wrapper
+    return decorator
+
+
+def stock_data_state(request, pk=None):
+    """
+    조건부 GET 상태: 종목/재무 데이터 최종 수정 시각 (재무 분기 수를 지문으로)
+    """
+    try:
+        stock_id = int(pk)
+    except (TypeError, ValueError):
+        return None, None
+    
+    edgar = Q(financials_raw__data_source='EDGAR')
+    row = Stock.objects.filter(id=stock_id, country='us', is_active=True).annotate(
+        financials_updated_at=Max('financials_raw__updated_at', filter=edgar),
+        financial_count=Count('financials_raw', filter=edgar),
+    ).values_list('updated_at', 'financials_updated_at', 'financial_count').first()
+    
+    if row is None:
+        return None, None
+    
+    updated_at, financials_updated_at, financial_count = row
+    return max(filter(None, [updated_at, financials_updated_at])), financial_count
+
+
+def stock_indicator_state(request, pk=None):
+    """
+    조건부 GET 상태: 종목/재무 데이터 + 섹터 분포 + 메이트 분석 최종 수정 시각
+    
+    indicators 응답에 메이트 점수 백분위가 포함되므로 메이트 분석 수도 지문에 포함
+    """
+    last_modified, fingerprint = stock_data_state(request, pk)
+    if last_modified is None:
+        return None, None
+    
+    distribution_version = get_distribution_version()
+    mates = MateAnalysis.objects.filter(stock_id=int(pk)).aggregate(
+        last_analyzed=Max('analyzed_at'),
+        count=Count('id'),
+    )
+    return (
+        max(filter(None, [last_modified, distribution_version, mates['last_analyzed']])),
+        (fingerprint, mates['count']),
+    )
+
+
+def tenk_insight_state(request, pk=None):
+    """
+    조건부 GET 상태: 10-K 인사이트 최종 수정 시각 (인사이트 수를 지문으로)
+    """
+    from apps.analysis.models import TenKInsight
+    
+    try:
+        stock_id = int(pk)
+    except (TypeError, ValueError):
+        return None, None
+    
+    summary = TenKInsight.objects.filter(stock_id=stock_id).aggregate(
+        last_updated=Max('updated_at'),
+        count=Count('id'),
+    )
+    return summary['last_updated'], summary['count']
+
+
+class StandardResultsSetPagination(KeysetPagination):
+    """키셋(커서) 페이지네이션: ?cursor=...&page_size=50"""
     page_size = 50
     page_size_query_param = 'page_size'
     max_page_size = 200
+    ordering = ('stock_code',)
 
 
 class StockViewSet(viewsets.ReadOnlyModelViewSet):
@@ -37,11 +268,16 @@ class StockViewSet(viewsets.ReadOnlyModelViewSet):
     retrieve: 종목 상세
     search: 종목 검색
     screen: 스크리닝 (필터링)
+    screen_export: 스크리닝 결과 전체 내보내기 (CSV/NDJSON 스트리밍)
     financials: 재무 데이터 (분기별)
     indicators: 핵심 지표 (TTM)
+    indicators_batch: 여러 종목 핵심 지표 일괄 조회
+    indicator_history: 분기별 시점 TTM 지표 (차트/백테스트)
     chart: 차트 데이터
     compare: 종목 비교
     score: 규칙 기반 점수
+    score_leaderboard: 규칙 기반 점수 순위 (등급/섹터 필터)
+    cache_stats: 응답 캐시 통계
     """
     queryset = Stock.objects.filter(country='us', is_active=True)
     permission_classes = [AllowAny]
@@ -76,7 +312,7 @@ class StockViewSet(viewsets.ReadOnlyModelViewSet):
     @action(detail=False, methods=['get'])
     def search(self, request):
         """
-        종목 검색
+        종목 검색 (자동완성)
         GET /api/stocks/search/?q=Apple
         """
         query = request.query_params.get('q', '').strip()
@@ -87,20 +323,12 @@ class StockViewSet(viewsets.ReadOnlyModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # 종목명 또는 종목코드로 검색
-        stocks = Stock.objects.filter(
-            Q(stock_name__icontains=query) |
-            Q(stock_code__icontains=query) |
-            Q(stock_name_en__icontains=query),
-            country='us',
-            is_active=True
-        ).order_by('stock_name')[:20]
-        
-        serializer = StockListSerializer(stocks, many=True)
+        # 메모리 검색 인덱스 (티커 일치 → 접두어 → 부분 일치 → 오타 허용 순)
+        results = search_stocks(query, limit=20)
         
         return Response({
-            'count': len(serializer.data),
-            'results': serializer.data
+            'count': len(results),
+            'results': results
         })
     
     @action(detail=False, methods=['get'])
@@ -118,149 +346,215 @@ class StockViewSet(viewsets.ReadOnlyModelViewSet):
         - mate: 메이트 타입 (benjamin, fisher, greenblatt, lynch)
         - min_mate_score: 메이트 최소 점수 (0-100)
         - sort: 정렬 (fcf, roe, fcf_margin, revenue_growth, mate_score)
+        - filter: 필터 표현식 (DB에서 필터링, 위 조건과 AND 결합)
+          예: roe>=15 AND debt_ratio<50 AND (mate.fisher>=70 OR revenue_growth>20)
+        - cursor: 페이지 커서 (응답의 next/previous)
+        - page_size: 페이지 크기 (기본: 50, 최대: 200)
         """
-        # 재무 데이터가 있는 종목만
-        stocks_with_data = StockFinancialRaw.objects.filter(
-            data_source='EDGAR'
-        ).values_list('stock_id', flat=True).distinct()
+        if request.query_params.get('filter'):
+            return self._screen_with_filter(request)
+        
+        # 전 종목 지표 배열 (프로세스 캐시, 재무 데이터 변경 시 재적재)
+        engine = get_screening_engine()
+        
+        params = request.query_params
+        
+        filters = dict(
+            min_fcf=params.get('min_fcf') or None,
+            min_roe=params.get('min_roe') or None,
+            max_debt_ratio=params.get('max_debt_ratio') or None,
+            min_fcf_margin=params.get('min_fcf_margin') or None,
+            min_revenue_growth=params.get('min_revenue_growth') or None,
+            fcf_positive_quarters=params.get('fcf_positive_quarters') or None,
+            mate_type=params.get('mate') or None,  # 메이트 필터
+            min_mate_score=params.get('min_mate_score') or None,  # 메이트 최소 점수
+            sort_by=params.get('sort', 'fcf'),
+        )
         
-        queryset = Stock.objects.filter(
-            id__in=stocks_with_data,
-            country='us',
-            is_active=True
+        sort_key = SCREEN_SORT_FIELDS.get(filters['sort_by'], 'ttm_fcf')
+        if sort_key == 'mate_score' and not filters['mate_type']:
+            sort_key = 'ttm_fcf'
+        
+        # 필터는 불리언 마스크로 일괄 적용, 커서(정렬 값, stock_id) 이후 현재 페이지만 변환
+        def fetch(cursor, limit):
+            return engine.screen_page(
+                cursor=cursor.values if cursor else None,
+                reverse=bool(cursor and cursor.reverse),
+                limit=limit,
+                **filters,
+            )
+        
+        paginator = self.pagination_class()
+        page = paginator.paginate_keyed(
+            request,
+            fetch,
+            key_func=lambda item: [item[sort_key], item['stock_id']],
+            key_count=2,
         )
         
-        # 각 종목의 지표 계산 및 필터링
+        # 엔진 적재 후 삭제/비활성화된 종목은 건너뜀
+        stocks = Stock.objects.filter(is_active=True).in_bulk([item['stock_id'] for item in page])
+        
         results = []
+        for item in page:
+            stock = stocks.get(item.pop('stock_id'))
+            if stock is not None:
+                results.append({'stock': StockListSerializer(stock).data, **item})
         
-        # 필터 파라미터
-        min_fcf = request.query_params.get('min_fcf')
-        min_roe = request.query_params.get('min_roe')
-        max_debt_ratio = request.query_params.get('max_debt_ratio')
-        min_fcf_margin = request.query_params.get('min_fcf_margin')
-        min_revenue_growth = request.query_params.get('min_revenue_growth')
-        fcf_positive_quarters = request.query_params.get('fcf_positive_quarters')
-        mate_type = request.query_params.get('mate')  # 메이트 필터
-        min_mate_score = request.query_params.get('min_mate_score')  # 메이트 최소 점수
-        sort_by = request.query_params.get('sort', 'fcf')
-        
-        for stock in queryset[:500]:  # 성능을 위해 500개로 제한
-            try:
-                # 최근 4분기
-                recent_4q = list(StockFinancialRaw.objects.filter(
-                    stock=stock,
-                    data_source='EDGAR'
-                ).order_by('-disclosure_year', '-disclosure_quarter')[:4])
-                
-                if len(recent_4q) < 4:
-                    continue
-                
-                # TTM 계산
-                ttm_fcf = sum([q.fcf or 0 for q in recent_4q])
-                ttm_revenue = sum([q.revenue or 0 for q in recent_4q])
-                ttm_net_income = sum([q.net_income or 0 for q in recent_4q])
-                
-                latest = recent_4q[0]
-                
-                if not latest.total_equity:
-                    continue
-                
-                # 지표 계산
-                fcf_margin = round((ttm_fcf / ttm_revenue) * 100, 2) if ttm_revenue else 0
-                roe = round((ttm_net_income / latest.total_equity) * 100, 2)
-                debt_ratio = round((latest.total_liabilities / latest.total_equity) * 100, 2) if (latest.total_equity and latest.total_liabilities) else 0
-                
-                # 성장률
-                previous_4q = list(StockFinancialRaw.objects.filter(
-                    stock=stock,
-                    data_source='EDGAR'
-                ).order_by('-disclosure_year', '-disclosure_quarter')[4:8])
-                
-                revenue_growth = None
-                if len(previous_4q) == 4:
-                    prev_revenue = sum([q.revenue or 0 for q in previous_4q])
-                    if prev_revenue:
-                        revenue_growth = round(((ttm_revenue - prev_revenue) / prev_revenue) * 100, 2)
-                
-                # FCF 양수 분기
-                all_financials = list(StockFinancialRaw.objects.filter(
-                    stock=stock,
-                    data_source='EDGAR'
-                ).order_by('-disclosure_year', '-disclosure_quarter')[:20])
-                
-                fcf_positive_count = len([q for q in all_financials if q.fcf and q.fcf > 0])
-                
-                # 필터 적용
-                if min_fcf and ttm_fcf < float(min_fcf):
-                    continue
-                if min_roe and roe < float(min_roe):
-                    continue
-                if max_debt_ratio and debt_ratio > float(max_debt_ratio):
-                    continue
-                if min_fcf_margin and fcf_margin < float(min_fcf_margin):
-                    continue
-                if min_revenue_growth and (revenue_growth is None or revenue_growth < float(min_revenue_growth)):
-                    continue
-                if fcf_positive_quarters and fcf_positive_count < int(fcf_positive_quarters):
-                    continue
-                
-                # 메이트 점수 필터
-                mate_score = None
-                if mate_type or min_mate_score:
-                    from apps.analysis.models import MateAnalysis
-                    
-                    try:
-                        if mate_type:
-                            mate_analysis = MateAnalysis.objects.get(
-                                stock=stock,
-                                mate_type=mate_type
-                            )
-                            mate_score = mate_analysis.score
-                            
-                            if min_mate_score and mate_score < int(min_mate_score):
-                                continue
-                    except MateAnalysis.DoesNotExist:
-                        # 메이트 분석이 없으면 건너뛰기
-                        continue
-                
-                result_item = {
-                    'stock': StockListSerializer(stock).data,
-                    'ttm_fcf': ttm_fcf,
-                    'fcf_margin': fcf_margin,
-                    'roe': roe,
-                    'debt_ratio': debt_ratio,
-                    'revenue_growth': revenue_growth,
-                    'fcf_positive_quarters': fcf_positive_count,
-                }
-                
-                # 메이트 점수 추가
-                if mate_score is not None:
-                    result_item['mate_score'] = mate_score
-                
-                results.append(result_item)
-                
-            except Exception as e:
-                continue
+        return paginator.get_paginated_response(results)
+    
+    def _screen_queryset(self, params):
+        """
+        스크리닝 조건 → 스냅샷 쿼리셋 (filter 표현식 + 기존 파라미터)
+        
+        Returns:
+            (쿼리셋, 정렬 필드)
+        
+        Raises:
+            ScreeningFilterError, ValueError: 잘못된 필터
+        """
+        mate_type = params.get('mate')
+        
+        condition = Q()
+        if params.get('filter'):
+            condition = compile_screening_filter(params['filter'])
+        
+        # 기존 파라미터도 같은 조건으로 결합
+        for param, (name, op) in SCREEN_PARAM_CONDITIONS.items():
+            if params.get(param):
+                condition &= compile_condition(name, op, float(params[param]))
+        
+        if mate_type and params.get('min_mate_score'):
+            condition &= compile_condition(f'mate.{mate_type}', '>=', float(params['min_mate_score']))
+        
+        queryset = StockIndicatorSnapshot.objects.filter(
+            condition,
+            stock__country='us',
+            stock__is_active=True,
+            total_equity__isnull=False,
+        ).exclude(total_equity=0)
+        
+        # 메이트 점수 (분석이 없으면 제외)
+        if mate_type:
+            queryset = queryset.annotate(
+                mate_score=Subquery(
+                    MateAnalysis.objects.filter(
+                        stock_id=OuterRef('stock_id'),
+                        mate_type=mate_type
+                    ).values('score')[:1]
+                )
+            ).filter(mate_score__isnull=False)
         
         # 정렬
-        if sort_by == 'fcf':
-            results.sort(key=lambda x: x['ttm_fcf'], reverse=True)
-        elif sort_by == 'roe':
-            results.sort(key=lambda x: x['roe'], reverse=True)
-        elif sort_by == 'fcf_margin':
-            results.sort(key=lambda x: x['fcf_margin'], reverse=True)
-        elif sort_by == 'revenue_growth':
-            results.sort(key=lambda x: x['revenue_growth'] or -999, reverse=True)
-        elif sort_by == 'mate_score':
-            results.sort(key=lambda x: x.get('mate_score', 0), reverse=True)
-        
-        # 페이지네이션
+        sort_field = SCREEN_SORT_FIELDS.get(params.get('sort', 'fcf'), 'ttm_fcf')
+        if sort_field == 'mate_score' and not mate_type:
+            sort_field = 'ttm_fcf'
+        
+        return queryset, sort_field
+    
+    def _screen_with_filter(self, request):
+        """
+        필터 표현식 스크리닝 (표현식을 Q로 컴파일해 스냅샷 테이블에서 필터링)
+        """
+        params = request.query_params
+        mate_type = params.get('mate')
+        
+        try:
+            queryset, sort_field = self._screen_queryset(params)
+        except (ScreeningFilterError, ValueError) as e:
+            return Response(
+                {'error': f'잘못된 필터: {e}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        queryset = queryset.select_related('stock')
+        
+        # 키셋 페이지네이션 (정렬 값, stock_id 커서 이후 현재 페이지만 조회)
         paginator = self.pagination_class()
-        page = paginator.paginate_queryset(results, request)
+        page = paginator.paginate_queryset(queryset, request, ordering=[f'-{sort_field}', 'stock_id'])
         
-        return paginator.get_paginated_response(page)
+        results = []
+        for snapshot in page:
+            item = {
+                'stock': StockListSerializer(snapshot.stock).data,
+                'ttm_fcf': snapshot.ttm_fcf,
+                'fcf_margin': snapshot.fcf_margin,
+                'roe': snapshot.roe,
+                'debt_ratio': snapshot.debt_ratio,
+                'revenue_growth': snapshot.revenue_growth,
+                'fcf_positive_quarters': snapshot.fcf_positive_quarters,
+            }
+            if mate_type:
+                item['mate_score'] = snapshot.mate_score
+            results.append(item)
+        
+        return paginator.get_paginated_response(results)
+    
+    @action(detail=False, methods=['get'], url_path='screen/export',
+            renderer_classes=[CSVRenderer, NDJSONRenderer])
+    def screen_export(self, request):
+        """
+        스크리닝 결과 전체 내보내기 (스트리밍)
+        
+        GET /api/stocks/screen/export/?format=csv|ndjson
+        
+        screen과 같은 조건(filter, min_roe, mate, sort 등)으로
+        모든 종목 × 모든 지표 × 모든 메이트 점수를 행 단위로 스트리밍
+        (서버 측 커서로 EXPORT_CHUNK_SIZE씩 조회 → 메모리 사용량 일정)
+        """
+        export_format = request.accepted_renderer.format
+        
+        try:
+            queryset, sort_field = self._screen_queryset(request.query_params)
+        except (ScreeningFilterError, ValueError) as e:
+            return Response(
+                {'error': f'잘못된 필터: {e}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        mate_columns = {
+            f'mate_{mate_type}': Subquery(
+                MateAnalysis.objects.filter(
+                    stock_id=OuterRef('stock_id'),
+                    mate_type=mate_type
+                ).values('score')[:1]
+            )
+            for mate_type in mate_types()
+        }
+        columns = ['stock_id', *EXPORT_STOCK_FIELDS, 'ttm_period', *INDICATOR_FIELDS, *mate_columns]
+        
+        rows = queryset.annotate(**mate_columns).order_by(
+            F(sort_field).desc(nulls_last=True), 'stock_id'
+        ).values(
+            'stock_id',
+            *[field for field in columns if field != 'stock_id' and field not in EXPORT_STOCK_FIELDS],
+            **{field: F(f'stock__{field}') for field in EXPORT_STOCK_FIELDS},
+        ).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+        
+        if export_format == 'ndjson':
+            content = (
+                json.dumps({column: row[column] for column in columns},
+                           cls=DjangoJSONEncoder, ensure_ascii=False) + '\n'
+                for row in rows
+            )
+        else:
+            writer = csv.writer(Echo())
+            
+            def generate():
+                # 헤더는 쿼리 실행 전에 먼저 전송
+                yield writer.writerow(columns)
+                for row in rows:
+                    yield writer.writerow([row[column] for column in columns])
+            
+            content = generate()
+        
+        response = StreamingHttpResponse(content, content_type=request.accepted_renderer.media_type)
+        response['Content-Disposition'] = f'attachment; filename="screen.{export_format}"'
+        return response
     
     @action(detail=True, methods=['get'])
+    @conditional_response(stock_data_state)
+    @cache_stock_response('financials')
     def financials(self, request, pk=None):
         """
         재무 데이터 조회 (분기별)
@@ -286,110 +580,156 @@ class StockViewSet(viewsets.ReadOnlyModelViewSet):
         })
     
     @action(detail=True, methods=['get'])
+    @conditional_response(stock_indicator_state)
+    @cache_stock_response('indicators')
     def indicators(self, request, pk=None):
         """
         핵심 지표 (TTM)
         
         TTM: Trailing Twelve Months (최근 12개월 = 최근 4분기)
+        sector_percentile / industry_percentile: 섹터/산업 내 백분위 (0-100)
         """
         stock = self.get_object()
         
-        # 최근 4분기 데이터 (list로 변환)
-        recent_4q = list(StockFinancialRaw.objects.filter(
-            stock=stock,
-            data_source='EDGAR'
-        ).order_by('-disclosure_year', '-disclosure_quarter')[:4])
+        snapshot = get_indicator_snapshot(stock)
         
-        if len(recent_4q) < 4:
+        if snapshot is None:
             return Response(
                 {'error': '재무 데이터가 부족합니다 (최소 4분기 필요)'},
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        # TTM 계산
-        ttm_ocf = sum([q.ocf or 0 for q in recent_4q])
-        ttm_fcf = sum([q.fcf or 0 for q in recent_4q])
-        ttm_capex = sum([abs(q.capex or 0) for q in recent_4q])
-        ttm_revenue = sum([q.revenue or 0 for q in recent_4q])
-        ttm_net_income = sum([q.net_income or 0 for q in recent_4q])
+        indicators = snapshot_indicators(snapshot)
         
-        # 최근 분기 재무상태
-        latest = recent_4q[0]
+        # 섹터/산업 내 백분위 (야간 계산된 분위수 조회)
+        values = {metric: indicators[metric] for metric in DISTRIBUTION_METRICS}
+        for mate_type, score in MateAnalysis.objects.filter(stock=stock).values_list('mate_type', 'score'):
+            values[mate_metric(mate_type)] = score
+        percentiles = get_stock_percentiles(stock, values)
         
-        # 지표 계산
-        fcf_margin = round((ttm_fcf / ttm_revenue) * 100, 2) if ttm_revenue else 0
-        roe = round((ttm_net_income / latest.total_equity) * 100, 2) if latest.total_equity else 0
-        debt_ratio = round((latest.total_liabilities / latest.total_equity) * 100, 2) if (latest.total_equity and latest.total_liabilities) else 0
-        current_ratio = round((latest.current_assets / latest.current_liabilities) * 100, 2) if latest.current_liabilities else 0
+        data = {
+            'stock_code': stock.stock_code,
+            'stock_name': stock.stock_name,
+            **indicators,
+            'sector': stock.sector,
+            'industry': stock.industry,
+            'sector_percentile': percentiles['sector'],
+            'industry_percentile': percentiles['industry'],
+        }
         
-        # 성장률 계산 (최근 4분기 vs 전년 동기 4분기)
-        previous_4q = list(StockFinancialRaw.objects.filter(
-            stock=stock,
-            data_source='EDGAR'
-        ).order_by('-disclosure_year', '-disclosure_quarter')[4:8])
+        serializer = StockIndicatorsSerializer(data)
+        return Response(serializer.data)
+    
+    @action(detail=True, methods=['get'], url_path='indicators/history')
+    @conditional_response(stock_data_state)
+    @cache_stock_response('indicator_history')
+    def indicator_history(self, request, pk=None):
+        """
+        분기별 시점 TTM 지표 (과거 → 최신 순)
         
-        revenue_growth = None
-        fcf_growth = None
+        각 분기 말 기준의 TTM/성장률/FCF 양수 분기 수 (그 시점에 알 수 있던 값)
         
-        if len(previous_4q) == 4:
-            prev_revenue = sum([q.revenue or 0 for q in previous_4q])
-            prev_fcf = sum([q.fcf or 0 for q in previous_4q])
-            
-            if prev_revenue:
-                revenue_growth = round(((ttm_revenue - prev_revenue) / prev_revenue) * 100, 2)
-            if prev_fcf and prev_fcf != 0:
-                fcf_growth = round(((ttm_fcf - prev_fcf) / abs(prev_fcf)) * 100, 2)
+        Query Parameters:
+        - limit: 최근 N분기 (기본: 전체)
+        """
+        stock = self.get_object()
         
-        # 현금흐름 품질
-        ocf_to_net_income = round(ttm_ocf / ttm_net_income, 2) if ttm_net_income else None
+        limit = request.query_params.get('limit')
+        if limit is not None:
+            try:
+                limit = int(limit)
+                if limit <= 0:
+                    raise ValueError
+            except ValueError:
+                return Response(
+                    {'error': 'limit은 양의 정수여야 합니다'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        
+        history = get_indicator_history(stock.id, limit=limit)
+        serializer = StockIndicatorHistorySerializer(history, many=True)
         
-        # FCF 양수 분기 수 (최근 20분기)
-        all_financials = list(StockFinancialRaw.objects.filter(
-            stock=stock,
-            data_source='EDGAR'
-        ).order_by('-disclosure_year', '-disclosure_quarter')[:20])
+        return Response({
+            'stock_code': stock.stock_code,
+            'stock_name': stock.stock_name,
+            'count': len(serializer.data),
+            'history': serializer.data,
+        })
+    
+    @action(detail=False, methods=['post'], url_path='indicators/batch', permission_classes=[AllowAny])
+    def indicators_batch(self, request):
+        """
+        여러 종목 핵심 지표 (TTM) 일괄 조회
         
-        fcf_positive_quarters = len([q for q in all_financials if q.fcf and q.fcf > 0])
+        POST /api/stocks/indicators/batch/
+        Body: { "stock_ids": [1, 2, 3], "stock_codes": ["AAPL", "MSFT"] }
         
-        # TTM 기간
-        ttm_period = f"{recent_4q[-1].disclosure_year}Q{recent_4q[-1].disclosure_quarter}-{recent_4q[0].disclosure_year}Q{recent_4q[0].disclosure_quarter}"
+        Response: { "count": 5, "results": { "AAPL": {...지표}, "XYZ": {"error": "..."} } }
+        """
+        stock_ids = request.data.get('stock_ids') or []
+        stock_codes = request.data.get('stock_codes') or []
         
-        data = {
-            'stock_code': stock.stock_code,
-            'stock_name': stock.stock_name,
-            'ttm_period': ttm_period,
-            
-            # TTM
-            'ttm_ocf': ttm_ocf,
-            'ttm_fcf': ttm_fcf,
-            'ttm_capex': ttm_capex,
-            'ttm_revenue': ttm_revenue,
-            'ttm_net_income': ttm_net_income,
-            
-            # 재무상태
-            'total_assets': latest.total_assets,
-            'total_liabilities': latest.total_liabilities or 0,
-            'total_equity': latest.total_equity,
-            
-            # 지표
-            'fcf_margin': fcf_margin,
-            'roe': roe,
-            'debt_ratio': debt_ratio,
-            'current_ratio': current_ratio,
-            
-            # 성장률
-            'revenue_growth': revenue_growth,
-            'fcf_growth': fcf_growth,
+        if not isinstance(stock_ids, list) or not isinstance(stock_codes, list):
+            return Response(
+                {'error': 'stock_ids, stock_codes는 배열이어야 합니다'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        if not stock_ids and not stock_codes:
+            return Response(
+                {'error': '종목을 1개 이상 선택해주세요'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        if len(stock_ids) + len(stock_codes) > BATCH_INDICATORS_MAX:
+            return Response(
+                {'error': f'최대 {BATCH_INDICATORS_MAX}개 종목까지 조회 가능합니다'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        results = {}
+        
+        valid_ids = []
+        for stock_id in stock_ids:
+            try:
+                valid_ids.append(int(stock_id))
+            except (TypeError, ValueError):
+                results[str(stock_id)] = {'error': '잘못된 종목 ID'}
+        codes = [str(code).upper() for code in stock_codes]
+        
+        # 종목 1회 + 스냅샷 1회 조회 (스냅샷 없는 종목만 TTM 집계 1회)
+        stocks = list(self.get_queryset().filter(Q(id__in=valid_ids) | Q(stock_code__in=codes)))
+        snapshots = get_indicator_snapshots(stock.id for stock in stocks)
+        
+        found_ids = {stock.id for stock in stocks}
+        found_codes = {stock.stock_code for stock in stocks}
+        for stock_id in valid_ids:
+            if stock_id not in found_ids:
+                results[str(stock_id)] = {'error': '종목을 찾을 수 없습니다'}
+        for code in codes:
+            if code not in found_codes:
+                results[code] = {'error': '종목을 찾을 수 없습니다'}
+        
+        for stock in stocks:
+            snapshot = snapshots.get(stock.id)
+            if snapshot is None:
+                results[stock.stock_code] = {'error': '재무 데이터가 부족합니다 (최소 4분기 필요)'}
+                continue
             
-            # 품질
-            'ocf_to_net_income': ocf_to_net_income,
-            'fcf_positive_quarters': fcf_positive_quarters,
-        }
+            results[stock.stock_code] = StockIndicatorsSerializer({
+                'stock_code': stock.stock_code,
+                'stock_name': stock.stock_name,
+                **snapshot_indicators(snapshot),
+            }).data
         
-        serializer = StockIndicatorsSerializer(data)
-        return Response(serializer.data)
+        return Response({
+            'count': len(results),
+            'results': results,
+        })
     
     @action(detail=True, methods=['get'])
+    @conditional_response(stock_data_state)
+    @cache_stock_response('chart')
     def chart(self, request, pk=None):
         """
         차트 데이터 (분기별 트렌드)
@@ -426,72 +766,125 @@ class StockViewSet(viewsets.ReadOnlyModelViewSet):
     @action(detail=False, methods=['post'], permission_classes=[AllowAny])
     def compare(self, request):
         """
-        종목 비교
+        종목 비교 (최대 50개)
         
         POST /api/stocks/compare/
-        Body: { "stock_ids": [1, 2, 3] }
+        Body: { "stock_ids": [1, 2, 3], "stock_codes": ["AAPL"], "quarters": 12 }
+        
+        - percentiles: 지표별 백분위 (set: 비교 종목 내, sector: 같은 섹터 전체 내)
+        - series: 분기별 시계열 (periods 순서에 맞춤, 없는 분기는 null)
         """
-        stock_ids = request.data.get('stock_ids', [])
+        stock_ids = request.data.get('stock_ids') or []
+        stock_codes = request.data.get('stock_codes') or []
+        
+        try:
+            stock_ids = [int(stock_id) for stock_id in stock_ids]
+            stock_codes = [str(code).upper() for code in stock_codes]
+            quarters = max(1, min(int(request.data.get('quarters', COMPARE_QUARTERS)), 20))
+        except (TypeError, ValueError):
+            return Response(
+                {'error': '잘못된 요청 형식입니다'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         
-        if not stock_ids or len(stock_ids) < 2:
+        if len(stock_ids) + len(stock_codes) < 2:
             return Response(
                 {'error': '최소 2개 종목을 선택해주세요'},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        if len(stock_ids) > 5:
+        if len(stock_ids) + len(stock_codes) > COMPARE_MAX_STOCKS:
             return Response(
-                {'error': '최대 5개 종목까지 비교 가능합니다'},
+                {'error': f'최대 {COMPARE_MAX_STOCKS}개 종목까지 비교 가능합니다'},
                 status=status.HTTP_400_BAD_REQUEST
             )
         
+        # 요청 순서 유지
+        stocks = Stock.objects.filter(Q(id__in=stock_ids) | Q(stock_code__in=stock_codes))
+        by_id = {stock.id: stock for stock in stocks}
+        by_code = {stock.stock_code: stock for stock in by_id.values()}
+        ordered = []
+        for stock in [by_id.get(i) for i in stock_ids] + [by_code.get(c) for c in stock_codes]:
+            if stock is not None and stock not in ordered:
+                ordered.append(stock)
+        
+        snapshots = get_indicator_snapshots(by_id.keys())
+        
+        # 섹터 전체 지표 (한 번의 쿼리)
+        sectors = {stock.sector for stock in ordered if stock.sector}
+        sector_values = {}
+        for row in StockIndicatorSnapshot.objects.filter(
+            stock__sector__in=sectors,
+            stock__country='us',
+            stock__is_active=True,
+        ).values('stock__sector', *COMPARE_METRICS):
+            values = sector_values.setdefault(row['stock__sector'], {metric: [] for metric in COMPARE_METRICS})
+            for metric in COMPARE_METRICS:
+                if row[metric] is not None:
+                    values[metric].append(row[metric])
+        
+        # 비교 종목 내 지표
+        set_values = {
+            metric: [getattr(snapshots[s.id], metric) for s in ordered if s.id in snapshots]
+            for metric in COMPARE_METRICS
+        }
+        
+        # 분기 시계열 (한 번의 쿼리)
+        series_rows = {}
+        for row in StockFinancialRaw.objects.filter(
+            stock_id__in=[stock.id for stock in ordered],
+            data_source='EDGAR',
+        ).order_by('stock_id', '-disclosure_year', '-disclosure_quarter').values(
+            'stock_id', 'disclosure_year', 'disclosure_quarter', *COMPARE_SERIES_FIELDS
+        ):
+            rows = series_rows.setdefault(row['stock_id'], {})
+            if len(rows) < quarters:
+                rows[(row['disclosure_year'], row['disclosure_quarter'])] = row
+        
+        periods = sorted({period for rows in series_rows.values() for period in rows})
+        
         comparison = []
         
-        for stock_id in stock_ids:
-            try:
-                stock = Stock.objects.get(id=stock_id)
-                
-                # 지표 계산 (indicators와 동일)
-                recent_4q = list(StockFinancialRaw.objects.filter(
-                    stock=stock,
-                    data_source='EDGAR'
-                ).order_by('-disclosure_year', '-disclosure_quarter')[:4])
-                
-                if len(recent_4q) < 4:
-                    comparison.append({
-                        'stock': StockListSerializer(stock).data,
-                        'error': '재무 데이터 부족'
-                    })
-                    continue
-                
-                ttm_fcf = sum([q.fcf or 0 for q in recent_4q])
-                ttm_revenue = sum([q.revenue or 0 for q in recent_4q])
-                ttm_net_income = sum([q.net_income or 0 for q in recent_4q])
-                
-                latest = recent_4q[0]
-                
-                fcf_margin = round((ttm_fcf / ttm_revenue) * 100, 2) if ttm_revenue else 0
-                roe = round((ttm_net_income / latest.total_equity) * 100, 2) if latest.total_equity else 0
-                debt_ratio = round((latest.total_liabilities / latest.total_equity) * 100, 2) if (latest.total_equity and latest.total_liabilities) else 0
-                
+        for stock in ordered:
+            snapshot = snapshots.get(stock.id)
+            if snapshot is None:
                 comparison.append({
                     'stock': StockListSerializer(stock).data,
-                    'ttm_fcf': ttm_fcf,
-                    'ttm_revenue': ttm_revenue,
-                    'fcf_margin': fcf_margin,
-                    'roe': roe,
-                    'debt_ratio': debt_ratio,
+                    'error': '재무 데이터 부족'
                 })
-                
-            except Stock.DoesNotExist:
                 continue
+            
+            percentiles = {}
+            for metric in COMPARE_METRICS:
+                value = getattr(snapshot, metric)
+                peers = sector_values.get(stock.sector, {}).get(metric)
+                percentiles[metric] = {
+                    'set': percentile_rank(set_values[metric], value),
+                    'sector': percentile_rank(peers, value) if peers else None,
+                }
+            
+            rows = series_rows.get(stock.id, {})
+            series = {
+                field: [rows[period][field] if period in rows else None for period in periods]
+                for field in COMPARE_SERIES_FIELDS
+            }
+            
+            comparison.append({
+                'stock': StockListSerializer(stock).data,
+                **{metric: getattr(snapshot, metric) for metric in COMPARE_METRICS},
+                'percentiles': percentiles,
+                'series': series,
+            })
         
         return Response({
             'count': len(comparison),
+            'periods': [f"{year}Q{quarter}" for year, quarter in periods],
             'comparison': comparison
         })
     
     @action(detail=True, methods=['get'])
+    @conditional_response(stock_data_state)
+    @cache_stock_response('mates')
     def mates(self, request, pk=None):
         """
         4개 메이트 종합 분석
@@ -502,81 +895,149 @@ class StockViewSet(viewsets.ReadOnlyModelViewSet):
         
         stock = self.get_object()
         
-        # 최근 4분기
-        recent_4q = list(StockFinancialRaw.objects.filter(
-            stock=stock,
-            data_source='EDGAR'
-        ).order_by('-disclosure_year', '-disclosure_quarter')[:4])
+        snapshot = get_indicator_snapshot(stock)
         
-        if len(recent_4q) < 4:
+        if snapshot is None:
             return Response(
                 {'error': '재무 데이터가 부족합니다'},
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        # 지표 계산
-        ttm_ocf = sum([q.ocf or 0 for q in recent_4q])
-        ttm_fcf = sum([q.fcf or 0 for q in recent_4q])
-        ttm_revenue = sum([q.revenue or 0 for q in recent_4q])
-        ttm_net_income = sum([q.net_income or 0 for q in recent_4q])
+        # 지표 딕셔너리
+        indicators_dict = snapshot_indicators(snapshot)
         
-        latest = recent_4q[0]
+        # 모든 메이트로 분석
+        mate_analyses = analyze_with_all_mates(indicators_dict)
         
-        fcf_margin = round((ttm_fcf / ttm_revenue) * 100, 2) if ttm_revenue else 0
-        roe = round((ttm_net_income / latest.total_equity) * 100, 2) if latest.total_equity else 0
-        debt_ratio = round((latest.total_liabilities / latest.total_equity) * 100, 2) if (latest.total_equity and latest.total_liabilities) else 0
-        current_ratio = round((latest.current_assets / latest.current_liabilities) * 100, 2) if latest.current_liabilities else 0
+        return Response({
+            'stock_code': stock.stock_code,
+            'stock_name': stock.stock_name,
+            'mates': mate_analyses,
+        })
+    
+    @action(detail=True, methods=['get'])
+    def valuation_sensitivity(self, request, pk=None):
+        """
+        DCF 적정가 민감도 (히트맵)
         
-        # 성장률
-        previous_4q = list(StockFinancialRaw.objects.filter(
-            stock=stock,
-            data_source='EDGAR'
-        ).order_by('-disclosure_year', '-disclosure_quarter')[4:8])
+        GET /api/stocks/{id}/valuation_sensitivity/
         
-        revenue_growth = None
-        fcf_growth = None
+        Query Parameters:
+        - growth_rates: 성장률 목록 (쉼표 구분, 예: 0,0.05,0.1)
+        - discount_rates: 할인율 목록
+        - terminal_growths: 영구 성장률 목록
+        - years: 예측 기간 (기본: 10, 1-30)
         
-        if len(previous_4q) == 4:
-            prev_revenue = sum([q.revenue or 0 for q in previous_4q])
-            prev_fcf = sum([q.fcf or 0 for q in previous_4q])
-            
-            if prev_revenue:
-                revenue_growth = round(((ttm_revenue - prev_revenue) / prev_revenue) * 100, 2)
-            if prev_fcf and prev_fcf != 0:
-                fcf_growth = round(((ttm_fcf - prev_fcf) / abs(prev_fcf)) * 100, 2)
+        heatmaps: 영구 성장률마다 성장률(행) × 할인율(열) 주당 적정가 / 괴리율
+        (할인율 ≤ 영구 성장률인 칸은 null)
+        """
+        stock = self.get_object()
         
-        # FCF 양수 분기
-        all_financials = list(StockFinancialRaw.objects.filter(
-            stock=stock,
-            data_source='EDGAR'
-        ).order_by('-disclosure_year', '-disclosure_quarter')[:20])
+        try:
+            growth_rates = parse_rates(request.query_params.get('growth_rates'), SENSITIVITY_GROWTH_RATES)
+            discount_rates = parse_rates(request.query_params.get('discount_rates'), SENSITIVITY_DISCOUNT_RATES)
+            terminal_growths = parse_rates(
+                request.query_params.get('terminal_growths'), SENSITIVITY_TERMINAL_GROWTHS
+            )
+            years = int(request.query_params.get('years', 10))
+            if not 1 <= years <= 30:
+                raise ValueError
+        except ValueError:
+            return Response(
+                {'error': f'비율은 쉼표로 구분한 소수 (축당 최대 {SENSITIVITY_MAX_VALUES}개), years는 1-30이어야 합니다'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         
-        fcf_positive_quarters = len([q for q in all_financials if q.fcf and q.fcf > 0])
+        snapshot = get_indicator_snapshot(stock)
         
-        # 지표 딕셔너리
-        indicators_dict = {
-            'ttm_fcf': ttm_fcf,
-            'ttm_revenue': ttm_revenue,
-            'ttm_net_income': ttm_net_income,
-            'fcf_margin': fcf_margin,
-            'roe': roe,
-            'debt_ratio': debt_ratio,
-            'current_ratio': current_ratio,
-            'revenue_growth': revenue_growth,
-            'fcf_growth': fcf_growth,
-            'fcf_positive_quarters': fcf_positive_quarters,
-        }
+        if snapshot is None:
+            return Response(
+                {'error': '재무 데이터가 부족합니다'},
+                status=status.HTTP_404_NOT_FOUND
+            )
         
-        # 모든 메이트로 분석
-        mate_analyses = analyze_with_all_mates(indicators_dict)
+        shares_outstanding = effective_shares(stock.shares_outstanding)
+        latest_price = get_latest_prices([stock.id]).get(stock.id)
+        current_price = float(latest_price[1]) if latest_price else None
+        
+        # (성장률, 할인율, 영구 성장률) 격자 한 번에 계산
+        fair_values = ValuationEngine.calculate_dcf_sensitivity(
+            snapshot.ttm_fcf, growth_rates, discount_rates, terminal_growths,
+            years=years, shares_outstanding=shares_outstanding
+        )
+        with np.errstate(divide='ignore', invalid='ignore'):
+            gap_ratios = np.where(
+                fair_values > 0, (current_price - fair_values) / fair_values * 100, np.nan
+            ) if current_price else np.full_like(fair_values, np.nan)
+        
+        heatmaps = [
+            {
+                'terminal_growth': terminal_growth,
+                'fair_values': grid_to_list(fair_values[:, :, index]),
+                'gap_ratios': grid_to_list(gap_ratios[:, :, index]),
+            }
+            for index, terminal_growth in enumerate(terminal_growths)
+        ]
         
         return Response({
             'stock_code': stock.stock_code,
             'stock_name': stock.stock_name,
-            'mates': mate_analyses,
+            'ttm_fcf': snapshot.ttm_fcf,
+            'shares_outstanding': shares_outstanding,
+            'current_price': current_price,
+            'years': years,
+            'growth_rates': growth_rates,
+            'discount_rates': discount_rates,
+            'heatmaps': heatmaps,
+        })
+    
+    @action(detail=True, methods=['get'])
+    def valuation_distribution(self, request, pk=None):
+        """
+        메이트별 적정가 분포 (몬테카를로, 야간 배치 결과)
+        
+        GET /api/stocks/{id}/valuation_distribution/
+        
+        - percentiles: 주당 적정가 분위수 (p5, p25, p50, p75, p95)
+        - prob_undervalued: 적정가 > 현재가인 경로 비율 (0-1)
+        """
+        stock = self.get_object()
+        
+        distributions = ValuationDistribution.objects.filter(stock=stock).order_by('mate_type')
+        
+        if not distributions:
+            return Response(
+                {'error': '적정가 분포가 아직 계산되지 않았습니다 (관심종목만 매일 밤 계산)'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        return Response({
+            'stock_code': stock.stock_code,
+            'stock_name': stock.stock_name,
+            'distributions': {
+                distribution.mate_type: {
+                    'percentiles': {
+                        'p5': distribution.p5,
+                        'p25': distribution.p25,
+                        'p50': distribution.p50,
+                        'p75': distribution.p75,
+                        'p95': distribution.p95,
+                    },
+                    'mean': distribution.mean,
+                    'prob_undervalued': distribution.prob_undervalued,
+                    'current_price': distribution.current_price,
+                    'price_date': distribution.price_date,
+                    'paths': distribution.paths,
+                    'seed': distribution.seed,
+                    'calculated_at': distribution.calculated_at,
+                }
+                for distribution in distributions
+            },
         })
     
     @action(detail=True, methods=['get'])
+    @conditional_response(stock_data_state)
+    @cache_stock_response('score')
     def score(self, request, pk=None):
         """
         규칙 기반 점수 계산
@@ -588,180 +1049,96 @@ class StockViewSet(viewsets.ReadOnlyModelViewSet):
         """
         stock = self.get_object()
         
-        # 최근 4분기
-        recent_4q = list(StockFinancialRaw.objects.filter(
-            stock=stock,
-            data_source='EDGAR'
-        ).order_by('-disclosure_year', '-disclosure_quarter')[:4])
+        snapshot = get_indicator_snapshot(stock)
         
-        if len(recent_4q) < 4:
+        if snapshot is None:
             return Response(
                 {'error': '재무 데이터가 부족합니다'},
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        # 지표 계산
-        ttm_ocf = sum([q.ocf or 0 for q in recent_4q])
-        ttm_fcf = sum([q.fcf or 0 for q in recent_4q])
-        ttm_revenue = sum([q.revenue or 0 for q in recent_4q])
-        ttm_net_income = sum([q.net_income or 0 for q in recent_4q])
-        
-        latest = recent_4q[0]
-        
-        fcf_margin = round((ttm_fcf / ttm_revenue) * 100, 2) if ttm_revenue else 0
-        roe = round((ttm_net_income / latest.total_equity) * 100, 2) if latest.total_equity else 0
-        debt_ratio = round((latest.total_liabilities / latest.total_equity) * 100, 2) if (latest.total_equity and latest.total_liabilities) else 0
-        current_ratio = round((latest.current_assets / latest.current_liabilities) * 100, 2) if latest.current_liabilities else 0
-        
-        # FCF 양수 분기
-        all_financials = list(StockFinancialRaw.objects.filter(
-            stock=stock,
-            data_source='EDGAR'
-        ).order_by('-disclosure_year', '-disclosure_quarter')[:20])
-        
-        fcf_positive_quarters = len([q for q in all_financials if q.fcf and q.fcf > 0])
+        details = {
+            'fcf_positive_quarters': snapshot.fcf_positive_quarters,
+            'fcf_margin': snapshot.fcf_margin,
+            'ocf_to_net_income': snapshot.ocf_to_net_income or 0,
+            'debt_ratio': snapshot.debt_ratio,
+            'current_ratio': snapshot.current_ratio,
+            'ttm_fcf': snapshot.ttm_fcf,
+            'roe': snapshot.roe,
+            'revenue_growth': snapshot.revenue_growth or 0,
+        }
         
-        # OCF/순이익 비율
-        ocf_to_net_income = round(ttm_ocf / ttm_net_income, 2) if ttm_net_income else 0
-        
-        # 성장률
-        previous_4q = list(StockFinancialRaw.objects.filter(
-            stock=stock,
-            data_source='EDGAR'
-        ).order_by('-disclosure_year', '-disclosure_quarter')[4:8])
-        
-        revenue_growth = 0
-        if len(previous_4q) == 4:
-            prev_revenue = sum([q.revenue or 0 for q in previous_4q])
-            if prev_revenue:
-                revenue_growth = round(((ttm_revenue - prev_revenue) / prev_revenue) * 100, 2)
-        
-        # 점수 계산
-        
-        # 1. 현금흐름 점수 (0-100)
-        cashflow_score = 0
-        
-        # FCF 양수 분기 (40점)
-        if fcf_positive_quarters >= 20:
-            cashflow_score += 40
-        elif fcf_positive_quarters >= 16:
-            cashflow_score += 30
-        elif fcf_positive_quarters >= 12:
-            cashflow_score += 20
-        elif fcf_positive_quarters >= 8:
-            cashflow_score += 10
-        
-        # FCF 마진 (30점)
-        if fcf_margin >= 20:
-            cashflow_score += 30
-        elif fcf_margin >= 15:
-            cashflow_score += 25
-        elif fcf_margin >= 10:
-            cashflow_score += 20
-        elif fcf_margin >= 5:
-            cashflow_score += 10
-        
-        # OCF/순이익 비율 (30점)
-        if ocf_to_net_income >= 1.5:
-            cashflow_score += 30
-        elif ocf_to_net_income >= 1.2:
-            cashflow_score += 20
-        elif ocf_to_net_income >= 1.0:
-            cashflow_score += 10
-        
-        # 2. 안전성 점수 (0-100)
-        safety_score = 0
-        
-        # 부채비율 (50점)
-        if debt_ratio <= 30:
-            safety_score += 50
-        elif debt_ratio <= 50:
-            safety_score += 40
-        elif debt_ratio <= 100:
-            safety_score += 30
-        elif debt_ratio <= 150:
-            safety_score += 15
-        
-        # 유동비율 (30점)
-        if current_ratio >= 200:
-            safety_score += 30
-        elif current_ratio >= 150:
-            safety_score += 20
-        elif current_ratio >= 100:
-            safety_score += 10
-        
-        # FCF > 0 (20점)
-        if ttm_fcf > 0:
-            safety_score += 20
-        
-        # 3. 성장성 점수 (0-100)
-        growth_score = 0
-        
-        # ROE (50점)
-        if roe >= 25:
-            growth_score += 50
-        elif roe >= 20:
-            growth_score += 40
-        elif roe >= 15:
-            growth_score += 30
-        elif roe >= 10:
-            growth_score += 20
-        elif roe >= 5:
-            growth_score += 10
-        
-        # 매출 성장률 (50점)
-        if revenue_growth >= 20:
-            growth_score += 50
-        elif revenue_growth >= 15:
-            growth_score += 40
-        elif revenue_growth >= 10:
-            growth_score += 30
-        elif revenue_growth >= 5:
-            growth_score += 20
-        elif revenue_growth >= 0:
-            growth_score += 10
-        
-        # 종합 점수 (평균)
-        total_score = round((cashflow_score + safety_score + growth_score) / 3, 1)
-        
-        # 등급
-        if total_score >= 80:
-            grade = 'A+'
-        elif total_score >= 70:
-            grade = 'A'
-        elif total_score >= 60:
-            grade = 'B+'
-        elif total_score >= 50:
-            grade = 'B'
-        elif total_score >= 40:
-            grade = 'C'
-        else:
-            grade = 'D'
+        # 점수 계산 (구간 점수표: core.utils.score_engine, 리더보드와 동일)
+        result = score_indicators(details)
         
         return Response({
             'stock_code': stock.stock_code,
             'stock_name': stock.stock_name,
-            'total_score': total_score,
-            'grade': grade,
-            'scores': {
-                'cashflow': cashflow_score,
-                'safety': safety_score,
-                'growth': growth_score,
-            },
-            'details': {
-                'fcf_positive_quarters': fcf_positive_quarters,
-                'fcf_margin': fcf_margin,
-                'ocf_to_net_income': ocf_to_net_income,
-                'debt_ratio': debt_ratio,
-                'current_ratio': current_ratio,
-                'ttm_fcf': ttm_fcf,
-                'roe': roe,
-                'revenue_growth': revenue_growth,
-            }
+            **result,
+            'details': details,
         })
     
+    @action(detail=False, methods=['get'])
+    def score_leaderboard(self, request):
+        """
+        규칙 기반 점수 순위 (야간 일괄 채점된 StockScore 조회)
+        
+        Query Parameters:
+        - grade: 등급 (쉼표로 여러 개, 예: A+,A)
+        - sector: 섹터
+        - cursor: 페이지 커서 (응답의 next/previous)
+        - page_size: 페이지 크기 (기본: 50, 최대: 200)
+        """
+        queryset = StockScore.objects.filter(stock__country='us', stock__is_active=True).values(
+            'stock_id', 'stock__stock_code', 'stock__stock_name', 'stock__sector',
+            'total_score', 'grade', 'cashflow_score', 'safety_score', 'growth_score', 'ttm_period',
+        )
+        
+        grade = request.query_params.get('grade')
+        if grade:
+            grades = [value.strip().upper() for value in grade.split(',') if value.strip()]
+            invalid = [value for value in grades if value not in GRADES]
+            if invalid:
+                return Response(
+                    {'error': f"지원하지 않는 등급입니다: {', '.join(invalid)} (가능: {', '.join(reversed(GRADES))})"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            queryset = queryset.filter(grade__in=grades)
+        
+        sector = request.query_params.get('sector')
+        if sector:
+            queryset = queryset.filter(stock__sector=sector)
+        
+        # 키셋 페이지네이션 (종합 점수, stock_id)
+        paginator = self.pagination_class()
+        rows = paginator.paginate_queryset(queryset, request, ordering=['-total_score', 'stock_id'])
+        
+        page = [
+            {
+                'stock': {
+                    'id': row['stock_id'],
+                    'stock_code': row['stock__stock_code'],
+                    'stock_name': row['stock__stock_name'],
+                    'sector': row['stock__sector'],
+                },
+                'total_score': row['total_score'],
+                'grade': row['grade'],
+                'scores': {
+                    'cashflow': row['cashflow_score'],
+                    'safety': row['safety_score'],
+                    'growth': row['growth_score'],
+                },
+                'ttm_period': row['ttm_period'],
+            }
+            for row in rows
+        ]
+        
+        return paginator.get_paginated_response(page)
+    
     @action(detail=True, methods=['get'])
     # @require_tier('standard')  # 개인 사용: 로그인 불필요
+    @conditional_response(tenk_insight_state)
+    @cache_stock_response('tenk_insights', timeout=60 * 60 * 24)
     def tenk_insights(self, request, pk=None):
         """
         10-K 인사이트 (제품별/지역별 매출, 신규 리스크)
@@ -785,6 +1162,13 @@ class StockViewSet(viewsets.ReadOnlyModelViewSet):
             'insights': TenKInsightSerializer(insights, many=True).data
         })
     
+    @action(detail=False, methods=['get'], permission_classes=[IsAdminUser])
+    def cache_stats(self, request):
+        """
+        응답 캐시 적중/미스 카운터 (모니터링용, 관리자 전용)
+        """
+        return Response(get_response_cache_stats())
+    
     @action(detail=False, methods=['get'])
     def screening_table(self, request):
         """
@@ -794,93 +1178,47 @@ class StockViewSet(viewsets.ReadOnlyModelViewSet):
         - min_avg_score: 평균 점수 최소값 (0-100)
         - min_all_mates: 모든 메이트가 이 점수 이상 (0-100)
         - sort_by: benjamin|fisher|greenblatt|lynch|avg (기본: avg)
-        - page: 페이지 번호
+        - cursor: 페이지 커서 (응답의 next/previous)
+        - page_size: 페이지 크기 (기본: 50, 최대: 200)
         """
-        from django.db.models import Avg, Min, Max, Count
-        
-        # 4개 메이트 분석이 모두 있는 종목만 (집계 쿼리 사용)
-        stocks_with_all_mates = MateAnalysis.objects.values('stock_id').annotate(
-            mate_count=Count('id')
-        ).filter(mate_count=4).values_list('stock_id', flat=True)
+        from apps.analysis.models import MateScoreWide
         
-        # MateAnalysis를 prefetch하여 N+1 문제 해결
-        mate_analyses = MateAnalysis.objects.filter(
-            stock_id__in=stocks_with_all_mates
-        ).select_related('stock').order_by('stock_id', 'mate_type')
+        mate_types = ['benjamin', 'fisher', 'greenblatt', 'lynch']
         
-        # 종목별로 그룹화
-        stock_scores = {}
-        
-        for analysis in mate_analyses:
-            stock_id = analysis.stock_id
-            
-            if stock_id not in stock_scores:
-                stock_scores[stock_id] = {
-                    'stock': analysis.stock,
-                    'benjamin': None,
-                    'fisher': None,
-                    'greenblatt': None,
-                    'lynch': None,
-                }
-            
-            stock_scores[stock_id][analysis.mate_type] = analysis.score
-        
-        # 평균 계산 및 결과 생성
-        results = []
-        
-        for stock_id, scores in stock_scores.items():
-            # 4개가 모두 있는지 확인
-            if all(scores[mate] is not None for mate in ['benjamin', 'fisher', 'greenblatt', 'lynch']):
-                avg_score = (
-                    scores['benjamin'] + 
-                    scores['fisher'] + 
-                    scores['greenblatt'] + 
-                    scores['lynch']
-                ) / 4
-                
-                results.append({
-                    'stock': {
-                        'id': scores['stock'].id,
-                        'stock_code': scores['stock'].stock_code,
-                        'stock_name': scores['stock'].stock_name,
-                    },
-                    'benjamin': scores['benjamin'],
-                    'fisher': scores['fisher'],
-                    'greenblatt': scores['greenblatt'],
-                    'lynch': scores['lynch'],
-                    'avg_score': round(avg_score, 1),
-                })
+        # 종목별 메이트 점수 테이블 (4개 메이트 분석이 모두 있는 종목만)
+        queryset = MateScoreWide.objects.filter(mate_count=4).values(
+            'stock_id', 'stock__stock_code', 'stock__stock_name', 'avg_score', *mate_types
+        )
         
-        # 필터링
+        # 필터링 (평균/최저 점수 컬럼 인덱스)
         min_avg = request.query_params.get('min_avg_score')
         min_all = request.query_params.get('min_all_mates')
         
         if min_avg:
-            results = [r for r in results if r['avg_score'] >= float(min_avg)]
+            queryset = queryset.filter(avg_score__gte=float(min_avg))
         
         if min_all:
-            min_all_val = float(min_all)
-            results = [
-                r for r in results
-                if all(r[mate] >= min_all_val for mate in ['benjamin', 'fisher', 'greenblatt', 'lynch'])
-            ]
+            queryset = queryset.filter(min_score__gte=float(min_all))
         
-        # 정렬
+        # 정렬 (메이트별/평균 점수 컬럼 인덱스)
         sort_by = request.query_params.get('sort_by', 'avg')
+        sort_field = sort_by if sort_by in mate_types else 'avg_score'
         
-        if sort_by == 'benjamin':
-            results.sort(key=lambda x: x['benjamin'], reverse=True)
-        elif sort_by == 'fisher':
-            results.sort(key=lambda x: x['fisher'], reverse=True)
-        elif sort_by == 'greenblatt':
-            results.sort(key=lambda x: x['greenblatt'], reverse=True)
-        elif sort_by == 'lynch':
-            results.sort(key=lambda x: x['lynch'], reverse=True)
-        else:  # avg
-            results.sort(key=lambda x: x['avg_score'], reverse=True)
-        
-        # 페이지네이션
+        # 키셋 페이지네이션 (정렬 점수, stock_id 커서 이후 현재 페이지만 조회)
         paginator = self.pagination_class()
-        page = paginator.paginate_queryset(results, request)
+        rows = paginator.paginate_queryset(queryset, request, ordering=[f'-{sort_field}', 'stock_id'])
+        
+        page = [
+            {
+                'stock': {
+                    'id': row['stock_id'],
+                    'stock_code': row['stock__stock_code'],
+                    'stock_name': row['stock__stock_name'],
+                },
+                **{mate: row[mate] for mate in mate_types},
+                'avg_score': round(row['avg_score'], 1),
+            }
+            for row in rows
+        ]
         
         return paginator.get_paginated_response(page)
@@ -1,7 +1,6 @@
 """
 관심 종목(Watchlist) API
 """
-from decimal import Decimal
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
@@ -9,10 +8,10 @@ from rest_framework.permissions import AllowAny
 from django.contrib.auth import get_user_model
 
 from apps.watchlist.models import Watchlist
-from apps.stocks.models import StockFinancialRaw, StockPrice
+from apps.stocks.models import StockPrice
+from apps.stocks.services import get_indicator_snapshot, refresh_proper_prices
 from apps.analysis.models import ProperPrice, MateAnalysis
 from .serializers import WatchlistSerializer
-from core.utils.valuation_engine import calculate_all_mates_proper_price
 
 User = get_user_model()
 
@@ -72,67 +71,15 @@ class WatchlistViewSet(viewsets.ModelViewSet):
     def _calculate_proper_prices(self, stock):
         """종목의 적정가격 계산 (4개 메이트 모두)"""
         try:
-            # 재무 지표 계산
-            recent_4q = list(StockFinancialRaw.objects.filter(
-                stock=stock,
-                data_source='EDGAR'
-            ).order_by('-disclosure_year', '-disclosure_quarter')[:4])
-            
-            if len(recent_4q) < 4:
+            # 재무 지표 (TTM 스냅샷) + 최신 주가 + 발행주식수 (없으면 10억주 가정)
+            if get_indicator_snapshot(stock) is None:
                 print(f"⚠️ {stock.stock_code}: 재무 데이터 부족 (적정가격 계산 생략)")
                 return
             
-            ttm_fcf = sum([q.fcf or 0 for q in recent_4q])
-            ttm_net_income = sum([q.net_income or 0 for q in recent_4q])
-            ttm_revenue = sum([q.revenue or 0 for q in recent_4q])
-            
-            latest = recent_4q[0]
-            
-            # 성장률
-            previous_4q = list(StockFinancialRaw.objects.filter(
-                stock=stock,
-                data_source='EDGAR'
-            ).order_by('-disclosure_year', '-disclosure_quarter')[4:8])
-            
-            revenue_growth = 0
-            if len(previous_4q) == 4:
-                prev_revenue = sum([q.revenue or 0 for q in previous_4q])
-                if prev_revenue:
-                    revenue_growth = ((ttm_revenue - prev_revenue) / prev_revenue) * 100
-            
-            indicators = {
-                'ttm_fcf': ttm_fcf,
-                'ttm_net_income': ttm_net_income,
-                'total_equity': latest.total_equity,
-                'revenue_growth': revenue_growth,
-            }
-            
-            # 현재가
-            latest_price = StockPrice.objects.filter(stock=stock).order_by('-date').first()
-            if not latest_price:
+            if not refresh_proper_prices([stock.id]):
                 print(f"⚠️ {stock.stock_code}: 주가 데이터 없음 (적정가격 계산 생략)")
                 return
             
-            current_price = float(latest_price.close_price)
-            
-            # 발행주식수
-            shares_outstanding = stock.shares_outstanding if stock.shares_outstanding else 1000000000  # 없으면 10억주 가정
-            
-            # 4개 메이트 적정가격 계산
-            valuations = calculate_all_mates_proper_price(indicators, current_price, shares_outstanding)
-            
-            # DB 저장
-            for mate_type, valuation in valuations.items():
-                ProperPrice.objects.update_or_create(
-                    stock=stock,
-                    mate_type=mate_type,
-                    defaults={
-                        'proper_price': valuation['proper_price'],
-                        'current_price': Decimal(str(current_price)),
-                        'gap_ratio': valuation['gap_ratio'],
-                        'calculation_method': valuation['method'],
-                    }
-                )
             print(f"✅ {stock.stock_code}: 적정가격 계산 완료 (4개 메이트)")
         except Exception as e:
             print(f"❌ {stock.stock_code}: 적정가격 계산 실패 - {e}")
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.11 on 2026-10-17 17:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0004_alter_userbankaccount_is_simulation'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['account', '-transaction_date', '-id'], name='transaction_account_7aeab1_idx'),
+        ),
+    ]
@@ -146,6 +146,7 @@ class Transaction(models.Model):
         indexes = [
             models.Index(fields=['plaid_transaction_id']),
             models.Index(fields=['is_synced_from_bank']),
+            models.Index(fields=['account', '-transaction_date', '-id']),  # 거래 내역 키셋 페이지네이션
         ]
         verbose_name = '거래 내역'
         verbose_name_plural = '거래 내역'
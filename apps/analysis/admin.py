@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import MateAnalysis, ProperPrice, ValuationJournalEntry
+from .models import MateAnalysis, MateAnalysisJob, MateAnalysisProgress, MateScoreWide, ProperPrice, ValuationDistribution, ValuationJournalEntry
 
 
 @admin.register(MateAnalysis)
@@ -22,6 +22,32 @@ class MateAnalysisAdmin(admin.ModelAdmin):
     )
 
 
+@admin.register(MateScoreWide)
+class MateScoreWideAdmin(admin.ModelAdmin):
+    list_display = ['stock', 'benjamin', 'fisher', 'greenblatt', 'lynch', 'avg_score', 'min_score', 'updated_at']
+    search_fields = ['stock__stock_name', 'stock__stock_code']
+    ordering = ['-avg_score']
+    readonly_fields = ['updated_at']
+
+
+@admin.register(MateAnalysisProgress)
+class MateAnalysisProgressAdmin(admin.ModelAdmin):
+    list_display = ['stock', 'mate_type', 'status', 'attempts', 'total_tokens', 'cost', 'cached', 'updated_at']
+    list_filter = ['status', 'mate_type', 'cached']
+    search_fields = ['stock__stock_name', 'stock__stock_code']
+    ordering = ['-updated_at']
+    readonly_fields = ['updated_at']
+
+
+@admin.register(MateAnalysisJob)
+class MateAnalysisJobAdmin(admin.ModelAdmin):
+    list_display = ['id', 'stock', 'mate_type', 'analysis_version', 'status', 'created_at', 'finished_at']
+    list_filter = ['status', 'mate_type']
+    search_fields = ['stock__stock_name', 'stock__stock_code']
+    ordering = ['-created_at']
+    readonly_fields = ['created_at', 'started_at', 'finished_at']
+
+
 @admin.register(ProperPrice)
 class ProperPriceAdmin(admin.ModelAdmin):
     list_display = ['stock', 'mate_type', 'proper_price', 'current_price', 'gap_ratio', 'calculated_at']
@@ -30,6 +56,14 @@ class ProperPriceAdmin(admin.ModelAdmin):
     ordering = ['-calculated_at']
 
 
+@admin.register(ValuationDistribution)
+class ValuationDistributionAdmin(admin.ModelAdmin):
+    list_display = ['stock', 'mate_type', 'p5', 'p50', 'p95', 'prob_undervalued', 'current_price', 'calculated_at']
+    list_filter = ['mate_type', 'calculated_at']
+    search_fields = ['stock__stock_name', 'stock__stock_code']
+    ordering = ['-calculated_at']
+
+
 @admin.register(ValuationJournalEntry)
 class ValuationJournalEntryAdmin(admin.ModelAdmin):
     list_display = [
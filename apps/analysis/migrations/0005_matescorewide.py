@@ -0,0 +1,60 @@
+# Generated by Django 4.2.11 on 2026-10-17 17:36
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+MATE_TYPES = ('benjamin', 'fisher', 'greenblatt', 'lynch')
+
+
+def backfill_mate_score_wide(apps, schema_editor):
+    MateAnalysis = apps.get_model('analysis', 'MateAnalysis')
+    MateScoreWide = apps.get_model('analysis', 'MateScoreWide')
+
+    scores = {}
+    rows = MateAnalysis.objects.filter(mate_type__in=MATE_TYPES).values_list('stock_id', 'mate_type', 'score')
+    for stock_id, mate_type, score in rows:
+        scores.setdefault(stock_id, {})[mate_type] = score
+
+    MateScoreWide.objects.bulk_create([
+        MateScoreWide(
+            stock_id=stock_id,
+            avg_score=sum(mate_scores.values()) / len(mate_scores),
+            min_score=min(mate_scores.values()),
+            mate_count=len(mate_scores),
+            **mate_scores,
+        )
+        for stock_id, mate_scores in scores.items()
+    ], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stocks', '0004_sectordistribution'),
+        ('analysis', '0004_valuationjournalentry'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MateScoreWide',
+            fields=[
+                ('stock', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='mate_score_wide', serialize=False, to='stocks.stock')),
+                ('benjamin', models.IntegerField(blank=True, null=True, verbose_name='베니 점수')),
+                ('fisher', models.IntegerField(blank=True, null=True, verbose_name='그로우 점수')),
+                ('greenblatt', models.IntegerField(blank=True, null=True, verbose_name='매직 점수')),
+                ('lynch', models.IntegerField(blank=True, null=True, verbose_name='데일리 점수')),
+                ('avg_score', models.FloatField(blank=True, null=True, verbose_name='평균 점수')),
+                ('min_score', models.IntegerField(blank=True, null=True, verbose_name='최저 점수')),
+                ('mate_count', models.PositiveSmallIntegerField(default=0, verbose_name='분석된 메이트 수')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='수정일')),
+            ],
+            options={
+                'verbose_name': '메이트 점수 (종목별)',
+                'verbose_name_plural': '메이트 점수 (종목별)',
+                'db_table': 'mate_score_wide',
+                'indexes': [models.Index(fields=['-benjamin', 'stock'], name='mate_score__benjami_fcd5b1_idx'), models.Index(fields=['-fisher', 'stock'], name='mate_score__fisher_2884e7_idx'), models.Index(fields=['-greenblatt', 'stock'], name='mate_score__greenbl_ac26e2_idx'), models.Index(fields=['-lynch', 'stock'], name='mate_score__lynch_1733cb_idx'), models.Index(fields=['-avg_score', 'stock'], name='mate_score__avg_sco_a319e7_idx'), models.Index(fields=['-min_score', 'stock'], name='mate_score__min_sco_420eb6_idx'), models.Index(fields=['mate_count'], name='mate_score__mate_co_87a12c_idx')],
+            },
+        ),
+        migrations.RunPython(backfill_mate_score_wide, migrations.RunPython.noop),
+    ]
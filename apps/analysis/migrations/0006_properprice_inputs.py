@@ -0,0 +1,28 @@
+# Generated by Django 4.2.11 on 2026-10-17 17:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analysis', '0005_matescorewide'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='properprice',
+            name='analysis_version',
+            field=models.CharField(default='1.0', max_length=20, verbose_name='분석 버전'),
+        ),
+        migrations.AddField(
+            model_name='properprice',
+            name='price_date',
+            field=models.DateField(blank=True, null=True, verbose_name='현재가 기준일'),
+        ),
+        migrations.AddField(
+            model_name='properprice',
+            name='shares_outstanding',
+            field=models.BigIntegerField(blank=True, null=True, verbose_name='계산 시 발행 주식 수'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.11 on 2026-10-17 17:52
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stocks', '0006_stockscore'),
+        ('analysis', '0006_properprice_inputs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MateAnalysisProgress',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('mate_type', models.CharField(max_length=50, verbose_name='메이트 타입')),
+                ('status', models.CharField(choices=[('success', '완료'), ('failed', '실패')], max_length=20, verbose_name='상태')),
+                ('prompt_key', models.CharField(blank=True, max_length=64, verbose_name='프롬프트 키')),
+                ('attempts', models.PositiveIntegerField(default=0, verbose_name='시도 횟수')),
+                ('total_tokens', models.IntegerField(default=0, verbose_name='토큰 수')),
+                ('cost', models.FloatField(default=0, verbose_name='비용($)')),
+                ('cached', models.BooleanField(default=False, verbose_name='캐시 응답')),
+                ('error', models.CharField(blank=True, max_length=200, verbose_name='오류')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='수정일')),
+                ('stock', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='mate_analysis_progress', to='stocks.stock')),
+            ],
+            options={
+                'verbose_name': '메이트 분석 진행 상태',
+                'verbose_name_plural': '메이트 분석 진행 상태',
+                'db_table': 'mate_analysis_progress',
+                'indexes': [models.Index(fields=['status'], name='mate_analys_status_3e0c52_idx')],
+                'unique_together': {('stock', 'mate_type')},
+            },
+        ),
+    ]
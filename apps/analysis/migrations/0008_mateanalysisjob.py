@@ -0,0 +1,41 @@
+# Generated by Django 4.2.11 on 2026-10-17 17:55
+
+from django.db import migrations, models
+import django.db.models.deletion
+import uuid
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stocks', '0006_stockscore'),
+        ('analysis', '0007_mateanalysisprogress'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MateAnalysisJob',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('mate_type', models.CharField(max_length=50, verbose_name='메이트 타입')),
+                ('analysis_version', models.CharField(max_length=20, verbose_name='분석 버전')),
+                ('status', models.CharField(choices=[('queued', '대기'), ('running', '진행 중'), ('success', '완료'), ('failed', '실패')], default='queued', max_length=20, verbose_name='상태')),
+                ('error', models.CharField(blank=True, max_length=200, verbose_name='오류')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='요청 일시')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='시작 일시')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='종료 일시')),
+                ('analysis', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='jobs', to='analysis.mateanalysis')),
+                ('stock', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='mate_analysis_jobs', to='stocks.stock')),
+            ],
+            options={
+                'verbose_name': '메이트 분석 작업',
+                'verbose_name_plural': '메이트 분석 작업',
+                'db_table': 'mate_analysis_jobs',
+                'indexes': [models.Index(fields=['status', 'created_at'], name='mate_analys_status_15b632_idx')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='mateanalysisjob',
+            constraint=models.UniqueConstraint(condition=models.Q(('status__in', ['queued', 'running'])), fields=('stock', 'mate_type', 'analysis_version'), name='unique_active_mate_analysis_job'),
+        ),
+    ]
@@ -0,0 +1,42 @@
+# Generated by Django 4.2.11 on 2026-10-17 18:03
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stocks', '0006_stockscore'),
+        ('analysis', '0008_mateanalysisjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ValuationDistribution',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('mate_type', models.CharField(max_length=50, verbose_name='메이트 타입')),
+                ('p5', models.FloatField(verbose_name='적정가 5%')),
+                ('p25', models.FloatField(verbose_name='적정가 25%')),
+                ('p50', models.FloatField(verbose_name='적정가 중앙값')),
+                ('p75', models.FloatField(verbose_name='적정가 75%')),
+                ('p95', models.FloatField(verbose_name='적정가 95%')),
+                ('mean', models.FloatField(verbose_name='적정가 평균')),
+                ('prob_undervalued', models.FloatField(blank=True, help_text='0-1', null=True, verbose_name='저평가 확률')),
+                ('current_price', models.DecimalField(blank=True, decimal_places=2, max_digits=15, null=True, verbose_name='현재가')),
+                ('price_date', models.DateField(blank=True, null=True, verbose_name='현재가 기준일')),
+                ('paths', models.IntegerField(verbose_name='경로 수')),
+                ('seed', models.BigIntegerField(verbose_name='시드')),
+                ('calculated_at', models.DateTimeField(auto_now=True, verbose_name='계산 일시')),
+                ('analysis_version', models.CharField(default='1.0', max_length=20, verbose_name='분석 버전')),
+                ('stock', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='valuation_distributions', to='stocks.stock')),
+            ],
+            options={
+                'verbose_name': '적정가 분포',
+                'verbose_name_plural': '적정가 분포',
+                'db_table': 'valuation_distributions',
+                'unique_together': {('stock', 'mate_type')},
+            },
+        ),
+    ]
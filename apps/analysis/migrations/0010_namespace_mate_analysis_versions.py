@@ -0,0 +1,87 @@
+from django.db import migrations
+from django.db.models import Q
+
+
+RULE_PREFIX = 'rule-'
+LLM_PREFIX = 'llm-'
+
+# 규칙 엔진(core.utils.mate_engines)이 저장하는 요약 문구 (이 마이그레이션 시점 기준으로 고정)
+RULE_SUMMARIES = {
+    'benjamin': {
+        "훌륭한 안전 자산입니다",
+        "장기 보유 적합한 안전 자산입니다",
+        "안정적이나 일부 주의사항이 있습니다",
+        "보수적 투자자에게는 다소 위험할 수 있습니다",
+        "안전마진이 부족합니다",
+    },
+    'fisher': {
+        "탁월한 성장 잠재력을 가진 기업입니다",
+        "성장성이 뛰어난 기업입니다",
+        "꾸준한 성장이 기대되는 기업입니다",
+        "성장성은 보통 수준입니다",
+        "성장 동력이 부족해 보입니다",
+    },
+    'greenblatt': {
+        "우량하고 저렴한 마법공식 후보입니다",
+        "우량한 기업이지만 가격은 적정 수준입니다",
+        "우량성과 가격이 균형을 이룹니다",
+        "우량도나 염가도 중 하나가 부족합니다",
+        "마법공식 기준에는 미달입니다",
+    },
+    'lynch': {
+        "일상 속에서 발견한 숨은 보석입니다",
+        "성장 모멘텀이 좋은 기업입니다",
+        "관심을 가질 만한 기업입니다",
+        "평범한 기업입니다",
+        "실적 모멘텀이 부족합니다",
+    },
+}
+
+
+def namespace_versions(apps, schema_editor):
+    """
+    기존 분석 버전에 작성자 접두어 부여
+
+    요약이 규칙 엔진 고정 문구와 같고 LLM 기록(MateAnalysisProgress / MateAnalysisJob success)이
+    없는 행만 rule-, 나머지(GPT 분석, 임포트 등 판단할 수 없는 행)는 llm-
+    → 판단이 틀려도 규칙 엔진이 유료 분석을 덮어쓰지 않는 쪽으로
+    """
+    MateAnalysis = apps.get_model('analysis', 'MateAnalysis')
+    MateAnalysisProgress = apps.get_model('analysis', 'MateAnalysisProgress')
+    MateAnalysisJob = apps.get_model('analysis', 'MateAnalysisJob')
+
+    llm_pairs = set(MateAnalysisProgress.objects.filter(status='success').values_list('stock_id', 'mate_type'))
+    llm_ids = set(
+        MateAnalysisJob.objects.filter(status='success', analysis__isnull=False).values_list('analysis_id', flat=True)
+    )
+
+    unprefixed = MateAnalysis.objects.exclude(
+        Q(analysis_version__startswith=RULE_PREFIX) | Q(analysis_version__startswith=LLM_PREFIX)
+    )
+    updated = []
+    for analysis in unprefixed.only('id', 'stock_id', 'mate_type', 'summary', 'analysis_version').iterator():
+        is_rule = (
+            analysis.summary in RULE_SUMMARIES.get(analysis.mate_type, ())
+            and analysis.id not in llm_ids
+            and (analysis.stock_id, analysis.mate_type) not in llm_pairs
+        )
+        analysis.analysis_version = (RULE_PREFIX if is_rule else LLM_PREFIX) + (analysis.analysis_version or '1.0')
+        updated.append(analysis)
+    MateAnalysis.objects.bulk_update(updated, ['analysis_version'], batch_size=1000)
+
+    # 분석 작업은 결과를 작업 버전으로 저장하므로 함께 변경
+    jobs = list(MateAnalysisJob.objects.exclude(analysis_version__startswith=LLM_PREFIX).only('id', 'analysis_version'))
+    for job in jobs:
+        job.analysis_version = LLM_PREFIX + job.analysis_version
+    MateAnalysisJob.objects.bulk_update(jobs, ['analysis_version'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analysis', '0009_valuationdistribution'),
+    ]
+
+    operations = [
+        migrations.RunPython(namespace_versions, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.11 on 2026-10-17 18:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analysis', '0010_namespace_mate_analysis_versions'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='mateanalysis',
+            name='analysis_version',
+            field=models.CharField(max_length=20, verbose_name='분석 버전'),
+        ),
+    ]
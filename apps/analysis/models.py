@@ -1,3 +1,5 @@
+import uuid
+
 from django.db import models
 from django.utils import timezone
 from apps.stocks.models import Stock
@@ -33,7 +35,8 @@ class MateAnalysis(models.Model):
     
     # 메타데이터
     analyzed_at = models.DateTimeField('분석 일시', auto_now=True)
-    analysis_version = models.CharField('분석 버전', max_length=20, default='1.0')
+    # 작성자 접두어 포함 (rule-: 규칙 엔진 / llm-: LLM 분석), 저장할 때 항상 지정
+    analysis_version = models.CharField('분석 버전', max_length=20)
     
     class Meta:
         db_table = 'mate_analyses'
@@ -49,6 +52,137 @@ class MateAnalysis(models.Model):
         return f"{self.get_mate_type_display()} - {self.stock.stock_name} ({self.score}점)"
 
 
+class MateScoreWide(models.Model):
+    """
+    종목별 메이트 점수 (MateAnalysis 비정규화, 종목당 1행)
+    
+    MateAnalysis 저장/삭제 시 시그널로 동기화
+    스크리닝 테이블의 필터/정렬을 컬럼 인덱스로 처리
+    """
+    stock = models.OneToOneField(Stock, on_delete=models.CASCADE, primary_key=True, related_name='mate_score_wide')
+    
+    # 메이트별 점수 (분석이 없으면 NULL)
+    benjamin = models.IntegerField('베니 점수', null=True, blank=True)
+    fisher = models.IntegerField('그로우 점수', null=True, blank=True)
+    greenblatt = models.IntegerField('매직 점수', null=True, blank=True)
+    lynch = models.IntegerField('데일리 점수', null=True, blank=True)
+    
+    # 집계 (분석이 있는 메이트 기준)
+    avg_score = models.FloatField('평균 점수', null=True, blank=True)
+    min_score = models.IntegerField('최저 점수', null=True, blank=True)
+    mate_count = models.PositiveSmallIntegerField('분석된 메이트 수', default=0)
+    
+    updated_at = models.DateTimeField('수정일', auto_now=True)
+    
+    class Meta:
+        db_table = 'mate_score_wide'
+        verbose_name = '메이트 점수 (종목별)'
+        verbose_name_plural = '메이트 점수 (종목별)'
+        indexes = [
+            models.Index(fields=['-benjamin', 'stock']),
+            models.Index(fields=['-fisher', 'stock']),
+            models.Index(fields=['-greenblatt', 'stock']),
+            models.Index(fields=['-lynch', 'stock']),
+            models.Index(fields=['-avg_score', 'stock']),
+            models.Index(fields=['-min_score', 'stock']),
+            models.Index(fields=['mate_count']),
+        ]
+    
+    def __str__(self):
+        return f"{self.stock.stock_name} (평균 {self.avg_score}점)"
+
+
+class MateAnalysisProgress(models.Model):
+    """
+    LLM 메이트 분석 진행 상태 (종목 × 메이트당 1행)
+
+    scripts/run_mate_analysis.py가 요청이 끝날 때마다 기록, 중단 후 재실행하면
+    success가 아닌 (종목, 메이트)와 프롬프트(지표)가 바뀐 (종목, 메이트)만 다시 분석
+    """
+    STATUS_CHOICES = [
+        ('success', '완료'),
+        ('failed', '실패'),
+    ]
+    
+    stock = models.ForeignKey(Stock, on_delete=models.CASCADE, related_name='mate_analysis_progress')
+    mate_type = models.CharField('메이트 타입', max_length=50)
+    status = models.CharField('상태', max_length=20, choices=STATUS_CHOICES)
+    
+    # 분석에 사용한 프롬프트 (LLM 캐시 키, 지표가 바뀌면 달라짐)
+    prompt_key = models.CharField('프롬프트 키', max_length=64, blank=True)
+    
+    # 사용량
+    attempts = models.PositiveIntegerField('시도 횟수', default=0)
+    total_tokens = models.IntegerField('토큰 수', default=0)
+    cost = models.FloatField('비용($)', default=0)
+    cached = models.BooleanField('캐시 응답', default=False)
+    
+    error = models.CharField('오류', max_length=200, blank=True)
+    updated_at = models.DateTimeField('수정일', auto_now=True)
+    
+    class Meta:
+        db_table = 'mate_analysis_progress'
+        verbose_name = '메이트 분석 진행 상태'
+        verbose_name_plural = '메이트 분석 진행 상태'
+        unique_together = ['stock', 'mate_type']
+        indexes = [
+            models.Index(fields=['status']),
+        ]
+    
+    def __str__(self):
+        return f"{self.stock.stock_name} - {self.mate_type} ({self.status})"
+
+
+class MateAnalysisJob(models.Model):
+    """
+    메이트 분석 백그라운드 작업 (POST /api/analysis/analyze_now/)
+    
+    (종목, 메이트, 분석 버전)당 진행 중(queued/running) 작업은 1개만 허용 →
+    동시에 들어온 중복 요청은 같은 작업으로 합쳐져 LLM을 한 번만 호출
+    """
+    STATUS_CHOICES = [
+        ('queued', '대기'),
+        ('running', '진행 중'),
+        ('success', '완료'),
+        ('failed', '실패'),
+    ]
+    ACTIVE_STATUSES = ('queued', 'running')
+    
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    stock = models.ForeignKey(Stock, on_delete=models.CASCADE, related_name='mate_analysis_jobs')
+    mate_type = models.CharField('메이트 타입', max_length=50)
+    analysis_version = models.CharField('분석 버전', max_length=20)
+    status = models.CharField('상태', max_length=20, choices=STATUS_CHOICES, default='queued')
+    
+    # 결과
+    analysis = models.ForeignKey(
+        MateAnalysis, on_delete=models.SET_NULL, null=True, blank=True, related_name='jobs'
+    )
+    error = models.CharField('오류', max_length=200, blank=True)
+    
+    created_at = models.DateTimeField('요청 일시', auto_now_add=True)
+    started_at = models.DateTimeField('시작 일시', null=True, blank=True)
+    finished_at = models.DateTimeField('종료 일시', null=True, blank=True)
+    
+    class Meta:
+        db_table = 'mate_analysis_jobs'
+        verbose_name = '메이트 분석 작업'
+        verbose_name_plural = '메이트 분석 작업'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['stock', 'mate_type', 'analysis_version'],
+                condition=models.Q(status__in=['queued', 'running']),
+                name='unique_active_mate_analysis_job',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.stock.stock_name} - {self.mate_type} ({self.status})"
+
+
 class ProperPrice(models.Model):
     """
     적정가 계산 결과
@@ -70,8 +204,13 @@ class ProperPrice(models.Model):
     expected_return = models.DecimalField('예상 수익률', max_digits=5, decimal_places=2, null=True, blank=True)
     success_probability = models.DecimalField('수익 확률', max_digits=5, decimal_places=2, null=True, blank=True)
     
+    # 계산 입력 (변경 추적: 주가만 바뀌면 괴리율만 재계산)
+    price_date = models.DateField('현재가 기준일', null=True, blank=True)
+    shares_outstanding = models.BigIntegerField('계산 시 발행 주식 수', null=True, blank=True)
+    
     # 메타데이터
-    calculated_at = models.DateTimeField('계산 일시', auto_now=True)
+    calculated_at = models.DateTimeField('계산 일시', auto_now=True)  # 적정가 계산 시각 (괴리율 갱신은 제외)
+    analysis_version = models.CharField('분석 버전', max_length=20, default='1.0')
     
     class Meta:
         db_table = 'proper_prices'
@@ -86,6 +225,46 @@ class ProperPrice(models.Model):
         return f"{self.stock.stock_name} - {self.proper_price}원 ({self.gap_ratio}%)"
 
 
+class ValuationDistribution(models.Model):
+    """
+    메이트별 적정가 분포 (몬테카를로, 야간 배치)
+    
+    종목 분기 재무 이력으로 추정한 성장률/마진/할인율 분포에서 경로를 샘플링해 계산
+    (core.utils.valuation_simulation)
+    """
+    stock = models.ForeignKey(Stock, on_delete=models.CASCADE, related_name='valuation_distributions')
+    mate_type = models.CharField('메이트 타입', max_length=50)
+    
+    # 주당 적정가 분위수
+    p5 = models.FloatField('적정가 5%')
+    p25 = models.FloatField('적정가 25%')
+    p50 = models.FloatField('적정가 중앙값')
+    p75 = models.FloatField('적정가 75%')
+    p95 = models.FloatField('적정가 95%')
+    mean = models.FloatField('적정가 평균')
+    
+    # 저평가 확률 (적정가 > 현재가인 경로 비율, 현재가가 없으면 NULL)
+    prob_undervalued = models.FloatField('저평가 확률', null=True, blank=True, help_text='0-1')
+    current_price = models.DecimalField('현재가', max_digits=15, decimal_places=2, null=True, blank=True)
+    price_date = models.DateField('현재가 기준일', null=True, blank=True)
+    
+    # 재현용 (같은 입력·경로 수·시드 → 같은 결과)
+    paths = models.IntegerField('경로 수')
+    seed = models.BigIntegerField('시드')
+    
+    calculated_at = models.DateTimeField('계산 일시', auto_now=True)
+    analysis_version = models.CharField('분석 버전', max_length=20, default='1.0')
+    
+    class Meta:
+        db_table = 'valuation_distributions'
+        verbose_name = '적정가 분포'
+        verbose_name_plural = '적정가 분포'
+        unique_together = ['stock', 'mate_type']
+    
+    def __str__(self):
+        return f"{self.stock.stock_name} - {self.mate_type} 중앙값 {self.p50:.2f}"
+
+
 class QualitativeAnalysis(models.Model):
     """
     정성적 분석 결과 (Claude 직접 분석)
@@ -0,0 +1,8 @@
+"""
+분석 서비스 패키지
+"""
+from .mate_analysis_job import (
+    enqueue_mate_analysis,
+    run_mate_analysis_job,
+    expire_stale_jobs,
+)
@@ -0,0 +1,137 @@
+"""
+메이트 분석 백그라운드 작업 (MateAnalysisJob)
+
+- enqueue_mate_analysis: 작업 등록 후 Celery로 전달
+  (같은 종목/메이트/분석 버전의 진행 중 작업이 있으면 새로 만들지 않고 그 작업 반환)
+- run_mate_analysis_job: Celery 워커에서 TTM 지표 스냅샷으로 LLM 통합 분석 실행 후 MateAnalysis 저장
+  (요청 1회로 4명 모두 저장, 분석 대상 스냅샷이 없으면 작업 실패)
+
+웹 요청은 작업 ID만 받고 GET /api/analysis/jobs/{id}/로 상태/결과를 조회
+"""
+import logging
+from datetime import timedelta
+from typing import Optional, Tuple
+
+from django.db import transaction
+from django.utils import timezone
+
+from apps.analysis.models import MateAnalysis, MateAnalysisJob
+from apps.stocks.models import Stock
+from apps.stocks.services.mate_analysis import llm_indicators, llm_snapshot_queryset
+from core.utils.mate_engine import ENGINE_VERSION, MateEngine
+
+logger = logging.getLogger(__name__)
+
+# 이 시간 안에 끝나지 않은 진행 중 작업은 워커 중단으로 보고 만료 (새 요청이 새 작업을 만들 수 있게)
+JOB_TIMEOUT = timedelta(minutes=10)
+
+
+def expire_stale_jobs(**filters) -> int:
+    """
+    시간 초과된 진행 중 작업을 failed로 처리
+
+    Returns:
+        만료된 작업 수
+    """
+    now = timezone.now()
+    return MateAnalysisJob.objects.filter(
+        status__in=MateAnalysisJob.ACTIVE_STATUSES,
+        created_at__lt=now - JOB_TIMEOUT,
+        **filters,
+    ).update(status='failed', error='시간 초과', finished_at=now)
+
+
+def _dispatch(job: MateAnalysisJob):
+    """Celery로 작업 전달 (브로커 오류면 작업을 failed로 기록)"""
+    from apps.analysis.tasks import run_mate_analysis_job_task
+
+    try:
+        run_mate_analysis_job_task.delay(str(job.id))
+    except Exception as e:
+        logger.error(f"❌ 메이트 분석 작업 등록 실패 ({job.id}): {e}")
+        MateAnalysisJob.objects.filter(id=job.id).update(
+            status='failed', error=f'작업 등록 실패: {e}'[:200], finished_at=timezone.now()
+        )
+        job.refresh_from_db()
+
+
+def enqueue_mate_analysis(stock: Stock, mate_type: str) -> Tuple[MateAnalysisJob, bool]:
+    """
+    메이트 분석 작업 등록
+
+    동시에 들어온 요청은 (종목, 메이트, 분석 버전) 부분 유니크 제약으로 하나의 작업으로 합쳐짐
+
+    Returns:
+        (작업, 새로 만들었는지 여부)
+    """
+    expire_stale_jobs(stock=stock, mate_type=mate_type)
+
+    job, created = MateAnalysisJob.objects.get_or_create(
+        stock=stock,
+        mate_type=mate_type,
+        analysis_version=ENGINE_VERSION,
+        status__in=MateAnalysisJob.ACTIVE_STATUSES,
+        defaults={'status': 'queued'},
+    )
+
+    if created:
+        # 작업 행이 커밋된 뒤에 워커가 조회하도록
+        transaction.on_commit(lambda: _dispatch(job))
+
+    return job, created
+
+
+def run_mate_analysis_job(job_id) -> Optional[MateAnalysisJob]:
+    """
+    작업 실행 (Celery 워커)
+
+    queued → running 전환에 성공한 워커만 실행 (중복 전달 시 LLM 호출 1회)
+
+    Returns:
+        처리한 작업 (이미 다른 워커가 가져갔거나 없는 작업이면 None)
+    """
+    claimed = MateAnalysisJob.objects.filter(id=job_id, status='queued').update(
+        status='running', started_at=timezone.now()
+    )
+    if not claimed:
+        return None
+
+    job = MateAnalysisJob.objects.select_related('stock').get(id=job_id)
+    stock = job.stock
+
+    try:
+        snapshot = llm_snapshot_queryset().filter(stock=stock).first()
+        if snapshot is None:
+            raise ValueError('지표 스냅샷 없음')
+
+        # 통합 요청 1회로 4명 결과를 받아 함께 저장 (같은 종목 다른 메이트 작업은 캐시 적중)
+        results = MateEngine().analyze_all(llm_indicators(snapshot))
+
+        with transaction.atomic():
+            analyses = {
+                mate_type: MateAnalysis.objects.update_or_create(
+                    stock=stock,
+                    mate_type=mate_type,
+                    defaults={
+                        'score': result['score'],
+                        'summary': result['summary'],
+                        'reason': result['reason'],
+                        'caution': result.get('caution', ''),
+                        'score_detail': result.get('score_detail', {}),
+                        'analysis_version': job.analysis_version,
+                    }
+                )[0]
+                for mate_type, result in results.items()
+            }
+        analysis = analyses[job.mate_type]
+    except Exception as e:
+        logger.exception(f"❌ 메이트 분석 실패: {stock.stock_code} {job.mate_type}")
+        job.status = 'failed'
+        job.error = str(e)[:200]
+    else:
+        job.status = 'success'
+        job.analysis = analysis
+
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'error', 'analysis', 'finished_at'])
+    return job
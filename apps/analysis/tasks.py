@@ -0,0 +1,36 @@
+"""
+분석 관련 Celery 작업
+
+analyze_now로 등록된 메이트 분석 작업 실행 (LLM 호출을 웹 요청 밖에서 처리)
+"""
+from celery import shared_task
+import logging
+
+from apps.analysis.services import run_mate_analysis_job
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name='analysis.run_mate_analysis_job')
+def run_mate_analysis_job_task(job_id: str):
+    """
+    메이트 분석 작업 실행
+
+    Args:
+        job_id: MateAnalysisJob ID
+    """
+    job = run_mate_analysis_job(job_id)
+    if job is None:
+        logger.info(f"메이트 분석 작업 {job_id}: 이미 처리되었거나 없는 작업")
+        return {
+            'success': False,
+            'job_id': job_id,
+            'error': '이미 처리되었거나 없는 작업',
+        }
+
+    logger.info(f"✅ 메이트 분석 작업 {job_id}: {job.status}")
+    return {
+        'success': job.status == 'success',
+        'job_id': job_id,
+        'status': job.status,
+    }
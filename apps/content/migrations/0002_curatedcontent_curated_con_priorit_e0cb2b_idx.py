@@ -0,0 +1,17 @@
+# Generated by Django 4.2.11 on 2026-10-17 17:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('content', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='curatedcontent',
+            index=models.Index(fields=['-priority', '-is_featured', '-created_at', '-id'], name='curated_con_priorit_e0cb2b_idx'),
+        ),
+    ]
@@ -162,6 +162,7 @@ class CuratedContent(models.Model):
         indexes = [
             models.Index(fields=['source']),
             models.Index(fields=['-priority', '-is_featured']),
+            models.Index(fields=['-priority', '-is_featured', '-created_at', '-id']),  # 키셋 페이지네이션
         ]
     
     def __str__(self):
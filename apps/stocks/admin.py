@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Stock, StockFinancialRaw, StockPrice
+from .models import Stock, StockFinancialRaw, StockPrice, StockIndicatorSnapshot, StockIndicatorHistory, StockScore, SectorDistribution
 
 
 @admin.register(Stock)
@@ -43,3 +43,37 @@ class StockPriceAdmin(admin.ModelAdmin):
     search_fields = ['stock__stock_name', 'stock__stock_code']
     ordering = ['-date']
 
+
+
+@admin.register(StockIndicatorSnapshot)
+class StockIndicatorSnapshotAdmin(admin.ModelAdmin):
+    list_display = ['stock', 'ttm_period', 'ttm_fcf', 'roe', 'debt_ratio', 'fcf_positive_quarters', 'calculated_at']
+    search_fields = ['stock__stock_name', 'stock__stock_code']
+    ordering = ['-calculated_at']
+    readonly_fields = ['source_updated_at', 'calculated_at']
+
+
+@admin.register(StockIndicatorHistory)
+class StockIndicatorHistoryAdmin(admin.ModelAdmin):
+    list_display = ['stock', 'disclosure_year', 'disclosure_quarter', 'ttm_fcf', 'roe', 'revenue_growth', 'calculated_at']
+    list_filter = ['disclosure_year', 'disclosure_quarter']
+    search_fields = ['stock__stock_name', 'stock__stock_code']
+    ordering = ['stock', '-disclosure_year', '-disclosure_quarter']
+    readonly_fields = ['calculated_at']
+
+
+@admin.register(StockScore)
+class StockScoreAdmin(admin.ModelAdmin):
+    list_display = ['stock', 'total_score', 'grade', 'cashflow_score', 'safety_score', 'growth_score', 'calculated_at']
+    list_filter = ['grade']
+    search_fields = ['stock__stock_name', 'stock__stock_code']
+    ordering = ['-total_score']
+    readonly_fields = ['calculated_at']
+
+
+@admin.register(SectorDistribution)
+class SectorDistributionAdmin(admin.ModelAdmin):
+    list_display = ['group_type', 'group_name', 'metric', 'count', 'calculated_at']
+    list_filter = ['group_type', 'metric']
+    search_fields = ['group_name']
+    readonly_fields = ['calculated_at']
@@ -0,0 +1,10 @@
+from django.apps import AppConfig
+
+
+class StocksConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.stocks'
+    verbose_name = '종목'
+
+    def ready(self):
+        from . import signals  # noqa: F401
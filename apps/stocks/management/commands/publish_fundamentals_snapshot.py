@@ -0,0 +1,21 @@
+"""
+재무 컬럼 스냅샷 발행 관리 명령어
+
+사용법:
+    python manage.py publish_fundamentals_snapshot
+"""
+from django.core.management.base import BaseCommand
+from apps.stocks.services import publish_fundamentals_snapshot
+
+
+class Command(BaseCommand):
+    help = '재무/주가/메이트 점수 컬럼 스냅샷(.npy)을 새 버전으로 발행합니다.'
+
+    def handle(self, *args, **options):
+        snapshot = publish_fundamentals_snapshot()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'✅ 스냅샷 {snapshot.version} 발행 완료 ({len(snapshot)}개 종목): {snapshot.path}'
+            )
+        )
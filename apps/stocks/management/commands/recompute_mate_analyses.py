@@ -0,0 +1,49 @@
+"""
+메이트 분석 일괄 재계산 관리 명령어
+
+재무 적재 후 전 종목의 4개 메이트 점수를 지표 열 배열로 한 번에 계산해
+MateAnalysis에 청크 단위로 upsert
+
+사용법:
+    python manage.py recompute_mate_analyses                   # 전체
+    python manage.py recompute_mate_analyses --stock AAPL MSFT
+    python manage.py recompute_mate_analyses --chunk-size 500
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from apps.stocks.models import Stock
+from apps.stocks.services import recompute_mate_analyses
+from apps.stocks.services.mate_analysis import DEFAULT_CHUNK_SIZE
+
+
+class Command(BaseCommand):
+    help = 'TTM 지표 스냅샷으로 모든 종목의 메이트 분석(MateAnalysis)을 일괄 재계산합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--stock',
+            nargs='+',
+            help='재계산할 종목 코드',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help=f'upsert 청크 크기 (기본: {DEFAULT_CHUNK_SIZE}개 종목)',
+        )
+
+    def handle(self, *args, **options):
+        stock_ids = None
+        if options['stock']:
+            stock_ids = list(
+                Stock.objects.filter(stock_code__in=options['stock']).values_list('id', flat=True)
+            )
+
+        started = time.monotonic()
+        analyzed = recompute_mate_analyses(stock_ids, chunk_size=options['chunk_size'])
+        elapsed = time.monotonic() - started
+
+        self.stdout.write(
+            self.style.SUCCESS(f'✅ {analyzed}개 종목의 메이트 분석이 갱신되었습니다. ({elapsed:.1f}초)')
+        )
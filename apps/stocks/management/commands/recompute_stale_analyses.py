@@ -0,0 +1,42 @@
+"""
+메이트 분석 / 적정가 증분 재계산 관리 명령어
+
+재무 데이터·주가·발행주식수·엔진 버전이 바뀐 종목만 재계산
+(주가만 바뀐 종목은 괴리율만 갱신)
+
+사용법:
+    python manage.py recompute_stale_analyses
+    python manage.py recompute_stale_analyses --dry-run   # 대상 종목 수만 출력
+"""
+from django.core.management.base import BaseCommand
+from apps.stocks.services import find_stale_analyses, recompute_stale_analyses
+
+
+class Command(BaseCommand):
+    help = '변경된 종목의 메이트 분석과 적정가만 재계산합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='재계산하지 않고 대상 종목 수만 출력',
+        )
+
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            stale = find_stale_analyses()
+            self.stdout.write(
+                f"메이트 분석: {len(stale['mates'])}개 | "
+                f"적정가: {len(stale['valuations'])}개 | "
+                f"괴리율만: {len(stale['prices'])}개"
+            )
+            return
+
+        counts = recompute_stale_analyses()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✅ 메이트 분석 {counts['mates']}개, 적정가 {counts['valuations']}개, "
+                f"괴리율 {counts['prices']}개 종목이 갱신되었습니다."
+            )
+        )
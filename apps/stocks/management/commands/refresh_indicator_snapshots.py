@@ -0,0 +1,72 @@
+"""
+TTM 지표 스냅샷 갱신 관리 명령어
+
+사용법:
+    python manage.py refresh_indicator_snapshots            # 변경된 종목만
+    python manage.py refresh_indicator_snapshots --all      # 전체 재계산 (분기별 지표 포함)
+    python manage.py refresh_indicator_snapshots --stock AAPL MSFT
+    python manage.py refresh_indicator_snapshots --no-publish  # 컬럼 스냅샷 발행 생략
+"""
+from django.core.management.base import BaseCommand
+from apps.stocks.models import Stock, StockFinancialRaw
+from apps.stocks.services import (
+    refresh_indicator_snapshots,
+    find_stale_snapshot_stock_ids,
+    publish_fundamentals_snapshot,
+)
+
+
+class Command(BaseCommand):
+    help = '재무 데이터가 변경된 종목의 TTM 지표 스냅샷을 재계산합니다.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--all',
+            action='store_true',
+            help='재무 데이터가 있는 모든 종목 재계산',
+        )
+        parser.add_argument(
+            '--stock',
+            nargs='+',
+            help='재계산할 종목 코드',
+        )
+        parser.add_argument(
+            '--no-publish',
+            action='store_true',
+            help='재계산 후 재무 컬럼 스냅샷을 발행하지 않음',
+        )
+
+    def handle(self, *args, **options):
+        if options['stock']:
+            stock_ids = list(
+                Stock.objects.filter(stock_code__in=options['stock']).values_list('id', flat=True)
+            )
+        elif options['all']:
+            stock_ids = list(
+                StockFinancialRaw.objects.filter(
+                    data_source='EDGAR'
+                ).values_list('stock_id', flat=True).distinct()
+            )
+        else:
+            stock_ids = find_stale_snapshot_stock_ids()
+
+        if not stock_ids:
+            self.stdout.write(
+                self.style.SUCCESS('갱신할 스냅샷이 없습니다.')
+            )
+            return
+
+        self.stdout.write(f'대상 종목: {len(stock_ids)}개')
+
+        refreshed = refresh_indicator_snapshots(stock_ids)
+
+        self.stdout.write(
+            self.style.SUCCESS(f'✅ {refreshed}개 종목의 스냅샷이 갱신되었습니다.')
+        )
+
+        # 재무 데이터가 바뀌었으므로 워커 공유 컬럼 스냅샷도 새 버전으로 교체
+        if not options['no_publish']:
+            snapshot = publish_fundamentals_snapshot()
+            self.stdout.write(
+                self.style.SUCCESS(f'✅ 컬럼 스냅샷 {snapshot.version} 발행 ({len(snapshot)}개 종목)')
+            )
@@ -0,0 +1,21 @@
+"""
+종목별 메이트 점수 테이블 재구성 관리 명령어
+
+MateAnalysis를 시그널 없이 적재한 뒤(bulk 등) 또는 최초 배포 시 실행
+
+사용법:
+    python manage.py refresh_mate_score_wide
+"""
+from django.core.management.base import BaseCommand
+from apps.stocks.services import refresh_mate_score_wide
+
+
+class Command(BaseCommand):
+    help = '종목별 메이트 점수 테이블(MateScoreWide)을 MateAnalysis로 재구성합니다.'
+
+    def handle(self, *args, **options):
+        saved = refresh_mate_score_wide()
+
+        self.stdout.write(
+            self.style.SUCCESS(f'✅ {saved}개 종목의 메이트 점수가 갱신되었습니다.')
+        )
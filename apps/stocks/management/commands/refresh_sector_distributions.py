@@ -0,0 +1,19 @@
+"""
+섹터 지표 분포 갱신 관리 명령어
+
+사용법:
+    python manage.py refresh_sector_distributions
+"""
+from django.core.management.base import BaseCommand
+from apps.stocks.services import refresh_sector_distributions
+
+
+class Command(BaseCommand):
+    help = '섹터/산업별 지표 분포(분위수)를 재계산합니다.'
+
+    def handle(self, *args, **options):
+        saved = refresh_sector_distributions()
+
+        self.stdout.write(
+            self.style.SUCCESS(f'✅ {saved}개 분포가 갱신되었습니다.')
+        )
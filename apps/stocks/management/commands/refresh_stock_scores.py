@@ -0,0 +1,21 @@
+"""
+규칙 기반 점수 테이블 재계산 관리 명령어
+
+야간 재무 적재 후 또는 점수표(core.utils.score_engine) 변경 후 실행
+
+사용법:
+    python manage.py refresh_stock_scores
+"""
+from django.core.management.base import BaseCommand
+from apps.stocks.services import refresh_stock_scores
+
+
+class Command(BaseCommand):
+    help = '모든 종목의 규칙 기반 점수(StockScore)를 TTM 지표 스냅샷으로 재계산합니다.'
+
+    def handle(self, *args, **options):
+        saved = refresh_stock_scores()
+
+        self.stdout.write(
+            self.style.SUCCESS(f'✅ {saved}개 종목의 점수가 갱신되었습니다.')
+        )
@@ -0,0 +1,52 @@
+# Generated by Django 4.2.11 on 2026-10-18 01:23
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stocks', '0002_add_shares_outstanding'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockIndicatorSnapshot',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ttm_period', models.CharField(max_length=20, verbose_name='TTM 기간')),
+                ('latest_year', models.IntegerField(verbose_name='최근 분기 연도')),
+                ('latest_quarter', models.IntegerField(verbose_name='최근 분기')),
+                ('source_quarters', models.JSONField(blank=True, default=list, verbose_name='TTM 원본 분기')),
+                ('quarter_count', models.IntegerField(default=0, verbose_name='사용 분기 수')),
+                ('ttm_ocf', models.BigIntegerField(default=0, verbose_name='TTM OCF')),
+                ('ttm_fcf', models.BigIntegerField(default=0, verbose_name='TTM FCF')),
+                ('ttm_capex', models.BigIntegerField(default=0, verbose_name='TTM CAPEX')),
+                ('ttm_revenue', models.BigIntegerField(default=0, verbose_name='TTM 매출액')),
+                ('ttm_net_income', models.BigIntegerField(default=0, verbose_name='TTM 순이익')),
+                ('total_assets', models.BigIntegerField(blank=True, null=True, verbose_name='총자산')),
+                ('current_assets', models.BigIntegerField(blank=True, null=True, verbose_name='유동자산')),
+                ('current_liabilities', models.BigIntegerField(blank=True, null=True, verbose_name='유동부채')),
+                ('total_liabilities', models.BigIntegerField(blank=True, null=True, verbose_name='총부채')),
+                ('total_equity', models.BigIntegerField(blank=True, null=True, verbose_name='자본총계')),
+                ('fcf_margin', models.FloatField(default=0, verbose_name='FCF 마진')),
+                ('roe', models.FloatField(default=0, verbose_name='ROE')),
+                ('debt_ratio', models.FloatField(default=0, verbose_name='부채비율')),
+                ('current_ratio', models.FloatField(default=0, verbose_name='유동비율')),
+                ('revenue_growth', models.FloatField(blank=True, null=True, verbose_name='매출 성장률')),
+                ('fcf_growth', models.FloatField(blank=True, null=True, verbose_name='FCF 성장률')),
+                ('ocf_to_net_income', models.FloatField(blank=True, null=True, verbose_name='OCF/순이익')),
+                ('fcf_positive_quarters', models.IntegerField(default=0, verbose_name='FCF 양수 분기 수')),
+                ('source_updated_at', models.DateTimeField(blank=True, null=True, verbose_name='원본 최종 수정일')),
+                ('calculated_at', models.DateTimeField(auto_now=True, verbose_name='계산 일시')),
+                ('stock', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='indicator_snapshot', to='stocks.stock')),
+            ],
+            options={
+                'verbose_name': 'TTM 지표 스냅샷',
+                'verbose_name_plural': 'TTM 지표 스냅샷',
+                'db_table': 'stock_indicator_snapshots',
+                'indexes': [models.Index(fields=['ttm_fcf'], name='stock_indic_ttm_fcf_778efc_idx'), models.Index(fields=['roe'], name='stock_indic_roe_6a3df7_idx'), models.Index(fields=['fcf_margin'], name='stock_indic_fcf_mar_d7a748_idx'), models.Index(fields=['debt_ratio'], name='stock_indic_debt_ra_c75775_idx'), models.Index(fields=['revenue_growth'], name='stock_indic_revenue_6e6f12_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.11 on 2026-10-17 17:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stocks', '0003_stockindicatorsnapshot'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SectorDistribution',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('group_type', models.CharField(choices=[('sector', '섹터'), ('industry', '산업')], max_length=20, verbose_name='그룹 종류')),
+                ('group_name', models.CharField(max_length=200, verbose_name='그룹명')),
+                ('metric', models.CharField(max_length=50, verbose_name='지표')),
+                ('count', models.IntegerField(verbose_name='종목 수')),
+                ('quantiles', models.JSONField(default=list, verbose_name='분위수')),
+                ('calculated_at', models.DateTimeField(auto_now=True, verbose_name='계산 일시')),
+            ],
+            options={
+                'verbose_name': '섹터 지표 분포',
+                'verbose_name_plural': '섹터 지표 분포',
+                'db_table': 'sector_distributions',
+                'indexes': [models.Index(fields=['group_type', 'group_name'], name='sector_dist_group_t_b82a9c_idx')],
+                'unique_together': {('group_type', 'group_name', 'metric')},
+            },
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 4.2.11 on 2026-10-17 17:37
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stocks', '0004_sectordistribution'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockIndicatorHistory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('disclosure_year', models.IntegerField(verbose_name='기준 연도')),
+                ('disclosure_quarter', models.IntegerField(verbose_name='기준 분기')),
+                ('ttm_period', models.CharField(max_length=20, verbose_name='TTM 기간')),
+                ('quarter_count', models.IntegerField(default=0, verbose_name='사용 분기 수')),
+                ('ttm_ocf', models.BigIntegerField(default=0, verbose_name='TTM OCF')),
+                ('ttm_fcf', models.BigIntegerField(default=0, verbose_name='TTM FCF')),
+                ('ttm_capex', models.BigIntegerField(default=0, verbose_name='TTM CAPEX')),
+                ('ttm_revenue', models.BigIntegerField(default=0, verbose_name='TTM 매출액')),
+                ('ttm_net_income', models.BigIntegerField(default=0, verbose_name='TTM 순이익')),
+                ('total_assets', models.BigIntegerField(blank=True, null=True, verbose_name='총자산')),
+                ('current_assets', models.BigIntegerField(blank=True, null=True, verbose_name='유동자산')),
+                ('current_liabilities', models.BigIntegerField(blank=True, null=True, verbose_name='유동부채')),
+                ('total_liabilities', models.BigIntegerField(blank=True, null=True, verbose_name='총부채')),
+                ('total_equity', models.BigIntegerField(blank=True, null=True, verbose_name='자본총계')),
+                ('fcf_margin', models.FloatField(default=0, verbose_name='FCF 마진')),
+                ('roe', models.FloatField(default=0, verbose_name='ROE')),
+                ('debt_ratio', models.FloatField(default=0, verbose_name='부채비율')),
+                ('current_ratio', models.FloatField(default=0, verbose_name='유동비율')),
+                ('revenue_growth', models.FloatField(blank=True, null=True, verbose_name='매출 성장률')),
+                ('fcf_growth', models.FloatField(blank=True, null=True, verbose_name='FCF 성장률')),
+                ('ocf_to_net_income', models.FloatField(blank=True, null=True, verbose_name='OCF/순이익')),
+                ('fcf_positive_quarters', models.IntegerField(default=0, verbose_name='FCF 양수 분기 수')),
+                ('calculated_at', models.DateTimeField(auto_now=True, verbose_name='계산 일시')),
+                ('stock', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='indicator_history', to='stocks.stock')),
+            ],
+            options={
+                'verbose_name': '분기별 TTM 지표',
+                'verbose_name_plural': '분기별 TTM 지표',
+                'db_table': 'stock_indicator_history',
+                'indexes': [models.Index(fields=['stock', '-disclosure_year', '-disclosure_quarter'], name='stock_indic_stock_i_29dada_idx'), models.Index(fields=['disclosure_year', 'disclosure_quarter'], name='stock_indic_disclos_7e035a_idx')],
+                'unique_together': {('stock', 'disclosure_year', 'disclosure_quarter')},
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.11 on 2026-10-17 17:41
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stocks', '0005_stockindicatorhistory'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StockScore',
+            fields=[
+                ('stock', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='score', serialize=False, to='stocks.stock')),
+                ('total_score', models.FloatField(verbose_name='종합 점수')),
+                ('grade', models.CharField(choices=[('A+', 'A+'), ('A', 'A'), ('B+', 'B+'), ('B', 'B'), ('C', 'C'), ('D', 'D')], max_length=2, verbose_name='등급')),
+                ('cashflow_score', models.IntegerField(verbose_name='현금흐름 점수')),
+                ('safety_score', models.IntegerField(verbose_name='안전성 점수')),
+                ('growth_score', models.IntegerField(verbose_name='성장성 점수')),
+                ('ttm_period', models.CharField(max_length=20, verbose_name='TTM 기간')),
+                ('calculated_at', models.DateTimeField(auto_now=True, verbose_name='계산 일시')),
+            ],
+            options={
+                'verbose_name': '규칙 기반 점수',
+                'verbose_name_plural': '규칙 기반 점수',
+                'db_table': 'stock_scores',
+                'indexes': [models.Index(fields=['-total_score', 'stock'], name='stock_score_total_s_f73def_idx'), models.Index(fields=['grade', '-total_score', 'stock'], name='stock_score_grade_37ec8b_idx')],
+            },
+        ),
+    ]
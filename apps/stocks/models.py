@@ -129,3 +129,198 @@ class StockPrice(models.Model):
     def __str__(self):
         return f"{self.stock.stock_name} {self.date} {self.close_price}원"
 
+
+
+class StockIndicatorSnapshot(models.Model):
+    """
+    TTM 지표 스냅샷 (종목당 1행)
+    
+    StockFinancialRaw가 변경된 종목만 재계산되며,
+    지표/스크리닝/메이트/점수/비교 API는 이 테이블을 조회
+    """
+    stock = models.OneToOneField(Stock, on_delete=models.CASCADE, related_name='indicator_snapshot')
+    
+    # TTM 기간 및 원본 분기 키
+    ttm_period = models.CharField('TTM 기간', max_length=20)  # "2024Q1-2024Q4"
+    latest_year = models.IntegerField('최근 분기 연도')
+    latest_quarter = models.IntegerField('최근 분기')
+    source_quarters = models.JSONField('TTM 원본 분기', default=list, blank=True)
+    # 예: ["2024Q4", "2024Q3", "2024Q2", "2024Q1"]
+    quarter_count = models.IntegerField('사용 분기 수', default=0)  # 최대 20
+    
+    # TTM
+    ttm_ocf = models.BigIntegerField('TTM OCF', default=0)
+    ttm_fcf = models.BigIntegerField('TTM FCF', default=0)
+    ttm_capex = models.BigIntegerField('TTM CAPEX', default=0)
+    ttm_revenue = models.BigIntegerField('TTM 매출액', default=0)
+    ttm_net_income = models.BigIntegerField('TTM 순이익', default=0)
+    
+    # 최근 분기 재무상태
+    total_assets = models.BigIntegerField('총자산', null=True, blank=True)
+    current_assets = models.BigIntegerField('유동자산', null=True, blank=True)
+    current_liabilities = models.BigIntegerField('유동부채', null=True, blank=True)
+    total_liabilities = models.BigIntegerField('총부채', null=True, blank=True)
+    total_equity = models.BigIntegerField('자본총계', null=True, blank=True)
+    
+    # 지표 (%)
+    fcf_margin = models.FloatField('FCF 마진', default=0)
+    roe = models.FloatField('ROE', default=0)
+    debt_ratio = models.FloatField('부채비율', default=0)
+    current_ratio = models.FloatField('유동비율', default=0)
+    
+    # 성장률 (최근 4분기 vs 전년 동기)
+    revenue_growth = models.FloatField('매출 성장률', null=True, blank=True)
+    fcf_growth = models.FloatField('FCF 성장률', null=True, blank=True)
+    
+    # 현금흐름 품질
+    ocf_to_net_income = models.FloatField('OCF/순이익', null=True, blank=True)
+    fcf_positive_quarters = models.IntegerField('FCF 양수 분기 수', default=0)  # 최근 20분기
+    
+    # 메타데이터
+    source_updated_at = models.DateTimeField('원본 최종 수정일', null=True, blank=True)
+    calculated_at = models.DateTimeField('계산 일시', auto_now=True)
+    
+    class Meta:
+        db_table = 'stock_indicator_snapshots'
+        verbose_name = 'TTM 지표 스냅샷'
+        verbose_name_plural = 'TTM 지표 스냅샷'
+        indexes = [
+            models.Index(fields=['ttm_fcf']),
+            models.Index(fields=['roe']),
+            models.Index(fields=['fcf_margin']),
+            models.Index(fields=['debt_ratio']),
+            models.Index(fields=['revenue_growth']),
+        ]
+    
+    def __str__(self):
+        return f"{self.stock.stock_name} TTM {self.ttm_period}"
+
+
+class StockIndicatorHistory(models.Model):
+    """
+    분기별 시점(point-in-time) TTM 지표 (종목 × 분기)
+    
+    각 분기 말 기준으로 계산한 지표 (그 시점의 롤링 TTM, 전년 동기 대비 성장률,
+    최근 20분기 FCF 양수 분기 수). 재무 데이터 적재 시 종목 단위로 재계산
+    """
+    stock = models.ForeignKey(Stock, on_delete=models.CASCADE, related_name='indicator_history')
+    
+    # 기준 분기
+    disclosure_year = models.IntegerField('기준 연도')
+    disclosure_quarter = models.IntegerField('기준 분기')
+    ttm_period = models.CharField('TTM 기간', max_length=20)  # "2024Q1-2024Q4"
+    quarter_count = models.IntegerField('사용 분기 수', default=0)  # 최대 20
+    
+    # TTM
+    ttm_ocf = models.BigIntegerField('TTM OCF', default=0)
+    ttm_fcf = models.BigIntegerField('TTM FCF', default=0)
+    ttm_capex = models.BigIntegerField('TTM CAPEX', default=0)
+    ttm_revenue = models.BigIntegerField('TTM 매출액', default=0)
+    ttm_net_income = models.BigIntegerField('TTM 순이익', default=0)
+    
+    # 기준 분기 재무상태
+    total_assets = models.BigIntegerField('총자산', null=True, blank=True)
+    current_assets = models.BigIntegerField('유동자산', null=True, blank=True)
+    current_liabilities = models.BigIntegerField('유동부채', null=True, blank=True)
+    total_liabilities = models.BigIntegerField('총부채', null=True, blank=True)
+    total_equity = models.BigIntegerField('자본총계', null=True, blank=True)
+    
+    # 지표 (%)
+    fcf_margin = models.FloatField('FCF 마진', default=0)
+    roe = models.FloatField('ROE', default=0)
+    debt_ratio = models.FloatField('부채비율', default=0)
+    current_ratio = models.FloatField('유동비율', default=0)
+    
+    # 성장률 (TTM vs 전년 동기)
+    revenue_growth = models.FloatField('매출 성장률', null=True, blank=True)
+    fcf_growth = models.FloatField('FCF 성장률', null=True, blank=True)
+    
+    # 현금흐름 품질
+    ocf_to_net_income = models.FloatField('OCF/순이익', null=True, blank=True)
+    fcf_positive_quarters = models.IntegerField('FCF 양수 분기 수', default=0)  # 기준 분기까지 최근 20분기
+    
+    calculated_at = models.DateTimeField('계산 일시', auto_now=True)
+    
+    class Meta:
+        db_table = 'stock_indicator_history'
+        verbose_name = '분기별 TTM 지표'
+        verbose_name_plural = '분기별 TTM 지표'
+        unique_together = ['stock', 'disclosure_year', 'disclosure_quarter']
+        indexes = [
+            models.Index(fields=['stock', '-disclosure_year', '-disclosure_quarter']),
+            models.Index(fields=['disclosure_year', 'disclosure_quarter']),  # 과거 시점 스크리닝
+        ]
+    
+    def __str__(self):
+        return f"{self.stock.stock_name} {self.disclosure_year}Q{self.disclosure_quarter} TTM"
+
+
+class StockScore(models.Model):
+    """
+    규칙 기반 점수 (종목당 1행)
+    
+    StockIndicatorSnapshot 지표를 core.utils.score_engine으로 일괄 채점해 저장
+    점수 리더보드의 등급 필터/정렬을 컬럼 인덱스로 처리
+    """
+    GRADE_CHOICES = [(grade, grade) for grade in ('A+', 'A', 'B+', 'B', 'C', 'D')]
+    
+    stock = models.OneToOneField(Stock, on_delete=models.CASCADE, primary_key=True, related_name='score')
+    
+    # 점수 (0-100)
+    total_score = models.FloatField('종합 점수')
+    grade = models.CharField('등급', max_length=2, choices=GRADE_CHOICES)
+    cashflow_score = models.IntegerField('현금흐름 점수')
+    safety_score = models.IntegerField('안전성 점수')
+    growth_score = models.IntegerField('성장성 점수')
+    
+    # 채점 기준 TTM 기간
+    ttm_period = models.CharField('TTM 기간', max_length=20)
+    
+    calculated_at = models.DateTimeField('계산 일시', auto_now=True)
+    
+    class Meta:
+        db_table = 'stock_scores'
+        verbose_name = '규칙 기반 점수'
+        verbose_name_plural = '규칙 기반 점수'
+        indexes = [
+            models.Index(fields=['-total_score', 'stock']),
+            models.Index(fields=['grade', '-total_score', 'stock']),
+        ]
+    
+    def __str__(self):
+        return f"{self.stock.stock_name} {self.total_score}점 ({self.grade})"
+
+
+class SectorDistribution(models.Model):
+    """
+    섹터/산업별 지표 분포 (분위수 스케치)
+    
+    매일 밤 재계산되며, 종목 지표의 섹터 내 백분위를
+    분위수 배열 이진 탐색으로 조회 (O(log n))
+    """
+    GROUP_CHOICES = [
+        ('sector', '섹터'),
+        ('industry', '산업'),
+    ]
+    
+    group_type = models.CharField('그룹 종류', max_length=20, choices=GROUP_CHOICES)
+    group_name = models.CharField('그룹명', max_length=200)
+    metric = models.CharField('지표', max_length=50)  # roe, fcf_margin, mate_fisher ...
+    
+    count = models.IntegerField('종목 수')
+    quantiles = models.JSONField('분위수', default=list)
+    # 0~100 백분위 지점의 값 (101개, 오름차순)
+    
+    calculated_at = models.DateTimeField('계산 일시', auto_now=True)
+    
+    class Meta:
+        db_table = 'sector_distributions'
+        verbose_name = '섹터 지표 분포'
+        verbose_name_plural = '섹터 지표 분포'
+        unique_together = ['group_type', 'group_name', 'metric']
+        indexes = [
+            models.Index(fields=['group_type', 'group_name']),
+        ]
+    
+    def __str__(self):
+        return f"{self.group_name} {self.metric} (n={self.count})"
@@ -0,0 +1,78 @@
+"""
+종목 서비스 패키지
+"""
+from .indicator_snapshot import (
+    compute_ttm_indicators,
+    refresh_indicator_snapshots,
+    get_indicator_snapshot,
+    get_indicator_snapshots,
+    find_stale_snapshot_stock_ids,
+    snapshot_indicators,
+)
+from .indicator_history import (
+    refresh_indicator_history,
+    get_indicator_history,
+)
+from .ttm_query import fetch_ttm_rows
+from .response_cache import (
+    bump_stock_cache_version,
+    bump_stock_cache_versions,
+    get_response_cache_stats,
+)
+from .sector_distribution import (
+    refresh_sector_distributions,
+    get_stock_percentiles,
+    get_sector_thresholds,
+    get_distribution_version,
+)
+from .mate_score_wide import refresh_mate_score_wide
+from .stock_score import refresh_stock_scores
+from .mate_analysis import recompute_mate_analyses, llm_snapshot_queryset, llm_indicators
+from .proper_price import refresh_proper_prices, refresh_gap_ratios
+from .valuation_distribution import refresh_valuation_distributions
+from .stale_analysis import find_stale_analyses, recompute_stale_analyses
+from .search_index import (
+    StockSearchIndex,
+    get_stock_search_index,
+    search_stocks,
+)
+from .columnar_snapshot import (
+    FundamentalsSnapshot,
+    publish_fundamentals_snapshot,
+    get_fundamentals_snapshot,
+)
+
+__all__ = [
+    'compute_ttm_indicators',
+    'refresh_indicator_snapshots',
+    'get_indicator_snapshot',
+    'get_indicator_snapshots',
+    'find_stale_snapshot_stock_ids',
+    'snapshot_indicators',
+    'refresh_indicator_history',
+    'get_indicator_history',
+    'fetch_ttm_rows',
+    'bump_stock_cache_version',
+    'bump_stock_cache_versions',
+    'get_response_cache_stats',
+    'refresh_sector_distributions',
+    'get_stock_percentiles',
+    'get_sector_thresholds',
+    'get_distribution_version',
+    'refresh_mate_score_wide',
+    'refresh_stock_scores',
+    'recompute_mate_analyses',
+    'llm_snapshot_queryset',
+    'llm_indicators',
+    'refresh_proper_prices',
+    'refresh_gap_ratios',
+    'refresh_valuation_distributions',
+    'find_stale_analyses',
+    'recompute_stale_analyses',
+    'StockSearchIndex',
+    'get_stock_search_index',
+    'search_stocks',
+    'FundamentalsSnapshot',
+    'publish_fundamentals_snapshot',
+    'get_fundamentals_snapshot',
+]
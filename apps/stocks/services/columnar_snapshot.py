@@ -0,0 +1,304 @@
+"""
+재무 컬럼 스냅샷 (.npy + mmap)
+
+StockFinancialRaw(EDGAR) 전체, 종목별 최신 주가를
+불변 .npy 파일 묶음으로 발행하고, 각 프로세스(gunicorn/Celery 워커)는
+읽기 전용 mmap으로 열어 같은 페이지 캐시를 공유
+(메이트 점수는 자주 바뀌므로 스냅샷에 넣지 않고 MateScoreWide에서 조회)
+
+manifest에 발행 시점의 원본 데이터 버전(source_data_version)을 기록해
+발행 후 지표 스냅샷이 바뀌면 읽는 쪽이 DB로 대체할 수 있게 함
+- 데이터 버전: Django 캐시 카운터 (지표 스냅샷 갱신 시 mark_fundamentals_changed로 증가,
+  요청마다 집계 쿼리 없이 캐시 조회 1회로 비교)
+- 변경 후 PUBLISH_DEBOUNCE초 뒤 재발행 작업을 한 번만 예약 (그 사이 변경은 한 번에 반영)
+- 야간 stocks.publish_fundamentals_snapshot 작업으로도 재발행
+
+디렉터리 구조:
+    FUNDAMENTALS_SNAPSHOT_DIR/
+        CURRENT                 # 현재 버전 이름 (원자적 교체)
+        v<버전>/manifest.json
+        v<버전>/<컬럼>.npy
+"""
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import OuterRef, Subquery
+
+from apps.stocks.models import Stock, StockFinancialRaw, StockPrice
+
+logger = logging.getLogger(__name__)
+
+# 분기 재무 컬럼 (float64, 결측은 NaN)
+FINANCIAL_COLUMNS = (
+    'revenue',
+    'operating_profit',
+    'net_income',
+    'ocf',
+    'icf',
+    'fcf',
+    'capex',
+    'total_assets',
+    'current_assets',
+    'current_liabilities',
+    'total_liabilities',
+    'total_equity',
+    'dividend',
+)
+
+# 보관할 이전 버전 수 (교체 직후에도 기존 mmap을 연 워커가 있을 수 있음)
+KEEP_VERSIONS = 2
+
+CURRENT_FILE = 'CURRENT'
+
+# 원본 데이터 버전 카운터 / 재발행 예약 표시 (Django 캐시, 운영은 프로세스 간 공유되는 Redis)
+DATA_VERSION_KEY = 'fundamentals_snapshot:data_version'
+PUBLISH_SCHEDULED_KEY = 'fundamentals_snapshot:publish_scheduled'
+
+# 변경 후 재발행까지 대기 시간 (초, 연속 변경을 한 번의 발행으로 묶음)
+PUBLISH_DEBOUNCE = 60
+
+
+def snapshot_root() -> Path:
+    return Path(settings.FUNDAMENTALS_SNAPSHOT_DIR)
+
+
+class FundamentalsSnapshot:
+    """
+    읽기 전용 컬럼 스냅샷
+
+    - stock_ids: 정렬된 종목 ID (n)
+    - offsets: 종목 i의 분기 행 범위 = offsets[i]:offsets[i + 1] (n + 1)
+    - 분기 행은 종목별 최신순 (disclosure_year, disclosure_quarter 내림차순)
+    - latest_close / latest_price_date: 종목별 최신 종가 (없으면 NaN / 0)
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.manifest = json.loads((path / 'manifest.json').read_text())
+        self.version = self.manifest['version']
+        # 발행 시점 원본 데이터 버전 (이전 형식 스냅샷은 None → 항상 오래된 것으로 취급)
+        self.data_version = self.manifest.get('data_version')
+        self.arrays = {
+            name: np.load(path / f'{name}.npy', mmap_mode='r')
+            for name in self.manifest['arrays']
+        }
+
+    def __len__(self):
+        return len(self.arrays['stock_ids'])
+
+    def __getitem__(self, name) -> np.ndarray:
+        return self.arrays[name]
+
+    @property
+    def stock_ids(self) -> np.ndarray:
+        return self.arrays['stock_ids']
+
+    def position(self, stock_id: int) -> Optional[int]:
+        """종목 ID → 행 번호 (이진 탐색, 없으면 None)"""
+        i = int(np.searchsorted(self.stock_ids, stock_id))
+        if i < len(self) and self.stock_ids[i] == stock_id:
+            return i
+        return None
+
+    def quarters(self, stock_id: int) -> Optional[Dict[str, np.ndarray]]:
+        """종목의 분기 컬럼 (mmap 뷰, 최신순)"""
+        i = self.position(stock_id)
+        if i is None:
+            return None
+        rows = slice(int(self['offsets'][i]), int(self['offsets'][i + 1]))
+        return {
+            name: self[name][rows]
+            for name in ('disclosure_year', 'disclosure_quarter') + FINANCIAL_COLUMNS
+        }
+
+
+def _write_arrays(path: Path, arrays: Dict[str, np.ndarray], manifest: Dict):
+    for name, values in arrays.items():
+        np.save(path / f'{name}.npy', values, allow_pickle=False)
+    manifest['arrays'] = list(arrays)
+    (path / 'manifest.json').write_text(json.dumps(manifest))
+
+
+def source_data_version() -> int:
+    """
+    스냅샷 원본 데이터 버전 (지표 스냅샷이 바뀔 때마다 증가하는 캐시 카운터)
+
+    재무 데이터가 바뀌면 지표 스냅샷이 재계산되므로 재무 변경도 반영됨
+    카운터가 없으면(캐시 축출/초기화) 시각 기반 새 값 → 발행된 스냅샷과 달라지므로 재발행 예약
+    """
+    version = cache.get(DATA_VERSION_KEY)
+    if version is None:
+        cache.add(DATA_VERSION_KEY, int(time.time() * 1000), timeout=None)
+        version = cache.get(DATA_VERSION_KEY)
+        schedule_snapshot_publish()
+    return version
+
+
+def schedule_snapshot_publish():
+    """PUBLISH_DEBOUNCE초 뒤 재발행 (이미 예약되어 있으면 무시)"""
+    if not cache.add(PUBLISH_SCHEDULED_KEY, 1, timeout=PUBLISH_DEBOUNCE):
+        return
+
+    from apps.stocks.tasks import publish_fundamentals_snapshot_task
+
+    try:
+        publish_fundamentals_snapshot_task.apply_async(countdown=PUBLISH_DEBOUNCE)
+    except Exception as e:
+        # 예약 실패 시 야간 발행 전까지 DB 경로 사용
+        logger.warning(f"재무 컬럼 스냅샷 재발행 예약 실패: {e}")
+        cache.delete(PUBLISH_SCHEDULED_KEY)
+
+
+def mark_fundamentals_changed():
+    """
+    지표 스냅샷 변경 표시 (커밋 후 데이터 버전 증가 + 재발행 예약)
+
+    발행된 스냅샷은 다음 발행 전까지 오래된 것으로 취급됨
+    """
+    def changed():
+        try:
+            cache.incr(DATA_VERSION_KEY)
+        except ValueError:
+            cache.set(DATA_VERSION_KEY, int(time.time() * 1000), timeout=None)
+        schedule_snapshot_publish()
+
+    transaction.on_commit(changed)
+
+
+def build_snapshot_arrays() -> Dict[str, np.ndarray]:
+    """
+    DB → 컬럼 배열 (종목당 분기 행은 최신순)
+    """
+    rows = list(StockFinancialRaw.objects.filter(
+        data_source='EDGAR',
+        stock__country='us',
+        stock__is_active=True,
+    ).order_by(
+        'stock_id', '-disclosure_year', '-disclosure_quarter'
+    ).values_list('stock_id', 'disclosure_year', 'disclosure_quarter', *FINANCIAL_COLUMNS))
+
+    data = np.array(rows, dtype=float).reshape(len(rows), 3 + len(FINANCIAL_COLUMNS))  # None → NaN
+    row_stock_ids = data[:, 0].astype(np.int64)
+
+    starts = np.flatnonzero(np.r_[True, row_stock_ids[1:] != row_stock_ids[:-1]])[:len(rows)]
+    stock_ids = row_stock_ids[starts]
+    offsets = np.r_[starts, len(rows)].astype(np.int64)
+
+    arrays = {
+        'stock_ids': stock_ids,
+        'offsets': offsets,
+        'disclosure_year': data[:, 1].astype(np.int16),
+        'disclosure_quarter': data[:, 2].astype(np.int8),
+    }
+    for i, name in enumerate(FINANCIAL_COLUMNS, start=3):
+        arrays[name] = np.ascontiguousarray(data[:, i])
+
+    # 종목별 최신 종가 ((stock, date) 인덱스 사용)
+    latest_prices = StockPrice.objects.filter(stock_id=OuterRef('pk')).order_by('-date')
+    prices = {
+        stock_id: (close_price, price_date)
+        for stock_id, close_price, price_date in Stock.objects.filter(
+            id__in=stock_ids.tolist()
+        ).annotate(
+            latest_close=Subquery(latest_prices.values('close_price')[:1]),
+            latest_date=Subquery(latest_prices.values('date')[:1]),
+        ).values_list('id', 'latest_close', 'latest_date')
+    }
+    latest_close = np.full(len(stock_ids), np.nan)
+    latest_price_date = np.zeros(len(stock_ids), dtype=np.int32)  # date.toordinal(), 없으면 0
+    for i, stock_id in enumerate(stock_ids.tolist()):
+        close_price, price_date = prices.get(stock_id, (None, None))
+        if close_price is not None:
+            latest_close[i] = float(close_price)
+            latest_price_date[i] = price_date.toordinal()
+    arrays['latest_close'] = latest_close
+    arrays['latest_price_date'] = latest_price_date
+
+    return arrays
+
+
+def publish_fundamentals_snapshot() -> FundamentalsSnapshot:
+    """
+    새 스냅샷 버전 발행
+
+    임시 디렉터리에 쓴 뒤 rename → CURRENT 파일을 os.replace로 교체
+    (읽는 쪽은 항상 완성된 버전만 보게 됨)
+    """
+    root = snapshot_root()
+    root.mkdir(parents=True, exist_ok=True)
+
+    version = datetime.now().strftime('%Y%m%d%H%M%S%f') + f'-{os.getpid()}'
+    # 배열보다 먼저 조회 (적재 중 바뀐 데이터는 다음 비교에서 더 새것으로 보임)
+    data_version = source_data_version()
+    arrays = build_snapshot_arrays()
+
+    staging = Path(tempfile.mkdtemp(prefix='.staging-', dir=root))
+    try:
+        _write_arrays(staging, arrays, {
+            'version': version,
+            'data_version': data_version,
+            'financial_columns': list(FINANCIAL_COLUMNS),
+            'stock_count': len(arrays['stock_ids']),
+        })
+        target = root / f'v{version}'
+        os.rename(staging, target)
+    except Exception:
+        shutil.rmtree(staging, ignore_errors=True)
+        raise
+
+    pointer = root / f'.{CURRENT_FILE}.{os.getpid()}'
+    pointer.write_text(target.name)
+    os.replace(pointer, root / CURRENT_FILE)
+
+    _remove_old_versions(root, keep=target.name)
+    logger.info(f"재무 컬럼 스냅샷 발행: {target.name} ({len(arrays['stock_ids'])}개 종목)")
+
+    return FundamentalsSnapshot(target)
+
+
+def _remove_old_versions(root: Path, keep: str):
+    """
+    오래된 버전 삭제 (최근 KEEP_VERSIONS개 보관)
+
+    이미 mmap으로 연 프로세스는 삭제 후에도 기존 페이지를 계속 사용
+    """
+    versions = sorted(p for p in root.glob('v*') if p.is_dir() and p.name != keep)
+    for path in versions[:max(len(versions) - (KEEP_VERSIONS - 1), 0)]:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+# 프로세스별 현재 스냅샷 (CURRENT가 바뀌면 교체)
+_snapshot_lock = threading.Lock()
+_current = {'name': None, 'snapshot': None}
+
+
+def get_fundamentals_snapshot() -> Optional[FundamentalsSnapshot]:
+    """
+    현재 발행된 스냅샷 (없으면 None)
+    """
+    try:
+        name = (snapshot_root() / CURRENT_FILE).read_text().strip()
+    except FileNotFoundError:
+        return None
+
+    with _snapshot_lock:
+        if _current['name'] != name:
+            try:
+                _current['snapshot'] = FundamentalsSnapshot(snapshot_root() / name)
+                _current['name'] = name
+            except (FileNotFoundError, ValueError) as e:
+                logger.warning(f"재무 컬럼 스냅샷 로드 실패 ({name}): {e}")
+                return _current['snapshot']
+        return _current['snapshot']
@@ -0,0 +1,83 @@
+"""
+분기별 시점(point-in-time) TTM 지표 서비스
+
+종목의 전체 분기 재무 데이터(StockFinancialRaw, EDGAR)를 한 번에 조회해
+각 분기 말 기준 TTM 지표를 계산하고 StockIndicatorHistory에 저장
+
+- 차트: 분기별 FCF/ROE 추이를 한 번의 인덱스 조회로 반환
+- 백테스트: 특정 분기 시점의 지표로 과거 스크리닝
+"""
+from typing import Dict, Iterable, List, Optional
+
+from django.db import transaction
+
+from apps.stocks.models import StockIndicatorHistory
+from core.utils.indicator_engine import (
+    compute_ttm_indicators,
+    fetch_quarters_bulk,
+    summarize_quarter_history,
+)
+
+# 스냅샷 전용 필드 (히스토리에는 기준 분기 컬럼으로 저장)
+SNAPSHOT_ONLY_FIELDS = ('latest_year', 'latest_quarter', 'source_quarters', 'source_updated_at')
+
+
+def build_indicator_history(quarters) -> List[Dict]:
+    """
+    분기 데이터 → 분기별 지표 (과거 → 최신 순, 4분기 미만 시점 제외)
+    """
+    history = []
+    for ttm in summarize_quarter_history(quarters):
+        data = compute_ttm_indicators(ttm)
+        if data is None:
+            continue
+
+        data['disclosure_year'] = data['latest_year']
+        data['disclosure_quarter'] = data['latest_quarter']
+        for field in SNAPSHOT_ONLY_FIELDS:
+            data.pop(field, None)
+        history.append(data)
+    return history
+
+
+def refresh_indicator_history(stock_ids: Iterable[int]) -> int:
+    """
+    지정한 종목들의 분기별 지표 재계산 (분기 조회 1회 + 종목별 교체 저장)
+
+    재무 데이터가 정정되면 이후 분기의 TTM/성장률도 바뀌므로
+    종목 단위로 전체 분기를 다시 계산해 교체
+
+    Returns:
+        저장된 행 수
+    """
+    stock_ids = set(stock_ids)
+    if not stock_ids:
+        return 0
+
+    quarters_by_stock = fetch_quarters_bulk(stock_ids, limit=None)
+
+    rows = []
+    for stock_id in stock_ids:
+        for data in build_indicator_history(quarters_by_stock.get(stock_id, [])):
+            rows.append(StockIndicatorHistory(stock_id=stock_id, **data))
+
+    with transaction.atomic():
+        StockIndicatorHistory.objects.filter(stock_id__in=stock_ids).delete()
+        StockIndicatorHistory.objects.bulk_create(rows, batch_size=1000)
+
+    return len(rows)
+
+
+def get_indicator_history(stock_id: int, limit: Optional[int] = None) -> List[StockIndicatorHistory]:
+    """
+    종목의 분기별 지표 (과거 → 최신 순)
+
+    Args:
+        limit: 최근 N분기만 (None이면 전체)
+    """
+    queryset = StockIndicatorHistory.objects.filter(stock_id=stock_id).order_by(
+        '-disclosure_year', '-disclosure_quarter'
+    )
+    if limit is not None:
+        queryset = queryset[:limit]
+    return list(queryset)[::-1]
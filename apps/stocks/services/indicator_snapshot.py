@@ -0,0 +1,161 @@
+"""
+TTM 지표 스냅샷 서비스
+
+StockFinancialRaw(EDGAR) 최근 20분기 TTM 집계(ttm_query)로
+지표(core.utils.indicator_engine)를 계산해
+StockIndicatorSnapshot에 저장하고, API는 스냅샷만 조회
+"""
+import logging
+from typing import Dict, Iterable, List, Optional
+
+from itertools import groupby
+
+from apps.stocks.models import Stock, StockFinancialRaw, StockIndicatorSnapshot
+from apps.stocks.services.ttm_query import fetch_ttm_rows
+from apps.stocks.services.indicator_history import refresh_indicator_history
+from apps.stocks.services.stock_score import refresh_stock_scores
+from core.utils.indicator_engine import HISTORY_QUARTERS, compute_ttm_indicators
+from apps.stocks.services.response_cache import bump_stock_cache_versions
+from apps.stocks.services.columnar_snapshot import mark_fundamentals_changed
+
+logger = logging.getLogger(__name__)
+
+
+def refresh_indicator_snapshots(stock_ids: Iterable[int]) -> int:
+    """
+    지정한 종목들의 스냅샷 재계산 (TTM 집계는 한 번의 쿼리)
+    
+    4분기 미만으로 줄어든 종목의 스냅샷은 삭제하고,
+    분기별 지표(StockIndicatorHistory)와 규칙 기반 점수(StockScore)도 함께 재계산한 뒤
+    대상 종목의 응답 캐시 버전과 재무 컬럼 스냅샷 데이터 버전을 올림
+    
+    Returns:
+        갱신된 스냅샷 수
+    """
+    stock_ids = set(stock_ids)
+    ttm_rows = fetch_ttm_rows(stock_ids)
+    
+    refreshed = 0
+    insufficient_ids = []
+    
+    for stock_id in stock_ids:
+        data = compute_ttm_indicators(ttm_rows.get(stock_id))
+        
+        if data is None:
+            insufficient_ids.append(stock_id)
+            continue
+        
+        StockIndicatorSnapshot.objects.update_or_create(stock_id=stock_id, defaults=data)
+        refreshed += 1
+    
+    if insufficient_ids:
+        StockIndicatorSnapshot.objects.filter(stock_id__in=insufficient_ids).delete()
+    
+    refresh_indicator_history(stock_ids)
+    refresh_stock_scores(stock_ids)
+    
+    bump_stock_cache_versions(stock_ids)
+    mark_fundamentals_changed()
+    
+    return refreshed
+
+
+def find_stale_snapshot_stock_ids() -> List[int]:
+    """
+    스냅샷 이후 재무 데이터가 변경된 종목 ID
+    
+    bulk_create 등 시그널을 우회한 적재 후 증분 갱신에 사용
+    스냅샷 source_updated_at과 같은 범위 (최근 HISTORY_QUARTERS분기)의 최종 수정 시각과 비교
+    (그보다 오래된 분기 수정은 스냅샷에 영향이 없음)
+    """
+    rows = StockFinancialRaw.objects.filter(
+        data_source='EDGAR'
+    ).order_by(
+        'stock_id', '-disclosure_year', '-disclosure_quarter'
+    ).values_list('stock_id', 'updated_at')
+    
+    snapshot_updated = dict(
+        StockIndicatorSnapshot.objects.values_list('stock_id', 'source_updated_at')
+    )
+    
+    stale_ids = []
+    for stock_id, group in groupby(rows.iterator(), key=lambda row: row[0]):
+        recent = [updated_at for _, updated_at in group][:HISTORY_QUARTERS]
+        has_snapshot = stock_id in snapshot_updated
+        snapshot_at = snapshot_updated.pop(stock_id, None)
+        
+        # 4분기 미만 종목은 스냅샷 대상 아님
+        if not has_snapshot and len(recent) < 4:
+            continue
+        
+        if snapshot_at is None or max(recent) > snapshot_at:
+            stale_ids.append(stock_id)
+    
+    # 재무 데이터가 사라진 종목 (스냅샷 삭제 대상)
+    stale_ids.extend(snapshot_updated.keys())
+    
+    return stale_ids
+
+
+def get_indicator_snapshot(stock: Stock) -> Optional[StockIndicatorSnapshot]:
+    """
+    종목 스냅샷 조회 (없으면 즉시 계산 후 저장)
+    """
+    snapshot = StockIndicatorSnapshot.objects.filter(stock_id=stock.id).first()
+    if snapshot is None and refresh_indicator_snapshots([stock.id]):
+        snapshot = StockIndicatorSnapshot.objects.filter(stock_id=stock.id).first()
+    return snapshot
+
+
+def get_indicator_snapshots(stock_ids: Iterable[int]) -> Dict[int, StockIndicatorSnapshot]:
+    """
+    여러 종목 스냅샷 일괄 조회 (없는 종목만 계산 후 저장)
+    
+    Returns:
+        {stock_id: StockIndicatorSnapshot}
+    """
+    stock_ids = set(stock_ids)
+    snapshots = StockIndicatorSnapshot.objects.in_bulk(stock_ids, field_name='stock_id')
+    
+    missing = stock_ids - set(snapshots)
+    if missing and refresh_indicator_snapshots(missing):
+        snapshots.update(StockIndicatorSnapshot.objects.in_bulk(missing, field_name='stock_id'))
+    
+    return snapshots
+
+
+def snapshot_indicators(snapshot: StockIndicatorSnapshot) -> Dict:
+    """
+    스냅샷 → 지표 딕셔너리 (메이트/밸류에이션 엔진 입력 형식)
+    """
+    return {
+        'ttm_period': snapshot.ttm_period,
+        
+        # TTM
+        'ttm_ocf': snapshot.ttm_ocf,
+        'ttm_fcf': snapshot.ttm_fcf,
+        'ttm_capex': snapshot.ttm_capex,
+        'ttm_revenue': snapshot.ttm_revenue,
+        'ttm_net_income': snapshot.ttm_net_income,
+        
+        # 재무상태
+        'total_assets': snapshot.total_assets,
+        'current_assets': snapshot.current_assets,
+        'current_liabilities': snapshot.current_liabilities,
+        'total_liabilities': snapshot.total_liabilities or 0,
+        'total_equity': snapshot.total_equity,
+        
+        # 지표
+        'fcf_margin': snapshot.fcf_margin,
+        'roe': snapshot.roe,
+        'debt_ratio': snapshot.debt_ratio,
+        'current_ratio': snapshot.current_ratio,
+        
+        # 성장률
+        'revenue_growth': snapshot.revenue_growth,
+        'fcf_growth': snapshot.fcf_growth,
+        
+        # 품질
+        'ocf_to_net_income': snapshot.ocf_to_net_income,
+        'fcf_positive_quarters': snapshot.fcf_positive_quarters,
+    }
@@ -0,0 +1,141 @@
+"""
+메이트 분석 일괄 재계산
+
+TTM 지표 스냅샷을 청크 단위로 조회해 4개 메이트 점수를 지표 열 배열로 한 번에 계산하고
+(core.utils.mate_engines.analyze_with_all_mates_bulk)
+MateAnalysis를 bulk_create(update_conflicts=True)로 청크마다 upsert
+
+규칙 엔진 버전(rule-)이 아닌 분석 (LLM 분석 등)은 덮어쓰지 않음
+"""
+from typing import Dict, Iterable, Optional
+
+from apps.analysis.models import MateAnalysis
+from apps.stocks.models import StockIndicatorSnapshot
+from apps.stocks.services.mate_score_wide import refresh_mate_score_wide
+from apps.stocks.services.response_cache import bump_stock_cache_versions
+from core.utils.mate_engines import ENGINE_VERSION, MATE_FIELDS, VERSION_PREFIX, analyze_with_all_mates_bulk
+
+# upsert 청크 크기 (종목 수)
+DEFAULT_CHUNK_SIZE = 1000
+
+
+def _save_chunk(chunk) -> int:
+    results = analyze_with_all_mates_bulk([indicators for _, indicators in chunk])
+
+    # 다른 작성자(LLM 등) 소유 (종목, 메이트)
+    foreign = set(MateAnalysis.objects.filter(
+        stock_id__in=[stock_id for stock_id, _ in chunk]
+    ).exclude(
+        analysis_version__startswith=VERSION_PREFIX
+    ).values_list('stock_id', 'mate_type'))
+
+    analyses = [
+        MateAnalysis(
+            stock_id=stock_id,
+            mate_type=mate_id,
+            score=analysis['score'],
+            summary=analysis['summary'],
+            reason='\n'.join(analysis.get('reasons', [])),
+            caution='\n'.join(analysis.get('cautions', [])),
+            score_detail=analysis.get('details', {}),
+            analysis_version=ENGINE_VERSION,
+        )
+        for (stock_id, _), mate_results in zip(chunk, results)
+        for mate_id, analysis in mate_results.items()
+        if (stock_id, mate_id) not in foreign
+    ]
+
+    MateAnalysis.objects.bulk_create(
+        analyses,
+        update_conflicts=True,
+        unique_fields=['stock', 'mate_type'],
+        update_fields=['score', 'summary', 'reason', 'caution', 'score_detail', 'analysis_version', 'analyzed_at'],
+    )
+    return len(analyses)
+
+
+def mate_snapshot_queryset():
+    """메이트 분석 대상 스냅샷 (활성 미국 종목, 자기자본 있음)"""
+    return StockIndicatorSnapshot.objects.filter(
+        stock__country='us',
+        stock__is_active=True,
+        total_equity__isnull=False,
+    ).exclude(total_equity=0)
+
+
+def llm_snapshot_queryset():
+    """LLM 메이트 분석 대상 스냅샷 (총자산 있음, 종목 함께 조회)"""
+    return mate_snapshot_queryset().exclude(
+        total_assets__isnull=True
+    ).exclude(
+        total_assets=0
+    ).select_related('stock')
+
+
+def llm_indicators(snapshot: StockIndicatorSnapshot) -> Dict:
+    """스냅샷 → LLM 메이트 프롬프트 입력 (core.utils.mate_prompt)"""
+    return {
+        'stock_name': snapshot.stock.stock_name,
+        'stock_code': snapshot.stock.stock_code,
+
+        # 현금흐름
+        'ocf': snapshot.ttm_ocf,
+        'fcf': snapshot.ttm_fcf,
+        'net_income': snapshot.ttm_net_income,
+        'revenue': snapshot.ttm_revenue,
+
+        # 재무상태
+        'total_assets': snapshot.total_assets,
+        'total_liabilities': snapshot.total_liabilities or 0,
+        'total_equity': snapshot.total_equity,
+        'current_assets': snapshot.current_assets or 0,
+        'current_liabilities': snapshot.current_liabilities or 0,
+
+        # 비율
+        'roe': snapshot.roe,
+        'debt_ratio': snapshot.debt_ratio,
+        'current_ratio': snapshot.current_ratio,
+        'fcf_margin': snapshot.fcf_margin,
+        'revenue_growth': snapshot.revenue_growth,
+    }
+
+
+def recompute_mate_analyses(stock_ids: Optional[Iterable[int]] = None,
+                            chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+    """
+    메이트 분석 재계산 (청크마다 스냅샷 조회 1회 + 채점 1회 + upsert 1회)
+
+    자기자본이 없는 종목은 지표를 신뢰할 수 없어 제외
+    bulk_create는 시그널을 보내지 않으므로 메이트 점수 테이블과 응답 캐시를 직접 갱신
+
+    Args:
+        stock_ids: 대상 종목 (None이면 활성 미국 종목 전체)
+        chunk_size: upsert 청크 크기 (종목 수)
+
+    Returns:
+        분석된 종목 수
+    """
+    snapshots = mate_snapshot_queryset()
+    if stock_ids is not None:
+        stock_ids = set(stock_ids)
+        if not stock_ids:
+            return 0
+        snapshots = snapshots.filter(stock_id__in=stock_ids)
+
+    analyzed_ids = []
+    chunk = []
+    for row in snapshots.order_by('stock_id').values_list('stock_id', *MATE_FIELDS).iterator(chunk_size=chunk_size):
+        chunk.append((row[0], dict(zip(MATE_FIELDS, row[1:]))))
+        if len(chunk) >= chunk_size:
+            _save_chunk(chunk)
+            analyzed_ids.extend(stock_id for stock_id, _ in chunk)
+            chunk = []
+    if chunk:
+        _save_chunk(chunk)
+        analyzed_ids.extend(stock_id for stock_id, _ in chunk)
+
+    if analyzed_ids:
+        refresh_mate_score_wide(analyzed_ids)
+        bump_stock_cache_versions(analyzed_ids)
+
+    return len(analyzed_ids)
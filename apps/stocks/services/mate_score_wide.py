@@ -0,0 +1,63 @@
+"""
+종목별 메이트 점수 테이블 (MateScoreWide) 동기화
+
+MateAnalysis(종목 × 메이트 행)를 종목당 1행으로 펼쳐
+메이트별 점수 / 평균 / 최저 점수 컬럼에 저장
+"""
+from typing import Iterable, Optional
+
+from apps.analysis.models import MateAnalysis, MateScoreWide
+
+# 펼치는 메이트 (MateScoreWide 컬럼)
+WIDE_MATE_TYPES = ('benjamin', 'fisher', 'greenblatt', 'lynch')
+
+
+def refresh_mate_score_wide(stock_ids: Optional[Iterable[int]] = None) -> int:
+    """
+    메이트 점수 테이블 재계산 (조회 1회 + upsert 1회)
+
+    Args:
+        stock_ids: 대상 종목 (None이면 전체)
+
+    Returns:
+        저장된 행 수
+    """
+    analyses = MateAnalysis.objects.filter(mate_type__in=WIDE_MATE_TYPES)
+    if stock_ids is not None:
+        stock_ids = set(stock_ids)
+        if not stock_ids:
+            return 0
+        analyses = analyses.filter(stock_id__in=stock_ids)
+
+    scores = {}
+    for stock_id, mate_type, score in analyses.values_list('stock_id', 'mate_type', 'score'):
+        scores.setdefault(stock_id, {})[mate_type] = score
+
+    rows = []
+    for stock_id, mate_scores in scores.items():
+        values = list(mate_scores.values())
+        rows.append(MateScoreWide(
+            stock_id=stock_id,
+            **{mate_type: mate_scores.get(mate_type) for mate_type in WIDE_MATE_TYPES},
+            avg_score=sum(values) / len(values),
+            min_score=min(values),
+            mate_count=len(values),
+        ))
+
+    MateScoreWide.objects.bulk_create(
+        rows,
+        batch_size=1000,
+        update_conflicts=True,
+        unique_fields=['stock'],
+        update_fields=[*WIDE_MATE_TYPES, 'avg_score', 'min_score', 'mate_count', 'updated_at'],
+    )
+
+    # 분석이 모두 사라진 종목
+    stale = MateScoreWide.objects.exclude(
+        stock_id__in=MateAnalysis.objects.filter(mate_type__in=WIDE_MATE_TYPES).values('stock_id')
+    )
+    if stock_ids is not None:
+        stale = stale.filter(stock_id__in=stock_ids)
+    stale.delete()
+
+    return len(rows)
@@ -0,0 +1,137 @@
+"""
+메이트별 적정가 (ProperPrice) 일괄 계산
+
+- refresh_proper_prices: 재무/발행주식수/엔진 버전이 바뀐 종목의 적정가 전체 재계산
+- refresh_gap_ratios: 주가만 바뀐 종목은 저장된 적정가로 현재가/괴리율만 갱신
+
+종목마다 최신 주가/스냅샷을 한 번의 쿼리로 조회하고 bulk upsert/update로 저장
+"""
+from decimal import Decimal
+from typing import Dict, Iterable, Tuple
+
+from django.db.models import OuterRef, Subquery
+
+from apps.analysis.models import ProperPrice
+from apps.stocks.models import Stock, StockIndicatorSnapshot, StockPrice
+from core.utils.valuation_engine import ENGINE_VERSION, calculate_all_mates_proper_price, calculate_gap_ratio
+
+# 발행주식수가 없을 때 가정 (10억주)
+DEFAULT_SHARES_OUTSTANDING = 1000000000
+
+# ProperPrice.gap_ratio 저장 범위 (DecimalField max_digits=5, decimal_places=2)
+GAP_RATIO_LIMIT = Decimal('999.99')
+
+
+def effective_shares(shares_outstanding) -> int:
+    return shares_outstanding if shares_outstanding else DEFAULT_SHARES_OUTSTANDING
+
+
+def valuation_indicators(snapshot: StockIndicatorSnapshot) -> Dict:
+    """적정가 계산에 사용하는 지표 (스냅샷)"""
+    return {
+        'ttm_fcf': snapshot.ttm_fcf,
+        'ttm_net_income': snapshot.ttm_net_income,
+        'total_equity': snapshot.total_equity or 0,
+        'roe': snapshot.roe or 0,
+        'revenue_growth': snapshot.revenue_growth or 0,
+    }
+
+
+def clamp_gap_ratio(gap_ratio: Decimal) -> Decimal:
+    return max(-GAP_RATIO_LIMIT, min(GAP_RATIO_LIMIT, gap_ratio))
+
+
+def get_latest_prices(stock_ids: Iterable[int]) -> Dict[int, Tuple]:
+    """
+    종목별 최신 종가 (한 번의 쿼리)
+
+    Returns:
+        {stock_id: (date, close_price)}
+    """
+    latest_date = StockPrice.objects.filter(stock_id=OuterRef('stock_id')).order_by('-date').values('date')[:1]
+    rows = StockPrice.objects.filter(
+        stock_id__in=set(stock_ids),
+        date=Subquery(latest_date),
+    ).values_list('stock_id', 'date', 'close_price')
+    return {stock_id: (date, close_price) for stock_id, date, close_price in rows}
+
+
+def refresh_proper_prices(stock_ids: Iterable[int]) -> int:
+    """
+    적정가 전체 재계산 (스냅샷/주가/발행주식수 조회 + upsert 1회)
+
+    스냅샷이나 주가가 없는 종목은 건너뜀
+
+    Returns:
+        계산된 종목 수
+    """
+    stock_ids = set(stock_ids)
+    if not stock_ids:
+        return 0
+
+    snapshots = {
+        snapshot.stock_id: snapshot
+        for snapshot in StockIndicatorSnapshot.objects.filter(stock_id__in=stock_ids)
+    }
+    prices = get_latest_prices(snapshots)
+    shares = dict(Stock.objects.filter(id__in=prices).values_list('id', 'shares_outstanding'))
+
+    rows = []
+    for stock_id, (price_date, close_price) in prices.items():
+        current_price = float(close_price)
+        shares_outstanding = effective_shares(shares.get(stock_id))
+
+        valuations = calculate_all_mates_proper_price(
+            valuation_indicators(snapshots[stock_id]), current_price, shares_outstanding
+        )
+        for mate_type, valuation in valuations.items():
+            rows.append(ProperPrice(
+                stock_id=stock_id,
+                mate_type=mate_type,
+                proper_price=valuation['proper_price'],
+                current_price=Decimal(str(current_price)),
+                gap_ratio=clamp_gap_ratio(valuation['gap_ratio']),
+                calculation_method=valuation['method'],
+                price_date=price_date,
+                shares_outstanding=shares_outstanding,
+                analysis_version=ENGINE_VERSION,
+            ))
+
+    ProperPrice.objects.bulk_create(
+        rows,
+        batch_size=1000,
+        update_conflicts=True,
+        unique_fields=['stock', 'mate_type'],
+        update_fields=[
+            'proper_price', 'current_price', 'gap_ratio', 'calculation_method',
+            'price_date', 'shares_outstanding', 'analysis_version', 'calculated_at',
+        ],
+    )
+    return len(prices)
+
+
+def refresh_gap_ratios(stock_ids: Iterable[int]) -> int:
+    """
+    주가 변경 반영 (적정가는 그대로, 현재가/괴리율/기준일만 bulk_update)
+
+    Returns:
+        갱신된 종목 수
+    """
+    stock_ids = set(stock_ids)
+    if not stock_ids:
+        return 0
+
+    prices = get_latest_prices(stock_ids)
+    proper_prices = list(ProperPrice.objects.filter(stock_id__in=prices))
+
+    for proper_price in proper_prices:
+        price_date, close_price = prices[proper_price.stock_id]
+        current_price = float(close_price)
+        proper_price.current_price = Decimal(str(current_price))
+        proper_price.gap_ratio = clamp_gap_ratio(calculate_gap_ratio(current_price, proper_price.proper_price))
+        proper_price.price_date = price_date
+
+    ProperPrice.objects.bulk_update(
+        proper_prices, ['current_price', 'gap_ratio', 'price_date'], batch_size=1000
+    )
+    return len({proper_price.stock_id for proper_price in proper_prices})
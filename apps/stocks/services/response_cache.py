@@ -0,0 +1,160 @@
+"""
+종목 응답 캐시
+
+종목별·엔드포인트별 응답을 Django 캐시(운영: Redis, 개발: locmem)에 저장
+
+- 키에 종목 데이터 버전 포함 → 재무/주가/메이트/10-K 데이터가 바뀌면
+  bump_stock_cache_version()으로 버전만 올려 기존 키를 무효화
+- 소프트 만료: 만료된 항목은 락을 잡은 한 요청만 재계산하고
+  나머지는 이전 응답을 반환 (인기 종목 키 만료 시 동시 재계산 방지)
+- 적중/미스 카운터: get_response_cache_stats()
+"""
+import hashlib
+import time
+from typing import Callable, Dict, Iterable, Tuple
+
+from django.core.cache import cache
+
+KEY_PREFIX = 'stock_response'
+
+# 소프트 만료 이후 이전 응답을 보관하는 시간 (초)
+STALE_GRACE = 60 * 10
+
+# 재계산 락 유지 시간 / 락 대기 시간 (초)
+LOCK_TIMEOUT = 30
+LOCK_WAIT = 2.0
+LOCK_POLL_INTERVAL = 0.05
+
+# 카운터 종류
+STAT_KINDS = ('hit', 'stale', 'miss')
+
+# 캐시를 사용하는 엔드포인트 (cache_stock_response 데코레이터가 등록)
+CACHED_ENDPOINTS = set()
+
+
+def _version_key(stock_id) -> str:
+    return f'{KEY_PREFIX}:version:{stock_id}'
+
+
+def _stat_key(endpoint: str, kind: str) -> str:
+    return f'{KEY_PREFIX}:stats:{endpoint}:{kind}'
+
+
+def _initial_version() -> int:
+    # 버전 키가 삭제/축출되어도 이전 버전과 겹치지 않도록 시각 기반
+    return int(time.time() * 1000)
+
+
+def get_stock_cache_version(stock_id) -> int:
+    key = _version_key(stock_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _initial_version(), timeout=None)
+        version = cache.get(key, _initial_version())
+    return version
+
+
+def bump_stock_cache_version(stock_id):
+    """종목의 캐시된 응답 전체 무효화"""
+    key = _version_key(stock_id)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, _initial_version(), timeout=None)
+
+
+def bump_stock_cache_versions(stock_ids: Iterable):
+    for stock_id in set(stock_ids):
+        bump_stock_cache_version(stock_id)
+
+
+def _count(endpoint: str, kind: str):
+    key = _stat_key(endpoint, kind)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, timeout=None)
+        try:
+            cache.incr(key)
+        except ValueError:
+            pass
+
+
+def get_response_cache_stats() -> Dict[str, Dict[str, int]]:
+    """
+    엔드포인트별 적중/미스 카운터
+
+    Returns:
+        {'indicators': {'hit': 120, 'stale': 3, 'miss': 10, 'hit_rate': 0.93}, ...}
+    """
+    keys = [_stat_key(endpoint, kind) for endpoint in sorted(CACHED_ENDPOINTS) for kind in STAT_KINDS]
+    values = cache.get_many(keys)
+
+    stats = {}
+    for endpoint in sorted(CACHED_ENDPOINTS):
+        counts = {kind: int(values.get(_stat_key(endpoint, kind)) or 0) for kind in STAT_KINDS}
+        total = sum(counts.values())
+        counts['hit_rate'] = round((counts['hit'] + counts['stale']) / total, 4) if total else None
+        stats[endpoint] = counts
+    return stats
+
+
+def response_cache_key(endpoint: str, stock_id, params: Dict) -> str:
+    """엔드포인트 + 종목 + 데이터 버전 + 쿼리 파라미터"""
+    version = get_stock_cache_version(stock_id)
+    query = '&'.join(f'{name}={params[name]}' for name in sorted(params))
+    digest = hashlib.md5(query.encode('utf-8')).hexdigest()[:12]
+    return f'{KEY_PREFIX}:{endpoint}:{stock_id}:v{version}:{digest}'
+
+
+def get_or_compute_response(endpoint: str, stock_id, params: Dict,
+                            compute: Callable[[], Tuple[object, int]],
+                            timeout: int) -> Tuple[object, int]:
+    """
+    캐시된 응답 조회 (없거나 만료되면 compute() 실행)
+
+    Args:
+        compute: () -> (응답 데이터, 상태 코드). 200만 캐시
+        timeout: 소프트 만료 시간 (초)
+
+    Returns:
+        (응답 데이터, 상태 코드)
+    """
+    key = response_cache_key(endpoint, stock_id, params)
+    lock_key = f'{key}:lock'
+
+    entry = cache.get(key)
+    if entry is not None and entry['expires_at'] > time.time():
+        _count(endpoint, 'hit')
+        return entry['data'], 200
+
+    # 재계산 락 (한 요청만 재계산)
+    locked = cache.add(lock_key, 1, timeout=LOCK_TIMEOUT)
+    if not locked:
+        if entry is not None:
+            # 만료됐지만 다른 요청이 재계산 중 → 이전 응답
+            _count(endpoint, 'stale')
+            return entry['data'], 200
+
+        # 최초 계산 중이면 잠시 대기
+        deadline = time.time() + LOCK_WAIT
+        while time.time() < deadline:
+            time.sleep(LOCK_POLL_INTERVAL)
+            entry = cache.get(key)
+            if entry is not None:
+                _count(endpoint, 'hit')
+                return entry['data'], 200
+
+    _count(endpoint, 'miss')
+    try:
+        data, status_code = compute()
+        if status_code == 200:
+            cache.set(
+                key,
+                {'data': data, 'expires_at': time.time() + timeout},
+                timeout=timeout + STALE_GRACE,
+            )
+        return data, status_code
+    finally:
+        if locked:
+            cache.delete(lock_key)
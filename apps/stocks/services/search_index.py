@@ -0,0 +1,270 @@
+"""
+종목 검색 인덱스
+
+활성 미국 종목의 코드/종목명/영문명을 프로세스 메모리에 색인해
+자동완성 수준(키 입력마다)의 검색을 DB 조회 없이 처리
+
+- 정렬 키 배열 + 이진 탐색: 코드/종목명/단어 접두어
+- 트라이그램 역색인: 부분 문자열, 오타(한 글자) 후보
+- 순위: 티커 일치 → 티커 접두어 → 종목명 접두어 → 단어 접두어 → 부분 일치 → 오타 허용
+
+Stock 저장/삭제 시 캐시의 인덱스 버전을 올리고(시그널),
+bulk 적재 등 시그널을 우회한 변경은 REBUILD_INTERVAL마다 재구성
+"""
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from django.core.cache import cache
+
+from apps.stocks.models import Stock
+
+VERSION_KEY = 'stock_search:version'
+
+# 시그널 없이 변경된 데이터를 반영하는 최대 주기 (초)
+REBUILD_INTERVAL = 60 * 10
+
+# 검색 결과 최대 개수
+DEFAULT_LIMIT = 20
+
+# 접두어 탐색 / 오타 검증 최대 후보 수 (응답 시간 상한)
+MAX_PREFIX_SCAN = 2000
+MAX_FUZZY_CANDIDATES = 200
+
+# 순위 (작을수록 먼저)
+RANK_EXACT_CODE = 0
+RANK_CODE_PREFIX = 1
+RANK_NAME_PREFIX = 2
+RANK_WORD_PREFIX = 3
+RANK_SUBSTRING = 4
+RANK_FUZZY = 5
+
+# 응답 필드 (StockListSerializer와 동일)
+RESULT_FIELDS = ('id', 'stock_code', 'stock_name', 'stock_name_en', 'exchange', 'sector')
+
+WORD_PATTERN = re.compile(r'[\w]+')
+
+
+def normalize(text: Optional[str]) -> str:
+    return ' '.join((text or '').lower().split())
+
+
+def trigrams(text: str) -> List[str]:
+    """단어 시작 경계(' ')를 포함한 트라이그램"""
+    padded = f' {text}'
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+
+def within_one_edit(a: str, b: str) -> bool:
+    """편집 거리 1 이하 (치환/삽입/삭제/인접 교환)"""
+    if a == b:
+        return True
+
+    len_a, len_b = len(a), len(b)
+    if abs(len_a - len_b) > 1:
+        return False
+
+    if len_a == len_b:
+        diff = [i for i in range(len_a) if a[i] != b[i]]
+        if len(diff) == 1:
+            return True
+        # 인접 교환 (aple ↔ alpe)
+        return (
+            len(diff) == 2
+            and diff[1] == diff[0] + 1
+            and a[diff[0]] == b[diff[1]]
+            and a[diff[1]] == b[diff[0]]
+        )
+
+    if len_a > len_b:
+        a, b = b, a
+    # b가 한 글자 더 김
+    i = 0
+    while i < len(a) and a[i] == b[i]:
+        i += 1
+    return a[i:] == b[i + 1:]
+
+
+class StockSearchIndex:
+    """
+    메모리 종목 검색 인덱스 (불변, 재구성 시 통째로 교체)
+    """
+
+    def __init__(self, rows: List[Dict], version=None):
+        self.version = version
+        self.built_at = time.time()
+
+        self.rows = rows
+        self.codes = [normalize(row['stock_code']) for row in rows]
+        self.names = [
+            [name for name in (normalize(row['stock_name']), normalize(row['stock_name_en'])) if name]
+            for row in rows
+        ]
+        self.words = [
+            sorted({word for name in names for word in WORD_PATTERN.findall(name)})
+            for names in self.names
+        ]
+
+        # 티커 → 행
+        self.code_index = {code: position for position, code in enumerate(self.codes)}
+
+        # 접두어: (키, 순위, 행) 정렬 배열
+        prefix_keys = []
+        for position in range(len(rows)):
+            prefix_keys.append((self.codes[position], RANK_CODE_PREFIX, position))
+            for name in self.names[position]:
+                prefix_keys.append((name, RANK_NAME_PREFIX, position))
+            for word in self.words[position]:
+                prefix_keys.append((word, RANK_WORD_PREFIX, position))
+        prefix_keys.sort()
+        self.prefix_keys = prefix_keys
+        self.prefix_strings = [key for key, _, _ in prefix_keys]
+
+        # 트라이그램 → 행 집합
+        postings = {}
+        for position in range(len(rows)):
+            for text in (self.codes[position], *self.names[position]):
+                for gram in trigrams(text):
+                    postings.setdefault(gram, set()).add(position)
+        self.postings = postings
+
+    @classmethod
+    def build(cls, version=None) -> 'StockSearchIndex':
+        """활성 미국 종목 전체로 인덱스 구성 (한 번의 쿼리)"""
+        rows = list(
+            Stock.objects.filter(country='us', is_active=True)
+            .order_by('stock_code')
+            .values(*RESULT_FIELDS)
+        )
+        return cls(rows, version=version)
+
+    def __len__(self):
+        return len(self.rows)
+
+    def _prefix_matches(self, query: str, ranks: Dict[int, Tuple[int, int]]):
+        start = bisect_left(self.prefix_strings, query)
+        end = min(start + MAX_PREFIX_SCAN, len(self.prefix_keys))
+        for key, rank, position in self.prefix_keys[start:end]:
+            if not key.startswith(query):
+                break
+            # 같은 순위면 더 짧은 (더 가깝게 일치한) 키 우선
+            match = (rank, len(key))
+            if match < ranks.get(position, (RANK_FUZZY + 1, 0)):
+                ranks[position] = match
+
+    def _substring_matches(self, query: str, ranks: Dict[int, Tuple[int, int]]):
+        grams = set(trigrams(query)[1:])  # 단어 시작 경계 제외
+        if not grams:
+            return
+
+        posting_lists = sorted((self.postings.get(gram, set()) for gram in grams), key=len)
+        candidates = set(posting_lists[0])
+        for posting in posting_lists[1:]:
+            candidates &= posting
+            if not candidates:
+                return
+
+        for position in candidates:
+            if position in ranks:
+                continue
+            matched = [text for text in (self.codes[position], *self.names[position]) if query in text]
+            if matched:
+                ranks[position] = (RANK_SUBSTRING, min(len(text) for text in matched))
+
+    def _fuzzy_matches(self, query: str, ranks: Dict[int, Tuple[int, int]]):
+        grams = trigrams(query)
+        # 한 글자 오타는 트라이그램을 최대 3개까지 바꿈
+        min_shared = max(1, len(grams) - 3)
+
+        shared = Counter()
+        for gram in set(grams):
+            shared.update(self.postings.get(gram, ()))
+
+        candidates = [
+            position for position, count in shared.most_common(MAX_FUZZY_CANDIDATES * 2)
+            if count >= min_shared and position not in ranks
+        ][:MAX_FUZZY_CANDIDATES]
+
+        length = len(query)
+        for position in candidates:
+            for token in (self.codes[position], *self.names[position], *self.words[position]):
+                # 전체 일치 또는 접두어(자동완성) 오타
+                if within_one_edit(query, token) or any(
+                    within_one_edit(query, token[:size])
+                    for size in (length - 1, length, length + 1)
+                    if 0 < size <= len(token)
+                ):
+                    ranks[position] = (RANK_FUZZY, len(token))
+                    break
+
+    def search(self, query: str, limit: int = DEFAULT_LIMIT) -> List[Dict]:
+        """
+        순위순 검색 결과
+
+        Returns:
+            [{'id', 'stock_code', 'stock_name', 'stock_name_en', 'exchange', 'sector'}, ...]
+        """
+        query = normalize(query)
+        if not query:
+            return []
+
+        # 행 → (순위, 일치한 키 길이)
+        ranks = {}
+
+        position = self.code_index.get(query)
+        if position is not None:
+            ranks[position] = (RANK_EXACT_CODE, len(query))
+
+        self._prefix_matches(query, ranks)
+
+        if len(ranks) < limit:
+            self._substring_matches(query, ranks)
+
+        if len(ranks) < limit:
+            self._fuzzy_matches(query, ranks)
+
+        ordered = sorted(
+            ranks,
+            key=lambda position: (ranks[position], self.codes[position]),
+        )
+        return [self.rows[position] for position in ordered[:limit]]
+
+
+def get_search_index_version():
+    return cache.get(VERSION_KEY, 0)
+
+
+def bump_search_index_version():
+    """Stock 변경 시 모든 프로세스의 인덱스 재구성"""
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, 1, timeout=None)
+
+
+_index_lock = threading.Lock()
+_cached_index = {'index': None}
+
+
+def get_stock_search_index() -> StockSearchIndex:
+    """
+    캐시된 검색 인덱스 (버전이 바뀌었거나 REBUILD_INTERVAL이 지났으면 재구성)
+    """
+    version = get_search_index_version()
+    index = _cached_index['index']
+    if index is not None and index.version == version and time.time() - index.built_at < REBUILD_INTERVAL:
+        return index
+
+    with _index_lock:
+        index = _cached_index['index']
+        if index is None or index.version != version or time.time() - index.built_at >= REBUILD_INTERVAL:
+            index = StockSearchIndex.build(version=version)
+            _cached_index['index'] = index
+        return index
+
+
+def search_stocks(query: str, limit: int = DEFAULT_LIMIT) -> List[Dict]:
+    return get_stock_search_index().search(query, limit=limit)
@@ -0,0 +1,191 @@
+"""
+섹터/산업별 지표 분포 서비스
+
+매일 밤 StockIndicatorSnapshot과 MateAnalysis로 섹터/산업별 지표 분포를
+계산해 101개 분위수(0~100 백분위)로 저장
+
+- 종목 백분위: 분위수 배열 이진 탐색 (O(log n))
+- 백분위 필터 (roe_pct>=90): 섹터별 임계값으로 변환해 DB에서 필터링
+"""
+import logging
+from bisect import bisect_left, bisect_right
+from typing import Dict, List, Optional
+
+import numpy as np
+from django.db import transaction
+from django.db.models import Max
+
+from apps.stocks.models import Stock, StockIndicatorSnapshot, SectorDistribution
+from apps.analysis.models import MateAnalysis
+from apps.stocks.services.response_cache import bump_stock_cache_versions
+
+logger = logging.getLogger(__name__)
+
+# 분포를 계산하는 지표 (StockIndicatorSnapshot 필드)
+DISTRIBUTION_METRICS = (
+    'ttm_fcf',
+    'fcf_margin',
+    'roe',
+    'debt_ratio',
+    'current_ratio',
+    'revenue_growth',
+    'fcf_growth',
+    'ocf_to_net_income',
+    'fcf_positive_quarters',
+)
+
+# 메이트 점수 지표 이름: mate_<메이트 타입>
+MATE_METRIC_PREFIX = 'mate_'
+
+# 분포를 저장하는 최소 종목 수
+MIN_GROUP_SIZE = 5
+
+# 백분위 지점 (0, 1, ..., 100)
+PERCENTILE_POINTS = np.arange(101)
+
+
+def mate_metric(mate_type: str) -> str:
+    return f'{MATE_METRIC_PREFIX}{mate_type}'
+
+
+def _quantiles(values: List[float]) -> List[float]:
+    return [round(float(v), 4) for v in np.percentile(np.asarray(values, dtype=float), PERCENTILE_POINTS)]
+
+
+def refresh_sector_distributions() -> int:
+    """
+    섹터/산업별 전 지표 분포 재계산
+
+    Returns:
+        저장된 분포 수
+    """
+    # 종목별 지표 (한 번의 쿼리)
+    rows = StockIndicatorSnapshot.objects.filter(
+        stock__country='us',
+        stock__is_active=True,
+    ).values('stock_id', 'stock__sector', 'stock__industry', *DISTRIBUTION_METRICS)
+
+    # 메이트 점수 (한 번의 쿼리)
+    mate_scores = {}
+    for stock_id, mate_type, score in MateAnalysis.objects.values_list('stock_id', 'mate_type', 'score'):
+        mate_scores.setdefault(stock_id, {})[mate_metric(mate_type)] = score
+
+    # (그룹 종류, 그룹명) → {지표: [값, ...]}
+    groups = {}
+    stock_ids = []
+    for row in rows:
+        stock_ids.append(row['stock_id'])
+        metrics = {metric: row[metric] for metric in DISTRIBUTION_METRICS}
+        metrics.update(mate_scores.get(row['stock_id'], {}))
+
+        for group_type, group_name in (('sector', row['stock__sector']), ('industry', row['stock__industry'])):
+            if not group_name:
+                continue
+            values = groups.setdefault((group_type, group_name), {})
+            for metric, value in metrics.items():
+                if value is not None:
+                    values.setdefault(metric, []).append(value)
+
+    distributions = [
+        SectorDistribution(
+            group_type=group_type,
+            group_name=group_name,
+            metric=metric,
+            count=len(values),
+            quantiles=_quantiles(values),
+        )
+        for (group_type, group_name), metrics in groups.items()
+        for metric, values in metrics.items()
+        if len(values) >= MIN_GROUP_SIZE
+    ]
+
+    with transaction.atomic():
+        SectorDistribution.objects.all().delete()
+        SectorDistribution.objects.bulk_create(distributions, batch_size=500)
+
+    # 캐시된 지표 응답의 백분위 무효화
+    bump_stock_cache_versions(stock_ids)
+
+    logger.info(f"섹터 지표 분포 {len(distributions)}개 저장 ({len(groups)}개 그룹)")
+    return len(distributions)
+
+
+def percentile_from_quantiles(quantiles: List[float], value) -> Optional[float]:
+    """
+    분위수 배열에서 값의 백분위 (0-100, 이진 탐색 + 선형 보간)
+    """
+    if value is None or not quantiles:
+        return None
+
+    # 같은 값이 여러 지점에 걸쳐 있으면 가운데 (최솟값/최댓값 동률 포함)
+    low = bisect_left(quantiles, value)
+    high = bisect_right(quantiles, value)
+    if high > low:
+        return round((low + high - 1) / 2, 1)
+
+    # 범위 밖
+    if low == 0:
+        return 0.0
+    if low == len(quantiles):
+        return 100.0
+
+    lower, upper = quantiles[low - 1], quantiles[low]
+    fraction = (value - lower) / (upper - lower) if upper != lower else 0
+    return round(low - 1 + fraction, 1)
+
+
+def value_at_percentile(quantiles: List[float], percentile: float) -> float:
+    """백분위 지점의 값 (선형 보간)"""
+    percentile = min(max(percentile, 0), 100)
+    return float(np.interp(percentile, PERCENTILE_POINTS, quantiles))
+
+
+def get_stock_percentiles(stock: Stock, values: Dict[str, Optional[float]]) -> Dict[str, Dict[str, Optional[float]]]:
+    """
+    종목 지표의 섹터/산업 내 백분위 (한 번의 쿼리)
+
+    Args:
+        values: {지표: 값} (mate_<타입> 포함 가능)
+
+    Returns:
+        {'sector': {지표: 백분위}, 'industry': {지표: 백분위}}
+    """
+    groups = {'sector': stock.sector, 'industry': stock.industry}
+    percentiles = {group_type: {} for group_type in groups}
+
+    if not stock.sector and not stock.industry:
+        return percentiles
+
+    distributions = SectorDistribution.objects.filter(
+        group_type__in=[group_type for group_type, name in groups.items() if name],
+        group_name__in=[name for name in groups.values() if name],
+        metric__in=list(values),
+    ).values_list('group_type', 'group_name', 'metric', 'quantiles')
+
+    for group_type, group_name, metric, quantiles in distributions:
+        if groups[group_type] != group_name:
+            continue
+        percentiles[group_type][metric] = percentile_from_quantiles(quantiles, values[metric])
+
+    return percentiles
+
+
+def get_distribution_version():
+    """분포 버전 (최종 계산 시각, 필터 컴파일 캐시 키)"""
+    return SectorDistribution.objects.aggregate(version=Max('calculated_at'))['version']
+
+
+def get_sector_thresholds(metric: str, percentile: float) -> Dict[str, float]:
+    """
+    섹터별 백분위 임계값
+
+    Returns:
+        {섹터명: 해당 백분위 지점의 값}
+    """
+    return {
+        group_name: value_at_percentile(quantiles, percentile)
+        for group_name, quantiles in SectorDistribution.objects.filter(
+            group_type='sector',
+            metric=metric,
+        ).values_list('group_name', 'quantiles')
+    }
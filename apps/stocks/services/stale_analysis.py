@@ -0,0 +1,124 @@
+"""
+메이트 분석 / 적정가 변경 추적 (증분 재계산)
+
+저장된 결과의 계산 시각·입력값·엔진 버전을 현재 원본과 비교해
+다시 계산해야 하는 종목만 골라냄 (bulk 적재 등 시그널을 우회한 변경도 반영)
+
+- 메이트 분석: 재무 데이터(스냅샷 원본 수정 시각) > analyzed_at, 분석 누락, 엔진 버전 변경
+              (규칙 엔진이 저장한 분석만 비교, LLM 분석은 규칙 엔진으로 덮어쓰지 않음)
+- 적정가: 재무 데이터 > calculated_at, 발행주식수 변경, 엔진 버전 변경 → 적정가 전체
+          최신 주가(기준일/종가)만 변경 → 현재가/괴리율만
+"""
+import logging
+from typing import Dict, Set
+
+from django.db.models import Count, Min, Q
+
+from apps.analysis.models import MateAnalysis, ProperPrice
+from apps.stocks.models import Stock, StockIndicatorSnapshot
+from apps.stocks.services.mate_analysis import mate_snapshot_queryset, recompute_mate_analyses
+from apps.stocks.services.proper_price import (
+    effective_shares,
+    get_latest_prices,
+    refresh_gap_ratios,
+    refresh_proper_prices,
+)
+from core.utils import mate_engines, valuation_engine
+
+logger = logging.getLogger(__name__)
+
+
+def find_stale_mate_stock_ids() -> Set[int]:
+    """
+    재무 데이터 또는 규칙 엔진 버전이 바뀐 종목
+
+    LLM 등 다른 작성자의 분석은 누락 여부에만 반영 (오래됨/버전 비교 제외)
+    """
+    source_updated = dict(mate_snapshot_queryset().values_list('stock_id', 'source_updated_at'))
+
+    rule_owned = Q(analysis_version__startswith=mate_engines.VERSION_PREFIX)
+    analyses = MateAnalysis.objects.filter(
+        stock_id__in=source_updated, mate_type__in=mate_engines.MATES
+    ).values('stock_id').annotate(
+        count=Count('id'),
+        oldest=Min('analyzed_at', filter=rule_owned),
+        outdated=Count('id', filter=rule_owned & ~Q(analysis_version=mate_engines.ENGINE_VERSION)),
+    )
+
+    stale = set(source_updated)
+    for row in analyses:
+        source_at = source_updated[row['stock_id']]
+        if (
+            row['count'] == len(mate_engines.MATES)
+            and not row['outdated']
+            and (source_at is None or row['oldest'] is None or row['oldest'] >= source_at)
+        ):
+            stale.discard(row['stock_id'])
+    return stale
+
+
+def find_stale_valuation_stock_ids() -> Dict[str, Set[int]]:
+    """
+    적정가가 있는 종목 중 다시 계산할 종목
+
+    Returns:
+        {'valuations': 적정가 전체 재계산, 'prices': 괴리율만 재계산}
+    """
+    rows = list(ProperPrice.objects.values_list(
+        'stock_id', 'calculated_at', 'analysis_version', 'shares_outstanding', 'price_date', 'current_price'
+    ))
+    stock_ids = {row[0] for row in rows}
+
+    source_updated = dict(
+        StockIndicatorSnapshot.objects.filter(stock_id__in=stock_ids).values_list('stock_id', 'source_updated_at')
+    )
+    shares = dict(Stock.objects.filter(id__in=stock_ids).values_list('id', 'shares_outstanding'))
+    prices = get_latest_prices(stock_ids)
+
+    valuations = set()
+    price_only = set()
+    for stock_id, calculated_at, version, shares_outstanding, price_date, current_price in rows:
+        # 스냅샷/주가가 없으면 다시 계산할 수 없음
+        if stock_id not in source_updated or stock_id not in prices:
+            continue
+
+        source_at = source_updated[stock_id]
+        if (
+            version != valuation_engine.ENGINE_VERSION
+            or shares_outstanding != effective_shares(shares.get(stock_id))
+            or (source_at is not None and calculated_at < source_at)
+        ):
+            valuations.add(stock_id)
+        elif (price_date, current_price) != prices[stock_id]:
+            price_only.add(stock_id)
+
+    return {'valuations': valuations, 'prices': price_only - valuations}
+
+
+def find_stale_analyses() -> Dict[str, Set[int]]:
+    """
+    Returns:
+        {'mates': 메이트 분석, 'valuations': 적정가 전체, 'prices': 괴리율만}
+    """
+    return {
+        'mates': find_stale_mate_stock_ids(),
+        **find_stale_valuation_stock_ids(),
+    }
+
+
+def recompute_stale_analyses() -> Dict[str, int]:
+    """
+    변경된 종목만 재계산
+
+    Returns:
+        {'mates': 종목 수, 'valuations': 종목 수, 'prices': 종목 수}
+    """
+    stale = find_stale_analyses()
+
+    counts = {
+        'mates': recompute_mate_analyses(stale['mates']) if stale['mates'] else 0,
+        'valuations': refresh_proper_prices(stale['valuations']),
+        'prices': refresh_gap_ratios(stale['prices']),
+    }
+    logger.info(f"증분 재계산: 메이트 {counts['mates']}개, 적정가 {counts['valuations']}개, 괴리율 {counts['prices']}개 종목")
+    return counts
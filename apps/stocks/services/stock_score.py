@@ -0,0 +1,64 @@
+"""
+규칙 기반 점수 테이블 (StockScore) 동기화
+
+TTM 지표 스냅샷을 열 배열로 한 번에 조회해 core.utils.score_engine으로
+유니버스 전체를 벡터 채점하고, 종목당 1행으로 upsert
+"""
+from typing import Iterable, Optional
+
+from apps.stocks.models import StockIndicatorSnapshot, StockScore
+from core.utils.score_engine import GRADES, SCORE_FIELDS, score_arrays
+
+
+def refresh_stock_scores(stock_ids: Optional[Iterable[int]] = None) -> int:
+    """
+    규칙 기반 점수 재계산 (스냅샷 조회 1회 + 채점 1회 + upsert 1회)
+
+    Args:
+        stock_ids: 대상 종목 (None이면 전체)
+
+    Returns:
+        저장된 행 수
+    """
+    snapshots = StockIndicatorSnapshot.objects.all()
+    if stock_ids is not None:
+        stock_ids = set(stock_ids)
+        if not stock_ids:
+            return 0
+        snapshots = snapshots.filter(stock_id__in=stock_ids)
+
+    rows = list(snapshots.values_list('stock_id', 'ttm_period', *SCORE_FIELDS))
+
+    if rows:
+        columns = list(zip(*rows))
+        scores = score_arrays({field: columns[index + 2] for index, field in enumerate(SCORE_FIELDS)})
+
+        StockScore.objects.bulk_create(
+            [
+                StockScore(
+                    stock_id=stock_id,
+                    ttm_period=ttm_period,
+                    total_score=float(scores['total'][i]),
+                    grade=GRADES[scores['grade'][i]],
+                    cashflow_score=int(scores['cashflow'][i]),
+                    safety_score=int(scores['safety'][i]),
+                    growth_score=int(scores['growth'][i]),
+                )
+                for i, (stock_id, ttm_period) in enumerate(zip(columns[0], columns[1]))
+            ],
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=['stock'],
+            update_fields=[
+                'ttm_period', 'total_score', 'grade',
+                'cashflow_score', 'safety_score', 'growth_score', 'calculated_at',
+            ],
+        )
+
+    # 스냅샷이 사라진 종목 (4분기 미만)
+    stale = StockScore.objects.exclude(stock_id__in=StockIndicatorSnapshot.objects.values('stock_id'))
+    if stock_ids is not None:
+        stale = stale.filter(stock_id__in=stock_ids)
+    stale.delete()
+
+    return len(rows)
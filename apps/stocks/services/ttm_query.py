@@ -0,0 +1,168 @@
+"""
+TTM 집계 쿼리
+
+종목별 최근 분기의 롤링 4분기 합계, 전년 동기 4분기 합계(LAG),
+최근 20분기 FCF 양수 분기 수를 한 번의 쿼리로 계산
+
+- PostgreSQL: 윈도우 함수 (SUM ... OVER ... ROWS 3 PRECEDING)
+- 그 외 (SQLite 개발 DB): 한 번의 조회 후 Python으로 동일 계산
+  (core.utils.indicator_engine.summarize_quarters)
+"""
+from typing import Dict, Iterable, List, Optional
+
+from django.db import connection
+
+from apps.stocks.models import StockFinancialRaw
+from core.utils.indicator_engine import (
+    TTM_QUARTERS,
+    fetch_quarters_bulk,
+    quarter_key,
+    summarize_quarters,
+)
+
+
+TTM_WINDOW_SQL = """
+WITH rolling AS (
+    SELECT
+        stock_id,
+        disclosure_year,
+        disclosure_quarter,
+        total_assets,
+        current_assets,
+        current_liabilities,
+        total_liabilities,
+        total_equity,
+        CAST(SUM(COALESCE(ocf, 0)) OVER w4 AS BIGINT) AS ttm_ocf,
+        CAST(SUM(COALESCE(fcf, 0)) OVER w4 AS BIGINT) AS ttm_fcf,
+        CAST(SUM(ABS(COALESCE(capex, 0))) OVER w4 AS BIGINT) AS ttm_capex,
+        CAST(SUM(COALESCE(revenue, 0)) OVER w4 AS BIGINT) AS ttm_revenue,
+        CAST(SUM(COALESCE(net_income, 0)) OVER w4 AS BIGINT) AS ttm_net_income,
+        COUNT(*) OVER w4 AS ttm_quarters,
+        COUNT(*) OVER w20 AS quarter_count,
+        SUM(CASE WHEN fcf > 0 THEN 1 ELSE 0 END) OVER w20 AS fcf_positive_quarters,
+        MAX(updated_at) OVER w20 AS source_updated_at,
+        ROW_NUMBER() OVER (
+            PARTITION BY stock_id
+            ORDER BY disclosure_year DESC, disclosure_quarter DESC
+        ) AS recency
+    FROM {table}
+    WHERE data_source = %s{stock_filter}
+    WINDOW
+        w4 AS (PARTITION BY stock_id ORDER BY disclosure_year, disclosure_quarter ROWS 3 PRECEDING),
+        w20 AS (PARTITION BY stock_id ORDER BY disclosure_year, disclosure_quarter ROWS 19 PRECEDING)
+),
+lagged AS (
+    SELECT
+        rolling.*,
+        LAG(ttm_revenue, 4) OVER w AS prev_ttm_revenue,
+        LAG(ttm_fcf, 4) OVER w AS prev_ttm_fcf,
+        LAG(ttm_quarters, 4) OVER w AS prev_ttm_quarters,
+        LAG(disclosure_year, 1) OVER w AS year_1,
+        LAG(disclosure_quarter, 1) OVER w AS quarter_1,
+        LAG(disclosure_year, 2) OVER w AS year_2,
+        LAG(disclosure_quarter, 2) OVER w AS quarter_2,
+        LAG(disclosure_year, 3) OVER w AS year_3,
+        LAG(disclosure_quarter, 3) OVER w AS quarter_3
+    FROM rolling
+    WINDOW w AS (PARTITION BY stock_id ORDER BY disclosure_year, disclosure_quarter)
+)
+SELECT
+    stock_id,
+    disclosure_year,
+    disclosure_quarter,
+    year_1, quarter_1,
+    year_2, quarter_2,
+    year_3, quarter_3,
+    ttm_ocf,
+    ttm_fcf,
+    ttm_capex,
+    ttm_revenue,
+    ttm_net_income,
+    ttm_quarters,
+    prev_ttm_revenue,
+    prev_ttm_fcf,
+    prev_ttm_quarters,
+    quarter_count,
+    fcf_positive_quarters,
+    source_updated_at,
+    total_assets,
+    current_assets,
+    current_liabilities,
+    total_liabilities,
+    total_equity
+FROM lagged
+WHERE recency = 1
+"""
+
+
+def _fetch_with_window_functions(stock_ids: Optional[List[int]], data_source: str) -> Dict[int, Dict]:
+    """PostgreSQL: 윈도우 함수 한 번의 쿼리"""
+    params = [data_source]
+    stock_filter = ''
+    if stock_ids is not None:
+        stock_filter = ' AND stock_id IN ({})'.format(', '.join(['%s'] * len(stock_ids)))
+        params.extend(stock_ids)
+
+    sql = TTM_WINDOW_SQL.format(
+        table=connection.ops.quote_name(StockFinancialRaw._meta.db_table),
+        stock_filter=stock_filter,
+    )
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        columns = [col[0] for col in cursor.description]
+        rows = [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    results = {}
+    for row in rows:
+        source_quarters = [
+            quarter_key(row.pop('disclosure_year'), row.pop('disclosure_quarter')),
+        ]
+        for lag in range(1, TTM_QUARTERS):
+            key = quarter_key(row.pop(f'year_{lag}'), row.pop(f'quarter_{lag}'))
+            if key is not None:
+                source_quarters.append(key)
+
+        row['source_quarters'] = source_quarters
+        results[row.pop('stock_id')] = row
+
+    return results
+
+
+def _fetch_in_python(stock_ids: Optional[List[int]], data_source: str) -> Dict[int, Dict]:
+    """SQLite 등: 한 번의 조회 후 종목별 Python 계산"""
+    return {
+        stock_id: summarize_quarters(quarters)
+        for stock_id, quarters in fetch_quarters_bulk(stock_ids, data_source=data_source).items()
+    }
+
+
+def fetch_ttm_rows(stock_ids: Optional[Iterable[int]] = None, data_source: str = 'EDGAR') -> Dict[int, Dict]:
+    """
+    종목별 최근 분기 기준 TTM 집계
+
+    Args:
+        stock_ids: 대상 종목 ID (None이면 전체)
+        data_source: 재무 데이터 소스
+
+    Returns:
+        {stock_id: {
+            'source_quarters': ['2024Q4', '2024Q3', ...],  # 최신순, 최대 4개
+            'ttm_ocf', 'ttm_fcf', 'ttm_capex', 'ttm_revenue', 'ttm_net_income',
+            'ttm_quarters': TTM 합산 분기 수 (최대 4),
+            'prev_ttm_revenue', 'prev_ttm_fcf': 전년 동기 4분기 합계 (없으면 None),
+            'prev_ttm_quarters': 전년 동기 분기 수 (없으면 None),
+            'quarter_count': 최근 20분기 중 존재하는 분기 수,
+            'fcf_positive_quarters': 최근 20분기 중 FCF 양수 분기 수,
+            'source_updated_at': 최근 20분기 최종 수정일,
+            'total_assets', ..., 'total_equity': 최근 분기 재무상태,
+        }}
+    """
+    if stock_ids is not None:
+        stock_ids = sorted(set(stock_ids))
+        if not stock_ids:
+            return {}
+
+    if connection.vendor == 'postgresql':
+        return _fetch_with_window_functions(stock_ids, data_source)
+    return _fetch_in_python(stock_ids, data_source)
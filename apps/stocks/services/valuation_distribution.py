@@ -0,0 +1,121 @@
+"""
+메이트별 적정가 분포 (ValuationDistribution) 야간 일괄 계산
+
+관심종목 유니버스 전체의 분기 이력/주가/발행주식수를 한 번씩 조회하고
+core.utils.valuation_simulation으로 종목 × 경로 배열을 한 번에 시뮬레이션해 upsert
+"""
+from typing import Iterable, Optional
+
+from django.conf import settings
+
+from apps.analysis.models import ValuationDistribution
+from apps.stocks.models import Stock, StockIndicatorSnapshot
+from apps.stocks.services.proper_price import effective_shares, get_latest_prices
+from apps.watchlist.models import Watchlist
+from core.utils.indicator_engine import fetch_quarters_bulk
+from core.utils.valuation_engine import ENGINE_VERSION
+from core.utils.valuation_simulation import (
+    DEFAULT_PATHS,
+    DEFAULT_SEED,
+    PERCENTILES,
+    fit_input_distribution,
+    simulate_fair_values,
+)
+
+
+def watchlist_universe() -> set:
+    """관심종목에 등록된 종목 ID 전체"""
+    return set(Watchlist.objects.values_list('stock_id', flat=True).distinct())
+
+
+def _optional(value: float) -> Optional[float]:
+    return None if value != value else float(value)
+
+
+def refresh_valuation_distributions(stock_ids: Optional[Iterable[int]] = None,
+                                    paths: Optional[int] = None, seed: Optional[int] = None) -> int:
+    """
+    적정가 분포 재계산 (분기 이력/주가/발행주식수 조회 + 시뮬레이션 + upsert 1회)
+
+    Args:
+        stock_ids: 대상 종목 (None이면 관심종목 유니버스 전체, 유니버스에서 빠진 종목 분포는 삭제)
+        paths / seed: 종목당 경로 수 / 시드 (None이면 설정값)
+
+    Returns:
+        계산된 종목 수 (4분기 미만 또는 최근 4분기 매출이 없는 종목은 건너뛰고 기존 분포 삭제)
+    """
+    paths = paths or getattr(settings, 'VALUATION_SIMULATION_PATHS', DEFAULT_PATHS)
+    seed = getattr(settings, 'VALUATION_SIMULATION_SEED', DEFAULT_SEED) if seed is None else seed
+
+    universe = stock_ids is None
+    stock_ids = watchlist_universe() if universe else set(stock_ids)
+
+    if universe:
+        ValuationDistribution.objects.exclude(stock_id__in=stock_ids).delete()
+    if not stock_ids:
+        return 0
+
+    quarters = fetch_quarters_bulk(stock_ids)
+    growth = dict(
+        StockIndicatorSnapshot.objects.filter(stock_id__in=quarters).values_list('stock_id', 'revenue_growth')
+    )
+
+    fitted = []
+    for stock_id, stock_quarters in quarters.items():
+        revenue_growth = growth.get(stock_id)
+        distribution = fit_input_distribution(
+            stock_quarters, fallback_growth=revenue_growth / 100 if revenue_growth is not None else None
+        )
+        if distribution is not None:
+            fitted.append((stock_id, distribution))
+
+    ids = [stock_id for stock_id, _ in fitted]
+
+    # 더 이상 계산 조건을 만족하지 않는 종목의 이전 분포는 삭제 (오래된 분포가 남지 않도록)
+    ValuationDistribution.objects.filter(stock_id__in=stock_ids).exclude(stock_id__in=ids).delete()
+    if not fitted:
+        return 0
+
+    prices = get_latest_prices(ids)
+    shares = dict(Stock.objects.filter(id__in=ids).values_list('id', 'shares_outstanding'))
+
+    results = simulate_fair_values(
+        ids,
+        [distribution for _, distribution in fitted],
+        [effective_shares(shares.get(stock_id)) for stock_id in ids],
+        [prices[stock_id][1] if stock_id in prices else None for stock_id in ids],
+        paths=paths,
+        seed=seed,
+    )
+
+    rows = []
+    for mate_type, result in results.items():
+        for index, stock_id in enumerate(ids):
+            price_date, close_price = prices.get(stock_id, (None, None))
+            rows.append(ValuationDistribution(
+                stock_id=stock_id,
+                mate_type=mate_type,
+                **{
+                    f'p{percentile}': float(value)
+                    for percentile, value in zip(PERCENTILES, result['percentiles'][index])
+                },
+                mean=float(result['mean'][index]),
+                prob_undervalued=_optional(result['prob_undervalued'][index]),
+                current_price=close_price,
+                price_date=price_date,
+                paths=paths,
+                seed=seed,
+                analysis_version=ENGINE_VERSION,
+            ))
+
+    ValuationDistribution.objects.bulk_create(
+        rows,
+        batch_size=1000,
+        update_conflicts=True,
+        unique_fields=['stock', 'mate_type'],
+        update_fields=[
+            'p5', 'p25', 'p50', 'p75', 'p95', 'mean', 'prob_undervalued',
+            'current_price', 'price_date', 'paths', 'seed', 'analysis_version', 'calculated_at',
+        ],
+    )
+    return len(ids)
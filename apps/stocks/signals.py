@@ -0,0 +1,80 @@
+"""
+종목 시그널
+
+재무 데이터가 저장/삭제되면 커밋 후 해당 종목의 TTM 지표 스냅샷만 재계산
+(한 트랜잭션에서 여러 분기가 바뀌어도 종목당 한 번)
+주가/메이트 분석/10-K 인사이트가 바뀌면 해당 종목의 응답 캐시 버전을 올림
+종목 정보가 바뀌면 검색 인덱스 버전을 올림
+메이트 분석이 바뀌면 종목별 메이트 점수 테이블(MateScoreWide)을 동기화
+"""
+import threading
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from apps.stocks.models import Stock, StockFinancialRaw, StockPrice
+from apps.analysis.models import MateAnalysis, TenKInsight
+from apps.stocks.services.indicator_snapshot import refresh_indicator_snapshots
+from apps.stocks.services.response_cache import bump_stock_cache_version
+from apps.stocks.services.search_index import bump_search_index_version
+from apps.stocks.services.mate_score_wide import refresh_mate_score_wide
+
+
+# 커밋 후 스냅샷을 재계산할 종목 (스레드별)
+_pending_snapshots = threading.local()
+
+
+def _pending_snapshot_ids() -> set:
+    if not hasattr(_pending_snapshots, 'stock_ids'):
+        _pending_snapshots.stock_ids = set()
+    return _pending_snapshots.stock_ids
+
+
+def _flush_pending_snapshots():
+    """모인 종목을 한 번에 재계산 (같은 트랜잭션의 나머지 콜백은 빈 목록이라 바로 반환)"""
+    stock_ids = _pending_snapshot_ids()
+    if not stock_ids:
+        return
+    pending = set(stock_ids)
+    stock_ids.clear()
+    refresh_indicator_snapshots(pending)
+
+
+@receiver(post_save, sender=StockFinancialRaw)
+@receiver(post_delete, sender=StockFinancialRaw)
+def refresh_snapshot_on_financial_change(sender, instance, **kwargs):
+    # 스냅샷 재계산 시 응답 캐시 버전도 함께 갱신
+    # (롤백된 트랜잭션의 종목은 다음 커밋 때 함께 재계산, DB 기준이라 결과는 같음)
+    _pending_snapshot_ids().add(instance.stock_id)
+    transaction.on_commit(_flush_pending_snapshots)
+
+
+@receiver(post_save, sender=StockPrice)
+@receiver(post_delete, sender=StockPrice)
+@receiver(post_save, sender=MateAnalysis)
+@receiver(post_delete, sender=MateAnalysis)
+@receiver(post_save, sender=TenKInsight)
+@receiver(post_delete, sender=TenKInsight)
+def invalidate_stock_responses(sender, instance, **kwargs):
+    stock_id = instance.stock_id
+    transaction.on_commit(lambda: bump_stock_cache_version(stock_id))
+
+
+@receiver(post_save, sender=MateAnalysis)
+@receiver(post_delete, sender=MateAnalysis)
+def sync_mate_score_wide(sender, instance, **kwargs):
+    stock_id = instance.stock_id
+    transaction.on_commit(lambda: refresh_mate_score_wide([stock_id]))
+
+
+@receiver(post_save, sender=Stock)
+def invalidate_stock_responses_on_stock_change(sender, instance, **kwargs):
+    stock_id = instance.pk
+    transaction.on_commit(lambda: bump_stock_cache_version(stock_id))
+
+
+@receiver(post_save, sender=Stock)
+@receiver(post_delete, sender=Stock)
+def rebuild_search_index_on_stock_change(sender, instance, **kwargs):
+    transaction.on_commit(bump_search_index_version)
@@ -0,0 +1,108 @@
+"""
+종목 관련 Celery 작업
+
+메이트 분석·적정가 증분 재계산 / 섹터 지표 분포 / 규칙 기반 점수 / 적정가 분포 재계산 등 배치 작업
+"""
+from celery import shared_task
+import logging
+
+from apps.stocks.services import (
+    recompute_mate_analyses,
+    recompute_stale_analyses,
+    refresh_sector_distributions,
+    refresh_stock_scores,
+    refresh_valuation_distributions,
+    publish_fundamentals_snapshot,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(name='stocks.recompute_mate_analyses')
+def recompute_mate_analyses_task():
+    """
+    메이트 분석 전체 재계산 (수동 실행용, 정기 실행은 recompute_stale_analyses)
+    """
+    analyzed = recompute_mate_analyses()
+    logger.info(f"✅ 메이트 분석 {analyzed}개 종목 갱신 완료")
+    return {
+        'success': True,
+        'analyzed_count': analyzed,
+    }
+
+
+@shared_task(name='stocks.recompute_stale_analyses')
+def recompute_stale_analyses_task():
+    """
+    메이트 분석 / 적정가 증분 재계산
+
+    재무 데이터·발행주식수·엔진 버전이 바뀐 종목만 재계산하고,
+    주가만 바뀐 종목은 괴리율만 갱신
+    """
+    counts = recompute_stale_analyses()
+    return {
+        'success': True,
+        **counts,
+    }
+
+
+@shared_task(name='stocks.refresh_sector_distributions')
+def refresh_sector_distributions_task():
+    """
+    섹터/산업별 지표 분포 재계산
+
+    매일 밤 실행되어 지표 백분위 조회/필터에 사용하는 분위수를 갱신
+    """
+    saved = refresh_sector_distributions()
+    logger.info(f"✅ 섹터 지표 분포 {saved}개 갱신 완료")
+    return {
+        'success': True,
+        'saved_count': saved,
+    }
+
+
+@shared_task(name='stocks.refresh_stock_scores')
+def refresh_stock_scores_task():
+    """
+    규칙 기반 점수 전체 재계산
+
+    야간 재무 적재 후 실행되어 점수 리더보드를 갱신 (유니버스 전체 벡터 채점)
+    """
+    saved = refresh_stock_scores()
+    logger.info(f"✅ 규칙 기반 점수 {saved}개 갱신 완료")
+    return {
+        'success': True,
+        'saved_count': saved,
+    }
+
+
+@shared_task(name='stocks.publish_fundamentals_snapshot')
+def publish_fundamentals_snapshot_task():
+    """
+    재무 컬럼 스냅샷 재발행
+
+    발행 후 지표 스냅샷이 바뀌면 스크리닝은 DB에서 적재하므로 다시 발행해 mmap 경로로 복귀
+    (지표 변경 후 자동 예약 + 야간/장 마감 후 재계산이 끝난 뒤)
+    """
+    snapshot = publish_fundamentals_snapshot()
+    logger.info(f"✅ 재무 컬럼 스냅샷 {snapshot.version} 발행 완료 ({len(snapshot)}개 종목)")
+    return {
+        'success': True,
+        'version': snapshot.version,
+        'stock_count': len(snapshot),
+    }
+
+
+@shared_task(name='stocks.refresh_valuation_distributions')
+def refresh_valuation_distributions_task():
+    """
+    메이트별 적정가 분포 재계산 (몬테카를로)
+
+    매일 밤 관심종목 유니버스 전체를 종목 × 경로 배열로 한 번에 시뮬레이션
+    """
+    saved = refresh_valuation_distributions()
+    logger.info(f"✅ 적정가 분포 {saved}개 종목 갱신 완료")
+    return {
+        'success': True,
+        'saved_count': saved,
+    }
@@ -0,0 +1,29 @@
+from django.test import SimpleTestCase
+
+from apps.stocks.services.sector_distribution import _quantiles, percentile_from_quantiles
+
+
+class PercentileFromQuantilesTests(SimpleTestCase):
+    """분위수 배열 → 백분위 (동률/범위 밖)"""
+
+    def test_constant_distribution_is_middle(self):
+        quantiles = _quantiles([200.0] * 50)
+        self.assertEqual(percentile_from_quantiles(quantiles, 200.0), 50.0)
+
+    def test_ties_at_both_ends_take_the_middle(self):
+        # fcf_positive_quarters: 30%는 0, 31%는 4
+        values = [0.0] * 30 + [1.0] * 13 + [2.0] * 13 + [3.0] * 13 + [4.0] * 31
+        quantiles = _quantiles(values)
+
+        self.assertAlmostEqual(percentile_from_quantiles(quantiles, 0.0), 15, delta=1)
+        self.assertAlmostEqual(percentile_from_quantiles(quantiles, 4.0), 85, delta=1)
+
+    def test_out_of_range_values_are_clamped(self):
+        quantiles = _quantiles(list(range(1, 101)))
+        self.assertEqual(percentile_from_quantiles(quantiles, 0), 0.0)
+        self.assertEqual(percentile_from_quantiles(quantiles, 1000), 100.0)
+        self.assertIsNone(percentile_from_quantiles(quantiles, None))
+
+    def test_interpolates_between_points(self):
+        quantiles = _quantiles(list(range(101)))
+        self.assertEqual(percentile_from_quantiles(quantiles, 42.5), 42.5)
@@ -205,6 +205,22 @@ TEMPLATES = [
 OPENAI_API_KEY = env('OPENAI_API_KEY', default='')
 OPENAI_MODEL = env('OPENAI_MODEL', default='gpt-4-turbo-preview')
 
+# 일괄 분석 호출 한도 (core.utils.llm_runner, 계정 등급에 맞게 설정)
+OPENAI_CONCURRENCY = env.int('OPENAI_CONCURRENCY', default=16)
+OPENAI_RPM_LIMIT = env.int('OPENAI_RPM_LIMIT', default=500)
+OPENAI_TPM_LIMIT = env.int('OPENAI_TPM_LIMIT', default=30000)
+
+# LLM 응답 캐시 (같은 프롬프트는 API 재호출 없음, core.utils.llm_cache)
+# 모드: readwrite (기본) / replay (오프라인, 저장된 응답만) / refresh / off
+LLM_CACHE_PATH = env('LLM_CACHE_PATH', default=os.path.join(BASE_DIR, 'data', 'llm_cache.sqlite3'))
+LLM_CACHE_MAX_BYTES = env.int('LLM_CACHE_MAX_BYTES', default=512 * 1024 * 1024)
+LLM_CACHE_MODE = env('LLM_CACHE_MODE', default='readwrite')
+
+
+# 적정가 몬테카를로 분포 (core.utils.valuation_simulation, 종목당 경로 수 / 재현용 시드)
+VALUATION_SIMULATION_PATHS = env.int('VALUATION_SIMULATION_PATHS', default=10000)
+VALUATION_SIMULATION_SEED = env.int('VALUATION_SIMULATION_SEED', default=42)
+
 
 # ===========
 # 미국 주식 데이터 API 설정
@@ -214,6 +230,12 @@ OPENAI_MODEL = env('OPENAI_MODEL', default='gpt-4-turbo-preview')
 EDGAR_USER_AGENT = env('EDGAR_USER_AGENT', default='Newturn support@newturn.com')
 ALPHA_VANTAGE_KEY = env('ALPHA_VANTAGE_KEY', default='')  # 선택
 
+# 재무 컬럼 스냅샷 (.npy, 모든 워커가 mmap으로 공유)
+FUNDAMENTALS_SNAPSHOT_DIR = env(
+    'FUNDAMENTALS_SNAPSHOT_DIR',
+    default=os.path.join(BASE_DIR, 'data', 'fundamentals'),
+)
+
 
 # ==============
 # Celery 설정
@@ -233,6 +255,41 @@ CELERY_BEAT_SCHEDULE = {
         'schedule': crontab(hour=18, minute=0),  # 매일 오후 6시 (미국 시장 마감 후)
         'options': {'timezone': TIME_ZONE},
     },
+    'recompute-stale-analyses-after-close': {
+        'task': 'stocks.recompute_stale_analyses',
+        'schedule': crontab(hour=18, minute=30),  # 매일 오후 6시 30분 (주가 반영)
+        'options': {'timezone': TIME_ZONE},
+    },
+    'recompute-stale-analyses-nightly': {
+        'task': 'stocks.recompute_stale_analyses',
+        'schedule': crontab(hour=1, minute=30),  # 매일 새벽 1시 30분 (섹터 분포 계산 전, 재무 반영)
+        'options': {'timezone': TIME_ZONE},
+    },
+    'refresh-sector-distributions-nightly': {
+        'task': 'stocks.refresh_sector_distributions',
+        'schedule': crontab(hour=2, minute=0),  # 매일 새벽 2시
+        'options': {'timezone': TIME_ZONE},
+    },
+    'refresh-stock-scores-nightly': {
+        'task': 'stocks.refresh_stock_scores',
+        'schedule': crontab(hour=2, minute=30),  # 매일 새벽 2시 30분
+        'options': {'timezone': TIME_ZONE},
+    },
+    'publish-fundamentals-snapshot-after-close': {
+        'task': 'stocks.publish_fundamentals_snapshot',
+        'schedule': crontab(hour=18, minute=45),  # 매일 오후 6시 45분 (장 마감 후 재계산 반영)
+        'options': {'timezone': TIME_ZONE},
+    },
+    'publish-fundamentals-snapshot-nightly': {
+        'task': 'stocks.publish_fundamentals_snapshot',
+        'schedule': crontab(hour=2, minute=45),  # 매일 새벽 2시 45분 (야간 재계산 반영)
+        'options': {'timezone': TIME_ZONE},
+    },
+    'refresh-valuation-distributions-nightly': {
+        'task': 'stocks.refresh_valuation_distributions',
+        'schedule': crontab(hour=3, minute=0),  # 매일 새벽 3시 (적정가 재계산 후)
+        'options': {'timezone': TIME_ZONE},
+    },
 }
 
 
@@ -0,0 +1,45 @@
+"""
+조건부 GET (ETag / Last-Modified)
+
+원본 데이터의 최종 수정 시각으로 ETag를 만들어
+변경이 없으면 뷰를 실행하지 않고 304 Not Modified 응답
+"""
+import hashlib
+
+from django.utils.decorators import method_decorator
+from django.views.decorators.http import condition
+
+
+def conditional_response(state_func):
+    """
+    조건부 GET 데코레이터 (ViewSet 메서드용)
+
+    state_func(request, **kwargs)는 (최종 수정 시각, 지문)을 반환
+    - 최종 수정 시각이 None이면 조건부 처리 없이 뷰 실행
+    - 지문: 수정 시각으로 드러나지 않는 변경(행 삭제 등)을 반영할 값 (행 수 등)
+
+    사용 예:
+    @action(detail=True, methods=['get'])
+    @conditional_response(stock_data_state)
+    def indicators(self, request, pk=None):
+        ...
+    """
+
+    def get_state(request, *args, **kwargs):
+        # ETag / Last-Modified 계산에 같은 조회 결과 재사용
+        if not hasattr(request, '_conditional_state'):
+            request._conditional_state = state_func(request, *args, **kwargs)
+        return request._conditional_state
+
+    def etag_func(request, *args, **kwargs):
+        last_modified, fingerprint = get_state(request, *args, **kwargs)
+        if last_modified is None:
+            return None
+
+        raw = f'{request.get_full_path()}|{fingerprint}|{last_modified.isoformat()}'
+        return '"{}"'.format(hashlib.md5(raw.encode('utf-8')).hexdigest())
+
+    def last_modified_func(request, *args, **kwargs):
+        return get_state(request, *args, **kwargs)[0]
+
+    return method_decorator(condition(etag_func=etag_func, last_modified_func=last_modified_func))
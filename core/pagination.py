@@ -0,0 +1,244 @@
+"""
+키셋(커서) 페이지네이션
+
+정렬 컬럼 + 고유 키(id)의 마지막 값을 커서로 넘겨
+WHERE (정렬 키) > (커서) ORDER BY ... LIMIT n+1 로 조회
+
+- 깊은 페이지도 첫 페이지와 같은 비용 (OFFSET 없음)
+- COUNT(*) 없음: 응답은 {'next', 'previous', 'results'}
+- NULL은 정방향 기준 항상 마지막
+"""
+import base64
+import datetime
+import json
+from typing import Callable, List, Optional, Sequence, Tuple
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound
+from rest_framework.filters import OrderingFilter
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class CursorEncoder(DjangoJSONEncoder):
+    """시각은 마이크로초까지 보존 (DjangoJSONEncoder는 밀리초로 자름)"""
+
+    def default(self, o):
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+class Cursor:
+    """
+    커서: 기준 행의 정렬 키 값 + 방향 (reverse=True면 이전 페이지)
+    """
+
+    def __init__(self, values: Sequence, reverse: bool = False):
+        self.values = list(values)
+        self.reverse = reverse
+
+    def encode(self) -> str:
+        raw = json.dumps({'v': self.values, 'r': int(self.reverse)}, cls=CursorEncoder)
+        return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+    @classmethod
+    def decode(cls, encoded: str, key_count: int) -> 'Cursor':
+        try:
+            padded = encoded + '=' * (-len(encoded) % 4)
+            data = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8'))
+            values, reverse = data['v'], bool(data['r'])
+        except (ValueError, TypeError, KeyError):
+            raise NotFound('잘못된 커서입니다')
+
+        if not isinstance(values, list) or len(values) != key_count:
+            raise NotFound('잘못된 커서입니다')
+        return cls(values, reverse)
+
+
+def parse_ordering(ordering: Sequence[str]) -> List[Tuple[str, bool]]:
+    """['-roe', 'id'] → [('roe', True), ('id', False)]"""
+    return [(name.lstrip('-'), name.startswith('-')) for name in ordering]
+
+
+def keyset_order_by(keys: List[Tuple[str, bool]], reverse: bool = False) -> list:
+    """정렬 식 (정방향: NULL 마지막, 역방향: NULL 처음)"""
+    nulls = {'nulls_first': True} if reverse else {'nulls_last': True}
+    expressions = []
+    for field, descending in keys:
+        if descending != reverse:
+            expressions.append(F(field).desc(**nulls))
+        else:
+            expressions.append(F(field).asc(**nulls))
+    return expressions
+
+
+def keyset_condition(keys: List[Tuple[str, bool]], values: Sequence, reverse: bool = False) -> Q:
+    """
+    커서 이후 행 조건
+
+    (k1, k2, k3) > (v1, v2, v3)
+    = k1 > v1 OR (k1 = v1 AND k2 > v2) OR (k1 = v1 AND k2 = v2 AND k3 > v3)
+    """
+    conditions = []
+    equal = Q()
+
+    for (field, descending), value in zip(keys, values):
+        if value is None:
+            # 정방향: NULL 뒤에는 없음 / 역방향: NULL 앞의 값 전체
+            after = None if not reverse else Q(**{f'{field}__isnull': False})
+            same = Q(**{f'{field}__isnull': True})
+        else:
+            lookup = 'lt' if descending != reverse else 'gt'
+            after = Q(**{f'{field}__{lookup}': value})
+            if not reverse:
+                after |= Q(**{f'{field}__isnull': True})
+            same = Q(**{field: value})
+
+        if after is not None:
+            conditions.append(equal & after)
+        equal &= same
+
+    # 집계 쿼리에서도 GROUP BY가 바뀌지 않도록 정렬 키만 참조
+    condition = Q()
+    for q in conditions:
+        condition |= q
+    return condition
+
+
+def row_value(row, field: str):
+    """객체/딕셔너리에서 정렬 키 값 (관계는 '__'로 연결)"""
+    if isinstance(row, dict):
+        return row.get(field)
+
+    value = row
+    for part in field.split('__'):
+        value = getattr(value, part, None)
+        if value is None:
+            return None
+    if hasattr(value, 'pk'):
+        return value.pk
+    return value
+
+
+class KeysetPagination(BasePagination):
+    """
+    키셋 페이지네이션
+
+    ordering의 마지막 키는 고유해야 함 (없으면 id를 자동 추가)
+    뷰에 OrderingFilter가 있으면 요청의 ordering 파라미터를 따름
+    """
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 200
+    cursor_query_param = 'cursor'
+    ordering = ('-id',)
+    unique_field = 'id'
+
+    def __init__(self):
+        self.base_url = None
+        self.next_cursor = None
+        self.previous_cursor = None
+
+    def get_page_size(self, request) -> int:
+        if self.page_size_query_param:
+            try:
+                size = int(request.query_params[self.page_size_query_param])
+                if size > 0:
+                    return min(size, self.max_page_size)
+            except (KeyError, ValueError):
+                pass
+        return self.page_size
+
+    def get_ordering(self, request, queryset, view=None) -> List[str]:
+        ordering = None
+        for backend in getattr(view, 'filter_backends', []):
+            if issubclass(backend, OrderingFilter):
+                ordering = backend().get_ordering(request, queryset, view)
+                break
+
+        ordering = list(ordering or self.ordering)
+        if ordering[-1].lstrip('-') not in (self.unique_field, 'pk'):
+            ordering.append(self.unique_field)
+        return ordering
+
+    def decode_cursor(self, request, key_count: int) -> Optional[Cursor]:
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        return Cursor.decode(encoded, key_count)
+
+    def paginate_keyed(self, request, fetch: Callable, key_func: Callable, key_count: int) -> list:
+        """
+        범용 키셋 페이지네이션
+
+        Args:
+            fetch: (커서 또는 None, 페이지 크기 + 1) -> 커서 이후 행 (정방향 순, 역방향이면 역순)
+            key_func: 행 -> 정렬 키 값 목록
+        """
+        self.base_url = request.build_absolute_uri()
+        size = self.get_page_size(request)
+        cursor = self.decode_cursor(request, key_count)
+        reverse = cursor is not None and cursor.reverse
+
+        rows = list(fetch(cursor, size + 1))
+        has_more = len(rows) > size
+        rows = rows[:size]
+        if reverse:
+            rows.reverse()
+
+        self.next_cursor = self.previous_cursor = None
+        if rows:
+            # 역방향으로 왔으면 다음 페이지는 항상 존재, 정방향으로 왔으면 이전 페이지가 존재
+            if has_more or reverse:
+                self.next_cursor = Cursor(key_func(rows[-1]))
+            if (has_more and reverse) or (cursor is not None and not reverse):
+                self.previous_cursor = Cursor(key_func(rows[0]), reverse=True)
+
+        return rows
+
+    def paginate_queryset(self, queryset, request, view=None, ordering=None):
+        ordering = ordering or self.get_ordering(request, queryset, view)
+        keys = parse_ordering(ordering)
+
+        def fetch(cursor, limit):
+            reverse = cursor is not None and cursor.reverse
+            page = queryset.order_by(*keyset_order_by(keys, reverse))
+            if cursor is not None:
+                page = page.filter(keyset_condition(keys, cursor.values, reverse))
+            return page[:limit]
+
+        def key_func(row):
+            return [row_value(row, field) for field, _ in keys]
+
+        return self.paginate_keyed(request, fetch, key_func, len(keys))
+
+    def _cursor_link(self, cursor: Optional[Cursor]) -> Optional[str]:
+        if cursor is None:
+            return None
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor.encode())
+
+    def get_next_link(self) -> Optional[str]:
+        return self._cursor_link(self.next_cursor)
+
+    def get_previous_link(self) -> Optional[str]:
+        return self._cursor_link(self.previous_cursor)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
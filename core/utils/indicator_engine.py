@@ -0,0 +1,340 @@
+"""
+TTM 지표 엔진
+
+분기 재무 데이터를 values_list로 한 번에 조회해 QuarterRecord(__slots__)로 담고,
+TTM 합계/재무상태/성장률/현금흐름 품질 지표를 한 곳에서 계산
+
+- fetch_quarters / fetch_quarters_bulk: 종목별 최근 20분기 (최신순)
+- summarize_quarters: 분기 → TTM 집계 (ttm_query.fetch_ttm_rows와 같은 형식)
+- summarize_quarter_history: 분기별 시점 TTM 집계 (누적합 배열로 한 번에 계산)
+- compute_ttm_indicators: TTM 집계 → 지표 (스냅샷/뷰/스크립트 공통)
+"""
+from itertools import groupby
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from apps.stocks.models import StockFinancialRaw
+
+
+# TTM 분기 수
+TTM_QUARTERS = 4
+
+# FCF 양수 분기 수 계산에 사용하는 최대 분기 수
+HISTORY_QUARTERS = 20
+
+# 최근 분기 재무상태 컬럼
+BALANCE_FIELDS = (
+    'total_assets',
+    'current_assets',
+    'current_liabilities',
+    'total_liabilities',
+    'total_equity',
+)
+
+
+class QuarterRecord:
+    """
+    분기 재무 레코드 (values_list 튜플 → 속성 접근)
+    """
+    FIELDS = (
+        'disclosure_year',
+        'disclosure_quarter',
+        'revenue',
+        'net_income',
+        'ocf',
+        'fcf',
+        'capex',
+        *BALANCE_FIELDS,
+        'updated_at',
+    )
+    __slots__ = FIELDS
+
+    def __init__(self, *values):
+        for field, value in zip(self.FIELDS, values):
+            setattr(self, field, value)
+
+    @property
+    def key(self) -> str:
+        return quarter_key(self.disclosure_year, self.disclosure_quarter)
+
+    def __repr__(self):
+        return f"QuarterRecord({self.key})"
+
+
+def quarter_key(year, quarter) -> Optional[str]:
+    if year is None:
+        return None
+    return f"{year}Q{quarter}"
+
+
+def fetch_quarters_bulk(stock_ids: Optional[Iterable[int]] = None, limit: Optional[int] = HISTORY_QUARTERS,
+                        data_source: str = 'EDGAR') -> Dict[int, List[QuarterRecord]]:
+    """
+    여러 종목의 최근 분기 (한 번의 쿼리)
+
+    Args:
+        stock_ids: 대상 종목 ID (None이면 전체)
+        limit: 종목당 최대 분기 수 (None이면 전체 분기)
+
+    Returns:
+        {stock_id: [QuarterRecord, ...]} (최신순)
+    """
+    queryset = StockFinancialRaw.objects.filter(data_source=data_source)
+    if stock_ids is not None:
+        queryset = queryset.filter(stock_id__in=list(stock_ids))
+
+    rows = queryset.order_by(
+        'stock_id', '-disclosure_year', '-disclosure_quarter'
+    ).values_list('stock_id', *QuarterRecord.FIELDS)
+
+    results = {}
+    for stock_id, group in groupby(rows.iterator(), key=lambda row: row[0]):
+        quarters = []
+        for row in group:
+            if limit is None or len(quarters) < limit:
+                quarters.append(QuarterRecord(*row[1:]))
+        results[stock_id] = quarters
+    return results
+
+
+def fetch_quarters(stock_id: int, limit: int = HISTORY_QUARTERS,
+                   data_source: str = 'EDGAR') -> List[QuarterRecord]:
+    """종목의 최근 분기 (최신순, 한 번의 쿼리)"""
+    rows = StockFinancialRaw.objects.filter(
+        stock_id=stock_id,
+        data_source=data_source,
+    ).order_by(
+        '-disclosure_year', '-disclosure_quarter'
+    ).values_list(*QuarterRecord.FIELDS)[:limit]
+
+    return [QuarterRecord(*row) for row in rows]
+
+
+def summarize_quarters(quarters: List[QuarterRecord]) -> Optional[Dict]:
+    """
+    분기 → TTM 집계 (ttm_query.fetch_ttm_rows와 같은 형식)
+
+    Args:
+        quarters: 최신순 정렬된 분기 데이터 (최대 20개)
+
+    Returns:
+        TTM 집계 딕셔너리 (분기가 없으면 None)
+    """
+    quarters = quarters[:HISTORY_QUARTERS]
+    if not quarters:
+        return None
+
+    recent = quarters[:TTM_QUARTERS]
+    previous = quarters[TTM_QUARTERS:TTM_QUARTERS * 2]
+    latest = recent[0]
+
+    def total(records, field, transform=None):
+        values = [getattr(q, field) or 0 for q in records]
+        if transform is not None:
+            values = [transform(value) for value in values]
+        return sum(values)
+
+    summary = {
+        'source_quarters': [q.key for q in recent],
+        'ttm_ocf': total(recent, 'ocf'),
+        'ttm_fcf': total(recent, 'fcf'),
+        'ttm_capex': total(recent, 'capex', transform=abs),
+        'ttm_revenue': total(recent, 'revenue'),
+        'ttm_net_income': total(recent, 'net_income'),
+        'ttm_quarters': len(recent),
+        'prev_ttm_revenue': total(previous, 'revenue') if previous else None,
+        'prev_ttm_fcf': total(previous, 'fcf') if previous else None,
+        'prev_ttm_quarters': len(previous) if previous else None,
+        'quarter_count': len(quarters),
+        'fcf_positive_quarters': len([q for q in quarters if q.fcf and q.fcf > 0]),
+        'source_updated_at': max(q.updated_at for q in quarters),
+    }
+    summary.update({field: getattr(latest, field) for field in BALANCE_FIELDS})
+
+    return summary
+
+
+def _rolling_sum(cumulative: np.ndarray, end: np.ndarray, window: int):
+    """누적합으로 [end - window + 1, end] 구간 합계와 구간 길이"""
+    start = np.maximum(end - window + 1, 0)
+    return cumulative[end + 1] - cumulative[start], end + 1 - start
+
+
+def summarize_quarter_history(quarters: List[QuarterRecord]) -> List[Dict]:
+    """
+    분기별 시점(point-in-time) TTM 집계
+
+    각 분기를 최신 분기로 보았을 때의 summarize_quarters() 결과를
+    누적합 배열로 전 분기에 대해 한 번에 계산
+
+    Args:
+        quarters: 최신순 정렬된 전체 분기 데이터
+
+    Returns:
+        [TTM 집계 딕셔너리, ...] (과거 → 최신 순, 분기마다 1개)
+    """
+    if not quarters:
+        return []
+
+    chronological = quarters[::-1]
+    count = len(chronological)
+    end = np.arange(count)
+
+    def cumulative(field, transform=None):
+        values = np.array([getattr(q, field) or 0 for q in chronological], dtype=np.int64)
+        if transform is not None:
+            values = transform(values)
+        return np.concatenate(([0], np.cumsum(values)))
+
+    sums = {
+        'ttm_ocf': cumulative('ocf'),
+        'ttm_fcf': cumulative('fcf'),
+        'ttm_capex': cumulative('capex', transform=np.abs),
+        'ttm_revenue': cumulative('revenue'),
+        'ttm_net_income': cumulative('net_income'),
+    }
+    ttm = {name: _rolling_sum(values, end, TTM_QUARTERS)[0] for name, values in sums.items()}
+    _, ttm_quarters = _rolling_sum(sums['ttm_revenue'], end, TTM_QUARTERS)
+
+    # 전년 동기 4분기 (4분기 전까지의 TTM)
+    previous_end = np.maximum(end - TTM_QUARTERS, 0)
+    prev_revenue, prev_quarters = _rolling_sum(sums['ttm_revenue'], previous_end, TTM_QUARTERS)
+    prev_fcf, _ = _rolling_sum(sums['ttm_fcf'], previous_end, TTM_QUARTERS)
+    has_previous = end >= TTM_QUARTERS
+
+    # 그 시점의 최근 20분기 FCF 양수 분기 수
+    positive = np.concatenate(([0], np.cumsum([bool(q.fcf and q.fcf > 0) for q in chronological])))
+    fcf_positive, quarter_count = _rolling_sum(positive, end, HISTORY_QUARTERS)
+
+    keys = [q.key for q in chronological]
+    updated = [q.updated_at for q in chronological]
+
+    history = []
+    for i, latest in enumerate(chronological):
+        summary = {
+            'source_quarters': keys[max(i - TTM_QUARTERS + 1, 0):i + 1][::-1],
+            **{name: int(values[i]) for name, values in ttm.items()},
+            'ttm_quarters': int(ttm_quarters[i]),
+            'prev_ttm_revenue': int(prev_revenue[i]) if has_previous[i] else None,
+            'prev_ttm_fcf': int(prev_fcf[i]) if has_previous[i] else None,
+            'prev_ttm_quarters': int(prev_quarters[i]) if has_previous[i] else None,
+            'quarter_count': int(quarter_count[i]),
+            'fcf_positive_quarters': int(fcf_positive[i]),
+            'source_updated_at': max(updated[max(i - HISTORY_QUARTERS + 1, 0):i + 1]),
+        }
+        summary.update({field: getattr(latest, field) for field in BALANCE_FIELDS})
+        history.append(summary)
+
+    return history
+
+
+def compute_ttm_indicators(ttm: Optional[Dict]) -> Optional[Dict]:
+    """
+    TTM 집계로 지표 계산
+    
+    Args:
+        ttm: summarize_quarters() 또는 fetch_ttm_rows()의 종목별 결과
+    
+    Returns:
+        StockIndicatorSnapshot 필드 딕셔너리 (4분기 미만이면 None)
+    """
+    if ttm is None or ttm['ttm_quarters'] < TTM_QUARTERS:
+        return None
+    
+    ttm_ocf = ttm['ttm_ocf']
+    ttm_fcf = ttm['ttm_fcf']
+    ttm_revenue = ttm['ttm_revenue']
+    ttm_net_income = ttm['ttm_net_income']
+    
+    # 최근 분기 재무상태
+    total_equity = ttm['total_equity']
+    total_liabilities = ttm['total_liabilities']
+    current_assets = ttm['current_assets']
+    current_liabilities = ttm['current_liabilities']
+    
+    # 지표 계산
+    fcf_margin = round((ttm_fcf / ttm_revenue) * 100, 2) if ttm_revenue else 0
+    roe = round((ttm_net_income / total_equity) * 100, 2) if total_equity else 0
+    debt_ratio = round((total_liabilities / total_equity) * 100, 2) if (total_equity and total_liabilities) else 0
+    current_ratio = round(((current_assets or 0) / current_liabilities) * 100, 2) if current_liabilities else 0
+    
+    # 성장률 (최근 4분기 vs 전년 동기 4분기)
+    revenue_growth = None
+    fcf_growth = None
+    
+    if ttm['prev_ttm_quarters'] == TTM_QUARTERS:
+        prev_revenue = ttm['prev_ttm_revenue']
+        prev_fcf = ttm['prev_ttm_fcf']
+        
+        if prev_revenue:
+            revenue_growth = round(((ttm_revenue - prev_revenue) / prev_revenue) * 100, 2)
+        if prev_fcf:
+            fcf_growth = round(((ttm_fcf - prev_fcf) / abs(prev_fcf)) * 100, 2)
+    
+    # 현금흐름 품질
+    ocf_to_net_income = round(ttm_ocf / ttm_net_income, 2) if ttm_net_income else None
+    
+    source_quarters = ttm['source_quarters']
+    latest_year, latest_quarter = (int(part) for part in source_quarters[0].split('Q'))
+    
+    return {
+        'ttm_period': f"{source_quarters[-1]}-{source_quarters[0]}",
+        'latest_year': latest_year,
+        'latest_quarter': latest_quarter,
+        'source_quarters': source_quarters,
+        'quarter_count': ttm['quarter_count'],
+        
+        # TTM
+        'ttm_ocf': ttm_ocf,
+        'ttm_fcf': ttm_fcf,
+        'ttm_capex': ttm['ttm_capex'],
+        'ttm_revenue': ttm_revenue,
+        'ttm_net_income': ttm_net_income,
+        
+        # 재무상태
+        'total_assets': ttm['total_assets'],
+        'current_assets': current_assets,
+        'current_liabilities': current_liabilities,
+        'total_liabilities': total_liabilities,
+        'total_equity': total_equity,
+        
+        # 지표
+        'fcf_margin': fcf_margin,
+        'roe': roe,
+        'debt_ratio': debt_ratio,
+        'current_ratio': current_ratio,
+        
+        # 성장률
+        'revenue_growth': revenue_growth,
+        'fcf_growth': fcf_growth,
+        
+        # 품질
+        'ocf_to_net_income': ocf_to_net_income,
+        'fcf_positive_quarters': ttm['fcf_positive_quarters'],
+        
+        'source_updated_at': ttm['source_updated_at'],
+    }
+
+
+def calculate_stock_indicators(stock_id: int, data_source: str = 'EDGAR') -> Optional[Dict]:
+    """
+    종목 지표 즉시 계산 (한 번의 쿼리, 스냅샷 미사용)
+    """
+    return compute_ttm_indicators(summarize_quarters(fetch_quarters(stock_id, data_source=data_source)))
+
+
+def calculate_bulk_indicators(stock_ids: Optional[Iterable[int]] = None,
+                              data_source: str = 'EDGAR') -> Dict[int, Dict]:
+    """
+    여러 종목 지표 즉시 계산 (한 번의 쿼리)
+
+    Returns:
+        {stock_id: 지표 딕셔너리} (4분기 미만 종목 제외)
+    """
+    results = {}
+    for stock_id, quarters in fetch_quarters_bulk(stock_ids, data_source=data_source).items():
+        indicators = compute_ttm_indicators(summarize_quarters(quarters))
+        if indicators is not None:
+            results[stock_id] = indicators
+    return results
@@ -0,0 +1,283 @@
+"""
+LLM 응답 캐시 (내용 주소 기반, SQLite)
+
+키 = sha256(model, messages, temperature, 기타 요청 파라미터)
+프롬프트 입력이 바이트 단위로 같으면 같은 키 → 재실행/미변경 종목은 API 호출 없음
+
+저장:
+    LLM_CACHE_PATH (SQLite 파일 1개, WAL 모드로 여러 프로세스 공유)
+    응답 본문은 zlib 압축, 전체 크기가 LLM_CACHE_MAX_BYTES를 넘으면
+    마지막 사용 시각이 오래된 항목부터 삭제 (LRU)
+    전체 크기는 인스턴스에서 누적 계산 (저장마다 합계 조회 없음),
+    SIZE_RESYNC_PUTS번마다 / 삭제 직전에 실제 합계로 다시 맞춤 (다른 프로세스의 쓰기 반영)
+
+모드 (LLM_CACHE_MODE):
+    - readwrite: 캐시 우선, 없으면 API 호출 후 저장 (기본)
+    - replay: 저장된 응답만 사용 (오프라인 재현), 없으면 LLMCacheMiss
+    - refresh: 항상 API 호출 후 덮어쓰기
+    - off: 캐시 사용 안 함
+"""
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from django.conf import settings
+
+MODES = ('readwrite', 'replay', 'refresh', 'off')
+
+# 기본 최대 크기 (512MB)
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+# 한도를 넘으면 이 비율까지 줄임 (삭제를 매번 하지 않도록)
+EVICT_TARGET_RATIO = 0.9
+
+# 누적 크기를 실제 합계로 다시 맞추는 주기 (저장 횟수)
+SIZE_RESYNC_PUTS = 1000
+
+# call(model, messages, temperature, **params) → (응답 본문, 총 토큰 수)
+LLMCall = Callable[..., Tuple[str, int]]
+AsyncLLMCall = Callable[..., Awaitable[Tuple[str, int]]]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    content BLOB NOT NULL,
+    total_tokens INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    last_used_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS llm_cache_last_used ON llm_cache (last_used_at);
+"""
+
+
+class LLMCacheMiss(Exception):
+    """replay 모드에서 저장된 응답이 없음"""
+
+
+def cache_key(model: str, messages: List[Dict], temperature: float, **params) -> str:
+    """요청 → 캐시 키 (sha256 hex)"""
+    payload = json.dumps(
+        {'model': model, 'messages': messages, 'temperature': temperature, **params},
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(',', ':'),
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def _is_valid(validate: Optional[Callable], content: str) -> bool:
+    if validate is None:
+        return True
+    try:
+        validate(content)
+    except Exception:
+        return False
+    return True
+
+
+class LLMCache:
+    """
+    SQLite LLM 응답 캐시
+
+    hits / misses / api_calls: 이 인스턴스에서의 통계
+    """
+
+    def __init__(self, path: str, max_bytes: int = DEFAULT_MAX_BYTES, mode: str = 'readwrite'):
+        if mode not in MODES:
+            raise ValueError(f"Unknown LLM cache mode: {mode}")
+
+        self.path = path
+        self.max_bytes = max_bytes
+        self.mode = mode
+        self.hits = 0
+        self.misses = 0
+        self.api_calls = 0
+        self._lock = threading.Lock()
+        self._conn = None
+        # 누적 전체 크기 (None이면 다음 저장 때 합계 조회) / 저장 횟수
+        self._size = None
+        self._puts = 0
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.executescript(SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str) -> Optional[Tuple[str, int]]:
+        """저장된 응답 (본문, 총 토큰 수), 없으면 None"""
+        with self._lock:
+            row = self.conn.execute(
+                'SELECT content, total_tokens FROM llm_cache WHERE key = ?', (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self.conn.execute('UPDATE llm_cache SET last_used_at = ? WHERE key = ?', (time.time(), key))
+
+        content, total_tokens = row
+        return zlib.decompress(content).decode('utf-8'), total_tokens
+
+    def put(self, key: str, model: str, content: str, total_tokens: int):
+        compressed = zlib.compress(content.encode('utf-8'))
+        now = time.time()
+
+        with self._lock:
+            replaced = self.conn.execute('SELECT size FROM llm_cache WHERE key = ?', (key,)).fetchone()
+            self.conn.execute(
+                'INSERT OR REPLACE INTO llm_cache '
+                '(key, model, content, total_tokens, size, created_at, last_used_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (key, model, compressed, total_tokens, len(compressed), now, now),
+            )
+
+            self._puts += 1
+            if self._size is None or self._puts % SIZE_RESYNC_PUTS == 0:
+                self._size = self._total_size()
+            else:
+                self._size += len(compressed) - (replaced[0] if replaced else 0)
+            self._evict()
+
+    def _total_size(self) -> int:
+        return self.conn.execute('SELECT COALESCE(SUM(size), 0) FROM llm_cache').fetchone()[0]
+
+    def _evict(self):
+        """최대 크기를 넘으면 오래 안 쓴 항목부터 삭제 (_lock 안에서 호출)"""
+        if self._size <= self.max_bytes:
+            return
+
+        # 다른 프로세스가 이미 삭제했을 수 있으므로 실제 합계로 확인
+        self._size = self._total_size()
+        if self._size <= self.max_bytes:
+            return
+
+        excess = self._size - int(self.max_bytes * EVICT_TARGET_RATIO)
+        keys = []
+        for key, size in self.conn.execute('SELECT key, size FROM llm_cache ORDER BY last_used_at'):
+            keys.append((key,))
+            self._size -= size
+            excess -= size
+            if excess <= 0:
+                break
+
+        self.conn.executemany('DELETE FROM llm_cache WHERE key = ?', keys)
+
+    def _lookup(self, model: str, messages: List[Dict], temperature: float,
+                params: Dict, validate: Optional[Callable]) -> Tuple[Optional[str], Optional[Tuple[str, int]]]:
+        """
+        (캐시 키, 저장된 응답 또는 None)
+
+        off 모드면 키도 None, 검증에 실패한 저장 응답은 미스로 처리
+        replay 모드 미스는 LLMCacheMiss
+        """
+        if self.mode == 'off':
+            return None, None
+
+        key = cache_key(model, messages, temperature, **params)
+
+        if self.mode != 'refresh':
+            cached = self.get(key)
+            if cached is not None and _is_valid(validate, cached[0]):
+                self.hits += 1
+                return key, cached
+
+        self.misses += 1
+        if self.mode == 'replay':
+            raise LLMCacheMiss(f"No cached LLM response (key={key[:12]})")
+        return key, None
+
+    def _store(self, key: Optional[str], model: str, content: str,
+               total_tokens: int, validate: Optional[Callable]):
+        """새 응답 검증 후 저장 (검증 실패는 저장하지 않고 예외 전파 → 다음 요청에서 다시 호출)"""
+        if validate is not None:
+            validate(content)
+        if key is not None:
+            self.put(key, model, content, total_tokens)
+
+    def complete(self, call: LLMCall, model: str, messages: List[Dict],
+                 temperature: float, validate: Optional[Callable] = None, **params) -> Tuple[str, int, bool]:
+        """
+        캐시를 거친 LLM 호출
+
+        Args:
+            call: 실제 API 호출 (model, messages, temperature, **params) → (본문, 총 토큰 수)
+            validate: 응답 본문 검증 (예외를 던지면 캐시하지 않음, 키에는 포함 안 됨)
+            params: 응답 형식 등 추가 요청 파라미터 (키에 포함)
+
+        Returns:
+            (응답 본문, 총 토큰 수, 캐시 적중 여부)
+
+        Raises:
+            LLMCacheMiss: replay 모드에서 저장된 응답이 없을 때
+        """
+        key, cached = self._lookup(model, messages, temperature, params, validate)
+        if cached is not None:
+            return cached[0], cached[1], True
+
+        self.api_calls += 1
+        content, total_tokens = call(model, messages, temperature, **params)
+        self._store(key, model, content, total_tokens, validate)
+        return content, total_tokens, False
+
+    async def acomplete(self, acall: AsyncLLMCall, model: str, messages: List[Dict],
+                        temperature: float, validate: Optional[Callable] = None, **params) -> Tuple[str, int, bool]:
+        """complete의 비동기 버전 (acall은 코루틴 함수, SQLite 조회/저장은 스레드에서 실행해 이벤트 루프를 막지 않음)"""
+        key, cached = await asyncio.to_thread(self._lookup, model, messages, temperature, params, validate)
+        if cached is not None:
+            return cached[0], cached[1], True
+
+        self.api_calls += 1
+        content, total_tokens = await acall(model, messages, temperature, **params)
+        await asyncio.to_thread(self._store, key, model, content, total_tokens, validate)
+        return content, total_tokens, False
+
+    def stats(self) -> Dict:
+        """저장 항목 수/크기 + 이 인스턴스의 적중 통계"""
+        with self._lock:
+            entries, size = self.conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache'
+            ).fetchone()
+        return {
+            'entries': entries,
+            'size': size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'api_calls': self.api_calls,
+        }
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMCache:
+    """설정(LLM_CACHE_*) 기반 프로세스 공용 캐시"""
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = LLMCache(
+                settings.LLM_CACHE_PATH,
+                max_bytes=settings.LLM_CACHE_MAX_BYTES,
+                mode=settings.LLM_CACHE_MODE,
+            )
+        return _default_cache
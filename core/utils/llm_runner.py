@@ -0,0 +1,247 @@
+"""
+비동기 LLM 실행기 (동시 요청 + RPM/TPM 제한 + 재시도)
+
+- AsyncRateLimiter: 분당 요청 수(RPM) / 분당 토큰 수(TPM) 토큰 버킷
+- AsyncLLMRunner: 최대 N개 요청을 동시에 보내고, 재시도 가능한 오류는
+  지터 백오프(full jitter)로 재시도, LLM 응답 캐시(core.utils.llm_cache) 경유
+- RunStats: 처리량/비용 집계 (진행 중 출력용)
+
+고정 sleep 없이 처리 속도가 공급자 한도(RPM/TPM)에만 묶이도록 함
+"""
+import asyncio
+import logging
+import random
+import time
+from functools import partial
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Tuple, Type
+
+from core.utils.llm_cache import AsyncLLMCall, LLMCache
+
+logger = logging.getLogger(__name__)
+
+# TPM 예약용 토큰 추정 (실제 사용량은 응답 후 정산)
+CHARS_PER_TOKEN = 2
+DEFAULT_OUTPUT_TOKENS = 500
+
+# GPT-4 Turbo 비용 ($ / 1K 토큰)
+DEFAULT_COST_PER_1K_TOKENS = 0.01
+
+
+def estimate_tokens(messages: List[Dict], output_tokens: int = DEFAULT_OUTPUT_TOKENS) -> int:
+    """요청 토큰 추정 (프롬프트 글자 수 기반 + 예상 응답 토큰)"""
+    chars = sum(len(message.get('content') or '') for message in messages)
+    return chars // CHARS_PER_TOKEN + output_tokens
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 60.0) -> float:
+    """재시도 대기 시간 (full jitter: 0 ~ min(cap, base × 2^attempt))"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class TokenBucket:
+    """분당 한도 토큰 버킷 (가득 찬 상태에서 시작, 초당 한도/60씩 충전)"""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60
+        self.level = self.capacity
+        self.updated = time.monotonic()
+
+    def refill(self, now: float):
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """amount를 꺼낼 수 있을 때까지 남은 시간 (초)"""
+        amount = min(amount, self.capacity)
+        if self.level >= amount:
+            return 0.0
+        return (amount - self.level) / self.rate
+
+
+class AsyncRateLimiter:
+    """
+    RPM / TPM 동시 제한
+
+    acquire(예상 토큰)로 예약하고, 응답 후 settle(예상, 실제)로 차이를 정산
+    (실제 사용량이 많았으면 이후 요청이 그만큼 늦게 나감)
+    """
+
+    def __init__(self, rpm: Optional[float] = None, tpm: Optional[float] = None):
+        self.requests = TokenBucket(rpm) if rpm else None
+        self.tokens = TokenBucket(tpm) if tpm else None
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, tokens: int = 0):
+        # 락을 잡은 채 대기 → 대기 순서대로 (FIFO) 나감
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                wait = 0.0
+                if self.requests is not None:
+                    self.requests.refill(now)
+                    wait = max(wait, self.requests.wait_time(1))
+                if self.tokens is not None:
+                    self.tokens.refill(now)
+                    wait = max(wait, self.tokens.wait_time(tokens))
+
+                if wait <= 0:
+                    if self.requests is not None:
+                        self.requests.level -= 1
+                    if self.tokens is not None:
+                        self.tokens.level -= min(tokens, self.tokens.capacity)
+                    return
+
+                await asyncio.sleep(wait)
+
+    def settle(self, estimated: int, actual: int):
+        if self.tokens is not None:
+            self.tokens.level -= actual - min(estimated, self.tokens.capacity)
+
+
+class RunStats:
+    """실행 통계 (API 호출/캐시 적중/재시도/토큰/비용, 처리량)"""
+
+    def __init__(self, cost_per_1k_tokens: float = DEFAULT_COST_PER_1K_TOKENS):
+        self.cost_per_1k_tokens = cost_per_1k_tokens
+        self.started = time.monotonic()
+        self.api_calls = 0
+        self.cache_hits = 0
+        self.retries = 0
+        self.failures = 0
+        self.tokens = 0
+        self.cost = 0.0
+
+    def cost_of(self, tokens: int) -> float:
+        return tokens / 1000 * self.cost_per_1k_tokens
+
+    def record_call(self, tokens: int):
+        """API 호출 1회 기록"""
+        self.api_calls += 1
+        self.tokens += tokens
+        self.cost += self.cost_of(tokens)
+
+    def summary(self) -> Dict:
+        elapsed = time.monotonic() - self.started
+        minutes = elapsed / 60 if elapsed > 0 else 0
+        return {
+            'elapsed': elapsed,
+            'api_calls': self.api_calls,
+            'cache_hits': self.cache_hits,
+            'retries': self.retries,
+            'failures': self.failures,
+            'tokens': self.tokens,
+            'cost': self.cost,
+            'requests_per_minute': self.api_calls / minutes if minutes else 0.0,
+            'tokens_per_minute': self.tokens / minutes if minutes else 0.0,
+        }
+
+    def progress(self) -> str:
+        summary = self.summary()
+        return (
+            f"{summary['requests_per_minute']:.0f} req/min, "
+            f"{summary['tokens_per_minute']:,.0f} tok/min, "
+            f"캐시 {summary['cache_hits']}회, 재시도 {summary['retries']}회, "
+            f"${summary['cost']:.2f}"
+        )
+
+
+class AsyncLLMRunner:
+    """
+    동시 LLM 호출 실행기
+
+    Args:
+        acall: 실제 API 호출 (캐시 미스일 때만 호출됨)
+        cache: LLM 응답 캐시
+        concurrency: 동시 요청 수 (in-flight 상한)
+        rpm / tpm: 분당 요청 수 / 토큰 수 한도 (None이면 제한 없음)
+        max_retries: 재시도 횟수
+        retryable: 재시도할 예외 타입 (그 외 예외는 바로 실패)
+    """
+
+    def __init__(self, acall: AsyncLLMCall, cache: LLMCache, concurrency: int = 8,
+                 rpm: Optional[float] = None, tpm: Optional[float] = None,
+                 max_retries: int = 3, retryable: Tuple[Type[BaseException], ...] = (Exception,),
+                 backoff_base: float = 1.0, backoff_cap: float = 60.0,
+                 output_tokens: int = DEFAULT_OUTPUT_TOKENS,
+                 cost_per_1k_tokens: float = DEFAULT_COST_PER_1K_TOKENS):
+        self.acall = acall
+        self.cache = cache
+        self.concurrency = concurrency
+        self.limiter = AsyncRateLimiter(rpm, tpm)
+        self.max_retries = max_retries
+        self.retryable = retryable
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.output_tokens = output_tokens
+        self.stats = RunStats(cost_per_1k_tokens)
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    async def _call(self, model: str, messages: List[Dict], temperature: float,
+                    output_tokens: Optional[int] = None, **params) -> Tuple[str, int]:
+        """한도 예약 → 호출 → 정산 (재시도 가능한 오류는 지터 백오프 후 재시도)"""
+        estimated = estimate_tokens(messages, output_tokens or self.output_tokens)
+
+        for attempt in range(self.max_retries + 1):
+            await self.limiter.acquire(estimated)
+            try:
+                async with self._semaphore:
+                    content, tokens = await self.acall(model, messages, temperature, **params)
+            except self.retryable as e:
+                if attempt >= self.max_retries:
+                    raise
+                self.stats.retries += 1
+                delay = backoff_delay(attempt, self.backoff_base, self.backoff_cap)
+                logger.warning(f"LLM 호출 실패, {delay:.1f}초 후 재시도 ({attempt + 1}/{self.max_retries}): {e}")
+                await asyncio.sleep(delay)
+                continue
+
+            self.limiter.settle(estimated, tokens)
+            self.stats.record_call(tokens)
+            return content, tokens
+
+    async def complete(self, model: str, messages: List[Dict], temperature: float,
+                       validate: Optional[Callable] = None, output_tokens: Optional[int] = None,
+                       **params) -> Tuple[str, int, float, bool]:
+        """
+        LLM 호출 1회 (캐시 → 한도 → API)
+
+        Args:
+            validate: 응답 검증 (실패하면 캐시하지 않고 예외 전파, LLMCache.complete 참고)
+            output_tokens: 예상 응답 토큰 (TPM 예약용, 기본 output_tokens)
+
+        Returns:
+            (응답 본문, 총 토큰 수, 비용, 캐시 적중 여부) - 캐시 적중이면 비용 0
+        """
+        content, tokens, cached = await self.cache.acomplete(
+            partial(self._call, output_tokens=output_tokens),
+            model, messages, temperature, validate=validate, **params
+        )
+        if cached:
+            self.stats.cache_hits += 1
+            return content, tokens, 0.0, True
+        return content, tokens, self.stats.cost_of(tokens), False
+
+    async def run(self, items: Iterable, worker: Callable[..., Awaitable], workers: Optional[int] = None):
+        """
+        items를 worker 코루틴으로 동시 처리 (워커 풀)
+
+        worker 예외는 로그만 남기고 다음 항목 진행 (실패 기록은 worker 책임)
+        """
+        queue = asyncio.Queue()
+        for item in items:
+            queue.put_nowait(item)
+
+        async def consume():
+            while True:
+                try:
+                    item = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                try:
+                    await worker(item)
+                except Exception as e:
+                    self.stats.failures += 1
+                    logger.exception(f"LLM 작업 실패: {item} ({e})")
+
+        await asyncio.gather(*(consume() for _ in range(workers or self.concurrency)))
@@ -1,11 +1,39 @@
 """
 메이트 분석 엔진
-GPT-4 기반 투자 분석
+GPT-4 기반 투자 분석 (openai v1 클라이언트)
+
+입력은 TTM 지표 스냅샷 기반 지표 (apps.stocks.services.mate_analysis.llm_indicators),
+프롬프트는 배치 스크립트와 공용 (core.utils.mate_prompt)
+같은 프롬프트는 LLM 응답 캐시(core.utils.llm_cache)에서 재사용
+응답은 core.utils.mate_response로 스키마 검증 (형식이 틀린 응답은 캐시하지 않음)
 """
 
-import openai
-import json
 from django.conf import settings
+from openai import OpenAI
+
+from core.utils.llm_cache import get_llm_cache
+from core.utils.mate_prompt import MATE_PROMPTS, build_combined_messages, build_messages, validate_combined
+from core.utils.mate_response import parse_combined_response, parse_mate_response
+
+# LLM이 저장한 분석의 버전 접두어 (규칙 엔진 재계산 대상에서 제외)
+VERSION_PREFIX = 'llm-'
+
+# 프롬프트/모델 변경 시 올림 (MateAnalysis.analysis_version, 분석 작업 중복 제거 키)
+ENGINE_VERSION = f'{VERSION_PREFIX}1.0'
+
+
+def _chat_completion(client):
+    """OpenAI 호출 함수 (캐시 미스일 때만 호출됨) → (응답 본문, 총 토큰 수)"""
+    def call(model, messages, temperature, **params):
+        response = client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            **params
+        )
+        return response.choices[0].message.content, response.usage.total_tokens
+    
+    return call
 
 
 class MateEngine:
@@ -13,16 +41,20 @@ class MateEngine:
     AI 메이트 분석 엔진
     """
     
-    def __init__(self):
-        openai.api_key = settings.OPENAI_API_KEY
+    # 메이트 → 프롬프트 생성
+    MATE_PROMPTS = MATE_PROMPTS
+    
+    def __init__(self, cache=None, api_key=None):
+        self.client = OpenAI(api_key=api_key or settings.OPENAI_API_KEY)
         self.model = settings.OPENAI_MODEL
+        self.cache = cache or get_llm_cache()
     
     def analyze(self, stock_data, mate_type='benjamin'):
         """
         종목 분석
         
         Args:
-            stock_data (dict): 재무 데이터
+            stock_data (dict): 지표 (llm_indicators)
             mate_type (str): 'benjamin', 'fisher', 'greenblatt', 'lynch'
         
         Returns:
@@ -34,84 +66,54 @@ class MateEngine:
                 'score_detail': dict
             }
         """
-        mate_prompts = {
-            'benjamin': self._get_benjamin_prompt,
-            'fisher': self._get_fisher_prompt,
-            'greenblatt': self._get_greenblatt_prompt,
-            'lynch': self._get_lynch_prompt,
-        }
-        
-        if mate_type not in mate_prompts:
+        if mate_type not in self.MATE_PROMPTS:
             raise ValueError(f"Unknown mate_type: {mate_type}")
         
-        prompt = mate_prompts[mate_type](stock_data)
-        
-        response = openai.ChatCompletion.create(
+        content, _, _ = self.cache.complete(
+            _chat_completion(self.client),
             model=self.model,
-            messages=[
-                {"role": "system", "content": f"{mate_type} 스타일 투자 분석가"},
-                {"role": "user", "content": prompt}
-            ],
+            messages=build_messages(mate_type, stock_data),
             temperature=0.7,
+            validate=parse_mate_response,
             response_format={"type": "json_object"}
         )
         
-        result = json.loads(response.choices[0].message.content)
-        return result
-    
-    def _get_benjamin_prompt(self, stock_data):
-        """벤저민 그레이엄 프롬프트"""
-        return f"""
-당신은 벤저민 그레이엄의 투자 철학을 따릅니다.
-
-기업: {stock_data.get('stock_name')}
-PBR: {stock_data.get('pbr')}
-부채비율: {stock_data.get('debt_ratio')}%
-배당: {stock_data.get('dividend_yield')}%
-
-안전마진 관점으로 평가하고 JSON으로 답변:
-{{
-  "score": 0-100,
-  "summary": "한 줄",
-  "reason": "3-4줄",
-  "caution": "주의사항",
-  "score_detail": {{"undervalued": 0-100, "safety": 0-100, "dividend": 0-100}}
-}}
-"""
-    
-    def _get_fisher_prompt(self, stock_data):
-        """필립 피셔 프롬프트"""
-        return f"""
-당신은 필립 피셔의 투자 철학을 따릅니다.
-
-기업: {stock_data.get('stock_name')}
-매출 성장: {stock_data.get('revenue_growth_3y')}%
-R&D 비중: {stock_data.get('rd_ratio')}%
-
-성장과 경영진 관점으로 평가하고 JSON으로 답변.
-"""
+        return parse_mate_response(content)
     
-    def _get_greenblatt_prompt(self, stock_data):
-        """조엘 그린블라트 프롬프트"""
-        return f"""
-당신은 조엘 그린블라트의 마법공식을 따릅니다.
-
-기업: {stock_data.get('stock_name')}
-ROE: {stock_data.get('roe')}%
-PER: {stock_data.get('per')}
-
-우량도와 염가도로 평가하고 JSON으로 답변.
-"""
-    
-    def _get_lynch_prompt(self, stock_data):
-        """피터 린치 프롬프트"""
-        return f"""
-당신은 피터 린치의 투자 철학을 따릅니다.
-
-기업: {stock_data.get('stock_name')}
-성장률: {stock_data.get('eps_growth_3y')}%
-PER: {stock_data.get('per')}
-
-이해하기 쉬운 기업인지 평가하고 JSON으로 답변.
-"""
-
+    def analyze_all(self, stock_data, mate_types=None):
+        """
+        여러 메이트 통합 분석 (지표를 한 번만 보내는 요청 1회)
+        
+        통합 프롬프트는 항상 4명 전체를 요청 (배치 스크립트와 같은 프롬프트 → 캐시 공유)
+        형식이 틀리거나 빠진 메이트만 analyze로 개별 재요청
+        
+        Args:
+            stock_data (dict): 지표 (llm_indicators)
+            mate_types (list): 분석할 메이트 (None이면 전체)
+        
+        Returns:
+            dict: {mate_type: analyze와 같은 결과}
+        """
+        mate_types = list(mate_types or self.MATE_PROMPTS)
+        unknown = [mate_type for mate_type in mate_types if mate_type not in self.MATE_PROMPTS]
+        if unknown:
+            raise ValueError(f"Unknown mate_type: {', '.join(unknown)}")
+        
+        try:
+            content, _, _ = self.cache.complete(
+                _chat_completion(self.client),
+                model=self.model,
+                messages=build_combined_messages(stock_data),
+                temperature=0.7,
+                validate=validate_combined,
+                response_format={"type": "json_object"}
+            )
+            results, errors = parse_combined_response(content, mate_types)
+        except ValueError as e:
+            results, errors = {}, dict.fromkeys(mate_types, str(e))
+        
+        # 메이트별 폴백
+        for mate_type in errors:
+            results[mate_type] = self.analyze(stock_data, mate_type)
+        
+        return {mate_type: results[mate_type] for mate_type in mate_types}
@@ -6,116 +6,133 @@
 - Fisher (필립 피셔): 성장주, R&D
 - Greenblatt (조엘 그린블라트): 마법공식, ROIC
 - Lynch (피터 린치): 일상 속 발견, 이해하기 쉬운 기업
+
+메이트별 평가 기준은 구간 점수표(MateRule)로 정의하고,
+점수는 지표 열 배열 전체를 numpy.searchsorted로 한 번에 계산한 뒤
+평가 이유/주의사항 문구는 최종 결과(종목별 구간)에서만 생성
 """
+from bisect import bisect_right
+from typing import Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
 
 
-class BenjaminMate:
+class MateRule:
     """
-    베니 (Benny) - 벤저민 그레이엄 메이트
-    - 핵심: 안전마진 (Margin of Safety)
-    - 중시: 저평가, 재무 안전성, 배당
-    - 캐릭터: 신중하고 보수적인 안전 지킴이
+    메이트 평가 항목 1개 (구간 점수표 + 구간별 문구)
+    
+    thresholds는 오름차순, points[i]는 searchsorted 결과 i(구간)의 점수
+    - '>=' / '>': 값이 클수록 높은 구간
+    - '<' / '<=': 값이 작을수록 앞 구간
+    reasons / cautions: {구간: 문구 템플릿} ({value}는 지표 값)
+    when: (지표, 연산자, 기준값) - 조건을 만족하지 않으면 구간 -1 (0점)
     """
+    SIDES = {'>=': 'right', '>': 'left', '<=': 'left', '<': 'right'}
     
-    name = "베니"
-    full_name = "베니 (Benny)"
-    character_name = "Benny"
-    original_investor = "벤저민 그레이엄"
-    color = "blue"
-    icon = "🎩"
-    motto = "손실을 피하는 게 먼저"
-    personality = "신중하고 보수적"
+    def __init__(self, field: str, op: str, thresholds: Sequence[float], points: Sequence[int],
+                 group: str, reasons: Optional[Dict[int, str]] = None,
+                 cautions: Optional[Dict[int, str]] = None, when: Optional[tuple] = None):
+        assert len(points) == len(thresholds) + 1
+        self.field = field
+        self.side = self.SIDES[op]
+        self.thresholds = np.asarray(thresholds, dtype=np.float64)
+        self.points = np.asarray(points, dtype=np.int64)
+        self.group = group
+        self.reasons = reasons or {}
+        self.cautions = cautions or {}
+        self.when = when
+    
+    def buckets(self, arrays: Mapping[str, np.ndarray]) -> np.ndarray:
+        buckets = np.searchsorted(self.thresholds, arrays[self.field], side=self.side)
+        if self.when is not None:
+            field, op, threshold = self.when
+            mask = compare(arrays[field], op, threshold)
+            buckets = np.where(mask, buckets, -1)
+        return buckets
+    
+    def scores(self, buckets: np.ndarray) -> np.ndarray:
+        return np.where(buckets >= 0, self.points[np.maximum(buckets, 0)], 0)
+
+
+def compare(values: np.ndarray, op: str, threshold: float) -> np.ndarray:
+    if op == '>':
+        return values > threshold
+    if op == '>=':
+        return values >= threshold
+    if op == '<':
+        return values < threshold
+    return values <= threshold
+
+
+# 지표가 없을 때 기본값 (None은 0으로 평가)
+FIELD_DEFAULTS = {
+    'debt_ratio': 100,
+    'current_ratio': 100,
+}
+
+# 종합 의견 구간 (50/60/70/80점 이상)
+SUMMARY_THRESHOLDS = (50, 60, 70, 80)
+
+
+def indicator_value(indicators: Mapping, field: str):
+    value = indicators.get(field, FIELD_DEFAULTS.get(field, 0))
+    return 0 if value is None else value
+
+
+class RuleBasedMate:
+    """
+    구간 점수표 기반 메이트 (점수 일괄 계산 + 결과 문구 생성)
+    """
+    RULES = ()
+    BASE_SCORE = 0
+    BASE_REASONS = ()
+    SUMMARIES = ()  # 50점 미만 → 80점 이상 (5개)
+    MAX_REASONS = 3
+    MAX_CAUTIONS = 2
     
     @classmethod
-    def analyze(cls, indicators):
+    def fields(cls) -> List[str]:
+        fields = []
+        for rule in cls.RULES:
+            fields.append(rule.field)
+            if rule.when is not None:
+                fields.append(rule.when[0])
+        return list(dict.fromkeys(fields))
+    
+    @classmethod
+    def evaluate(cls, arrays: Mapping[str, np.ndarray]) -> Dict:
         """
-        벤저민 관점 분석
+        지표 열 배열 → 점수 배열
         
-        평가 기준:
-        - 안전성 (50점): 부채비율, 유동비율, FCF
-        - 저평가 (30점): PBR, PER (현재는 간단히 FCF 마진으로 대체)
-        - 배당 (20점): FCF 양수 분기 수
+        Returns:
+            {'score': 점수 배열, 'buckets': [항목별 구간 배열], 'groups': {그룹: 점수 배열}}
         """
-        score = 0
-        reasons = []
-        cautions = []
+        size = len(next(iter(arrays.values())))
+        buckets = [rule.buckets(arrays) for rule in cls.RULES]
         
-        # 1. 안전성 평가 (50점)
-        safety_score = 0
+        groups = {}
+        score = np.full(size, cls.BASE_SCORE, dtype=np.int64)
+        for rule, rule_buckets in zip(cls.RULES, buckets):
+            points = rule.scores(rule_buckets)
+            groups[rule.group] = groups.get(rule.group, 0) + points
+            score += points
         
-        # 부채비율 (25점)
-        debt_ratio = indicators.get('debt_ratio', 100)
-        if debt_ratio < 30:
-            safety_score += 25
-            reasons.append(f"부채비율 {debt_ratio:.1f}%로 매우 건전합니다")
-        elif debt_ratio < 50:
-            safety_score += 20
-            reasons.append(f"부채비율 {debt_ratio:.1f}%로 안정적입니다")
-        elif debt_ratio < 100:
-            safety_score += 15
-        else:
-            cautions.append(f"부채비율 {debt_ratio:.1f}%로 다소 높습니다")
-        
-        # 유동비율 (15점)
-        current_ratio = indicators.get('current_ratio', 100)
-        if current_ratio >= 200:
-            safety_score += 15
-            reasons.append(f"유동비율 {current_ratio:.0f}%로 우수합니다")
-        elif current_ratio >= 150:
-            safety_score += 10
-        elif current_ratio >= 100:
-            safety_score += 5
-        
-        # FCF 양수 (10점)
-        fcf = indicators.get('ttm_fcf', 0)
-        if fcf > 0:
-            safety_score += 10
-            reasons.append("안정적인 현금흐름을 보이고 있습니다")
-        else:
-            cautions.append("FCF가 음수입니다")
-        
-        score += safety_score
-        
-        # 2. 저평가 평가 (30점) - 간단히 FCF 마진으로 평가
-        value_score = 0
-        fcf_margin = indicators.get('fcf_margin', 0)
-        
-        if fcf_margin >= 15:
-            value_score += 30
-            reasons.append(f"FCF 마진 {fcf_margin:.1f}%로 높은 수익성")
-        elif fcf_margin >= 10:
-            value_score += 20
-        elif fcf_margin >= 5:
-            value_score += 10
-        else:
-            cautions.append("FCF 마진이 낮습니다")
-        
-        score += value_score
-        
-        # 3. 배당/안정성 (20점)
-        fcf_positive_quarters = indicators.get('fcf_positive_quarters', 0)
-        
-        if fcf_positive_quarters >= 18:
-            score += 20
-            reasons.append(f"최근 20분기 중 {fcf_positive_quarters}분기 양수 FCF - 매우 안정적")
-        elif fcf_positive_quarters >= 16:
-            score += 15
-        elif fcf_positive_quarters >= 12:
-            score += 10
-        else:
-            cautions.append("FCF가 불안정합니다")
+        return {'score': score, 'buckets': buckets, 'groups': groups}
+    
+    @classmethod
+    def describe(cls, indicators: Mapping, score: int, buckets: Sequence[int], groups: Mapping[str, int]) -> Dict:
+        """
+        종목 1개의 최종 결과 (평가 이유/주의사항/의견 문구)
+        """
+        reasons = list(cls.BASE_REASONS)
+        cautions = []
+        for rule, bucket in zip(cls.RULES, buckets):
+            if bucket in rule.reasons:
+                reasons.append(rule.reasons[bucket].format(value=indicator_value(indicators, rule.field)))
+            if bucket in rule.cautions:
+                cautions.append(rule.cautions[bucket].format(value=indicator_value(indicators, rule.field)))
         
-        # 종합 의견
-        if score >= 80:
-            summary = "훌륭한 안전 자산입니다"
-        elif score >= 70:
-            summary = "장기 보유 적합한 안전 자산입니다"
-        elif score >= 60:
-            summary = "안정적이나 일부 주의사항이 있습니다"
-        elif score >= 50:
-            summary = "보수적 투자자에게는 다소 위험할 수 있습니다"
-        else:
-            summary = "안전마진이 부족합니다"
+        summary = cls.SUMMARIES[bisect_right(SUMMARY_THRESHOLDS, score)]
         
         return {
             'mate': cls.name,
@@ -123,13 +140,85 @@ class BenjaminMate:
             'color': cls.color,
             'score': score,
             'summary': summary,
-            'reasons': reasons[:3],  # 상위 3개만
-            'cautions': cautions[:2],  # 상위 2개만
-            'recommendation': cls._get_recommendation(score, reasons, cautions),
+            'reasons': reasons[:cls.MAX_REASONS],
+            'cautions': cautions[:cls.MAX_CAUTIONS],
+            'recommendation': cls.recommend(indicators, score, groups),
         }
     
     @classmethod
-    def _get_recommendation(cls, score, reasons, cautions):
+    def recommend(cls, indicators: Mapping, score: int, groups: Mapping[str, int]) -> str:
+        raise NotImplementedError
+    
+    @classmethod
+    def analyze(cls, indicators):
+        """지표 딕셔너리 1개 분석"""
+        arrays = indicator_arrays([indicators], cls.fields())
+        evaluated = cls.evaluate(arrays)
+        return cls.describe(
+            indicators,
+            int(evaluated['score'][0]),
+            [int(buckets[0]) for buckets in evaluated['buckets']],
+            {group: int(points[0]) for group, points in evaluated['groups'].items()},
+        )
+
+
+class BenjaminMate(RuleBasedMate):
+    """
+    베니 (Benny) - 벤저민 그레이엄 메이트
+    - 핵심: 안전마진 (Margin of Safety)
+    - 중시: 저평가, 재무 안전성, 배당
+    - 캐릭터: 신중하고 보수적인 안전 지킴이
+    
+    평가 기준:
+    - 안전성 (50점): 부채비율, 유동비율, FCF
+    - 저평가 (30점): PBR, PER (현재는 간단히 FCF 마진으로 대체)
+    - 배당 (20점): FCF 양수 분기 수
+    """
+    
+    name = "베니"
+    full_name = "베니 (Benny)"
+    character_name = "Benny"
+    original_investor = "벤저민 그레이엄"
+    color = "blue"
+    icon = "🎩"
+    motto = "손실을 피하는 게 먼저"
+    personality = "신중하고 보수적"
+    
+    RULES = (
+        # 1. 안전성 - 부채비율 (25점)
+        MateRule('debt_ratio', '<', [30, 50, 100], [25, 20, 15, 0], 'safety',
+                 reasons={0: "부채비율 {value:.1f}%로 매우 건전합니다", 1: "부채비율 {value:.1f}%로 안정적입니다"},
+                 cautions={3: "부채비율 {value:.1f}%로 다소 높습니다"}),
+        # 유동비율 (15점)
+        MateRule('current_ratio', '>=', [100, 150, 200], [0, 5, 10, 15], 'safety',
+                 reasons={3: "유동비율 {value:.0f}%로 우수합니다"}),
+        # FCF 양수 (10점)
+        MateRule('ttm_fcf', '>', [0], [0, 10], 'safety',
+                 reasons={1: "안정적인 현금흐름을 보이고 있습니다"},
+                 cautions={0: "FCF가 음수입니다"}),
+        # 2. 저평가 (30점) - 간단히 FCF 마진으로 평가
+        MateRule('fcf_margin', '>=', [5, 10, 15], [0, 10, 20, 30], 'value',
+                 reasons={3: "FCF 마진 {value:.1f}%로 높은 수익성"},
+                 cautions={0: "FCF 마진이 낮습니다"}),
+        # 3. 배당/안정성 (20점)
+        MateRule('fcf_positive_quarters', '>=', [12, 16, 18], [0, 10, 15, 20], 'dividend',
+                 reasons={3: "최근 20분기 중 {value}분기 양수 FCF - 매우 안정적"},
+                 cautions={0: "FCF가 불안정합니다"}),
+    )
+    SUMMARIES = (
+        "안전마진이 부족합니다",
+        "보수적 투자자에게는 다소 위험할 수 있습니다",
+        "안정적이나 일부 주의사항이 있습니다",
+        "장기 보유 적합한 안전 자산입니다",
+        "훌륭한 안전 자산입니다",
+    )
+    
+    @classmethod
+    def recommend(cls, indicators, score, groups):
+        return cls._get_recommendation(score)
+    
+    @classmethod
+    def _get_recommendation(cls, score):
         """투자 판단"""
         if score >= 70:
             return "안전마진이 충분하여 장기 투자에 적합합니다"
@@ -139,12 +228,17 @@ class BenjaminMate:
             return "리스크가 있어 신중한 접근이 필요합니다"
 
 
-class FisherMate:
+class FisherMate(RuleBasedMate):
     """
     그로우 (Grow) - 필립 피셔 메이트
     - 핵심: 성장주 발굴
     - 중시: 매출 성장, ROE, 현금흐름 개선
     - 캐릭터: 열정적이고 미래 지향적인 성장 탐험가
+    
+    평가 기준:
+    - 성장성 (50점): 매출 성장률, FCF 성장률
+    - 수익성 (30점): ROE, FCF 마진
+    - 현금창출력 (20점): FCF 양수 분기
     """
     
     name = "그로우"
@@ -156,115 +250,38 @@ class FisherMate:
     motto = "우수한 기업은 시간이 증명한다"
     personality = "열정적이고 미래 지향적"
     
-    @classmethod
-    def analyze(cls, indicators):
-        """
-        피셔 관점 분석
-        
-        평가 기준:
-        - 성장성 (50점): 매출 성장률, FCF 성장률
-        - 수익성 (30점): ROE, FCF 마진
-        - 현금창출력 (20점): FCF 양수 분기
-        """
-        score = 0
-        reasons = []
-        cautions = []
-        
-        # 1. 성장성 평가 (50점)
-        growth_score = 0
-        
-        # 매출 성장률 (30점)
-        revenue_growth = indicators.get('revenue_growth') or 0
-        if revenue_growth >= 20:
-            growth_score += 30
-            reasons.append(f"매출이 전년 대비 {revenue_growth:.1f}% 급성장 중입니다")
-        elif revenue_growth >= 15:
-            growth_score += 25
-            reasons.append(f"매출 성장률 {revenue_growth:.1f}%로 빠르게 성장 중")
-        elif revenue_growth >= 10:
-            growth_score += 20
-        elif revenue_growth >= 5:
-            growth_score += 10
-        elif revenue_growth >= 0:
-            growth_score += 5
-        else:
-            cautions.append(f"매출이 감소하고 있습니다 ({revenue_growth:.1f}%)")
-        
+    RULES = (
+        # 1. 성장성 - 매출 성장률 (30점)
+        MateRule('revenue_growth', '>=', [0, 5, 10, 15, 20], [0, 5, 10, 20, 25, 30], 'growth',
+                 reasons={5: "매출이 전년 대비 {value:.1f}% 급성장 중입니다", 4: "매출 성장률 {value:.1f}%로 빠르게 성장 중"},
+                 cautions={0: "매출이 감소하고 있습니다 ({value:.1f}%)"}),
         # FCF 성장률 (20점)
-        fcf_growth = indicators.get('fcf_growth') or 0
-        if fcf_growth >= 20:
-            growth_score += 20
-            reasons.append("현금흐름이 빠르게 개선되고 있습니다")
-        elif fcf_growth >= 10:
-            growth_score += 15
-        elif fcf_growth >= 0:
-            growth_score += 10
-        else:
-            cautions.append("FCF가 감소 추세입니다")
-        
-        score += growth_score
-        
-        # 2. 수익성 (30점)
-        profitability_score = 0
-        
-        # ROE (20점)
-        roe = indicators.get('roe', 0)
-        if roe >= 25:
-            profitability_score += 20
-            reasons.append(f"ROE {roe:.1f}%로 뛰어난 수익성")
-        elif roe >= 20:
-            profitability_score += 15
-        elif roe >= 15:
-            profitability_score += 10
-        elif roe >= 10:
-            profitability_score += 5
-        else:
-            cautions.append(f"ROE {roe:.1f}%로 수익성이 낮습니다")
-        
+        MateRule('fcf_growth', '>=', [0, 10, 20], [0, 10, 15, 20], 'growth',
+                 reasons={3: "현금흐름이 빠르게 개선되고 있습니다"},
+                 cautions={0: "FCF가 감소 추세입니다"}),
+        # 2. 수익성 - ROE (20점)
+        MateRule('roe', '>=', [10, 15, 20, 25], [0, 5, 10, 15, 20], 'profitability',
+                 reasons={4: "ROE {value:.1f}%로 뛰어난 수익성"},
+                 cautions={0: "ROE {value:.1f}%로 수익성이 낮습니다"}),
         # FCF 마진 (10점)
-        fcf_margin = indicators.get('fcf_margin', 0)
-        if fcf_margin >= 15:
-            profitability_score += 10
-        elif fcf_margin >= 10:
-            profitability_score += 7
-        elif fcf_margin >= 5:
-            profitability_score += 5
-        
-        score += profitability_score
-        
+        MateRule('fcf_margin', '>=', [5, 10, 15], [0, 5, 7, 10], 'profitability'),
         # 3. 현금창출력 (20점)
-        fcf_positive = indicators.get('fcf_positive_quarters', 0)
-        if fcf_positive >= 18:
-            score += 20
-        elif fcf_positive >= 16:
-            score += 15
-        elif fcf_positive >= 12:
-            score += 10
-        else:
-            cautions.append("현금흐름이 불안정합니다")
-        
-        # 종합 의견
-        if score >= 80:
-            summary = "탁월한 성장 잠재력을 가진 기업입니다"
-        elif score >= 70:
-            summary = "성장성이 뛰어난 기업입니다"
-        elif score >= 60:
-            summary = "꾸준한 성장이 기대되는 기업입니다"
-        elif score >= 50:
-            summary = "성장성은 보통 수준입니다"
-        else:
-            summary = "성장 동력이 부족해 보입니다"
-        
-        return {
-            'mate': cls.name,
-            'icon': cls.icon,
-            'color': cls.color,
-            'score': score,
-            'summary': summary,
-            'reasons': reasons[:3],
-            'cautions': cautions[:2],
-            'recommendation': cls._get_recommendation(score, revenue_growth, roe),
-        }
+        MateRule('fcf_positive_quarters', '>=', [12, 16, 18], [0, 10, 15, 20], 'cashflow',
+                 cautions={0: "현금흐름이 불안정합니다"}),
+    )
+    SUMMARIES = (
+        "성장 동력이 부족해 보입니다",
+        "성장성은 보통 수준입니다",
+        "꾸준한 성장이 기대되는 기업입니다",
+        "성장성이 뛰어난 기업입니다",
+        "탁월한 성장 잠재력을 가진 기업입니다",
+    )
+    
+    @classmethod
+    def recommend(cls, indicators, score, groups):
+        return cls._get_recommendation(
+            score, indicator_value(indicators, 'revenue_growth'), indicator_value(indicators, 'roe')
+        )
     
     @classmethod
     def _get_recommendation(cls, score, revenue_growth, roe):
@@ -277,12 +294,16 @@ class FisherMate:
             return "성장성 측면에서는 매력도가 떨어집니다"
 
 
-class GreenblattMate:
+class GreenblattMate(RuleBasedMate):
     """
     매직 (Magic) - 조엘 그린블라트 메이트
     - 핵심: 마법공식 (Magic Formula)
     - 중시: ROIC, 이익수익률
     - 캐릭터: 논리적이고 수학적인 마법사
+    
+    평가 기준:
+    - 우량도 (50점): ROE, FCF 마진 (ROIC 대체)
+    - 염가도 (50점): FCF 기준 저평가
     """
     
     name = "매직"
@@ -294,103 +315,49 @@ class GreenblattMate:
     motto = "우량하고 저렴한 기업"
     personality = "논리적이고 수학적"
     
-    @classmethod
-    def analyze(cls, indicators):
-        """
-        그린블라트 관점 분석
-        
-        평가 기준:
-        - 우량도 (50점): ROE, FCF 마진 (ROIC 대체)
-        - 염가도 (50점): FCF 기준 저평가
-        """
-        score = 0
-        reasons = []
-        cautions = []
-        
-        # 1. 우량도 (50점) - ROE로 대체
-        quality_score = 0
-        
-        roe = indicators.get('roe', 0)
-        if roe >= 20:
-            quality_score += 30
-            reasons.append(f"자본 효율이 뛰어납니다 (ROE {roe:.1f}%)")
-        elif roe >= 15:
-            quality_score += 25
-        elif roe >= 10:
-            quality_score += 15
-        elif roe >= 5:
-            quality_score += 10
-        else:
-            cautions.append("자본 효율이 낮습니다")
-        
+    RULES = (
+        # 1. 우량도 - ROE (30점)
+        MateRule('roe', '>=', [5, 10, 15, 20], [0, 10, 15, 25, 30], 'quality',
+                 reasons={4: "자본 효율이 뛰어납니다 (ROE {value:.1f}%)"},
+                 cautions={0: "자본 효율이 낮습니다"}),
         # FCF 마진 (20점)
-        fcf_margin = indicators.get('fcf_margin', 0)
-        if fcf_margin >= 15:
-            quality_score += 20
-            reasons.append(f"현금 창출 능력이 우수합니다 ({fcf_margin:.1f}%)")
-        elif fcf_margin >= 10:
-            quality_score += 15
-        elif fcf_margin >= 5:
-            quality_score += 10
-        
-        score += quality_score
-        
-        # 2. 염가도 (50점) - 간단히 FCF 대비 평가
-        value_score = 0
-        
-        fcf = indicators.get('ttm_fcf', 0)
-        revenue = indicators.get('ttm_revenue', 1)
-        
-        # FCF yield 계산 (간단 버전)
-        if fcf > 0 and fcf_margin >= 10:
-            value_score += 30
-            reasons.append("현금흐름 대비 적정 가격입니다")
-        elif fcf > 0 and fcf_margin >= 5:
-            value_score += 20
-        elif fcf > 0:
-            value_score += 10
-        else:
-            cautions.append("FCF가 음수입니다")
-        
+        MateRule('fcf_margin', '>=', [5, 10, 15], [0, 10, 15, 20], 'quality',
+                 reasons={3: "현금 창출 능력이 우수합니다 ({value:.1f}%)"}),
+        # 2. 염가도 - FCF 대비 평가 (30점, FCF 양수일 때만)
+        MateRule('fcf_margin', '>=', [5, 10], [10, 20, 30], 'value', when=('ttm_fcf', '>', 0),
+                 reasons={2: "현금흐름 대비 적정 가격입니다"},
+                 cautions={-1: "FCF가 음수입니다"}),
         # 안정성 (20점)
-        debt_ratio = indicators.get('debt_ratio', 100)
-        if debt_ratio < 50:
-            value_score += 20
-        elif debt_ratio < 100:
-            value_score += 10
-        
-        score += value_score
-        
-        # 종합 의견
-        if score >= 80:
-            summary = "우량하고 저렴한 마법공식 후보입니다"
-        elif score >= 70:
-            summary = "우량한 기업이지만 가격은 적정 수준입니다"
-        elif score >= 60:
-            summary = "우량성과 가격이 균형을 이룹니다"
-        elif score >= 50:
-            summary = "우량도나 염가도 중 하나가 부족합니다"
-        else:
-            summary = "마법공식 기준에는 미달입니다"
-        
-        # 순위 표시 (간단 버전)
-        quality_rank = "상위 20%" if quality_score >= 40 else "중위권"
-        value_rank = "상위 30%" if value_score >= 35 else "중위권"
-        
-        return {
-            'mate': cls.name,
-            'icon': cls.icon,
-            'color': cls.color,
-            'score': score,
-            'summary': summary,
-            'reasons': reasons[:3],
-            'cautions': cautions[:2],
-            'recommendation': cls._get_recommendation(score, quality_rank, value_rank),
-            'details': {
-                'quality_rank': quality_rank,
-                'value_rank': value_rank,
-            }
+        MateRule('debt_ratio', '<', [50, 100], [20, 10, 0], 'value'),
+    )
+    SUMMARIES = (
+        "마법공식 기준에는 미달입니다",
+        "우량도나 염가도 중 하나가 부족합니다",
+        "우량성과 가격이 균형을 이룹니다",
+        "우량한 기업이지만 가격은 적정 수준입니다",
+        "우량하고 저렴한 마법공식 후보입니다",
+    )
+    
+    @classmethod
+    def ranks(cls, groups):
+        """순위 표시 (간단 버전)"""
+        quality_rank = "상위 20%" if groups['quality'] >= 40 else "중위권"
+        value_rank = "상위 30%" if groups['value'] >= 35 else "중위권"
+        return quality_rank, value_rank
+    
+    @classmethod
+    def describe(cls, indicators, score, buckets, groups):
+        result = super().describe(indicators, score, buckets, groups)
+        quality_rank, value_rank = cls.ranks(groups)
+        result['details'] = {
+            'quality_rank': quality_rank,
+            'value_rank': value_rank,
         }
+        return result
+    
+    @classmethod
+    def recommend(cls, indicators, score, groups):
+        return cls._get_recommendation(score, *cls.ranks(groups))
     
     @classmethod
     def _get_recommendation(cls, score, quality_rank, value_rank):
@@ -403,12 +370,17 @@ class GreenblattMate:
             return "마법공식 기준으로는 추천하기 어렵습니다"
 
 
-class LynchMate:
+class LynchMate(RuleBasedMate):
     """
     데일리 (Daily) - 피터 린치 메이트
     - 핵심: 일상에서 발견
     - 중시: 이해하기 쉬운 비즈니스, 실적 개선 모멘텀
     - 캐릭터: 친근하고 실용적인 일상 투자자
+    
+    평가 기준:
+    - 이해가능성 (30점): 섹터, 비즈니스 단순성
+    - 실적 모멘텀 (40점): 매출/ROE 성장
+    - 기본 체력 (30점): FCF, 부채
     """
     
     name = "데일리"
@@ -420,102 +392,37 @@ class LynchMate:
     motto = "이해할 수 있는 곳에 투자하라"
     personality = "친근하고 실용적"
     
-    @classmethod
-    def analyze(cls, indicators):
-        """
-        린치 관점 분석
-        
-        평가 기준:
-        - 이해가능성 (30점): 섹터, 비즈니스 단순성
-        - 실적 모멘텀 (40점): 매출/ROE 성장
-        - 기본 체력 (30점): FCF, 부채
-        """
-        score = 0
-        reasons = []
-        cautions = []
-        
-        # 1. 이해가능성 (30점) - 기본 점수 제공
-        # 실제로는 섹터, 제품 친숙도 등으로 평가해야 함
-        understandability_score = 20  # 기본 점수
-        reasons.append("비즈니스 모델이 이해하기 쉽습니다")
-        score += understandability_score
-        
-        # 2. 실적 모멘텀 (40점)
-        momentum_score = 0
-        
-        # 매출 성장 (25점)
-        revenue_growth = indicators.get('revenue_growth') or 0
-        if revenue_growth >= 15:
-            momentum_score += 25
-            reasons.append(f"매출이 {revenue_growth:.1f}% 급성장하고 있습니다")
-        elif revenue_growth >= 10:
-            momentum_score += 20
-        elif revenue_growth >= 5:
-            momentum_score += 15
-        elif revenue_growth >= 0:
-            momentum_score += 10
-        else:
-            cautions.append("매출이 감소하고 있습니다")
-        
+    # 1. 이해가능성 (30점) - 기본 점수 제공
+    # 실제로는 섹터, 제품 친숙도 등으로 평가해야 함
+    BASE_SCORE = 20
+    BASE_REASONS = ("비즈니스 모델이 이해하기 쉽습니다",)
+    
+    RULES = (
+        # 2. 실적 모멘텀 - 매출 성장 (25점)
+        MateRule('revenue_growth', '>=', [0, 5, 10, 15], [0, 10, 15, 20, 25], 'momentum',
+                 reasons={4: "매출이 {value:.1f}% 급성장하고 있습니다"},
+                 cautions={0: "매출이 감소하고 있습니다"}),
         # ROE 개선 (15점)
-        roe = indicators.get('roe', 0)
-        if roe >= 15:
-            momentum_score += 15
-            reasons.append(f"수익성이 우수합니다 (ROE {roe:.1f}%)")
-        elif roe >= 10:
-            momentum_score += 10
-        elif roe >= 5:
-            momentum_score += 5
-        
-        score += momentum_score
-        
-        # 3. 기본 체력 (30점)
-        fundamental_score = 0
-        
-        # FCF (20점)
-        fcf_positive = indicators.get('fcf_positive_quarters', 0)
-        if fcf_positive >= 16:
-            fundamental_score += 20
-        elif fcf_positive >= 12:
-            fundamental_score += 15
-        elif fcf_positive >= 8:
-            fundamental_score += 10
-        else:
-            cautions.append("현금흐름이 불안정합니다")
-        
+        MateRule('roe', '>=', [5, 10, 15], [0, 5, 10, 15], 'momentum',
+                 reasons={3: "수익성이 우수합니다 (ROE {value:.1f}%)"}),
+        # 3. 기본 체력 - FCF (20점)
+        MateRule('fcf_positive_quarters', '>=', [8, 12, 16], [0, 10, 15, 20], 'fundamental',
+                 cautions={0: "현금흐름이 불안정합니다"}),
         # 부채 (10점)
-        debt_ratio = indicators.get('debt_ratio', 100)
-        if debt_ratio < 100:
-            fundamental_score += 10
-        elif debt_ratio < 150:
-            fundamental_score += 5
-        else:
-            cautions.append("부채가 과도합니다")
-        
-        score += fundamental_score
-        
-        # 종합 의견
-        if score >= 80:
-            summary = "일상 속에서 발견한 숨은 보석입니다"
-        elif score >= 70:
-            summary = "성장 모멘텀이 좋은 기업입니다"
-        elif score >= 60:
-            summary = "관심을 가질 만한 기업입니다"
-        elif score >= 50:
-            summary = "평범한 기업입니다"
-        else:
-            summary = "실적 모멘텀이 부족합니다"
-        
-        return {
-            'mate': cls.name,
-            'icon': cls.icon,
-            'color': cls.color,
-            'score': score,
-            'summary': summary,
-            'reasons': reasons[:3],
-            'cautions': cautions[:2],
-            'recommendation': cls._get_recommendation(score, revenue_growth),
-        }
+        MateRule('debt_ratio', '<', [100, 150], [10, 5, 0], 'fundamental',
+                 cautions={2: "부채가 과도합니다"}),
+    )
+    SUMMARIES = (
+        "실적 모멘텀이 부족합니다",
+        "평범한 기업입니다",
+        "관심을 가질 만한 기업입니다",
+        "성장 모멘텀이 좋은 기업입니다",
+        "일상 속에서 발견한 숨은 보석입니다",
+    )
+    
+    @classmethod
+    def recommend(cls, indicators, score, groups):
+        return cls._get_recommendation(score, indicator_value(indicators, 'revenue_growth'))
     
     @classmethod
     def _get_recommendation(cls, score, revenue_growth):
@@ -528,6 +435,12 @@ class LynchMate:
             return "현재로서는 매력도가 떨어집니다"
 
 
+# 규칙 엔진이 저장한 분석의 버전 접두어 (이 접두어가 아닌 분석은 LLM 등 다른 작성자 소유, 재계산 제외)
+VERSION_PREFIX = 'rule-'
+
+# 점수표/문구 변경 시 올리면 규칙 엔진 메이트 분석 재계산 (MateAnalysis.analysis_version)
+ENGINE_VERSION = f'{VERSION_PREFIX}1.0'
+
 # 4개 메이트 통합
 MATES = {
     'benjamin': BenjaminMate,
@@ -536,19 +449,68 @@ MATES = {
     'lynch': LynchMate,
 }
 
+# 모든 메이트가 사용하는 지표
+MATE_FIELDS = tuple(dict.fromkeys(field for mate_class in MATES.values() for field in mate_class.fields()))
 
-def analyze_with_all_mates(indicators):
+
+def indicator_arrays(rows: Sequence[Mapping], fields: Sequence[str] = MATE_FIELDS) -> Dict[str, np.ndarray]:
+    """지표 딕셔너리 목록 → {지표: float 배열} (없는 값은 기본값, None은 0)"""
+    arrays = {}
+    for field in fields:
+        default = FIELD_DEFAULTS.get(field, 0)
+        values = np.array([row.get(field, default) for row in rows], dtype=np.float64)  # None → NaN
+        arrays[field] = np.nan_to_num(values, nan=0.0)
+    return arrays
+
+
+def analyze_with_all_mates_bulk(rows: Sequence[Mapping]) -> List[Dict]:
     """
-    모든 메이트로 분석
+    여러 종목을 모든 메이트로 분석 (점수는 지표 열 배열로 한 번에 계산)
+    
+    Args:
+        rows: 종목별 지표 딕셔너리 목록
+    
+    Returns:
+        [{mate_id: 분석 결과}, ...] (rows 순서)
     """
-    results = {}
+    if not rows:
+        return []
+    
+    arrays = indicator_arrays(rows)
     
+    # 메이트별 점수/구간은 배열 연산 후 파이썬 리스트로 한 번에 변환
+    evaluated = {}
     for mate_id, mate_class in MATES.items():
-        results[mate_id] = mate_class.analyze(indicators)
+        result = mate_class.evaluate(arrays)
+        evaluated[mate_id] = (
+            result['score'].tolist(),
+            list(zip(*(buckets.tolist() for buckets in result['buckets']))),
+            {group: points.tolist() for group, points in result['groups'].items()},
+        )
     
+    # 문구는 최종 점수/구간에서만 생성
+    results = []
+    for i, indicators in enumerate(rows):
+        analysis = {}
+        for mate_id, mate_class in MATES.items():
+            scores, buckets, groups = evaluated[mate_id]
+            analysis[mate_id] = mate_class.describe(
+                indicators,
+                scores[i],
+                buckets[i],
+                {group: points[i] for group, points in groups.items()},
+            )
+        results.append(analysis)
     return results
 
 
+def analyze_with_all_mates(indicators):
+    """
+    모든 메이트로 분석
+    """
+    return analyze_with_all_mates_bulk([indicators])[0]
+
+
 def recommend_mate(watchlist_analysis):
     """
     사용자 관심 종목 기반 메이트 추천
@@ -581,4 +543,3 @@ def recommend_mate(watchlist_analysis):
         'reason': f"{recommended_mate.name}가 당신의 관심 종목을 높이 평가했어요",
         'personality': recommended_mate.motto,
     }
-
@@ -0,0 +1,291 @@
+"""
+메이트 LLM 프롬프트
+
+GPT 메이트 분석(scripts/run_mate_analysis.py, 분석 작업 apps.analysis.services.mate_analysis_job)이
+같은 프롬프트를 쓰도록 공용으로 둠 → 같은 종목/지표면 LLM 캐시 키도 같음
+
+- build_messages: 메이트 1명 개별 요청
+- build_combined_messages / validate_combined: 4명 통합 요청 (지표 블록 1회)
+
+입력: 지표 딕셔너리 (apps.stocks.services.mate_analysis.llm_indicators)
+"""
+from core.utils.mate_response import MateResponseError, parse_combined_response
+
+
+def build_benjamin_prompt(indicators):
+    """벤저민 그레이엄 메이트 프롬프트 (system, user)"""
+    prompt = f"""
+당신은 벤저민 그레이엄의 투자 철학을 따르는 AI 분석가입니다.
+
+투자 원칙:
+• 안전마진 최우선
+• 재무 안전성 중시 (부채비율, 유동비율)
+• 현금흐름 품질
+
+기업 정보:
+- 기업명: {indicators['stock_name']}
+- ROE: {indicators['roe']}%
+- 부채비율: {indicators['debt_ratio']}%
+- 유동비율: {indicators['current_ratio']}%
+- FCF 마진: {indicators['fcf_margin']}%
+- OCF: ${indicators['ocf']:,.0f}
+- FCF: ${indicators['fcf']:,.0f}
+
+당신의 투자 철학에 따라 이 기업을 평가하세요.
+
+응답 형식 (JSON):
+{{
+  "score": 0-100 점수,
+  "summary": "한 줄 요약 (30자 이내)",
+  "reason": "평가 이유 (3-4줄, 쉬운 언어, 구체적 숫자 포함)",
+  "caution": "주의사항 (있다면)",
+  "score_detail": {{
+    "safety": 0-100,
+    "cashflow": 0-100,
+    "stability": 0-100
+  }}
+}}
+
+말투: 신중하고 정중한 톤
+"""
+    
+    return "벤저민 그레이엄 스타일 투자 분석가", prompt
+
+
+def build_fisher_prompt(indicators):
+    """필립 피셔 메이트 프롬프트 (system, user)"""
+    prompt = f"""
+당신은 필립 피셔의 투자 철학을 따르는 AI 분석가입니다.
+
+투자 원칙:
+• 성장성 중시
+• 현금흐름 창출 능력
+• 장기 투자
+
+기업 정보:
+- 기업명: {indicators['stock_name']}
+- ROE: {indicators['roe']}%
+- OCF: ${indicators['ocf']:,.0f}
+- FCF: ${indicators['fcf']:,.0f}
+- FCF 마진: {indicators['fcf_margin']}%
+- 매출: ${indicators['revenue']:,.0f}
+
+당신의 투자 철학에 따라 이 기업의 성장성을 평가하세요.
+
+응답 형식 (JSON):
+{{
+  "score": 0-100 점수,
+  "summary": "한 줄 요약 (30자 이내)",
+  "reason": "평가 이유 (3-4줄, 쉬운 언어, 구체적 숫자 포함)",
+  "caution": "주의사항 (있다면)",
+  "score_detail": {{
+    "growth": 0-100,
+    "quality": 0-100,
+    "management": 0-100
+  }}
+}}
+
+말투: 열정적이고 미래 지향적
+"""
+    
+    return "필립 피셔 스타일 투자 분석가", prompt
+
+
+def build_greenblatt_prompt(indicators):
+    """조엘 그린블라트 메이트 프롬프트 (system, user)"""
+    
+    # ROIC 계산 (간이버전: ROE 사용)
+    roic = indicators['roe']
+    
+    # Earnings Yield 계산 (간이버전: Net Income / Total Assets)
+    earnings_yield = (indicators['net_income'] / indicators['total_assets'] * 100) if indicators['total_assets'] else 0
+    
+    prompt = f"""
+당신은 조엘 그린블라트의 마법공식을 따르는 AI 분석가입니다.
+
+투자 원칙:
+• 좋은 회사 (높은 ROIC)
+• 싼 가격 (높은 Earnings Yield)
+• 계량적 분석
+
+기업 정보:
+- 기업명: {indicators['stock_name']}
+- ROIC (ROE): {roic:.2f}%
+- Earnings Yield: {earnings_yield:.2f}%
+- FCF: ${indicators['fcf']:,.0f}
+- 총자산: ${indicators['total_assets']:,.0f}
+
+당신의 마법공식에 따라 이 기업을 평가하세요.
+
+응답 형식 (JSON):
+{{
+  "score": 0-100 점수,
+  "summary": "한 줄 요약 (30자 이내)",
+  "reason": "평가 이유 (3-4줄, 쉬운 언어, 구체적 숫자 포함)",
+  "caution": "주의사항 (있다면)",
+  "score_detail": {{
+    "roic": 0-100,
+    "earnings_yield": 0-100,
+    "value": 0-100
+  }}
+}}
+
+말투: 명확하고 논리적
+"""
+    
+    return "조엘 그린블라트 스타일 투자 분석가", prompt
+
+
+def build_lynch_prompt(indicators):
+    """피터 린치 메이트 프롬프트 (system, user)"""
+    revenue_growth = indicators['revenue_growth']
+    revenue_growth_text = f"{revenue_growth:.1f}%" if revenue_growth is not None else "데이터 없음"
+    
+    prompt = f"""
+당신은 피터 린치의 투자 철학을 따르는 AI 분석가입니다.
+
+투자 원칙:
+• 이해하기 쉬운 사업
+• 합리적인 가격의 꾸준한 성장
+• 탄탄한 재무 (낮은 부채)
+
+기업 정보:
+- 기업명: {indicators['stock_name']}
+- 매출 성장률 (YoY): {revenue_growth_text}
+- ROE: {indicators['roe']}%
+- 부채비율: {indicators['debt_ratio']}%
+- FCF 마진: {indicators['fcf_margin']}%
+- 순이익: ${indicators['net_income']:,.0f}
+
+당신의 투자 철학에 따라 이 기업을 평가하세요.
+
+응답 형식 (JSON):
+{{
+  "score": 0-100 점수,
+  "summary": "한 줄 요약 (30자 이내)",
+  "reason": "평가 이유 (3-4줄, 쉬운 언어, 구체적 숫자 포함)",
+  "caution": "주의사항 (있다면)",
+  "score_detail": {{
+    "growth": 0-100,
+    "simplicity": 0-100,
+    "value": 0-100
+  }}
+}}
+
+말투: 친근하고 쉬운 설명
+"""
+    
+    return "피터 린치 스타일 투자 분석가", prompt
+
+
+# 메이트 → 프롬프트 생성
+MATE_PROMPTS = {
+    'benjamin': build_benjamin_prompt,
+    'fisher': build_fisher_prompt,
+    'greenblatt': build_greenblatt_prompt,
+    'lynch': build_lynch_prompt,
+}
+
+
+def build_messages(mate_type, indicators):
+    """메이트 1명 개별 요청 messages"""
+    system_prompt, prompt = MATE_PROMPTS[mate_type](indicators)
+    return [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": prompt}
+    ]
+
+
+# 통합 프롬프트용 메이트별 관점 (개별 프롬프트의 투자 원칙 / 세부 점수 / 말투)
+MATE_GUIDES = {
+    'benjamin': {
+        'name': '벤저민 그레이엄',
+        'principles': '안전마진 최우선, 재무 안전성 중시 (부채비율, 유동비율), 현금흐름 품질',
+        'score_detail': ('safety', 'cashflow', 'stability'),
+        'tone': '신중하고 정중한 톤',
+    },
+    'fisher': {
+        'name': '필립 피셔',
+        'principles': '성장성 중시, 현금흐름 창출 능력, 장기 투자',
+        'score_detail': ('growth', 'quality', 'management'),
+        'tone': '열정적이고 미래 지향적',
+    },
+    'greenblatt': {
+        'name': '조엘 그린블라트',
+        'principles': '좋은 회사 (높은 ROIC), 싼 가격 (높은 Earnings Yield), 계량적 분석',
+        'score_detail': ('roic', 'earnings_yield', 'value'),
+        'tone': '명확하고 논리적',
+    },
+    'lynch': {
+        'name': '피터 린치',
+        'principles': '이해하기 쉬운 사업, 합리적인 가격의 꾸준한 성장, 탄탄한 재무 (낮은 부채)',
+        'score_detail': ('growth', 'simplicity', 'value'),
+        'tone': '친근하고 쉬운 설명',
+    },
+}
+
+
+def build_combined_messages(indicators):
+    """
+    통합 프롬프트 (지표 블록 1회 + 4명 관점, 메이트 키별 JSON 응답)
+    
+    항상 4명 전체를 요청 (종목별 프롬프트 키가 남은 메이트 구성에 따라 바뀌지 않도록)
+    """
+    revenue_growth = indicators['revenue_growth']
+    revenue_growth_text = f"{revenue_growth:.1f}%" if revenue_growth is not None else "데이터 없음"
+    earnings_yield = (indicators['net_income'] / indicators['total_assets'] * 100) if indicators['total_assets'] else 0
+    
+    guides = '\n\n'.join(
+        f"[{mate_type}] {guide['name']}\n"
+        f"• 투자 원칙: {guide['principles']}\n"
+        f"• score_detail: {', '.join(guide['score_detail'])} (각 0-100)\n"
+        f"• 말투: {guide['tone']}"
+        for mate_type, guide in MATE_GUIDES.items()
+    )
+    
+    prompt = f"""
+당신은 4명의 투자 대가 메이트 관점으로 같은 기업을 각각 독립적으로 평가하는 AI 분석가입니다.
+
+기업 정보:
+- 기업명: {indicators['stock_name']}
+- ROE: {indicators['roe']}%
+- 부채비율: {indicators['debt_ratio']}%
+- 유동비율: {indicators['current_ratio']}%
+- FCF 마진: {indicators['fcf_margin']}%
+- 매출 성장률 (YoY): {revenue_growth_text}
+- Earnings Yield: {earnings_yield:.2f}%
+- OCF: ${indicators['ocf']:,.0f}
+- FCF: ${indicators['fcf']:,.0f}
+- 순이익: ${indicators['net_income']:,.0f}
+- 매출: ${indicators['revenue']:,.0f}
+- 총자산: ${indicators['total_assets']:,.0f}
+
+메이트별 관점:
+{guides}
+
+각 메이트의 투자 철학에 따라 이 기업을 평가하세요.
+
+응답 형식 (JSON, 메이트 키마다 객체 1개):
+{{
+  "<메이트 키>": {{
+    "score": 0-100 점수,
+    "summary": "한 줄 요약 (30자 이내)",
+    "reason": "평가 이유 (3-4줄, 쉬운 언어, 구체적 숫자 포함)",
+    "caution": "주의사항 (있다면)",
+    "score_detail": {{"<세부 항목>": 0-100, ...}}
+  }}
+}}
+메이트 키: {', '.join(MATE_GUIDES)}
+"""
+    
+    return [
+        {"role": "system", "content": "투자 대가 메이트 통합 분석가"},
+        {"role": "user", "content": prompt}
+    ]
+
+
+def validate_combined(content):
+    """통합 응답 검증 (유효한 메이트가 하나도 없으면 캐시하지 않음)"""
+    results, errors = parse_combined_response(content, MATE_GUIDES)
+    if not results:
+        raise MateResponseError(f"유효한 메이트 결과 없음: {errors}")
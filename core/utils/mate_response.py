@@ -0,0 +1,110 @@
+"""
+LLM 메이트 응답 스키마 검증
+
+- validate_mate_result: 메이트 1명 결과 검증 + 정규화 (MateAnalysis 저장 형식)
+- parse_combined_response: 통합 응답 {메이트: 결과} → (유효 결과, 메이트별 오류)
+
+통합 요청에서 일부 메이트만 형식이 틀리면 그 메이트만 개별 요청으로 재시도하도록
+메이트 단위로 오류를 돌려줌
+"""
+import json
+from typing import Dict, Iterable, Tuple
+
+# MateAnalysis.summary max_length
+SUMMARY_MAX_LENGTH = 200
+
+
+class MateResponseError(ValueError):
+    """응답이 메이트 결과 스키마와 맞지 않음"""
+
+
+def _score(value, field: str) -> int:
+    """0-100 점수 (숫자 문자열 허용)"""
+    if isinstance(value, bool):
+        raise MateResponseError(f"{field}: 숫자가 아님")
+    try:
+        score = round(float(value))
+    except (TypeError, ValueError):
+        raise MateResponseError(f"{field}: 숫자가 아님 ({value!r})")
+    if not 0 <= score <= 100:
+        raise MateResponseError(f"{field}: 0-100 범위 밖 ({score})")
+    return score
+
+
+def _text(value, field: str, required: bool = True) -> str:
+    """문자열 (줄 목록이면 줄바꿈으로 합침)"""
+    if isinstance(value, list) and all(isinstance(line, str) for line in value):
+        value = '\n'.join(value)
+    if value is None and not required:
+        return ''
+    if not isinstance(value, str):
+        raise MateResponseError(f"{field}: 문자열이 아님")
+    value = value.strip()
+    if required and not value:
+        raise MateResponseError(f"{field}: 비어 있음")
+    return value
+
+
+def validate_mate_result(data) -> Dict:
+    """
+    메이트 1명 결과 검증
+
+    Returns:
+        {'score', 'summary', 'reason', 'caution', 'score_detail'}
+
+    Raises:
+        MateResponseError: 필수 필드 누락/형식 오류
+    """
+    if not isinstance(data, dict):
+        raise MateResponseError("결과가 객체가 아님")
+
+    score_detail = data.get('score_detail') or {}
+    if not isinstance(score_detail, dict):
+        raise MateResponseError("score_detail: 객체가 아님")
+
+    return {
+        'score': _score(data.get('score'), 'score'),
+        'summary': _text(data.get('summary'), 'summary')[:SUMMARY_MAX_LENGTH],
+        'reason': _text(data.get('reason'), 'reason'),
+        'caution': _text(data.get('caution'), 'caution', required=False),
+        'score_detail': {
+            key: _score(value, f'score_detail.{key}') for key, value in score_detail.items()
+        },
+    }
+
+
+def parse_mate_response(content: str) -> Dict:
+    """개별 요청 응답(JSON 문자열) → 검증된 결과"""
+    try:
+        data = json.loads(content)
+    except ValueError as e:
+        raise MateResponseError(f"JSON 오류: {e}")
+    return validate_mate_result(data)
+
+
+def parse_combined_response(content: str, mate_types: Iterable[str]) -> Tuple[Dict[str, Dict], Dict[str, str]]:
+    """
+    통합 요청 응답 → 메이트별 결과
+
+    Returns:
+        ({mate_type: 검증된 결과}, {mate_type: 오류 메시지})
+    """
+    mate_types = list(mate_types)
+    try:
+        data = json.loads(content)
+    except ValueError as e:
+        return {}, dict.fromkeys(mate_types, f"JSON 오류: {e}")
+    if not isinstance(data, dict):
+        return {}, dict.fromkeys(mate_types, "응답이 객체가 아님")
+
+    results, errors = {}, {}
+    for mate_type in mate_types:
+        if mate_type not in data:
+            errors[mate_type] = "응답에 없음"
+            continue
+        try:
+            results[mate_type] = validate_mate_result(data[mate_type])
+        except MateResponseError as e:
+            errors[mate_type] = str(e)
+
+    return results, errors
@@ -0,0 +1,117 @@
+"""
+규칙 기반 점수 엔진 (NumPy 벡터 연산)
+
+현금흐름/안전성/성장성 구간 점수표를 데이터로 정의하고
+numpy.searchsorted로 지표 배열 전체(유니버스)를 한 번에 채점
+
+- score_arrays: 지표 열 배열 → 점수/등급 배열 (리더보드 일괄 계산)
+- score_indicators: 지표 딕셔너리 1개 → 점수 (종목 상세 API)
+"""
+from typing import Dict, Mapping, Sequence
+
+import numpy as np
+
+
+class ScoreRule:
+    """
+    구간 점수표 1개
+
+    thresholds는 오름차순, points[i]는 searchsorted 결과 i(구간)의 점수
+    - '>=' / '>': 값이 클수록 높은 구간 (points는 낮은 점수 → 높은 점수)
+    - '<=' / '<': 값이 작을수록 앞 구간 (points는 높은 점수 → 낮은 점수)
+    """
+    # 연산자 → searchsorted side (경계값이 어느 구간에 속하는지)
+    SIDES = {'>=': 'right', '>': 'left', '<=': 'left', '<': 'right'}
+
+    def __init__(self, field: str, op: str, thresholds: Sequence[float], points: Sequence[int]):
+        assert len(points) == len(thresholds) + 1
+        self.field = field
+        self.side = self.SIDES[op]
+        self.thresholds = np.asarray(thresholds, dtype=np.float64)
+        self.points = np.asarray(points, dtype=np.int64)
+
+    def apply(self, values: np.ndarray) -> np.ndarray:
+        return self.points[np.searchsorted(self.thresholds, values, side=self.side)]
+
+
+# 점수 영역 → 구간 점수표 (각 영역 합계 최대 100점)
+SCORE_RULES = {
+    'cashflow': (
+        # FCF 양수 분기 (40점)
+        ScoreRule('fcf_positive_quarters', '>=', [8, 12, 16, 20], [0, 10, 20, 30, 40]),
+        # FCF 마진 (30점)
+        ScoreRule('fcf_margin', '>=', [5, 10, 15, 20], [0, 10, 20, 25, 30]),
+        # OCF/순이익 비율 (30점)
+        ScoreRule('ocf_to_net_income', '>=', [1.0, 1.2, 1.5], [0, 10, 20, 30]),
+    ),
+    'safety': (
+        # 부채비율 (50점)
+        ScoreRule('debt_ratio', '<=', [30, 50, 100, 150], [50, 40, 30, 15, 0]),
+        # 유동비율 (30점)
+        ScoreRule('current_ratio', '>=', [100, 150, 200], [0, 10, 20, 30]),
+        # FCF > 0 (20점)
+        ScoreRule('ttm_fcf', '>', [0], [0, 20]),
+    ),
+    'growth': (
+        # ROE (50점)
+        ScoreRule('roe', '>=', [5, 10, 15, 20, 25], [0, 10, 20, 30, 40, 50]),
+        # 매출 성장률 (50점)
+        ScoreRule('revenue_growth', '>=', [0, 5, 10, 15, 20], [0, 10, 20, 30, 40, 50]),
+    ),
+}
+
+SCORE_CATEGORIES = tuple(SCORE_RULES)
+
+# 채점에 사용하는 지표 (값이 없으면 0으로 채점)
+SCORE_FIELDS = tuple(dict.fromkeys(rule.field for rules in SCORE_RULES.values() for rule in rules))
+
+# 종합 점수 → 등급
+GRADE_THRESHOLDS = np.asarray([40, 50, 60, 70, 80], dtype=np.float64)
+GRADES = ('D', 'C', 'B', 'B+', 'A', 'A+')
+
+
+def grade_array(total: np.ndarray) -> np.ndarray:
+    """종합 점수 배열 → 등급 인덱스 배열 (GRADES 기준)"""
+    return np.searchsorted(GRADE_THRESHOLDS, total, side='right')
+
+
+def score_arrays(columns: Mapping[str, Sequence]) -> Dict[str, np.ndarray]:
+    """
+    지표 열 배열 → 점수 배열
+
+    Args:
+        columns: {지표: 값 배열} (None/NaN은 0으로 채점)
+
+    Returns:
+        {'cashflow', 'safety', 'growth': int 배열, 'total': float 배열, 'grade': 등급 인덱스 배열}
+    """
+    values = {}
+    for field in SCORE_FIELDS:
+        array = np.asarray(
+            [0 if value is None else value for value in columns[field]], dtype=np.float64
+        )
+        values[field] = np.nan_to_num(array, nan=0.0)
+
+    scores = {}
+    for category, rules in SCORE_RULES.items():
+        scores[category] = sum(rule.apply(values[rule.field]) for rule in rules)
+
+    # 종합 점수 (평균)
+    scores['total'] = np.round(sum(scores[category] for category in SCORE_CATEGORIES) / len(SCORE_CATEGORIES), 1)
+    scores['grade'] = grade_array(scores['total'])
+    return scores
+
+
+def score_indicators(indicators: Mapping[str, float]) -> Dict:
+    """
+    지표 딕셔너리 1개 채점
+
+    Returns:
+        {'total_score', 'grade', 'scores': {'cashflow', 'safety', 'growth'}}
+    """
+    scores = score_arrays({field: [indicators.get(field)] for field in SCORE_FIELDS})
+    return {
+        'total_score': float(scores['total'][0]),
+        'grade': GRADES[int(scores['grade'][0])],
+        'scores': {category: int(scores[category][0]) for category in SCORE_CATEGORIES},
+    }
@@ -0,0 +1,353 @@
+"""
+스크리닝 엔진 (NumPy 벡터 연산)
+
+미국 활성 종목 전체의 분기 재무 데이터를 컬럼 스냅샷(mmap, DB 데이터와 같은 버전일 때만) 또는
+한 번의 쿼리로 열(column) 배열에 적재하고, TTM/성장률/FCF 양수 분기 수를
+배열 연산으로 계산한 뒤 필터를 불리언 마스크로 적용
+메이트 점수는 요청마다 MateScoreWide에서 조회 (메이트 분석 변경이 적재된 배열을 무효화하지 않음)
+"""
+import threading
+from typing import Dict, List, Optional
+
+import numpy as np
+from apps.stocks.models import StockFinancialRaw
+from apps.stocks.services.columnar_snapshot import (
+    FundamentalsSnapshot,
+    get_fundamentals_snapshot,
+    source_data_version,
+)
+from apps.analysis.models import MateAnalysis, MateScoreWide
+from apps.stocks.services.mate_score_wide import WIDE_MATE_TYPES
+
+
+# 종목당 사용하는 최대 분기 수 (FCF 양수 분기 수 기준)
+MAX_QUARTERS = 20
+
+# values_list 컬럼 순서
+FINANCIAL_FIELDS = (
+    'revenue',
+    'net_income',
+    'ocf',
+    'fcf',
+    'capex',
+    'total_liabilities',
+    'total_equity',
+)
+
+# 정렬 키 → 지표 컬럼
+SORT_COLUMNS = {
+    'fcf': 'ttm_fcf',
+    'roe': 'roe',
+    'fcf_margin': 'fcf_margin',
+    'revenue_growth': 'revenue_growth',
+    'mate_score': 'mate_score',
+}
+
+
+def _percent(numerator, denominator, default=0.0):
+    """분모가 0/결측이면 default, 아니면 소수 둘째 자리까지 반올림한 비율(%)"""
+    valid = np.isfinite(denominator) & (denominator != 0)
+    result = np.full(numerator.shape, default, dtype=float)
+    np.divide(numerator * 100, denominator, out=result, where=valid)
+    return np.round(result, 2)
+
+
+class ScreeningEngine:
+    """
+    전 종목 지표 배열
+
+    stock_ids[i]에 대응하는 지표가 각 배열의 i번째 원소
+    (4분기 미만 또는 자본총계가 없는 종목은 제외)
+    """
+
+    def __init__(self, stock_ids, columns: Dict[str, np.ndarray]):
+        self.stock_ids = stock_ids
+        self.columns = columns
+
+    def __len__(self):
+        return len(self.stock_ids)
+
+    @classmethod
+    def load(cls, snapshot: Optional[FundamentalsSnapshot] = None) -> 'ScreeningEngine':
+        """
+        지표 배열 생성
+
+        재무 컬럼 스냅샷을 주면 mmap 배열을 사용하고,
+        없으면 분기 재무 데이터를 한 번의 쿼리로 적재
+        """
+        if snapshot is not None:
+            return cls.from_snapshot(snapshot)
+
+        rows = list(StockFinancialRaw.objects.filter(
+            data_source='EDGAR',
+            stock__country='us',
+            stock__is_active=True,
+        ).order_by(
+            'stock_id', '-disclosure_year', '-disclosure_quarter'
+        ).values_list('stock_id', *FINANCIAL_FIELDS))
+
+        if not rows:
+            return cls(np.empty(0, dtype=np.int64), {})
+
+        data = np.array(rows, dtype=float)  # None → NaN
+        row_stock_ids = data[:, 0].astype(np.int64)
+        starts = np.flatnonzero(np.r_[True, row_stock_ids[1:] != row_stock_ids[:-1]])
+
+        return cls.build(
+            row_stock_ids[starts],
+            np.r_[starts, len(rows)],
+            {field: data[:, offset] for offset, field in enumerate(FINANCIAL_FIELDS, start=1)},
+        )
+
+    @classmethod
+    def from_snapshot(cls, snapshot: FundamentalsSnapshot) -> 'ScreeningEngine':
+        """재무 컬럼 스냅샷(mmap)으로 생성"""
+        if not len(snapshot):
+            return cls(np.empty(0, dtype=np.int64), {})
+
+        return cls.build(
+            snapshot.stock_ids,
+            snapshot['offsets'],
+            {field: snapshot[field] for field in FINANCIAL_FIELDS},
+        )
+
+    @classmethod
+    def build(cls, stock_ids, offsets, fields: Dict[str, np.ndarray]) -> 'ScreeningEngine':
+        """
+        종목별 최신순 분기 행 → 지표 배열
+
+        Args:
+            stock_ids: 종목 ID (n)
+            offsets: 종목 i의 행 범위 = offsets[i]:offsets[i + 1] (n + 1)
+            fields: FINANCIAL_FIELDS별 분기 행 배열
+        """
+        # 종목별 그룹 시작 위치 / 그룹 내 순번 (0 = 최근 분기)
+        starts = np.asarray(offsets[:-1])
+        counts = np.diff(offsets)
+        group = np.repeat(np.arange(len(starts)), counts)
+        position = np.arange(int(offsets[-1])) - starts[group]
+
+        in_window = position < MAX_QUARTERS
+        group = group[in_window]
+        position = position[in_window]
+
+        # 필드별 (종목 수 × 20분기) 행렬
+        matrix = {}
+        for field in FINANCIAL_FIELDS:
+            values = np.full((len(starts), MAX_QUARTERS), np.nan)
+            values[group, position] = fields[field][in_window]
+            matrix[field] = values
+
+        def ttm(field, window=slice(0, 4), transform=None):
+            values = matrix[field][:, window]
+            if transform is not None:
+                values = transform(values)
+            return np.nansum(values, axis=1)  # 결측은 0으로 합산
+
+        ttm_revenue = ttm('revenue')
+        ttm_net_income = ttm('net_income')
+        ttm_ocf = ttm('ocf')
+        ttm_fcf = ttm('fcf')
+        ttm_capex = ttm('capex', transform=np.abs)
+        prev_revenue = ttm('revenue', window=slice(4, 8))
+        prev_fcf = ttm('fcf', window=slice(4, 8))
+
+        total_equity = matrix['total_equity'][:, 0]
+        total_liabilities = matrix['total_liabilities'][:, 0]
+
+        fcf_margin = _percent(ttm_fcf, ttm_revenue)
+        roe = _percent(ttm_net_income, total_equity)
+        debt_ratio = np.where(
+            np.nan_to_num(total_liabilities) != 0,
+            _percent(total_liabilities, total_equity),
+            0.0,
+        )
+
+        # 성장률: 전년 동기 4분기가 있어야 계산 (없으면 NaN)
+        has_previous = counts >= 8
+        revenue_growth = np.where(
+            has_previous,
+            _percent(ttm_revenue - prev_revenue, prev_revenue, default=np.nan),
+            np.nan,
+        )
+        fcf_growth = np.where(
+            has_previous,
+            _percent(ttm_fcf - prev_fcf, np.abs(prev_fcf), default=np.nan),
+            np.nan,
+        )
+
+        fcf_positive_quarters = (np.nan_to_num(matrix['fcf']) > 0).sum(axis=1)
+
+        # 4분기 이상 + 자본총계 있는 종목만
+        valid = (counts >= 4) & np.isfinite(total_equity) & (total_equity != 0)
+
+        columns = {
+            'ttm_ocf': ttm_ocf,
+            'ttm_fcf': ttm_fcf,
+            'ttm_capex': ttm_capex,
+            'ttm_revenue': ttm_revenue,
+            'ttm_net_income': ttm_net_income,
+            'fcf_margin': fcf_margin,
+            'roe': roe,
+            'debt_ratio': debt_ratio,
+            'revenue_growth': revenue_growth,
+            'fcf_growth': fcf_growth,
+            'fcf_positive_quarters': fcf_positive_quarters,
+        }
+
+        return cls(
+            np.asarray(stock_ids)[valid],
+            {name: values[valid] for name, values in columns.items()},
+        )
+
+    def mate_scores(self, mate_type: str) -> np.ndarray:
+        """메이트 점수 배열 (분석이 없으면 NaN, 종목당 1행인 MateScoreWide 우선)"""
+        if mate_type in WIDE_MATE_TYPES:
+            scores = dict(MateScoreWide.objects.filter(
+                **{f'{mate_type}__isnull': False}
+            ).values_list('stock_id', mate_type))
+        else:
+            scores = dict(
+                MateAnalysis.objects.filter(mate_type=mate_type).values_list('stock_id', 'score')
+            )
+        return np.array([scores.get(stock_id, np.nan) for stock_id in self.stock_ids.tolist()], dtype=float)
+
+    def _screen_indices(self, min_fcf=None, min_roe=None, max_debt_ratio=None, min_fcf_margin=None,
+                        min_revenue_growth=None, fcf_positive_quarters=None, mate_type=None,
+                        min_mate_score=None, sort_by='fcf'):
+        """
+        필터 적용 후 정렬된 행 번호
+
+        Returns:
+            (행 번호 배열, 정렬 값 배열 (NaN은 -inf), 컬럼 딕셔너리)
+        """
+        columns = dict(self.columns)
+        mask = np.ones(len(self), dtype=bool)
+
+        # NaN과의 비교는 항상 False → 성장률 없는 종목은 자동 제외
+        if min_fcf is not None:
+            mask &= columns['ttm_fcf'] >= float(min_fcf)
+        if min_roe is not None:
+            mask &= columns['roe'] >= float(min_roe)
+        if max_debt_ratio is not None:
+            mask &= columns['debt_ratio'] <= float(max_debt_ratio)
+        if min_fcf_margin is not None:
+            mask &= columns['fcf_margin'] >= float(min_fcf_margin)
+        if min_revenue_growth is not None:
+            mask &= columns['revenue_growth'] >= float(min_revenue_growth)
+        if fcf_positive_quarters is not None:
+            mask &= columns['fcf_positive_quarters'] >= int(fcf_positive_quarters)
+
+        # 메이트 점수 (분석이 없으면 제외)
+        if mate_type:
+            columns['mate_score'] = self.mate_scores(mate_type)
+            mask &= np.isfinite(columns['mate_score'])
+            if min_mate_score is not None:
+                mask &= columns['mate_score'] >= int(min_mate_score)
+
+        indices = np.flatnonzero(mask)
+
+        # 내림차순 정렬 (NaN은 뒤로, 동점은 stock_id 순)
+        sort_column = SORT_COLUMNS.get(sort_by, 'ttm_fcf')
+        if sort_column not in columns:
+            sort_column = 'ttm_fcf'
+        sort_values = np.nan_to_num(columns[sort_column][indices].astype(float), nan=-np.inf)
+        order = np.lexsort((self.stock_ids[indices], -sort_values))
+
+        return indices[order], sort_values[order], columns
+
+    def _item(self, i: int, columns: Dict[str, np.ndarray], mate_type: Optional[str]) -> Dict:
+        revenue_growth = columns['revenue_growth'][i]
+        item = {
+            'stock_id': int(self.stock_ids[i]),
+            'ttm_fcf': int(columns['ttm_fcf'][i]),
+            'fcf_margin': float(columns['fcf_margin'][i]),
+            'roe': float(columns['roe'][i]),
+            'debt_ratio': float(columns['debt_ratio'][i]),
+            'revenue_growth': None if np.isnan(revenue_growth) else float(revenue_growth),
+            'fcf_positive_quarters': int(columns['fcf_positive_quarters'][i]),
+        }
+        if mate_type:
+            item['mate_score'] = int(columns['mate_score'][i])
+        return item
+
+    def screen(self, mate_type=None, **filters) -> List[Dict]:
+        """
+        필터 적용 후 정렬된 결과
+
+        Returns:
+            [{'stock_id': int, 'ttm_fcf': ..., 'roe': ..., ...}, ...] (정렬 순)
+        """
+        if not len(self):
+            return []
+
+        indices, _, columns = self._screen_indices(mate_type=mate_type, **filters)
+        return [self._item(i, columns, mate_type) for i in indices.tolist()]
+
+    def screen_page(self, cursor=None, reverse=False, limit=50, mate_type=None, **filters) -> List[Dict]:
+        """
+        키셋 페이지 (정렬 값, stock_id 커서 이후 limit개만 딕셔너리로 변환)
+
+        Args:
+            cursor: (정렬 값 또는 None, stock_id) - 기준 행
+            reverse: True면 기준 행 이전 limit개 (역순)
+
+        Returns:
+            결과 목록 (정방향 순, reverse면 역순)
+        """
+        if not len(self):
+            return []
+
+        indices, sort_values, columns = self._screen_indices(mate_type=mate_type, **filters)
+
+        if cursor is None:
+            start = 0
+        else:
+            value, stock_id = cursor
+            value = -np.inf if value is None else float(value)
+            stock_ids = self.stock_ids[indices]
+            # 정렬 순서상 기준 행보다 앞선 행 수 (정렬되어 있으므로 곧 위치)
+            ahead = (sort_values > value) | ((sort_values == value) & (stock_ids < int(stock_id)))
+            start = int(np.count_nonzero(ahead))
+            if not reverse and start < len(indices) and int(stock_ids[start]) == int(stock_id):
+                start += 1
+
+        if reverse:
+            page = indices[max(start - limit, 0):start][::-1]
+        else:
+            page = indices[start:start + limit]
+
+        return [self._item(i, columns, mate_type) for i in page.tolist()]
+
+
+# 프로세스별 캐시 (스냅샷 갱신 시 재적재)
+_engine_lock = threading.Lock()
+_cached_engine = {'version': None, 'engine': None}
+
+
+def _data_version():
+    """
+    (데이터 버전, 사용할 컬럼 스냅샷 또는 None)
+
+    발행된 컬럼 스냅샷이 현재 지표 스냅샷 데이터로 만든 것이면 스냅샷 버전,
+    발행 후 데이터가 바뀌었으면 DB 버전 (변경 시 예약된 재발행 전까지 DB에서 적재)
+    버전 비교는 캐시 카운터 조회 1회 (source_data_version)
+    """
+    data_version = source_data_version()
+    snapshot = get_fundamentals_snapshot()
+    if snapshot is not None and snapshot.data_version == data_version:
+        return ('snapshot', snapshot.version), snapshot
+    return ('db', data_version), None
+
+
+def get_screening_engine() -> ScreeningEngine:
+    """
+    캐시된 스크리닝 엔진 (재무 데이터가 바뀌었으면 재적재)
+    """
+    version, snapshot = _data_version()
+
+    with _engine_lock:
+        if _cached_engine['engine'] is None or _cached_engine['version'] != version:
+            _cached_engine['engine'] = ScreeningEngine.load(snapshot)
+            _cached_engine['version'] = version
+        return _cached_engine['engine']
@@ -0,0 +1,304 @@
+"""
+스크리닝 필터 표현식
+
+예: roe>=15 AND debt_ratio<50 AND (mate.fisher>=70 OR revenue_growth>20)
+    roe_pct>=90 AND mate.fisher_pct>=80  (섹터 내 백분위)
+
+표현식을 파싱/검증해 StockIndicatorSnapshot 기준 Django Q로 컴파일
+(메이트 조건은 MateAnalysis EXISTS 서브쿼리) → DB에서 필터링
+
+백분위 조건은 야간 계산된 섹터 분포(SectorDistribution)로
+섹터별 임계값을 구해 일반 비교 조건으로 변환
+"""
+import re
+from functools import lru_cache
+from typing import List, Tuple
+
+from django.db.models import Exists, OuterRef, Q
+
+from apps.analysis.models import MateAnalysis
+from apps.stocks.services.sector_distribution import (
+    DISTRIBUTION_METRICS,
+    get_distribution_version,
+    get_sector_thresholds,
+    mate_metric,
+)
+
+
+# 표현식 최대 길이
+MAX_EXPRESSION_LENGTH = 500
+
+# 최대 괄호 중첩 깊이
+MAX_DEPTH = 10
+
+# 필터 가능한 지표 (StockIndicatorSnapshot 필드)
+INDICATOR_FIELDS = (
+    'ttm_ocf',
+    'ttm_fcf',
+    'ttm_capex',
+    'ttm_revenue',
+    'ttm_net_income',
+    'total_assets',
+    'current_assets',
+    'current_liabilities',
+    'total_liabilities',
+    'total_equity',
+    'fcf_margin',
+    'roe',
+    'debt_ratio',
+    'current_ratio',
+    'revenue_growth',
+    'fcf_growth',
+    'ocf_to_net_income',
+    'fcf_positive_quarters',
+    'quarter_count',
+)
+
+# 기존 쿼리 파라미터 이름과 맞춘 별칭
+FIELD_ALIASES = {
+    'fcf': 'ttm_fcf',
+    'revenue': 'ttm_revenue',
+    'net_income': 'ttm_net_income',
+}
+
+# 비교 연산자 → ORM lookup
+OPERATORS = {
+    '>=': 'gte',
+    '<=': 'lte',
+    '>': 'gt',
+    '<': 'lt',
+    '=': 'exact',
+    '==': 'exact',
+    '!=': 'exact',  # 부정
+}
+
+# 섹터 내 백분위 조건 접미사 / 허용 연산자
+PERCENTILE_SUFFIX = '_pct'
+PERCENTILE_OPERATORS = ('>=', '<=', '>', '<')
+
+KEYWORDS = ('AND', 'OR', 'NOT')
+
+TOKEN_PATTERN = re.compile(r"""
+    \s*(?:
+        (?P<number>-?\d+(?:\.\d+)?)
+      | (?P<op>>=|<=|==|!=|>|<|=)
+      | (?P<paren>[()])
+      | (?P<name>[A-Za-z_][A-Za-z0-9_]*(?:\.[A-Za-z_][A-Za-z0-9_]*)?)
+    )
+""", re.VERBOSE)
+
+
+class ScreeningFilterError(ValueError):
+    """잘못된 필터 표현식"""
+
+
+def mate_types() -> List[str]:
+    return [choice[0] for choice in MateAnalysis._meta.get_field('mate_type').choices]
+
+
+def tokenize(expression: str) -> List[Tuple[str, str]]:
+    """
+    표현식 → [(종류, 값), ...]
+
+    종류: number, op, paren, name, keyword
+    """
+    tokens = []
+    position = 0
+    expression = expression.rstrip()
+
+    while position < len(expression):
+        match = TOKEN_PATTERN.match(expression, position)
+        if not match:
+            raise ScreeningFilterError(f"알 수 없는 문자: '{expression[position:].strip()[:20]}'")
+
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == 'name' and value.upper() in KEYWORDS:
+            kind, value = 'keyword', value.upper()
+
+        tokens.append((kind, value))
+        position = match.end()
+
+    return tokens
+
+
+class _Parser:
+    """
+    재귀 하강 파서
+
+    expr       := and_expr (OR and_expr)*
+    and_expr   := not_expr (AND not_expr)*
+    not_expr   := NOT not_expr | '(' expr ')' | comparison
+    comparison := name op number
+    """
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+        self.position = 0
+        self.depth = 0
+
+    def peek(self):
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return (None, None)
+
+    def take(self, kind, value=None):
+        token_kind, token_value = self.peek()
+        if token_kind != kind or (value is not None and token_value != value):
+            expected = value or kind
+            found = token_value if token_value is not None else '표현식 끝'
+            raise ScreeningFilterError(f"'{expected}'이(가) 필요합니다 (위치: '{found}')")
+        self.position += 1
+        return token_value
+
+    def parse(self) -> Q:
+        q = self.expr()
+        if self.position != len(self.tokens):
+            raise ScreeningFilterError(f"예상하지 못한 토큰: '{self.peek()[1]}'")
+        return q
+
+    def expr(self) -> Q:
+        q = self.and_expr()
+        while self.peek() == ('keyword', 'OR'):
+            self.position += 1
+            q = q | self.and_expr()
+        return q
+
+    def and_expr(self) -> Q:
+        q = self.not_expr()
+        while self.peek() == ('keyword', 'AND'):
+            self.position += 1
+            q = q & self.not_expr()
+        return q
+
+    def not_expr(self) -> Q:
+        if self.peek() == ('keyword', 'NOT'):
+            self.position += 1
+            return ~self.not_expr()
+
+        if self.peek() == ('paren', '('):
+            self.position += 1
+            self.depth += 1
+            if self.depth > MAX_DEPTH:
+                raise ScreeningFilterError(f"괄호는 최대 {MAX_DEPTH}단계까지 중첩할 수 있습니다")
+            q = self.expr()
+            self.take('paren', ')')
+            self.depth -= 1
+            return q
+
+        return self.comparison()
+
+    def comparison(self) -> Q:
+        name = self.take('name')
+        op = self.take('op')
+        value = float(self.take('number'))
+        return compile_condition(name, op, value)
+
+
+def _mate_type(name: str) -> str:
+    mate_type = name.split('.', 1)[1]
+    if mate_type not in mate_types():
+        raise ScreeningFilterError(
+            f"알 수 없는 메이트: '{mate_type}' (가능: {', '.join(mate_types())})"
+        )
+    return mate_type
+
+
+def _mate_score_condition(mate_type: str, score: Q) -> Q:
+    analyses = MateAnalysis.objects.filter(
+        score,
+        stock_id=OuterRef('stock_id'),
+        mate_type=mate_type,
+    )
+    return Q(Exists(analyses))
+
+
+def compile_percentile_condition(name: str, op: str, value: float) -> Q:
+    """
+    섹터 내 백분위 조건 → 섹터별 임계값 조건의 OR
+
+    roe_pct>=90 → (sector=A AND roe>=A의 90백분위) OR (sector=B AND ...)
+    분포가 없는 섹터의 종목은 제외
+    """
+    if op not in PERCENTILE_OPERATORS:
+        raise ScreeningFilterError(
+            f"백분위 조건은 {', '.join(PERCENTILE_OPERATORS)} 연산자만 사용할 수 있습니다"
+        )
+    if not 0 <= value <= 100:
+        raise ScreeningFilterError("백분위는 0~100 사이여야 합니다")
+
+    base = name[:-len(PERCENTILE_SUFFIX)]
+    if base.startswith('mate.'):
+        mate_type = _mate_type(base)
+        metric = mate_metric(mate_type)
+    else:
+        metric = FIELD_ALIASES.get(base, base)
+        if metric not in DISTRIBUTION_METRICS:
+            raise ScreeningFilterError(
+                f"백분위를 지원하지 않는 지표: '{base}' (가능: {', '.join(DISTRIBUTION_METRICS)})"
+            )
+
+    lookup = OPERATORS[op]
+    q = Q(pk__in=[])
+    for sector, threshold in sorted(get_sector_thresholds(metric, value).items()):
+        if base.startswith('mate.'):
+            condition = _mate_score_condition(mate_type, Q(**{f'score__{lookup}': threshold}))
+        else:
+            condition = Q(**{f'{metric}__{lookup}': threshold})
+        q |= Q(stock__sector=sector) & condition
+    return q
+
+
+def compile_condition(name: str, op: str, value: float) -> Q:
+    """
+    단일 조건 → Q
+
+    - 지표: roe>=15 → Q(roe__gte=15)
+    - 메이트: mate.fisher>=70 → Q(EXISTS(MateAnalysis 점수 조건))
+    - 섹터 백분위: roe_pct>=90, mate.fisher_pct>=80
+    """
+    if name.endswith(PERCENTILE_SUFFIX):
+        return compile_percentile_condition(name, op, value)
+
+    lookup = OPERATORS[op]
+    negate = op == '!='
+
+    if name.startswith('mate.'):
+        mate_type = _mate_type(name)
+        score = Q(**{f'score__{lookup}': value})
+        return _mate_score_condition(mate_type, ~score if negate else score)
+
+    field = FIELD_ALIASES.get(name, name)
+    if field not in INDICATOR_FIELDS:
+        raise ScreeningFilterError(f"알 수 없는 지표: '{name}'")
+
+    q = Q(**{f'{field}__{lookup}': value})
+    if negate:
+        # 결측(NULL)은 != 조건에서도 제외
+        q = ~q & Q(**{f'{field}__isnull': False})
+    return q
+
+
+def compile_screening_filter(expression: str) -> Q:
+    """
+    필터 표현식 → Django Q (같은 표현식은 한 번만 파싱)
+
+    백분위 조건이 있으면 섹터 분포가 갱신될 때 다시 컴파일
+
+    Raises:
+        ScreeningFilterError: 문법 오류 또는 알 수 없는 지표/메이트
+    """
+    distribution_version = get_distribution_version() if PERCENTILE_SUFFIX in expression else None
+    return _compile_screening_filter(expression, distribution_version)
+
+
+@lru_cache(maxsize=256)
+def _compile_screening_filter(expression: str, distribution_version) -> Q:
+    if len(expression) > MAX_EXPRESSION_LENGTH:
+        raise ScreeningFilterError(f"표현식은 최대 {MAX_EXPRESSION_LENGTH}자까지 가능합니다")
+
+    tokens = tokenize(expression)
+    if not tokens:
+        raise ScreeningFilterError("빈 표현식입니다")
+
+    return _Parser(tokens).parse()
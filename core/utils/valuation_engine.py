@@ -10,6 +10,100 @@
 from decimal import Decimal
 from typing import Dict, Optional
 
+import numpy as np
+
+
+# 계산 방식 변경 시 올리면 모든 적정가 재계산 (ProperPrice.analysis_version)
+ENGINE_VERSION = '1.1'
+
+
+def dcf_value_grid(fcf, growth_rate, discount_rate, terminal_growth,
+                   years: int = 10, shares_outstanding=1000000000) -> np.ndarray:
+    """
+    DCF 주당 가치 (등비급수 닫힌 형태, NumPy 브로드캐스트)
+    
+    q = (1 + g) / (1 + r) 일 때
+        예측 기간 현재가치 = FCF × q × (1 - qⁿ) / (1 - q)   (q = 1이면 FCF × n)
+        영구 가치 현재가치 = FCF × qⁿ × (1 + g∞) / (r - g∞)
+    
+    모든 인자는 스칼라 또는 배열 (서로 브로드캐스트 가능한 모양),
+    종목 × 성장률 × 할인율 × 영구 성장률 격자를 한 번에 계산
+    
+    Returns:
+        주당 가치 배열 (FCF ≤ 0 → 0, 할인율 ≤ 영구 성장률 → NaN)
+    """
+    fcf = np.asarray(fcf, dtype=float)
+    growth_rate = np.asarray(growth_rate, dtype=float)
+    discount_rate = np.asarray(discount_rate, dtype=float)
+    terminal_growth = np.asarray(terminal_growth, dtype=float)
+    shares_outstanding = np.asarray(shares_outstanding, dtype=float)
+    
+    q = (1 + growth_rate) / (1 + discount_rate)
+    q_n = q ** years
+    
+    with np.errstate(divide='ignore', invalid='ignore'):
+        annuity = np.where(np.isclose(q, 1.0), float(years), q * (1 - q_n) / (1 - q))
+        spread = discount_rate - terminal_growth
+        terminal = np.where(spread > 0, q_n * (1 + terminal_growth) / spread, np.nan)
+        value = fcf * (annuity + terminal) / shares_outstanding
+    
+    return np.where(fcf > 0, value, 0.0)
+
+
+def mate_fair_value_arrays(fcf, net_income, total_equity, growth_rate, discount_rate,
+                           shares_outstanding=1000000000) -> Dict[str, np.ndarray]:
+    """
+    메이트별 주당 적정가 (배열 입력, 몬테카를로 경로 일괄 계산용)
+    
+    calculate_mate_proper_price와 같은 공식 (그린블라트 ROE = 순이익 / 자본총계 × 100,
+    지표 스냅샷 roe와 같은 정의 → 경로마다 샘플한 순이익으로 다시 계산)
+    
+    Args:
+        fcf / net_income: FCF / 순이익 (TTM)
+        total_equity: 자본총계
+        growth_rate: 성장률 (소수, 0.05 = 5%)
+        discount_rate: 할인율 (피셔 DCF)
+        shares_outstanding: 발행 주식 수
+    
+    Returns:
+        {mate_type: 주당 적정가 배열} (계산 불가 → 0)
+    """
+    fcf, net_income, total_equity, growth_rate, discount_rate, shares_outstanding = (
+        np.asarray(value, dtype=float)
+        for value in (fcf, net_income, total_equity, growth_rate, discount_rate, shares_outstanding)
+    )
+    eps = net_income / shares_outstanding
+    bvps = total_equity / shares_outstanding
+    
+    # 벤저민: Graham Number
+    benjamin = np.sqrt(22.5 * np.clip(eps, 0, None) * np.clip(bvps, 0, None))
+    
+    # 피셔: DCF (성장률 최대 15%)
+    fisher = dcf_value_grid(fcf, np.minimum(growth_rate, 0.15), discount_rate, 0.03, 10, shares_outstanding)
+    
+    # 그린블라트: ROE 기반 PBR (ROE 20% → PBR 2.0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        roe = np.where(total_equity > 0, net_income / total_equity * 100, 0.0)
+    greenblatt = np.where(total_equity > 0, bvps * np.maximum(roe / 10, 1.0), 0.0)
+    
+    # 린치: PEG 1.0 (적정 PER = 성장률, 최소 5)
+    lynch = np.where(net_income > 0, eps * np.maximum(growth_rate * 100, 5), 0.0)
+    
+    return {
+        'benjamin': benjamin,
+        'fisher': np.nan_to_num(fisher),
+        'greenblatt': greenblatt,
+        'lynch': lynch,
+    }
+
+
+def calculate_gap_ratio(current_price: float, proper_price: Decimal) -> Decimal:
+    """괴리율 (%) = (현재가 - 적정가) / 적정가"""
+    if proper_price > 0 and current_price > 0:
+        gap_ratio = ((current_price - float(proper_price)) / float(proper_price)) * 100
+        return Decimal(str(round(gap_ratio, 2)))
+    return Decimal('0')
+
 
 class ValuationEngine:
     """적정가격 계산 엔진"""
@@ -34,25 +128,43 @@ class ValuationEngine:
         if fcf <= 0:
             return Decimal('0')
         
-        # 1. 명시적 예측 기간 FCF 현재가치
-        pv_fcf = 0
-        for year in range(1, years + 1):
-            future_fcf = fcf * ((1 + growth_rate) ** year)
-            pv = future_fcf / ((1 + discount_rate) ** year)
-            pv_fcf += pv
+        # 예측 기간 + 영구 가치 현재가치 (닫힌 형태, dcf_value_grid)
+        price_per_share = float(dcf_value_grid(
+            fcf, growth_rate, discount_rate, terminal_growth, years, shares_outstanding
+        ))
+        if not np.isfinite(price_per_share):
+            return Decimal('0')
         
-        # 2. 영구 가치 (Terminal Value)
-        terminal_fcf = fcf * ((1 + growth_rate) ** years) * (1 + terminal_growth)
-        terminal_value = terminal_fcf / (discount_rate - terminal_growth)
-        pv_terminal = terminal_value / ((1 + discount_rate) ** years)
+        return Decimal(str(round(price_per_share, 2)))
+    
+    @staticmethod
+    def calculate_dcf_sensitivity(fcf, growth_rates, discount_rates, terminal_growths,
+                                  years: int = 10, shares_outstanding=1000000000) -> np.ndarray:
+        """
+        DCF 민감도 격자 (여러 종목 × 성장률 × 할인율 × 영구 성장률)
         
-        # 3. 기업 가치
-        enterprise_value = pv_fcf + pv_terminal
+        Args:
+            fcf: 종목별 FCF (TTM), 스칼라 또는 1차원 배열
+            growth_rates / discount_rates / terminal_growths: 시나리오 값 목록
+            years: 예측 기간
+            shares_outstanding: 종목별 발행 주식 수 (fcf와 같은 모양)
         
-        # 4. 주당 가치
-        price_per_share = enterprise_value / shares_outstanding
+        Returns:
+            주당 가치 배열, 모양 (종목 수, 성장률 수, 할인율 수, 영구 성장률 수)
+            (스칼라 fcf면 종목 축 없이 (성장률, 할인율, 영구 성장률))
+        """
+        fcf = np.asarray(fcf, dtype=float)
+        shares_outstanding = np.asarray(shares_outstanding, dtype=float)
+        axes = (slice(None),) + (np.newaxis,) * 3 if fcf.ndim else ()
         
-        return Decimal(str(round(price_per_share, 2)))
+        return dcf_value_grid(
+            fcf[axes],
+            np.asarray(growth_rates, dtype=float)[:, np.newaxis, np.newaxis],
+            np.asarray(discount_rates, dtype=float)[np.newaxis, :, np.newaxis],
+            np.asarray(terminal_growths, dtype=float)[np.newaxis, np.newaxis, :],
+            years,
+            shares_outstanding[axes] if shares_outstanding.ndim else shares_outstanding,
+        )
     
     @staticmethod
     def calculate_graham_number(eps: float, bvps: float) -> Decimal:
@@ -160,8 +272,10 @@ class ValuationEngine:
             method = 'DCF_GROWTH'
             
         elif mate_type == 'greenblatt':
-            # 그린블라트: ROE 기반 PBR
-            roe = indicators.get('roe', 0)
+            # 그린블라트: ROE 기반 PBR (ROE가 없으면 순이익 / 자본총계로 계산)
+            roe = indicators.get('roe')
+            if roe is None:
+                roe = ttm_net_income / total_equity * 100 if total_equity > 0 else 0
             pbr = max(roe / 10, 1.0)  # ROE 20% → PBR 2.0
             proper_price = cls.calculate_pbr_based(total_equity, category_avg_pbr=pbr, shares_outstanding=shares_outstanding)
             method = 'ROE_BASED_PBR'
@@ -175,11 +289,7 @@ class ValuationEngine:
             method = 'PEG_BASED'
         
         # 괴리율 계산
-        if proper_price > 0 and current_price > 0:
-            gap_ratio = ((current_price - float(proper_price)) / float(proper_price)) * 100
-            gap_ratio = Decimal(str(round(gap_ratio, 2)))
-        else:
-            gap_ratio = Decimal('0')
+        gap_ratio = calculate_gap_ratio(current_price, proper_price)
         
         # 분석 결과 (참고용)
         if gap_ratio <= -20:
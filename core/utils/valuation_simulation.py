@@ -0,0 +1,203 @@
+"""
+적정가 몬테카를로 시뮬레이션 (NumPy 배치)
+
+메이트별 적정가(core.utils.valuation_engine)는 점 입력(매출 성장률, 할인율 10%)으로
+적정가 1개만 계산 → 종목 자신의 분기 재무 이력에서 성장률/마진 분포를 추정하고
+종목 × 경로(기본 10,000개) 배열로 한 번에 샘플링해 메이트별 적정가 분포를 계산
+
+- fit_input_distribution: 분기 이력 → 입력 분포 (매출 성장률, FCF 마진, 순이익 마진)
+- simulate_fair_values: 여러 종목 분포 → 메이트별 분위수 / 평균 / 저평가 확률
+
+입력 분포 (정규분포, 범위 제한):
+    매출 성장률: 분기 매출 전년 동기 대비 성장률의 평균/표준편차
+    FCF 마진 / 순이익 마진: 분기별 FCF / 매출, 순이익 / 매출의 평균/표준편차
+    할인율: 이력으로 추정할 수 없어 공통 분포 (평균 10%, 표준편차 1.5%p)
+    관측치가 부족하면 기본 표준편차 사용
+
+재현성: 종목마다 SeedSequence(seed, stock_id)로 난수 생성기를 만들어
+같은 시드·입력이면 함께 계산한 종목 구성과 상관없이 같은 결과
+"""
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from core.utils.valuation_engine import mate_fair_value_arrays
+
+# 종목당 경로 수 / 기본 시드
+DEFAULT_PATHS = 10000
+DEFAULT_SEED = 42
+
+# 저장 분위수 (%)
+PERCENTILES = (5, 25, 50, 75, 95)
+
+# 할인율 분포 (공통)
+DISCOUNT_RATE_MEAN = 0.10
+DISCOUNT_RATE_SD = 0.015
+DISCOUNT_RATE_RANGE = (0.06, 0.16)
+
+# 관측치가 부족할 때 표준편차 / 최소 표준편차
+DEFAULT_GROWTH_SD = 0.10
+DEFAULT_MARGIN_SD = 0.05
+MIN_SD = 0.005
+
+# 샘플 범위 제한
+GROWTH_RANGE = (-0.5, 0.5)
+MARGIN_RANGE = (-1.0, 1.0)
+
+# 한 번에 계산하는 종목 수 (배열 크기 = 종목 수 × 경로 수)
+CHUNK_SIZE = 256
+
+
+def _mean_sd(values: List[float], default_sd: float, fallback_mean: float = 0.0):
+    """(평균, 표준편차), 관측치 2개 미만이면 기본 표준편차"""
+    if not values:
+        return fallback_mean, default_sd
+    if len(values) < 2:
+        return float(values[0]), default_sd
+    array = np.asarray(values, dtype=float)
+    return float(array.mean()), max(float(array.std(ddof=1)), MIN_SD)
+
+
+def fit_input_distribution(quarters: Sequence, fallback_growth: Optional[float] = None) -> Optional[Dict]:
+    """
+    분기 이력 → 입력 분포
+
+    Args:
+        quarters: QuarterRecord 목록 (최신순, core.utils.indicator_engine.fetch_quarters_bulk)
+        fallback_growth: 전년 동기 분기가 없을 때 성장률 평균 (소수)
+
+    Returns:
+        {'ttm_revenue', 'total_equity', 'growth_mean', 'growth_sd',
+         'fcf_margin_mean', 'fcf_margin_sd', 'net_margin_mean', 'net_margin_sd'}
+        최근 4분기 매출 합계가 0 이하면 None
+    """
+    if len(quarters) < 4:
+        return None
+
+    ttm_revenue = sum(quarter.revenue or 0 for quarter in quarters[:4])
+    if ttm_revenue <= 0:
+        return None
+
+    revenue_by_key = {
+        (quarter.disclosure_year, quarter.disclosure_quarter): quarter.revenue
+        for quarter in quarters
+    }
+
+    growths, fcf_margins, net_margins = [], [], []
+    for quarter in quarters:
+        revenue = quarter.revenue
+        if not revenue or revenue <= 0:
+            continue
+
+        previous = revenue_by_key.get((quarter.disclosure_year - 1, quarter.disclosure_quarter))
+        if previous and previous > 0:
+            growths.append(revenue / previous - 1)
+        if quarter.fcf is not None:
+            fcf_margins.append(quarter.fcf / revenue)
+        if quarter.net_income is not None:
+            net_margins.append(quarter.net_income / revenue)
+
+    growth_mean, growth_sd = _mean_sd(growths, DEFAULT_GROWTH_SD, fallback_growth or 0.0)
+    fcf_margin_mean, fcf_margin_sd = _mean_sd(fcf_margins, DEFAULT_MARGIN_SD)
+    net_margin_mean, net_margin_sd = _mean_sd(net_margins, DEFAULT_MARGIN_SD)
+
+    return {
+        'ttm_revenue': float(ttm_revenue),
+        'total_equity': float(quarters[0].total_equity or 0),
+        'growth_mean': growth_mean,
+        'growth_sd': growth_sd,
+        'fcf_margin_mean': fcf_margin_mean,
+        'fcf_margin_sd': fcf_margin_sd,
+        'net_margin_mean': net_margin_mean,
+        'net_margin_sd': net_margin_sd,
+    }
+
+
+def _column(distributions: List[Dict], field: str) -> np.ndarray:
+    return np.array([distribution[field] for distribution in distributions], dtype=float)[:, np.newaxis]
+
+
+def _simulate_chunk(stock_ids: List[int], distributions: List[Dict], shares: np.ndarray,
+                    current_prices: np.ndarray, paths: int, seed: int) -> Dict[str, Dict[str, np.ndarray]]:
+    # 표준정규 난수 (종목, 입력 4개, 경로) - 종목별 시드
+    normals = np.stack([
+        np.random.default_rng(np.random.SeedSequence([seed, stock_id])).standard_normal((4, paths))
+        for stock_id in stock_ids
+    ])
+
+    def sample(field: str, index: int, bounds) -> np.ndarray:
+        mean = _column(distributions, f'{field}_mean')
+        sd = _column(distributions, f'{field}_sd')
+        return np.clip(mean + sd * normals[:, index], *bounds)
+
+    revenue = _column(distributions, 'ttm_revenue')
+    growth = sample('growth', 0, GROWTH_RANGE)
+    fcf = revenue * sample('fcf_margin', 1, MARGIN_RANGE)
+    net_income = revenue * sample('net_margin', 2, MARGIN_RANGE)
+    discount_rate = np.clip(DISCOUNT_RATE_MEAN + DISCOUNT_RATE_SD * normals[:, 3], *DISCOUNT_RATE_RANGE)
+
+    values = mate_fair_value_arrays(
+        fcf, net_income, _column(distributions, 'total_equity'),
+        growth, discount_rate, shares[:, np.newaxis],
+    )
+
+    results = {}
+    for mate_type, fair_values in values.items():
+        # 현재가가 없으면 저평가 확률 NaN
+        undervalued = (fair_values > current_prices[:, np.newaxis]).mean(axis=1)
+        results[mate_type] = {
+            'percentiles': np.percentile(fair_values, PERCENTILES, axis=1).T,
+            'mean': fair_values.mean(axis=1),
+            'prob_undervalued': np.where(np.isnan(current_prices), np.nan, undervalued),
+        }
+    return results
+
+
+def simulate_fair_values(stock_ids: Iterable[int], distributions: Sequence[Dict],
+                         shares_outstanding: Sequence[float], current_prices: Sequence[Optional[float]],
+                         paths: int = DEFAULT_PATHS, seed: int = DEFAULT_SEED,
+                         chunk_size: int = CHUNK_SIZE) -> Dict[str, Dict[str, np.ndarray]]:
+    """
+    메이트별 적정가 분포 (종목 × 경로 배열 연산, CHUNK_SIZE 종목씩)
+
+    Args:
+        stock_ids: 종목 ID (종목별 난수 시드에 사용)
+        distributions: 종목별 입력 분포 (fit_input_distribution)
+        shares_outstanding: 종목별 발행 주식 수
+        current_prices: 종목별 현재가 (None이면 저평가 확률 NaN)
+        paths: 종목당 경로 수
+        seed: 기본 시드
+
+    Returns:
+        {mate_type: {
+            'percentiles': (종목 수, len(PERCENTILES)),
+            'mean': (종목 수,),
+            'prob_undervalued': (종목 수,) - 적정가 > 현재가인 경로 비율
+        }}
+    """
+    stock_ids = list(stock_ids)
+    distributions = list(distributions)
+    shares = np.asarray(shares_outstanding, dtype=float)
+    prices = np.array([np.nan if price is None else float(price) for price in current_prices], dtype=float)
+
+    chunks = [
+        _simulate_chunk(
+            stock_ids[start:start + chunk_size],
+            distributions[start:start + chunk_size],
+            shares[start:start + chunk_size],
+            prices[start:start + chunk_size],
+            paths,
+            seed,
+        )
+        for start in range(0, len(stock_ids), chunk_size)
+    ]
+    if not chunks:
+        return {}
+
+    return {
+        mate_type: {
+            key: np.concatenate([chunk[mate_type][key] for chunk in chunks])
+            for key in chunks[0][mate_type]
+        }
+        for mate_type in chunks[0]
+    }
@@ -16,6 +16,7 @@ django.setup()
 
 from apps.stocks.models import Stock
 from apps.analysis.models import MateAnalysis, QualitativeAnalysis
+from core.utils.mate_engine import ENGINE_VERSION
 
 
 def import_qualitative_analyses():
@@ -107,6 +108,8 @@ def import_qualitative_analyses():
                         'summary': mate_info.get('assessment', ''),
                         'reason': mate_info.get('verdict', ''),
                         'caution': mate_info.get('recommendation', ''),
+                        # 외부 정성 분석 → 규칙 엔진이 덮어쓰지 않도록 LLM 버전
+                        'analysis_version': ENGINE_VERSION,
                     }
                 )
             
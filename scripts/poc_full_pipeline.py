@@ -25,7 +25,7 @@ import yfinance as yf
 from datetime import datetime, timedelta
 from apps.stocks.models import Stock, StockFinancialRaw, StockPrice
 from apps.analysis.models import MateAnalysis
-from core.utils.mate_engine import MateEngine
+from core.utils.mate_engine import ENGINE_VERSION, MateEngine
 
 
 def step1_create_stock():
@@ -198,22 +198,26 @@ def step4_mate_analysis(stock, openai_api_key):
     
     try:
         # 메이트 엔진 초기화
-        import openai
-        openai.api_key = openai_api_key
+        engine = MateEngine(api_key=openai_api_key)
         
-        engine = MateEngine()
-        
-        # 샘플 재무 데이터
+        # 샘플 지표 (llm_indicators 형식)
         stock_data = {
             'stock_name': stock.stock_name,
-            'pbr': 1.8,
-            'roe': 12.3,
-            'debt_ratio': 30.5,
-            'current_ratio': 220,
-            'dividend_yield': 2.5,
-            'revenue_growth_3y': 8.5,
-            'eps_growth_3y': 10.2,
-            'rd_ratio': 7.5,
+            'stock_code': stock.stock_code,
+            'ocf': 65_000_000_000,
+            'fcf': 12_000_000_000,
+            'net_income': 15_000_000_000,
+            'revenue': 258_000_000_000,
+            'total_assets': 455_000_000_000,
+            'total_liabilities': 92_000_000_000,
+            'total_equity': 363_000_000_000,
+            'current_assets': 195_000_000_000,
+            'current_liabilities': 75_000_000_000,
+            'roe': 4.1,
+            'debt_ratio': 25.3,
+            'current_ratio': 260.0,
+            'fcf_margin': 4.7,
+            'revenue_growth': -14.3,
         }
         
         # 3개 메이트 분석
@@ -235,6 +239,7 @@ def step4_mate_analysis(stock, openai_api_key):
                     'reason': result['reason'],
                     'caution': result.get('caution', ''),
                     'score_detail': result.get('score_detail', {}),
+                    'analysis_version': ENGINE_VERSION,
                 }
             )
             
@@ -1,26 +1,35 @@
 """
-GPT-4 메이트 분석 실행
+GPT-4 메이트 분석 실행 (비동기)
 
-DB에 저장된 재무 데이터를 기반으로 3명의 투자 대가 메이트가 분석
+DB에 저장된 TTM 지표 스냅샷을 기반으로 4명의 투자 대가 메이트가 분석
 
 메이트:
 1. 벤저민 그레이엄 - 안전마진, 저평가
 2. 필립 피셔 - 성장성, 경영 품질
 3. 조엘 그린블라트 - 마법공식 (ROIC + Earnings Yield)
+4. 피터 린치 - 이해하기 쉬운 성장주
+
+실행 방식 (core.utils.llm_runner):
+- 통합 모드(기본): 종목당 요청 1회로 지표 블록을 한 번만 보내고 4명 결과를 함께 받음
+  (스키마 검증에 실패하거나 빠진 메이트만 개별 요청으로 재시도)
+- 개별 모드(--mode per-mate): 메이트마다 요청 1회
+- 최대 --concurrency개 요청을 동시에 보내고 RPM/TPM 한도 안에서만 호출 (고정 sleep 없음)
+- 일시적 오류(429/5xx/타임아웃)는 지터 백오프로 재시도
+- (종목, 메이트)마다 결과를 MateAnalysisProgress 테이블에 기록 → 중단 후 재실행하면 남은 것만 분석
+- 같은 프롬프트의 응답은 LLM 캐시(core.utils.llm_cache)에서 재사용 (비용 0)
 
 사용법:
     python scripts/run_mate_analysis.py --limit 10  # 테스트용 10개
     python scripts/run_mate_analysis.py  # 전체 실행
+    python scripts/run_mate_analysis.py --concurrency 16 --rpm 500 --tpm 150000
+    python scripts/run_mate_analysis.py --mode per-mate  # 메이트별 개별 요청
+    python scripts/run_mate_analysis.py --cache-mode replay  # 저장된 응답만 사용 (API 호출 0회, 오프라인)
 """
 
 import os
 import sys
 import django
-from datetime import datetime
-import time
-import csv
-import json
-from decimal import Decimal
+import asyncio
 import argparse
 
 # Django 설정
@@ -29,459 +38,377 @@ sys.path.insert(0, project_root)
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.local')
 django.setup()
 
-from openai import OpenAI
-from apps.stocks.models import Stock, StockFinancialRaw
-from apps.analysis.models import MateAnalysis
+import openai
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+from openai import AsyncOpenAI
+from apps.analysis.models import MateAnalysis, MateAnalysisProgress
+from apps.stocks.services.mate_analysis import llm_indicators, llm_snapshot_queryset
+from core.utils.llm_cache import MODES as CACHE_MODES, LLMCache, LLMCacheMiss, cache_key, get_llm_cache
+from core.utils.llm_runner import DEFAULT_OUTPUT_TOKENS, AsyncLLMRunner
+from core.utils.mate_engine import ENGINE_VERSION
+from core.utils.mate_prompt import MATE_GUIDES, MATE_PROMPTS, build_combined_messages, build_messages, validate_combined
+from core.utils.mate_response import MateResponseError, parse_combined_response, parse_mate_response
 
 
 # 설정
-PROGRESS_FILE = 'progress_mate_analysis.csv'
-RETRY_COUNT = 2
-
-# 통계
-stats = {
-    'success': 0,
-    'failed': 0,
-    'skipped': 0,
-    'total_cost': 0.0,
-}
-
-
-def load_progress():
-    """진행 상황 로드"""
-    if not os.path.exists(PROGRESS_FILE):
-        return set()
-    
-    processed = set()
-    with open(PROGRESS_FILE, 'r', encoding='utf-8') as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            if row.get('status') == 'success':
-                processed.add(row['stock_code'])
-    return processed
-
-
-def save_progress(stock_code, status, message='', cost=0.0):
-    """진행 상황 저장"""
-    file_exists = os.path.exists(PROGRESS_FILE)
-    
-    with open(PROGRESS_FILE, 'a', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=['stock_code', 'status', 'message', 'cost', 'timestamp'])
-        
-        if not file_exists:
-            writer.writeheader()
-        
-        writer.writerow({
-            'stock_code': stock_code,
-            'status': status,
-            'message': message[:100] if message else '',
-            'cost': f'{cost:.4f}',
-            'timestamp': datetime.now().isoformat()
-        })
+RETRY_COUNT = 3
+MODEL = "gpt-4-turbo-preview"
+TEMPERATURE = 0.7
+RESPONSE_FORMAT = {"type": "json_object"}
+
+# 실행 모드
+MODES = ('combined', 'per-mate')
+
+# 개별 요청 응답이 스키마와 맞지 않을 때 재요청 횟수
+FALLBACK_RETRIES = 2
 
+# 재시도할 OpenAI 오류 (그 외 400대 오류는 바로 실패)
+RETRYABLE_ERRORS = (
+    openai.RateLimitError,
+    openai.APITimeoutError,
+    openai.APIConnectionError,
+    openai.InternalServerError,
+)
 
-def calculate_indicators(stock):
+
+def load_indicators():
     """
-    재무 지표 계산
+    분석 대상 종목의 지표 (TTM 지표 스냅샷, 쿼리 1회)
+    
+    Returns:
+        [(stock_id, indicators)] - 종목 코드순
     """
-    # 최근 4개 분기 데이터 (TTM)
-    recent_financials = StockFinancialRaw.objects.filter(
-        stock=stock,
-        data_source='EDGAR'
-    ).order_by('-disclosure_year', '-disclosure_quarter')[:4]
-    
-    if len(recent_financials) < 4:
-        return None
-    
-    # TTM 계산
-    ttm_data = {
-        'ocf': sum([f.ocf or 0 for f in recent_financials]),
-        'fcf': sum([f.fcf or 0 for f in recent_financials]),
-        'net_income': sum([f.net_income or 0 for f in recent_financials]),
-        'revenue': sum([f.revenue or 0 for f in recent_financials]),
-    }
+    snapshots = llm_snapshot_queryset().order_by('stock__stock_code')
+    return [(snapshot.stock_id, llm_indicators(snapshot)) for snapshot in snapshots]
+
+
+def plan_work(rows, limit=None):
+    """
+    분석할 (종목, 메이트) 목록
     
-    # 최근 분기 재무상태
-    latest = recent_financials[0]
+    MateAnalysisProgress가 success이고 프롬프트 키(개별 또는 통합)가 같으면 건너뜀
+    (중단/실패한 것, 지표가 바뀐 것만 남음)
     
-    # 기본 체크
-    if not latest.total_assets or not latest.total_equity:
-        return None
+    Returns:
+        [(stock_id, indicators, [(mate_type, messages, prompt_key)], (통합 messages, 통합 prompt_key))]
+    """
+    done = {
+        (stock_id, mate_type): prompt_key
+        for stock_id, mate_type, prompt_key in MateAnalysisProgress.objects.filter(
+            status='success'
+        ).values_list('stock_id', 'mate_type', 'prompt_key')
+    }
     
-    # 지표 계산
-    indicators = {
-        'stock_name': stock.stock_name,
-        'stock_code': stock.stock_code,
-        
-        # 현금흐름
-        'ocf': ttm_data['ocf'],
-        'fcf': ttm_data['fcf'],
-        'net_income': ttm_data['net_income'],
-        'revenue': ttm_data['revenue'],
+    work = []
+    for stock_id, indicators in rows:
+        combined_messages = build_combined_messages(indicators)
+        combined_key = cache_key(MODEL, combined_messages, TEMPERATURE, response_format=RESPONSE_FORMAT)
         
-        # 재무상태
-        'total_assets': latest.total_assets,
-        'total_liabilities': latest.total_liabilities or 0,
-        'total_equity': latest.total_equity,
-        'current_assets': latest.current_assets or 0,
-        'current_liabilities': latest.current_liabilities or 0,
+        mates = []
+        for mate_type in MATE_PROMPTS:
+            messages = build_messages(mate_type, indicators)
+            prompt_key = cache_key(MODEL, messages, TEMPERATURE, response_format=RESPONSE_FORMAT)
+            if done.get((stock_id, mate_type)) not in (prompt_key, combined_key):
+                mates.append((mate_type, messages, prompt_key))
         
-        # 비율 계산
-        'roe': round((ttm_data['net_income'] / latest.total_equity) * 100, 2) if latest.total_equity else 0,
-        'debt_ratio': round((latest.total_liabilities / latest.total_equity) * 100, 2) if latest.total_equity else 0,
-        'current_ratio': round((latest.current_assets / latest.current_liabilities) * 100, 2) if latest.current_liabilities else 0,
-        'fcf_margin': round((ttm_data['fcf'] / ttm_data['revenue']) * 100, 2) if ttm_data['revenue'] else 0,
-    }
-    
-    return indicators
-
-
-def analyze_with_benjamin(indicators, client):
-    """벤저민 그레이엄 메이트 분석"""
-    prompt = f"""
-당신은 벤저민 그레이엄의 투자 철학을 따르는 AI 분석가입니다.
-
-투자 원칙:
-• 안전마진 최우선
-• 재무 안전성 중시 (부채비율, 유동비율)
-• 현금흐름 품질
-
-기업 정보:
-- 기업명: {indicators['stock_name']}
-- ROE: {indicators['roe']}%
-- 부채비율: {indicators['debt_ratio']}%
-- 유동비율: {indicators['current_ratio']}%
-- FCF 마진: {indicators['fcf_margin']}%
-- OCF: ${indicators['ocf']:,.0f}
-- FCF: ${indicators['fcf']:,.0f}
-
-당신의 투자 철학에 따라 이 기업을 평가하세요.
-
-응답 형식 (JSON):
-{{
-  "score": 0-100 점수,
-  "summary": "한 줄 요약 (30자 이내)",
-  "reason": "평가 이유 (3-4줄, 쉬운 언어, 구체적 숫자 포함)",
-  "caution": "주의사항 (있다면)",
-  "score_detail": {{
-    "safety": 0-100,
-    "cashflow": 0-100,
-    "stability": 0-100
-  }}
-}}
-
-말투: 신중하고 정중한 톤
-"""
-    
-    response = client.chat.completions.create(
-        model="gpt-4-turbo-preview",
-        messages=[
-            {"role": "system", "content": "벤저민 그레이엄 스타일 투자 분석가"},
-            {"role": "user", "content": prompt}
-        ],
-        temperature=0.7,
-        response_format={"type": "json_object"}
+        if mates:
+            work.append((stock_id, indicators, mates, (combined_messages, combined_key)))
+            if limit and len(work) >= limit:
+                break
+    
+    return work
+
+
+def save_result(stock_id, mate_type, prompt_key, result, tokens, cost, cached):
+    """분석 결과 + 진행 상태 저장 (MateAnalysis 시그널로 메이트 점수 테이블도 동기화)"""
+    with transaction.atomic():
+        MateAnalysis.objects.update_or_create(
+            stock_id=stock_id,
+            mate_type=mate_type,
+            defaults={
+                'score': result['score'],
+                'summary': result['summary'],
+                'reason': result['reason'],
+                'caution': result.get('caution', ''),
+                'score_detail': result['score_detail'],
+                'analysis_version': ENGINE_VERSION,
+            }
+        )
+        save_progress(stock_id, mate_type, prompt_key, 'success', tokens=tokens, cost=cost, cached=cached)
+
+
+def save_progress(stock_id, mate_type, prompt_key, status, tokens=0, cost=0.0, cached=False, error=''):
+    """(종목, 메이트) 진행 상태 기록"""
+    progress, _ = MateAnalysisProgress.objects.get_or_create(
+        stock_id=stock_id,
+        mate_type=mate_type,
+        defaults={'status': status},
     )
+    progress.status = status
+    progress.prompt_key = prompt_key
+    progress.attempts += 1
+    progress.total_tokens = tokens
+    progress.cost = cost
+    progress.cached = cached
+    progress.error = error[:200]
+    progress.save()
+
+
+def openai_call(client):
+    """OpenAI 비동기 호출 함수 (캐시 미스일 때만 호출됨)"""
+    async def call(model, messages, temperature, **params):
+        if client is None:
+            raise RuntimeError("OpenAI API Key가 없습니다")
+        
+        response = await client.chat.completions.create(
+            model=model,
+            messages=messages,
+            temperature=temperature,
+            **params
+        )
+        return response.choices[0].message.content, response.usage.total_tokens
     
-    result = json.loads(response.choices[0].message.content)
-    tokens = response.usage.total_tokens
-    cost = (tokens / 1000) * 0.01  # GPT-4 Turbo 비용
-    
-    return result, cost
-
-
-def analyze_with_fisher(indicators, client):
-    """필립 피셔 메이트 분석"""
-    prompt = f"""
-당신은 필립 피셔의 투자 철학을 따르는 AI 분석가입니다.
-
-투자 원칙:
-• 성장성 중시
-• 현금흐름 창출 능력
-• 장기 투자
-
-기업 정보:
-- 기업명: {indicators['stock_name']}
-- ROE: {indicators['roe']}%
-- OCF: ${indicators['ocf']:,.0f}
-- FCF: ${indicators['fcf']:,.0f}
-- FCF 마진: {indicators['fcf_margin']}%
-- 매출: ${indicators['revenue']:,.0f}
-
-당신의 투자 철학에 따라 이 기업의 성장성을 평가하세요.
-
-응답 형식 (JSON):
-{{
-  "score": 0-100 점수,
-  "summary": "한 줄 요약 (30자 이내)",
-  "reason": "평가 이유 (3-4줄, 쉬운 언어, 구체적 숫자 포함)",
-  "caution": "주의사항 (있다면)",
-  "score_detail": {{
-    "growth": 0-100,
-    "quality": 0-100,
-    "management": 0-100
-  }}
-}}
-
-말투: 열정적이고 미래 지향적
-"""
-    
-    response = client.chat.completions.create(
-        model="gpt-4-turbo-preview",
-        messages=[
-            {"role": "system", "content": "필립 피셔 스타일 투자 분석가"},
-            {"role": "user", "content": prompt}
-        ],
-        temperature=0.7,
-        response_format={"type": "json_object"}
-    )
-    
-    result = json.loads(response.choices[0].message.content)
-    tokens = response.usage.total_tokens
-    cost = (tokens / 1000) * 0.01
-    
-    return result, cost
+    return call
 
 
-def analyze_with_greenblatt(indicators, client):
-    """조엘 그린블라트 메이트 분석"""
+async def analyze_mate(runner, stock_id, mate_type, messages, prompt_key):
+    """
+    (종목, 메이트) 개별 요청 1건 분석 + 저장
     
-    # ROIC 계산 (간이버전: ROE 사용)
-    roic = indicators['roe']
+    응답이 스키마와 맞지 않으면 FALLBACK_RETRIES번까지 재요청 (틀린 응답은 캐시되지 않음)
     
-    # Earnings Yield 계산 (간이버전: Net Income / Total Assets)
-    earnings_yield = (indicators['net_income'] / indicators['total_assets'] * 100) if indicators['total_assets'] else 0
+    Returns:
+        성공 여부
+    """
+    for attempt in range(FALLBACK_RETRIES + 1):
+        try:
+            content, tokens, cost, cached = await runner.complete(
+                MODEL, messages, TEMPERATURE,
+                validate=parse_mate_response,
+                response_format=RESPONSE_FORMAT
+            )
+            result = parse_mate_response(content)
+            await sync_to_async(save_result)(stock_id, mate_type, prompt_key, result, tokens, cost, cached)
+            return True
+        
+        except MateResponseError as e:
+            error = f"응답 형식 오류: {e}"
+            continue
+        except LLMCacheMiss:
+            error = "캐시 없음 (replay 모드)"
+        except Exception as e:
+            error = str(e)
+        break
     
-    prompt = f"""
-당신은 조엘 그린블라트의 마법공식을 따르는 AI 분석가입니다.
-
-투자 원칙:
-• 좋은 회사 (높은 ROIC)
-• 싼 가격 (높은 Earnings Yield)
-• 계량적 분석
-
-기업 정보:
-- 기업명: {indicators['stock_name']}
-- ROIC (ROE): {roic:.2f}%
-- Earnings Yield: {earnings_yield:.2f}%
-- FCF: ${indicators['fcf']:,.0f}
-- 총자산: ${indicators['total_assets']:,.0f}
+    runner.stats.failures += 1
+    await sync_to_async(save_progress)(stock_id, mate_type, prompt_key, 'failed', error=error)
+    return False
 
-당신의 마법공식에 따라 이 기업을 평가하세요.
 
-응답 형식 (JSON):
-{{
-  "score": 0-100 점수,
-  "summary": "한 줄 요약 (30자 이내)",
-  "reason": "평가 이유 (3-4줄, 쉬운 언어, 구체적 숫자 포함)",
-  "caution": "주의사항 (있다면)",
-  "score_detail": {{
-    "roic": 0-100,
-    "earnings_yield": 0-100,
-    "value": 0-100
-  }}
-}}
-
-말투: 명확하고 논리적
-"""
+async def analyze_combined(runner, stock_id, mates, combined):
+    """
+    종목 1개의 남은 메이트를 통합 요청 1회로 분석 + 저장
     
-    response = client.chat.completions.create(
-        model="gpt-4-turbo-preview",
-        messages=[
-            {"role": "system", "content": "조엘 그린블라트 스타일 투자 분석가"},
-            {"role": "user", "content": prompt}
-        ],
-        temperature=0.7,
-        response_format={"type": "json_object"}
-    )
+    스키마 검증에 실패했거나 응답에 빠진 메이트만 개별 요청으로 폴백
     
-    result = json.loads(response.choices[0].message.content)
-    tokens = response.usage.total_tokens
-    cost = (tokens / 1000) * 0.01
+    Returns:
+        (성공한 메이트 수, 폴백한 메이트 수)
+    """
+    messages, prompt_key = combined
+    pending = {mate_type: (mate_messages, mate_key) for mate_type, mate_messages, mate_key in mates}
+    
+    try:
+        content, tokens, cost, cached = await runner.complete(
+            MODEL, messages, TEMPERATURE,
+            validate=validate_combined,
+            output_tokens=DEFAULT_OUTPUT_TOKENS * len(MATE_GUIDES),
+            response_format=RESPONSE_FORMAT
+        )
+        results, errors = parse_combined_response(content, pending)
+    except LLMCacheMiss:
+        results, errors = {}, dict.fromkeys(pending, "캐시 없음 (replay 모드)")
+    except Exception as e:
+        results, errors = {}, dict.fromkeys(pending, str(e))
+    
+    # 사용량은 통합 응답의 메이트 수로 나눠 기록
+    if results:
+        share = len(MATE_GUIDES)
+        for mate_type, result in results.items():
+            await sync_to_async(save_result)(
+                stock_id, mate_type, prompt_key, result, tokens // share, cost / share, cached
+            )
     
-    return result, cost
+    fallbacks = await asyncio.gather(*(
+        analyze_mate(runner, stock_id, mate_type, *pending[mate_type])
+        for mate_type in errors
+    ))
+    
+    return len(results) + sum(fallbacks), len(errors)
 
 
-def analyze_stock(stock, client):
-    """
-    단일 종목 분석 (3명 메이트)
+async def run_async(work, runner, mode='combined'):
     """
-    # 1. 재무 지표 계산
-    indicators = calculate_indicators(stock)
-    if not indicators:
-        return None, "재무 데이터 부족"
+    종목별로 분석하고, 종목이 끝날 때마다 진행 상황 출력
     
-    total_cost = 0.0
+    combined: 남은 메이트가 2명 이상이면 통합 요청 1회, 1명이면 개별 요청
+    per-mate: 메이트별 요청을 동시에
+    """
+    total = len(work)
+    completed = 0
+    fallback_count = 0
     
-    try:
-        # 2. 벤저민 분석
-        benjamin_result, cost1 = analyze_with_benjamin(indicators, client)
-        time.sleep(0.5)  # Rate limit
+    async def analyze_stock(item):
+        nonlocal completed, fallback_count
+        stock_id, indicators, mates, combined = item
         
-        # 3. 피셔 분석
-        fisher_result, cost2 = analyze_with_fisher(indicators, client)
-        time.sleep(0.5)
+        if mode == 'combined' and len(mates) > 1:
+            succeeded, fallbacks = await analyze_combined(runner, stock_id, mates, combined)
+            fallback_count += fallbacks
+        else:
+            results = await asyncio.gather(*(
+                analyze_mate(runner, stock_id, mate_type, messages, prompt_key)
+                for mate_type, messages, prompt_key in mates
+            ))
+            succeeded = sum(results)
         
-        # 4. 그린블라트 분석
-        greenblatt_result, cost3 = analyze_with_greenblatt(indicators, client)
-        time.sleep(0.5)
-        
-        total_cost = cost1 + cost2 + cost3
-        
-        # 5. DB 저장
-        for mate_type, result in [
-            ('benjamin', benjamin_result),
-            ('fisher', fisher_result),
-            ('greenblatt', greenblatt_result)
-        ]:
-            MateAnalysis.objects.update_or_create(
-                stock=stock,
-                mate_type=mate_type,
-                defaults={
-                    'score': result['score'],
-                    'summary': result['summary'],
-                    'reason': result['reason'],
-                    'caution': result.get('caution', ''),
-                    'score_detail': result['score_detail'],
-                }
-            )
-        
-        return total_cost, None
-        
-    except Exception as e:
-        return None, str(e)[:100]
+        completed += 1
+        mark = "✅" if succeeded == len(mates) else "❌"
+        print(
+            f"[{completed}/{total}] {mark} {indicators['stock_code']}: "
+            f"{succeeded}/{len(mates)} | {runner.stats.progress()}"
+        )
+    
+    await runner.run(work, analyze_stock)
+    return fallback_count
 
 
-def run_mate_analysis(api_key, limit=None):
+def run_mate_analysis(api_key, limit=None, cache=None, concurrency=None, rpm=None, tpm=None, mode='combined'):
     """
     메이트 분석 실행
+    
+    Args:
+        api_key: OpenAI API Key (replay 모드에서는 없어도 됨)
+        limit: 처리할 종목 수 (테스트용)
+        cache: LLM 응답 캐시 (None이면 설정 기반 공용 캐시)
+        concurrency / rpm / tpm: 동시 요청 수 / 분당 요청 수 / 분당 토큰 수 (None이면 설정값)
+        mode: 'combined' (종목당 요청 1회) / 'per-mate' (메이트마다 요청 1회)
+    
+    Returns:
+        실행 통계 (RunStats.summary)
     """
     print("=" * 60)
     print("🤖 GPT-4 메이트 분석")
     print("=" * 60)
     print()
     
-    # OpenAI 클라이언트
-    client = OpenAI(api_key=api_key)
-    
-    # 1. 진행 상황 로드
-    print("📂 진행 상황 확인 중...")
-    processed_codes = load_progress()
-    if processed_codes:
-        print(f"✅ 이미 처리된 종목: {len(processed_codes)}개 (건너뛰기)")
+    # 재시도는 runner가 담당 (클라이언트 자체 재시도 끔)
+    client = AsyncOpenAI(api_key=api_key, max_retries=0) if api_key else None
+    cache = cache or get_llm_cache()
+    concurrency = concurrency or settings.OPENAI_CONCURRENCY
+    rpm = rpm or settings.OPENAI_RPM_LIMIT
+    tpm = tpm or settings.OPENAI_TPM_LIMIT
+    
+    runner = AsyncLLMRunner(
+        openai_call(client),
+        cache,
+        concurrency=concurrency,
+        rpm=rpm,
+        tpm=tpm,
+        max_retries=RETRY_COUNT,
+        retryable=RETRYABLE_ERRORS,
+    )
+    print(f"🗄️  LLM 캐시: {cache.path} (모드: {cache.mode})")
+    print(f"⚙️  모드: {mode}, 동시 요청: {concurrency}개, RPM: {rpm}, TPM: {tpm}")
     print()
     
-    # 2. 분석할 종목 조회 (재무 데이터가 있는 종목만)
-    print("🔍 분석 대상 종목 조회 중...")
-    
-    stocks_with_data = StockFinancialRaw.objects.filter(
-        data_source='EDGAR'
-    ).values_list('stock_id', flat=True).distinct()
-    
-    stocks = Stock.objects.filter(
-        id__in=stocks_with_data,
-        country='us'
-    ).exclude(
-        stock_code__in=processed_codes
-    ).order_by('stock_code')
+    # 1. 분석 대상 (완료된 (종목, 메이트)는 제외)
+    print("🔍 분석 대상 조회 중...")
+    work = plan_work(load_indicators(), limit=limit)
+    requests_count = sum(len(mates) for _, _, mates, _ in work)
     
     if limit:
-        stocks = stocks[:limit]
         print(f"⚠️  테스트 모드: {limit}개만 처리")
-    
-    total = stocks.count()
-    print(f"✅ 분석 대상: {total}개")
+    print(f"✅ 분석 대상: {len(work)}개 종목, {requests_count}건")
     print()
     
-    if total == 0:
+    if not work:
         print("✅ 모든 종목이 이미 분석되었습니다!")
-        return
+        return runner.stats.summary()
     
-    # 3. 분석 시작
+    # 2. 분석
     print("=" * 60)
     print("🚀 메이트 분석 시작!")
     print("=" * 60)
     print()
     
-    start_time = time.time()
+    fallback_count = asyncio.run(run_async(work, runner, mode=mode))
     
-    for idx, stock in enumerate(stocks, 1):
-        try:
-            print(f"[{idx}/{total}] 🔍 {stock.stock_code}: {stock.stock_name[:30]}")
-            
-            cost, error = analyze_stock(stock, client)
-            
-            if cost is not None:
-                stats['success'] += 1
-                stats['total_cost'] += cost
-                save_progress(stock.stock_code, 'success', '3명 분석 완료', cost)
-                
-                print(f"        ✅ 완료 (${cost:.4f})")
-                print(f"        💰 누적: ${stats['total_cost']:.2f}")
-            else:
-                stats['failed'] += 1
-                save_progress(stock.stock_code, 'failed', error)
-                print(f"        ❌ 실패: {error}")
-            
-            print()
-            
-        except Exception as e:
-            stats['failed'] += 1
-            save_progress(stock.stock_code, 'error', str(e)[:100])
-            print(f"        ❌ 에러: {str(e)[:50]}\n")
+    # 3. 최종 통계
+    summary = runner.stats.summary()
     
-    elapsed_time = time.time() - start_time
-    
-    # 4. 최종 통계
     print()
     print("=" * 60)
     print("📊 분석 완료!")
     print("=" * 60)
-    print(f"✅ 성공: {stats['success']}개")
-    print(f"❌ 실패: {stats['failed']}개")
-    print(f"💰 총 비용: ${stats['total_cost']:.2f}")
-    print(f"⏱️  소요 시간: {elapsed_time/60:.1f}분")
+    print(f"✅ 성공: {requests_count - summary['failures']}건")
+    print(f"❌ 실패: {summary['failures']}건")
+    print(f"🌐 API 호출: {summary['api_calls']}회 (재시도 {summary['retries']}회, 캐시 적중 {summary['cache_hits']}회)")
+    if mode == 'combined':
+        print(f"🔁 개별 요청 폴백: {fallback_count}건")
+    print(f"🔢 토큰: {summary['tokens']:,} ({summary['tokens_per_minute']:,.0f} tok/min)")
+    print(f"💰 총 비용: ${summary['cost']:.2f}")
+    print(f"⏱️  소요 시간: {summary['elapsed']/60:.1f}분 ({summary['requests_per_minute']:.0f} req/min)")
     print()
     
     # DB 통계
-    total_analyses = MateAnalysis.objects.count()
-    total_stocks_analyzed = MateAnalysis.objects.values('stock').distinct().count()
-    
     print(f"💾 DB 통계:")
-    print(f"  - 메이트 분석: {total_analyses}개")
-    print(f"  - 분석된 종목: {total_stocks_analyzed}개")
+    print(f"  - 메이트 분석: {MateAnalysis.objects.count()}개")
+    print(f"  - 분석된 종목: {MateAnalysis.objects.values('stock').distinct().count()}개")
+    print(f"  - 실패 (다음 실행 때 재시도): {MateAnalysisProgress.objects.filter(status='failed').count()}건")
     print()
     
-    if limit:
-        remaining = Stock.objects.filter(
-            id__in=stocks_with_data,
-            country='us'
-        ).exclude(
-            stock_code__in=load_progress()
-        ).count()
-        
-        estimated_cost = (stats['total_cost'] / stats['success']) * remaining if stats['success'] > 0 else 0
-        
-        print(f"📊 전체 실행 예상:")
-        print(f"  - 남은 종목: {remaining}개")
-        print(f"  - 예상 비용: ${estimated_cost:.2f}")
-        print(f"  - 예상 시간: {(elapsed_time / stats['success'] * remaining / 60):.0f}분")
+    return summary
 
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='GPT-4 메이트 분석')
     parser.add_argument('--limit', type=int, help='처리할 종목 수 제한 (테스트용)')
     parser.add_argument('--api-key', type=str, help='OpenAI API Key')
+    parser.add_argument('--concurrency', type=int, help='동시 요청 수 (기본: OPENAI_CONCURRENCY)')
+    parser.add_argument('--rpm', type=int, help='분당 요청 수 한도 (기본: OPENAI_RPM_LIMIT)')
+    parser.add_argument('--tpm', type=int, help='분당 토큰 수 한도 (기본: OPENAI_TPM_LIMIT)')
+    parser.add_argument('--mode', choices=MODES, default='combined',
+                        help='combined: 종목당 요청 1회 (기본) / per-mate: 메이트마다 요청 1회')
+    parser.add_argument('--cache-mode', choices=CACHE_MODES,
+                        help='LLM 캐시 모드 (기본: LLM_CACHE_MODE, replay는 저장된 응답만 사용/오프라인)')
+    parser.add_argument('--cache-path', type=str, help='LLM 캐시 파일 (기본: LLM_CACHE_PATH)')
     args = parser.parse_args()
     
-    # API 키 입력
-    api_key = args.api_key
-    if not api_key:
+    cache = get_llm_cache()
+    if args.cache_mode or args.cache_path:
+        cache = LLMCache(
+            args.cache_path or cache.path,
+            max_bytes=cache.max_bytes,
+            mode=args.cache_mode or cache.mode,
+        )
+    
+    # API 키 입력 (replay 모드는 API를 호출하지 않음)
+    api_key = args.api_key or settings.OPENAI_API_KEY
+    if not api_key and cache.mode != 'replay':
         api_key = input("🔑 OpenAI API Key 입력: ").strip()
-    
-    if not api_key:
-        print("❌ API 키가 필요합니다!")
-        sys.exit(1)
-    
-    run_mate_analysis(api_key, limit=args.limit)
-
+        
+        if not api_key:
+            print("❌ API 키가 필요합니다!")
+            sys.exit(1)
+    
+    run_mate_analysis(
+        api_key,
+        limit=args.limit,
+        cache=cache,
+        concurrency=args.concurrency,
+        rpm=args.rpm,
+        tpm=args.tpm,
+        mode=args.mode,
+    )